@@ -0,0 +1,138 @@
+"""
+Compare the binary GameState codec with the JSON path.
+
+Usage:
+    python -m benchmarks.codec_benchmark [--games N] [--guesses G] [--repeat R]
+
+The "json" rows are what the text repositories do: to_db_format() plus
+json.dumps on the way in, json.loads plus from_db_format() on the way out.
+The "binary" rows use encode_state / decode_state. Sizes are bytes per game.
+The last line is the size in SQLiteArchiveRepository's zlib-compressed
+blocks of games like the archive holds: finished (won or lost) games with
+random codes, guesses and timestamps, so the ratio is not inflated by
+games that only differ in their ids.
+"""
+import argparse
+from datetime import datetime, timedelta
+import json
+import random
+import timeit
+import zlib
+from typing import Callable, Dict, List
+
+from benchmarks.repository_benchmark import _states
+from src.core.config.game_config import GameConfig
+from src.core.game_logic import GameLogic
+from src.core.models.game_state import GameState
+from src.core.models.game_status import GameStatus
+from src.core.models.guess import Guess
+from src.repository.archive import ARCHIVE_BLOCK_GAMES
+from src.repository.codec import decode_state, encode_state
+
+
+def _json_encode(state: GameState) -> bytes:
+    return json.dumps(state.to_db_format()).encode("utf-8")
+
+
+def _json_decode(data: bytes) -> GameState:
+    return GameState.from_db_format(json.loads(data))
+
+
+CODECS: Dict[str, Dict[str, Callable]] = {
+    "json": {"encode": _json_encode, "decode": _json_decode},
+    "binary": {"encode": encode_state, "decode": decode_state},
+}
+
+
+def benchmark(states: List[GameState], repeat: int) -> dict:
+    """
+    Best-of-repeat games per second for encode and decode, and mean bytes per game.
+
+    Returns:
+        dict: codec name to {"encode": games/s, "decode": games/s, "bytes": bytes per game}
+    """
+    results = {}
+    for name, codec in CODECS.items():
+        encoded = [codec["encode"](state) for state in states]
+        encode = min(timeit.repeat(lambda: [codec["encode"](state) for state in states], number=1, repeat=repeat))
+        decode = min(timeit.repeat(lambda: [codec["decode"](data) for data in encoded], number=1, repeat=repeat))
+        results[name] = {
+            "encode": len(states) / encode,
+            "decode": len(states) / decode,
+            "bytes": sum(map(len, encoded)) / len(states),
+        }
+    return results
+
+
+def finished_states(games: int, seed: int = 0) -> List[GameState]:
+    """
+    Won and lost Normal games with random codes, guesses, timestamps and players.
+
+    A game is won at a random attempt by guessing its code, or lost after
+    max_attempts random guesses; feedback is scored by GameLogic.
+    """
+    rng = random.Random(seed)
+    config = GameConfig()
+    game_logic = GameLogic(config)
+    start = datetime(2024, 1, 1)
+
+    def random_code() -> List[int]:
+        return [rng.randint(config.min_number, config.max_number) for _ in range(config.pattern_length)]
+
+    states = []
+    for game in range(games):
+        code = random_code()
+        pattern_count = game_logic.calculate_pattern_counts(code)
+        won = rng.random() < 0.5
+        attempts = rng.randint(1, config.max_attempts) if won else config.max_attempts
+        guesses = [random_code() for _ in range(attempts - 1)] + [code if won else random_code()]
+        created_at = start + timedelta(seconds=rng.randrange(365 * 24 * 3600))
+        states.append(GameState(
+            game_id=f"archive-{game:08d}",
+            code_pattern=code,
+            status=GameStatus.WON if won else GameStatus.LOST,
+            attempts=attempts,
+            guess_records=[(Guess(guess), game_logic.check_guess(Guess(guess), pattern_count, code))
+                           for guess in guesses],
+            created_at=created_at,
+            updated_at=created_at + timedelta(seconds=rng.randrange(1, 3600)),
+            config=config,
+            player_id=f"player-{rng.randrange(games // 10 + 1)}" if rng.random() < 0.8 else None,
+        ))
+    return states
+
+
+def archived_bytes(states: List[GameState], block_games: int = ARCHIVE_BLOCK_GAMES) -> float:
+    """
+    Mean bytes per game once binary-encoded and compressed in archive blocks.
+    """
+    encoded = [encode_state(state) for state in states]
+    blocks = [zlib.compress(b"".join(encoded[start:start + block_games]))
+              for start in range(0, len(encoded), block_games)]
+    return sum(map(len, blocks)) / len(states)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the binary GameState codec against JSON")
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--guesses", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # the final state of every game, with its full history
+    states = _states(args.games, args.guesses, "codec")[args.guesses::args.guesses + 1]
+    results = benchmark(states, args.repeat)
+    baseline = results["json"]
+    for name, result in results.items():
+        print(f"{name:>6}: encode {result['encode']:9.0f} games/s ({result['encode'] / baseline['encode']:.2f}x)  "
+              f"decode {result['decode']:9.0f} games/s ({result['decode'] / baseline['decode']:.2f}x)  "
+              f"{result['bytes']:7.1f} bytes/game")
+    finished = finished_states(args.games)
+    encoded = sum(len(encode_state(state)) for state in finished) / len(finished)
+    archived = archived_bytes(finished)
+    print(f"archived blocks of {ARCHIVE_BLOCK_GAMES}, finished games: {encoded:7.1f} -> {archived:7.1f} "
+          f"bytes/game ({encoded / archived:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
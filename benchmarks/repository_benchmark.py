@@ -0,0 +1,154 @@
+"""
+Measure per-save and per-load latency of SQLiteGameRepository.
+
+Usage:
+    python -m benchmarks.repository_benchmark [--games N] [--guesses G] [--repeat R] [--db PATH]
+
+Replays the save pattern of real play: every game is saved once on creation
+and once after each of G guesses. The "per-call" rows open, use and close a
+connection around every statement (the repository's original behaviour),
+the "pooled" rows go through the repository's long-lived connection. The
+"wal" row adds journal_mode=WAL with synchronous=NORMAL and the
+"write-behind" row also queues saves for group commits (its time includes
+the final flush). The "bulk" load row fetches every game with one
+load_many call and the "cached" row reloads them through a warm
+CachingGameRepository. The "log" rows use LogStructuredGameRepository,
+which appends each save to a segment file instead of updating pages.
+"""
+import argparse
+from datetime import datetime
+import os
+import sqlite3
+import tempfile
+import timeit
+from typing import Callable, List, Optional
+
+from src.core.config.game_config import GameConfig
+from src.core.models.feedback import Feedback
+from src.core.models.game_state import GameState
+from src.core.models.game_status import GameStatus
+from src.core.models.guess import Guess
+from src.repository.cache import CachingGameRepository
+from src.repository.log_structured import LogStructuredGameRepository
+from src.repository.sqlite import SELECT_GAME, SELECT_GUESSES, SQLiteGameRepository
+
+
+def _states(games: int, guesses: int, prefix: str) -> List[GameState]:
+    """
+    Every intermediate state of each game, in the order play would save them.
+    """
+    states = []
+    for game in range(games):
+        records = []
+        for attempt in range(guesses + 1):
+            states.append(GameState(
+                game_id=f"{prefix}-{game:08d}",
+                code_pattern=[1, 2, 3, 4],
+                status=GameStatus.IN_PROGRESS,
+                attempts=attempt,
+                guess_records=list(records),
+                created_at=datetime(2024, 1, 1),
+                updated_at=datetime(2024, 1, 1),
+                config=GameConfig(),
+            ))
+            records.append((Guess([attempt % 8, 0, 1, 2]), Feedback(1, 0)))
+    return states
+
+
+def _save_per_call(repository: SQLiteGameRepository, state: GameState) -> None:
+    save = repository._to_rows(state)
+    connection = sqlite3.connect(repository._db_name)
+    try:
+        repository._write(connection, [save])
+        connection.commit()
+        repository._saved([save])
+    finally:
+        connection.close()
+
+
+def _load_per_call(db_name: str, game_id: str) -> None:
+    connection = sqlite3.connect(db_name)
+    try:
+        connection.execute(SELECT_GAME, (game_id,)).fetchone()
+        connection.execute(SELECT_GUESSES, (game_id,)).fetchall()
+    finally:
+        connection.close()
+
+
+def _best(run: Callable[[], None], operations: int, repeat: int) -> float:
+    return min(timeit.repeat(run, number=1, repeat=repeat)) / operations
+
+
+def _best_save(save: Callable[[GameState], None], mode: str, games: int, guesses: int, repeat: int,
+               finish: Optional[Callable[[], None]] = None) -> float:
+    """
+    Time replaying whole games, with fresh game ids on every repeat.
+    """
+    batches = iter([_states(games, guesses, f"{mode}-{run}") for run in range(repeat)])
+
+    def run():
+        for state in next(batches):
+            save(state)
+        if finish is not None:
+            finish()
+
+    return _best(run, games * (guesses + 1), repeat)
+
+
+def benchmark(db_name: str, games: int, guesses: int, repeat: int) -> dict:
+    """
+    Time saves and loads in each connection and durability mode.
+
+    Returns:
+        dict: (operation, mode) to best-of-repeat seconds per operation
+    """
+    game_ids = [f"pooled-0-{game:08d}" for game in range(games)]
+    results = {}
+
+    with SQLiteGameRepository(db_name) as repository:
+        results[("save", "per-call")] = _best_save(lambda state: _save_per_call(repository, state),
+                                                   "per-call", games, guesses, repeat)
+        results[("save", "pooled")] = _best_save(repository.save_game, "pooled", games, guesses, repeat)
+        results[("load", "per-call")] = _best(lambda: [_load_per_call(db_name, g) for g in game_ids],
+                                              games, repeat)
+        results[("load", "pooled")] = _best(lambda: [repository.load_game(g) for g in game_ids],
+                                            games, repeat)
+        results[("load", "bulk")] = _best(lambda: repository.load_many(game_ids), games, repeat)
+        cache = CachingGameRepository(repository, max_entries=games)
+        cache.load_many(game_ids)
+        results[("load", "cached")] = _best(lambda: [cache.load_game(g) for g in game_ids], games, repeat)
+
+    with SQLiteGameRepository(db_name, wal=True, synchronous="NORMAL") as repository:
+        results[("save", "wal")] = _best_save(repository.save_game, "wal", games, guesses, repeat)
+
+    with SQLiteGameRepository(db_name, wal=True, synchronous="NORMAL", write_behind=True) as repository:
+        results[("save", "write-behind")] = _best_save(repository.save_game, "write-behind", games, guesses,
+                                                       repeat, finish=repository.flush)
+
+    with tempfile.TemporaryDirectory() as log_directory, \
+            LogStructuredGameRepository(log_directory, compact_interval=None) as repository:
+        results[("save", "log")] = _best_save(repository.save_game, "log", games, guesses, repeat)
+        log_ids = [f"log-0-{game:08d}" for game in range(games)]
+        results[("load", "log")] = _best(lambda: [repository.load_game(g) for g in log_ids], games, repeat)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark SQLite repository latency")
+    parser.add_argument("--games", type=int, default=50)
+    parser.add_argument("--guesses", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--db", default=None, help="database file, a temporary one by default")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_name = args.db or os.path.join(directory, "benchmark.db")
+        results = benchmark(db_name, args.games, args.guesses, args.repeat)
+
+    for (operation, mode), seconds in results.items():
+        baseline = results[(operation, "per-call")]
+        print(f"{operation:>5} {mode:>12}: {seconds * 1e6:10.1f} us/op  ({baseline / seconds:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Compare the single-guess scoring kernels for every difficulty.
+
+Usage:
+    python -m benchmarks.scoring_benchmark [--pairs N] [--guess-pool P] [--repeat R]
+
+Reports pairs scored per second for the raw kernels and end to end through
+GameLogic.check_guess. Guesses are drawn from a pool of P distinct codes,
+which models bots and solvers that score the same guesses repeatedly; pass
+--guess-pool 0 to make every guess unique. Every timed run starts from a
+fresh scorer and GameLogic, so kernels that memoize encodings (bitmask)
+are measured cold: a run only reuses what it encoded itself.
+"""
+import argparse
+import random
+import timeit
+
+from src.core.config.game_config import PRESET_DIFFICULTIES, GameConfig
+from src.core.game_logic import GameLogic
+from src.core.models.game_difficulty import Difficulty
+from src.core.models.guess import Guess
+from src.core.models.scoring_kernel import ScoringKernel
+from src.core.scoring.kernels import create_scorer
+
+
+def _random_code(config: GameConfig, rng: random.Random) -> list[int]:
+    return [rng.randint(config.min_number, config.max_number) for _ in range(config.pattern_length)]
+
+
+def benchmark(difficulty: Difficulty, pairs: int, guess_pool: int, repeat: int) -> dict:
+    """
+    Time each kernel on the same random (guess, code) pairs, each run with a cold scorer.
+
+    Returns:
+        dict: (layer, kernel name) to best-of-repeat pairs scored per second
+    """
+    rng = random.Random(0)
+    base_config = GameConfig(difficulty)
+    codes = [_random_code(base_config, rng) for _ in range(64)]
+    pool = [_random_code(base_config, rng) for _ in range(guess_pool)]
+    guesses = [rng.choice(pool) if pool else _random_code(base_config, rng) for _ in range(pairs)]
+    workload = [(guess, rng.choice(codes)) for guess in guesses]
+
+    results = {}
+    for kernel in ScoringKernel:
+        config = GameConfig(difficulty, scoring_kernel=kernel)
+        counts = {id(code): GameLogic(config).calculate_pattern_counts(code) for code in codes}
+        wrapped = [(Guess(guess), code) for guess, code in workload]
+        fresh = {}
+
+        def reset():
+            # untimed setup of every run: no encodings memoized by an earlier run
+            fresh["scorer"] = create_scorer(config)
+            fresh["game_logic"] = GameLogic(config)
+
+        def run_kernel():
+            scorer = fresh["scorer"]
+            for guess, code in workload:
+                scorer.score(guess, code, counts[id(code)])
+
+        def run_game_logic():
+            game_logic = fresh["game_logic"]
+            for guess, code in wrapped:
+                game_logic.check_guess(guess, counts[id(code)], code)
+
+        for layer, run in (("kernel", run_kernel), ("check_guess", run_game_logic)):
+            best = min(timeit.repeat(run, setup=reset, number=1, repeat=repeat))
+            results[(layer, kernel.value)] = pairs / best
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare single-guess scoring kernels")
+    parser.add_argument("--pairs", type=int, default=100_000)
+    parser.add_argument("--guess-pool", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for difficulty in PRESET_DIFFICULTIES:
+        results = benchmark(difficulty, args.pairs, args.guess_pool, args.repeat)
+        for (layer, kernel), rate in results.items():
+            baseline = results[(layer, ScoringKernel.STANDARD.value)]
+            print(f"{difficulty.value:>7} {layer:>11} {kernel:>9}: "
+                  f"{rate:12,.0f} pairs/s  ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Measure save throughput of concurrent writers on one SQLite file versus shards.
+
+Usage:
+    python -m benchmarks.sharded_benchmark [--writers W] [--shards N] [--games G] [--guesses K] [--repeat R]
+                                           [--processes]
+
+Every writer replays the save pattern of its own games (see
+repository_benchmark). The "single" row writes to one SQLiteGameRepository,
+the "sharded" row to a ShardedSQLiteGameRepository with N shards; both use
+the default rollback journal, so every save waits for its own fsync.
+
+Writers are threads of one process by default. With --processes every
+writer is a separate process opening its own repository on the same files,
+the multi-process deployment sharding is meant for; the clock runs from
+the moment all writers are ready to the last one finishing, so process
+start-up and opening the databases are not counted. A repository only
+knows the guesses it has saved or loaded itself, so a process saving a
+game another process wrote rewrites its whole history (see
+SQLiteGameRepository); here every process saves its own games.
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+import os
+import tempfile
+import time
+from typing import Any, List
+
+from benchmarks.repository_benchmark import _states
+from src.core.models.game_state import GameState
+from src.repository.base import GameRepository
+from src.repository.sharded import ShardedSQLiteGameRepository
+from src.repository.sqlite import SQLiteGameRepository
+
+
+def _open(layout: str, directory: str, shards: int) -> GameRepository:
+    if layout == "single":
+        return SQLiteGameRepository(os.path.join(directory, "single.db"))
+    return ShardedSQLiteGameRepository(os.path.join(directory, "shards"), shards)
+
+
+def _write(repository: GameRepository, states: List[GameState]) -> None:
+    for state in states:
+        repository.save_game(state)
+
+
+def _saves_per_second(repository: GameRepository, batches: List[List[GameState]]) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(batches)) as executor:
+        list(executor.map(lambda states: _write(repository, states), batches))
+    return sum(map(len, batches)) / (time.perf_counter() - start)
+
+
+def _process_writer(layout: str, directory: str, shards: int, prefix: str, games: int, guesses: int,
+                    ready: Any, times: Any) -> None:
+    """
+    One writer process: open the layout, wait for the others, save its games.
+
+    ready is a manager Barrier shared by every writer, times a manager dict
+    receiving (start, end, saves) under the writer's prefix.
+    """
+    states = _states(games, guesses, prefix)
+    with _open(layout, directory, shards) as repository:
+        ready.wait()
+        start = time.time()
+        _write(repository, states)
+        times[prefix] = (start, time.time(), len(states))
+
+
+def _saves_per_second_processes(layout: str, directory: str, shards: int, prefixes: List[str],
+                                games: int, guesses: int) -> float:
+    context = multiprocessing.get_context("spawn")
+    with context.Manager() as manager:
+        ready = manager.Barrier(len(prefixes))
+        times = manager.dict()
+        writers = [context.Process(target=_process_writer,
+                                   args=(layout, directory, shards, prefix, games, guesses, ready, times))
+                   for prefix in prefixes]
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join()
+        if any(writer.exitcode for writer in writers):
+            raise RuntimeError(f"A {layout} writer process failed")
+        runs = list(times.values())
+    elapsed = max(end for _, end, _ in runs) - min(start for start, _, _ in runs)
+    return sum(saves for _, _, saves in runs) / elapsed
+
+
+def benchmark(directory: str, writers: int, shards: int, games: int, guesses: int, repeat: int,
+              processes: bool = False) -> dict:
+    """
+    Best-of-repeat saves per second for each layout.
+    """
+    results = {}
+    for layout in ("single", "sharded"):
+        # threads share this repository; processes open their own, after it created the schema
+        with _open(layout, directory, shards) as repository:
+            rates = []
+            for run in range(repeat):
+                prefixes = [f"{layout}-{run}-{writer}" for writer in range(writers)]
+                if processes:
+                    rates.append(_saves_per_second_processes(layout, directory, shards, prefixes, games, guesses))
+                else:
+                    rates.append(_saves_per_second(repository, [_states(games, guesses, prefix)
+                                                                for prefix in prefixes]))
+            results[layout] = max(rates)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark concurrent SQLite writers, single file vs shards")
+    parser.add_argument("--writers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--shards", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--guesses", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--processes", action="store_true", help="one process per writer instead of threads")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = benchmark(directory, args.writers, args.shards, args.games, args.guesses, args.repeat,
+                            args.processes)
+
+    for name, saves in results.items():
+        print(f"{name:>8}: {saves:10.0f} saves/s  ({saves / results['single']:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
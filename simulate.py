@@ -0,0 +1,40 @@
+import argparse
+import logging
+from src.core.config.game_config import PRESET_DIFFICULTIES
+from src.core.models.game_difficulty import Difficulty
+from src.core.models.solver_strategy import SolverStrategy
+from src.services.simulation.harness import REPOSITORIES, STRATEGIES, run_simulation
+from src.utils.logging_config import setup_logging_config
+
+logger = logging.getLogger(__name__)
+
+def main():
+    parser = argparse.ArgumentParser(description="Play every secret of a difficulty against a guessing strategy")
+    parser.add_argument("--difficulty", choices=[d.value for d in PRESET_DIFFICULTIES], default=Difficulty.NORMAL.value)
+    parser.add_argument("--strategy", choices=STRATEGIES, default=SolverStrategy.MINIMAX.value)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--limit", type=int, default=None, help="only play this many secrets")
+    parser.add_argument("--chunk-size", type=int, default=64, help="secrets per worker task")
+    parser.add_argument("--repository", choices=list(REPOSITORIES), default="null")
+    parser.add_argument("--table-dir", default=None, help="directory for precomputed feedback tables")
+    parser.add_argument("--log-level", default="WARNING", help="per-game logging is costly, keep it quiet by default")
+    args = parser.parse_args()
+
+    setup_logging_config()
+    logging.getLogger("src").setLevel(args.log_level)
+    logger.info("Starting Mastermind simulation")
+
+    report = run_simulation(
+        difficulty=Difficulty(args.difficulty),
+        strategy=args.strategy,
+        workers=args.workers,
+        limit=args.limit,
+        chunk_size=args.chunk_size,
+        repository=args.repository,
+        table_dir=args.table_dir,
+    )
+    print(report)
+    logger.info("Simulation terminated normally")
+
+if __name__ == "__main__":
+    main()
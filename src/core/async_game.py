@@ -0,0 +1,193 @@
+import asyncio
+import functools
+import logging
+from typing import List, Optional, Tuple
+from src.core.config.game_config import GameConfig
+from src.core.game import Game
+from src.core.models.feedback import Feedback
+from src.core.models.game_status import GameStatus
+from src.core.models.guess import Guess
+from src.core.state_manager import AsyncStateManager
+from src.repository.async_base import AsyncGameRepository
+from src.repository.null import NullGameRepository
+from src.services.generators.base import NumberGenerator
+from src.services.generators.random_org import RandomOrgGenerator
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncGame:
+    """
+    Asyncio facade over a Game session, for serving many players from one event loop.
+    
+    The wrapped Game keeps the rules and the in-memory state and saves to a
+    NullGameRepository; this facade persists each new state through an
+    AsyncGameRepository instead. Work that can take long runs off the loop:
+    code generation (a network call for random.org), solver hints, candidate
+    counts and, once the game tracks its candidate set, guesses (each one
+    narrows the set) go to the loop's default executor, storage to the
+    repository's own executor. Calls on one game are serialized, including
+    the executor work, which keeps the lock even when its caller is
+    cancelled, so the game is only ever touched by one thread at a time and
+    its saves reach the repository in guess order; different games proceed
+    concurrently.
+    
+    Attributes:
+        state_manager (AsyncStateManager): Manages game state persistence
+        _game (Game): The synchronous game holding rules and state
+        _lock (asyncio.Lock): Serializes guesses and hints on this game
+    """
+    def __init__(self, repository: AsyncGameRepository, game: Game):
+        """
+        Wrap an existing game, use create() or load() to get one.
+        
+        Args:
+            repository (AsyncGameRepository): Repository game states are saved to
+            game (Game): Game session whose own repository discards saves
+        """
+        self.state_manager = AsyncStateManager(repository)
+        self._game = game
+        self._lock = asyncio.Lock()
+    
+    @classmethod
+    async def create(cls, repository: AsyncGameRepository,
+                     generator: Optional[NumberGenerator] = None,
+                     config: Optional[GameConfig] = None,
+                     player_id: Optional[str] = None) -> 'AsyncGame':
+        """
+        Start and save a new game.
+        
+        Args:
+            repository (AsyncGameRepository): Repository game states are saved to
+            generator (Optional[NumberGenerator]): Secret code source, random.org by default
+            config (Optional[GameConfig]): Game rules, Normal difficulty by default
+            player_id (Optional[str]): Player the game belongs to
+            
+        Returns:
+            AsyncGame: The new game
+            
+        Raises:
+            GameInitError: If the code pattern cannot be generated
+            SaveError: If the initial state cannot be saved
+        """
+        generator = generator or RandomOrgGenerator()
+        loop = asyncio.get_running_loop()
+        game = await loop.run_in_executor(
+            None, functools.partial(Game, repository=NullGameRepository(), generator=generator, config=config,
+                                    player_id=player_id))
+        async_game = cls(repository, game)
+        await async_game.state_manager.save_state(game.to_state())
+        return async_game
+    
+    @classmethod
+    async def load(cls, repository: AsyncGameRepository, game_id: str) -> 'AsyncGame':
+        """
+        Resume a saved game.
+        
+        Args:
+            repository (AsyncGameRepository): Repository holding the game
+            game_id (str): Unique identifier of the game to load
+            
+        Returns:
+            AsyncGame: The restored game
+            
+        Raises:
+            GameNotFoundError: If no game exists with the given ID
+        """
+        logger.info("Loading existing game with ID: %s", game_id)
+        state = await AsyncStateManager(repository).load_state(game_id)
+        return cls(repository, Game.from_state(state, NullGameRepository()))
+    
+    @property
+    def game_id(self) -> str:
+        return self._game.game_id
+    
+    @property
+    def config(self) -> GameConfig:
+        return self._game.config
+    
+    def get_status(self) -> GameStatus:
+        return self._game.get_status()
+    
+    def get_code_pattern(self) -> List[int]:
+        return self._game.get_code_pattern()
+    
+    def get_guess_history(self) -> List[Tuple[Guess, Feedback]]:
+        return self._game.get_guess_history()
+    
+    def get_remaining_attempts(self) -> int:
+        return self._game.get_remaining_attempts()
+    
+    async def make_guess(self, guess: Guess) -> None:
+        """
+        Processes a player's guess and saves the updated state.
+        
+        Scoring one guess is cheap and runs on the loop, unless the game
+        tracks its candidate set: narrowing it scores every remaining code,
+        so the guess then runs in the loop's default executor.
+        
+        Args:
+            guess (Guess): The player's guess to evaluate
+            
+        Raises:
+            SaveError: If the updated state cannot be saved
+        """
+        async with self._lock:
+            if self._game.tracks_candidates:
+                await self._in_executor(self._game.make_guess, guess)
+            else:
+                self._game.make_guess(guess)
+            await self.state_manager.save_state(self._game.to_state())
+    
+    async def get_hint(self) -> Guess:
+        """
+        Suggests a next guess, searching in the loop's default executor.
+        
+        Returns:
+            Guess: The solver's suggested next guess
+        """
+        return await self._run(self._game.get_hint)
+    
+    async def get_remaining_candidates(self) -> int:
+        """
+        Counts the codes still possible, built off the loop on first use.
+        
+        Returns:
+            int: Number of consistent codes, a lower bound for sampled configurations
+        """
+        return await self._run(self._game.get_remaining_candidates)
+    
+    async def is_consistent_guess(self, guess: Guess) -> bool:
+        """
+        Checks whether a guess could still be the secret code.
+        
+        Args:
+            guess (Guess): The guess to check
+            
+        Returns:
+            bool: True if the guess agrees with all feedback received so far
+        """
+        return await self._run(self._game.is_consistent_guess, guess)
+    
+    async def _run(self, function, *args):
+        async with self._lock:
+            return await self._in_executor(function, *args)
+    
+    @staticmethod
+    async def _in_executor(function, *args):
+        """
+        Run a Game method in the default executor, returning only once it is done.
+        
+        Must be called holding the lock: if the caller is cancelled, the
+        cancellation waits for the thread so the lock is not released while
+        the game is still being changed.
+        """
+        future = asyncio.get_running_loop().run_in_executor(None, functools.partial(function, *args))
+        try:
+            return await asyncio.shield(future)
+        finally:
+            while not future.done():
+                try:
+                    await asyncio.wait({future})
+                except asyncio.CancelledError:
+                    pass
@@ -0,0 +1,258 @@
+import logging
+from typing import List, Optional, Sequence, Tuple, Union
+import numpy as np
+from src.core.config.game_config import GameConfig
+from src.core.models.feedback import Feedback
+from src.core.models.guess import Guess
+from src.core.scoring.batch import score_batch
+from src.core.scoring.code_space import (code_space_size, code_to_index, codes_from_indices, codes_to_indices,
+                                         is_enumerable, random_codes)
+
+logger = logging.getLogger(__name__)
+
+
+class CandidateSet:
+    """
+    The codes still consistent with a game's feedback.
+
+    Kept both as a sorted index array (for iteration and filtering) and as a
+    bitset over the code space (for membership tests). Each new
+    (guess, feedback) pair only scores the guess against the remaining codes,
+    so an update costs O(remaining) instead of replaying the whole history.
+
+    Attributes:
+        config (GameConfig): Configuration of the game being tracked
+    """
+    def __init__(self, config: GameConfig):
+        """
+        Start with every code in the code space.
+        """
+        self.config = config
+        size = code_space_size(config)
+        self._indices = np.arange(size)
+        self._mask = np.ones(size, dtype=bool)
+
+    @classmethod
+    def from_history(cls, config: GameConfig, guess_records: List[Tuple[Guess, Feedback]]) -> 'CandidateSet':
+        """
+        Build the set by applying a complete guess history.
+
+        Args:
+            config: Configuration of the game
+            guess_records: The game's (guess, feedback) history
+
+        Returns:
+            CandidateSet: Codes consistent with every record
+        """
+        candidates = cls(config)
+        for guess, feedback in guess_records:
+            candidates.apply(guess, feedback)
+        logger.debug("Candidate set rebuilt from %d records - %d codes remain",
+                     len(guess_records), len(candidates))
+        return candidates
+
+    def apply(self, guess: Guess, feedback: Feedback) -> None:
+        """
+        Remove the codes that would not have produced this feedback.
+
+        Args:
+            guess: The newest guess
+            feedback: Feedback received for it
+        """
+        codes = codes_from_indices(self._indices, self.config)
+        numbers, positions = score_batch([guess.get_numbers()], codes, self.config)
+        keep = (numbers[0] == feedback.numbers_correct) & (positions[0] == feedback.positions_correct)
+
+        self._mask[self._indices[~keep]] = False
+        self._indices = self._indices[keep]
+        logger.debug("Candidate set filtered by %s - %d codes remain", guess, len(self._indices))
+
+    @property
+    def indices(self) -> np.ndarray:
+        """
+        Sorted code indices still possible (read-only view).
+        """
+        view = self._indices.view()
+        view.flags.writeable = False
+        return view
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def contains(self, numbers: Sequence[int]) -> bool:
+        """
+        Whether a code is still possible, in O(1).
+
+        Args:
+            numbers: The code to test
+
+        Returns:
+            bool: False for codes that are inconsistent or outside the configuration
+        """
+        if len(numbers) != self.config.pattern_length or \
+                any(n < self.config.min_number or n > self.config.max_number for n in numbers):
+            return False
+        return bool(self._mask[code_to_index(numbers, self.config)])
+
+    def codes(self) -> np.ndarray:
+        """
+        The remaining codes as an array of shape (len(self), pattern_length).
+        """
+        return codes_from_indices(self._indices, self.config)
+
+
+
+class SampledCandidateSet:
+    """
+    Bounded-memory stand-in for CandidateSet on code spaces too large to enumerate.
+
+    Only the guess history and a sample of at most sample_size consistent
+    codes are kept. Membership is exact (a code is checked against every
+    record), while the sample is found by a randomized local search: a
+    population of random codes is repeatedly mutated (one position recolored
+    or two positions swapped), keeping mutations that do not move a code
+    further from matching the recorded feedback, until enough codes match
+    or max_rounds is reached. Each new record filters the current sample and
+    the search tops it up on next access.
+
+    Attributes:
+        config (GameConfig): Configuration of the game being tracked
+        sample_size (int): Maximum number of consistent codes kept
+        population (int): Codes mutated in parallel per search round
+        max_rounds (int): Search rounds per top-up
+    """
+    def __init__(self, config: GameConfig, sample_size: int = 1024, population: int = 512,
+                 max_rounds: int = 200, seed: Optional[int] = 0):
+        self.config = config
+        self.sample_size = sample_size
+        self.population = population
+        self.max_rounds = max_rounds
+        self._rng = np.random.default_rng(seed)
+        self._guesses = np.empty((0, config.pattern_length), dtype=np.int64)
+        self._feedback = np.empty((0, 2), dtype=np.int64)
+        self._indices = np.empty(0, dtype=np.int64)
+        self._complete = False
+
+    @classmethod
+    def from_history(cls, config: GameConfig, guess_records: List[Tuple[Guess, Feedback]],
+                     **kwargs) -> 'SampledCandidateSet':
+        """
+        Build the set from a complete guess history (the sample is searched lazily).
+        """
+        candidates = cls(config, **kwargs)
+        for guess, feedback in guess_records:
+            candidates.apply(guess, feedback)
+        return candidates
+
+    def apply(self, guess: Guess, feedback: Feedback) -> None:
+        """
+        Record a (guess, feedback) pair and drop sampled codes it rules out.
+        """
+        self._guesses = np.vstack([self._guesses, [guess.get_numbers()]])
+        self._feedback = np.vstack([self._feedback, [[feedback.numbers_correct, feedback.positions_correct]]])
+        if len(self._indices):
+            keep = self._distance(codes_from_indices(self._indices, self.config)) == 0
+            self._indices = self._indices[keep]
+        self._complete = False
+        logger.debug("Sampled candidate set filtered by %s - %d sampled codes remain", guess, len(self._indices))
+
+    @property
+    def indices(self) -> np.ndarray:
+        """
+        Sorted indices of the sampled consistent codes (read-only view).
+        """
+        if not self._complete:
+            self._search()
+        view = self._indices.view()
+        view.flags.writeable = False
+        return view
+
+    def __len__(self) -> int:
+        """
+        Number of consistent codes known, a lower bound on the true count.
+        """
+        return len(self.indices)
+
+    def contains(self, numbers: Sequence[int]) -> bool:
+        """
+        Whether a code is still possible, in O(history length).
+        """
+        if len(numbers) != self.config.pattern_length or \
+                any(n < self.config.min_number or n > self.config.max_number for n in numbers):
+            return False
+        return bool(self._distance(np.array([numbers], dtype=np.int64))[0] == 0)
+
+    def codes(self) -> np.ndarray:
+        """
+        The sampled codes as an array of shape (len(self), pattern_length).
+        """
+        return codes_from_indices(self.indices, self.config)
+
+    def _distance(self, codes: np.ndarray) -> np.ndarray:
+        """
+        How far each code is from reproducing every recorded feedback (0 = consistent).
+        """
+        if not len(self._guesses):
+            return np.zeros(len(codes), dtype=np.int64)
+        numbers, positions = score_batch(self._guesses, codes, self.config)
+        return (np.abs(numbers.astype(np.int64) - self._feedback[:, :1]) +
+                np.abs(positions.astype(np.int64) - self._feedback[:, 1:])).sum(axis=0)
+
+    def _search(self) -> None:
+        found = set(self._indices.tolist())
+        length = self.config.pattern_length
+        rows = np.arange(self.population)
+        population = random_codes(self.population, self.config, self._rng)
+        distance = self._distance(population)
+
+        for _ in range(self.max_rounds):
+            hits = distance == 0
+            found.update(codes_to_indices(population[hits], self.config).tolist())
+            if len(found) >= self.sample_size:
+                break
+            # restart from fresh codes where a match was just collected
+            if hits.any():
+                population[hits] = random_codes(int(hits.sum()), self.config, self._rng)
+                distance[hits] = self._distance(population[hits])
+
+            mutated = population.copy()
+            first = self._rng.integers(0, length, self.population)
+            second = self._rng.integers(0, length, self.population)
+            recolor = self._rng.random(self.population) < 0.5
+            mutated[rows[recolor], first[recolor]] = self._rng.integers(
+                self.config.min_number, self.config.max_number + 1, int(recolor.sum()))
+            swap = rows[~recolor]
+            mutated[swap, first[swap]], mutated[swap, second[swap]] = \
+                population[swap, second[swap]], population[swap, first[swap]]
+
+            mutated_distance = self._distance(mutated)
+            accept = mutated_distance <= distance
+            population[accept] = mutated[accept]
+            distance[accept] = mutated_distance[accept]
+
+        found = np.array(sorted(found), dtype=np.int64)
+        if len(found) > self.sample_size:
+            found = np.sort(self._rng.choice(found, self.sample_size, replace=False))
+        self._indices = found
+        self._complete = True
+        logger.debug("Sampled %d consistent codes after %d records", len(self._indices), len(self._guesses))
+
+
+def candidate_set_for(config: GameConfig, guess_records: List[Tuple[Guess, Feedback]]
+                      ) -> Union[CandidateSet, SampledCandidateSet]:
+    """
+    Candidate tracking suited to the size of a configuration's code space.
+
+    Enumerable code spaces get an exact CandidateSet, larger ones (custom
+    configurations such as 8 positions and 12 colors) a SampledCandidateSet.
+
+    Args:
+        config: Configuration of the game
+        guess_records: The game's (guess, feedback) history
+
+    Returns:
+        CandidateSet or SampledCandidateSet built from the history
+    """
+    if is_enumerable(config):
+        return CandidateSet.from_history(config, guess_records)
+    return SampledCandidateSet.from_history(config, guess_records)
@@ -1,39 +1,132 @@
+from typing import Any, Dict, Optional
 from src.core.models.game_difficulty import Difficulty
+from src.core.models.scoring_kernel import ScoringKernel
+
+# pattern_length, min_number, max_number, max_attempts of the built-in levels
+_PRESETS = {
+    Difficulty.NORMAL: (4, 0, 7, 10),
+    Difficulty.HARD: (5, 0, 9, 8),
+}
+PRESET_DIFFICULTIES = list(_PRESETS)
+
+# Packed feedback must fit in one byte: (pattern_length + 1) ** 2 <= 256
+MAX_PATTERN_LENGTH = 15
+# Code indices must fit in a signed 64-bit integer
+MAX_CODE_SPACE = 1 << 62
+# Batch scoring keeps a per-color histogram of every code, one byte per color
+MAX_COLORS = 1024
+# The bitmask kernel only pays off while its memo holds the whole code space
+BITMASK_MAX_CODE_SPACE = 1 << 16
 
 
 class GameConfig():
     """
     Configuration class for the Mastermind game settings.
-    
+
     This class holds all configurable parameters for a game instance, allowing
-    for flexible game rules and difficulty settings.
-    
+    for flexible game rules and difficulty settings. Difficulty.NORMAL and
+    Difficulty.HARD use fixed presets, Difficulty.CUSTOM takes its rules from
+    the keyword arguments (unset ones default to the normal preset).
+
     Attributes:
-        difficulty (Difficulty): The game's difficulty level (normal or hard)
+        difficulty (Difficulty): The game's difficulty level (normal, hard or custom)
         pattern_length (int): Length of the code pattern to guess (default: 4)
         min_number (int): Minimum value for each digit in the pattern (default: 0)
         max_number (int): Maximum value for each digit in the pattern (default: 7)
         max_attempts (int): Maximum number of guess attempts allowed (default: 10)
+        scoring_kernel (ScoringKernel): Algorithm used to score guesses (default:
+            bitmask for code spaces up to BITMASK_MAX_CODE_SPACE, such as normal,
+            standard for larger ones, such as hard)
     """
-    def __init__(self, difficulty: Difficulty = Difficulty.NORMAL) -> None:
+    def __init__(self, difficulty: Difficulty = Difficulty.NORMAL,
+                 scoring_kernel: Optional[ScoringKernel] = None,
+                 pattern_length: Optional[int] = None,
+                 min_number: Optional[int] = None,
+                 max_number: Optional[int] = None,
+                 max_attempts: Optional[int] = None) -> None:
         """
         Initialize a new game configuration.
-        
+
         Args:
-        pattern_length (int): Length of the code pattern to guess (default: 4)
-        min_number (int): Minimum value for each digit in the pattern (default: 0)
-        max_number (int): Maximum value for each digit in the pattern (default: 7)
-        max_attempts (int): Maximum number of guess attempts allowed (default: 10)
+        difficulty (Difficulty): Preset to use, or Difficulty.CUSTOM (default: normal)
+        scoring_kernel (ScoringKernel): Algorithm used to score guesses (default: default_scoring_kernel)
+        pattern_length (int): Custom length of the code pattern to guess
+        min_number (int): Custom minimum value for each digit in the pattern
+        max_number (int): Custom maximum value for each digit in the pattern
+        max_attempts (int): Custom maximum number of guess attempts allowed
+
+        Raises:
+        ValueError: If custom rules are given for a preset difficulty, or are out of range
         """
         self.difficulty = difficulty
-        
-        if difficulty == Difficulty.NORMAL:
-            self.pattern_length = 4
-            self.min_number = 0
-            self.max_number = 7
-            self.max_attempts = 10
-        elif difficulty == Difficulty.HARD:
-            self.pattern_length = 5
-            self.min_number = 0
-            self.max_number = 9
-            self.max_attempts = 8
\ No newline at end of file
+
+        custom = (pattern_length, min_number, max_number, max_attempts)
+        if difficulty != Difficulty.CUSTOM:
+            if any(value is not None for value in custom):
+                raise ValueError(f"Custom rules require Difficulty.CUSTOM, not {difficulty}")
+            self.pattern_length, self.min_number, self.max_number, self.max_attempts = _PRESETS[difficulty]
+        else:
+            defaults = _PRESETS[Difficulty.NORMAL]
+            self.pattern_length, self.min_number, self.max_number, self.max_attempts = (
+                default if value is None else value for value, default in zip(custom, defaults))
+            self._validate()
+
+        self.scoring_kernel = scoring_kernel or self.default_scoring_kernel()
+
+    def default_scoring_kernel(self) -> ScoringKernel:
+        """
+        The kernel that measures faster for these rules.
+
+        The bitmask kernel wins while its memo can hold every code; beyond
+        that (e.g. hard, 10^5 codes) it keeps re-encoding and the standard
+        kernel is faster.
+        """
+        code_space = (self.max_number - self.min_number + 1) ** self.pattern_length
+        if code_space <= BITMASK_MAX_CODE_SPACE:
+            return ScoringKernel.BITMASK
+        return ScoringKernel.STANDARD
+
+    def _validate(self) -> None:
+        if not 1 <= self.pattern_length <= MAX_PATTERN_LENGTH:
+            raise ValueError(f"pattern_length must be between 1 and {MAX_PATTERN_LENGTH}")
+        if self.min_number < 0 or self.max_number < self.min_number:
+            raise ValueError("Numbers must satisfy 0 <= min_number <= max_number")
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if self.max_number - self.min_number + 1 > MAX_COLORS:
+            raise ValueError(f"At most {MAX_COLORS} numbers (max_number - min_number + 1) are supported")
+        if (self.max_number - self.min_number + 1) ** self.pattern_length > MAX_CODE_SPACE:
+            raise ValueError("Code space is too large, use fewer positions or colors")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serializable form of the configuration, as stored with a game.
+
+        Presets only store their difficulty; custom configurations also store
+        their rules. The scoring kernel is stored when it is not the default
+        for the rules.
+        """
+        data: Dict[str, Any] = {"difficulty": self.difficulty.value}
+        if self.difficulty == Difficulty.CUSTOM:
+            data.update(pattern_length=self.pattern_length, min_number=self.min_number,
+                        max_number=self.max_number, max_attempts=self.max_attempts)
+        if self.scoring_kernel != self.default_scoring_kernel():
+            data["scoring_kernel"] = self.scoring_kernel.value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'GameConfig':
+        """
+        Inverse of to_dict. Missing difficulty defaults to normal, a missing
+        scoring kernel to the default for the rules.
+        """
+        difficulty = Difficulty(data.get("difficulty", Difficulty.NORMAL.value))
+        kernel = data.get("scoring_kernel")
+        scoring_kernel = ScoringKernel(kernel) if kernel is not None else None
+        if difficulty != Difficulty.CUSTOM:
+            return cls(difficulty=difficulty, scoring_kernel=scoring_kernel)
+        return cls(difficulty=difficulty, scoring_kernel=scoring_kernel,
+                   pattern_length=data.get("pattern_length"),
+                   min_number=data.get("min_number"),
+                   max_number=data.get("max_number"),
+                   max_attempts=data.get("max_attempts"))
@@ -1,7 +1,8 @@
 from datetime import datetime
 import logging
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Union
 import uuid
+from src.core.candidate_set import CandidateSet, SampledCandidateSet, candidate_set_for
 from src.core.config.game_config import GameConfig
 from src.services.exceptions.exceptions import GameInitError
 from src.services.generators.random_org import RandomOrgGenerator
@@ -11,12 +12,18 @@ from src.core.models.game_state import GameState
 from src.core.models.game_status import GameStatus
 from src.core.models.guess import Guess
 from src.core.game_logic import GameLogic
+from src.core.solver.decision_tree import load_decision_tree
+from src.core.solver.opening_book import load_opening_book
+from src.core.solver.solver import Solver
 from src.core.state_manager import StateManager
 from src.services.generators.base import NumberGenerator
 from src.repository.base import GameRepository
 
 logger = logging.getLogger(__name__)
 
+# Seconds a hint may spend searching before returning its best guess so far
+HINT_TIME_BUDGET = 1.0
+
 class Game:
     """
     Represents a Mastermind game session that manages game state and rules.
@@ -34,22 +41,27 @@ class Game:
         config (GameConfig): Game configuration settings
         game_logic (GameLogic): Core game rules implementation
         game_id (str): Unique identifier for this game session
-        code_pattern (List[int]): Secret code players try to guess
+        code_pattern (List[int] | PackedCode): Secret code players try to guess
         pattern_count (dict): Count of each number in code pattern
         status (GameStatus): Current game status
         attempts (int): Number of guesses made
         guess_records (List[Tuple[Guess, Feedback]]): History of guesses and feedback
         created_at (datetime): When the game was created
         updated_at (datetime): When the game was updated by a new guess or exit
+        player_id (Optional[str]): Player the game belongs to, None for anonymous games
     """
     def __init__(self, 
                  repository: GameRepository = InMemoryGameRepository(), 
                  generator: NumberGenerator = RandomOrgGenerator(), 
                  game_id: str = None,
-                 config: Optional[GameConfig] = None):
+                 config: Optional[GameConfig] = None,
+                 player_id: Optional[str] = None):
         self.state_manager = StateManager(repository)
         self.config = config or GameConfig()
         self.game_logic = GameLogic(self.config)
+        self._solver = None
+        self._candidates = None
+        self.player_id = player_id
         
         if game_id:
             logger.info("Loading existing game with ID: %s", game_id)
@@ -87,22 +99,54 @@ class Game:
         except GameInitError:
             raise
         
-    def _save_current_state(self) -> None:
+    @classmethod
+    def from_state(cls, state: GameState, repository: GameRepository) -> 'Game':
+        """
+        Builds a game from an already loaded state, without touching the repository.
+        
+        Args:
+            state (GameState): Saved game state to restore from
+            repository (GameRepository): Repository later guesses are saved to
+            
+        Returns:
+            Game: The restored game
         """
-        Creates a GameState object capturing all current game information and saves it
-        using the state manager. This ensures game progress can be restored later.
+        game = cls.__new__(cls)
+        game.state_manager = StateManager(repository)
+        game.config = state.config
+        game.game_logic = GameLogic(state.config)
+        game._solver = None
+        game._restore_state(state)
+        return game
+    
+    def to_state(self) -> GameState:
         """
-        state = GameState(
+        Creates a GameState object capturing all current game information.
+        
+        The guess history is copied, so the state stays a snapshot while
+        the game goes on.
+        
+        Returns:
+            GameState: Snapshot of the game, stamped with the current time
+        """
+        return GameState(
             game_id=self.game_id,
             code_pattern=self.code_pattern,
             status=self.status,
             attempts=self.attempts,
-            guess_records=self.guess_records,
+            guess_records=list(self.guess_records),
             created_at=self.created_at,
             updated_at=datetime.now(),
-            config=self.config
+            config=self.config,
+            player_id=self.player_id
         )
-        self.state_manager.save_state(state)
+        
+    def _save_current_state(self) -> None:
+        """
+        Saves a snapshot of the game using the state manager. This ensures
+        game progress can be restored later.
+        """
+        self.state_manager.save_state(self.to_state())
         logger.debug("Game state saved for ID: %s", self.game_id)
     
     def get_status(self) -> str:
@@ -121,7 +165,7 @@ class Game:
         Returns:
             List[int]: Copy of the secret code pattern to prevent direct modification
         """
-        return self.code_pattern.copy()
+        return list(self.code_pattern)
     
     def get_guess_history(self) -> List[Tuple[Guess, Feedback]]:
         """
@@ -132,6 +176,76 @@ class Game:
         """
         return self.guess_records.copy()
     
+    def get_hint(self) -> Guess:
+        """
+        Suggests a next guess consistent with the feedback received so far.
+        
+        While the game has followed a precomputed decision tree the hint is
+        read from the tree with no search; otherwise the solver searches.
+        
+        Returns:
+            Guess: The solver's suggested next guess
+        """
+        tree = load_decision_tree(self.config)
+        if tree is not None:
+            hint = tree.next_guess(self.guess_records)
+            if hint is not None:
+                logger.info("Hint for game %s from the decision tree: %s", self.game_id, hint)
+                return hint
+        
+        if self._solver is None or self._solver.config is not self.config:
+            self._solver = Solver(self.config, time_budget=HINT_TIME_BUDGET,
+                                  opening_book=load_opening_book(self.config))
+        
+        hint = self._solver.suggest(self.guess_records, candidates=self.candidates.indices)
+        logger.info("Hint for game %s: %s", self.game_id, hint)
+        return hint
+    
+    @property
+    def candidates(self) -> Union[CandidateSet, SampledCandidateSet]:
+        """
+        Codes still consistent with every guess so far.
+        
+        Built from the guess history on first access, then narrowed
+        incrementally by each new guess. Configurations too large to
+        enumerate only track a bounded sample of the consistent codes.
+        
+        Returns:
+            CandidateSet or SampledCandidateSet: The remaining possible codes
+        """
+        if self._candidates is None:
+            self._candidates = candidate_set_for(self.config, self.guess_records)
+        return self._candidates
+    
+    @property
+    def tracks_candidates(self) -> bool:
+        """
+        Whether the candidate set has been built, so each guess narrows it.
+        """
+        return self._candidates is not None
+    
+    def get_remaining_candidates(self) -> int:
+        """
+        Counts how many codes are still possible given the feedback so far.
+        
+        Returns:
+            int: Number of consistent codes, a lower bound (the sample size)
+                for configurations too large to enumerate
+        """
+        return len(self.candidates)
+    
+    def is_consistent_guess(self, guess: Guess) -> bool:
+        """
+        Checks whether a guess could still be the secret code.
+        
+        Args:
+            guess (Guess): The guess to check
+            
+        Returns:
+            bool: True if the guess agrees with all feedback received so far
+        """
+        return self.candidates.contains(guess.get_numbers())
+    
     def get_remaining_attempts(self) -> int:
         """
         Calculates how many guess attempts remain.
@@ -163,6 +277,8 @@ class Game:
         
         self.guess_records.append((guess, feedback))
         self.attempts += 1
+        if self._candidates is not None:
+            self._candidates.apply(guess, feedback)
     
         self._update_game_state(feedback)    
         self._save_current_state()
@@ -210,6 +326,8 @@ class Game:
         self.guess_records = state.guess_records
         self.created_at = state.created_at
         self.config = state.config
+        self.player_id = state.player_id
+        self._candidates = None
         
         self.pattern_count = {}
         for num in self.code_pattern:
@@ -1,7 +1,11 @@
 import logging
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Union
+import numpy as np
 from src.core.models.feedback import Feedback
+from src.core.scoring.batch import CodeBatch, score_batch
+from src.core.scoring.kernels import create_scorer
 from src.core.models.guess import Guess
+from src.core.models.packed_code import PackedCode, as_numbers
 from src.services.generators.base import NumberGenerator
 from src.core.config.game_config import GameConfig
 from src.services.exceptions.exceptions import GameInitError, GeneratorError
@@ -18,6 +22,7 @@ class GameLogic:
     
     Attributes:
         config (GameConfig): Configuration settings for the game including code length, value ranges, and maximum attempts.
+        _scorer (GuessScorer): Single-guess scoring kernel selected by config.scoring_kernel
     """
     def __init__(self, config: GameConfig):
         """
@@ -27,6 +32,7 @@ class GameLogic:
             config (GameConfig): Configuration object containing game settings.
         """
         self.config = config
+        self._scorer = create_scorer(config)
         
     def generate_code_pattern(self, generator: NumberGenerator) -> List[int]:
         """
@@ -50,32 +56,33 @@ class GameLogic:
             logger.error(f"Failed to generate code pattern: {e}")
             raise GameInitError(f"Failed to initialize game: {e}")
         
-    def calculate_pattern_counts(self, code_pattern: List[int]) -> Dict[int, int]:
+    def calculate_pattern_counts(self, code_pattern: Union[List[int], PackedCode]) -> Dict[int, int]:
         """
         Creates a dictionary mapping each number to its frequency in the pattern.
         
         Args:
-            code_pattern (List[int]): The secret code pattern to analyze.
+            code_pattern (List[int] | PackedCode): The secret code pattern to analyze.
             
         Returns:
             Dict[int, int]: Dictionary mapping numbers to their frequencies.
         """
         
         pattern_count = {}
-        for num in code_pattern:
+        for num in as_numbers(code_pattern):
             pattern_count[num] = pattern_count.get(num, 0) + 1
             
         logger.debug("Pattern frequency map calculated: %s", pattern_count)
         return pattern_count
     
-    def check_guess(self, guess: Guess, pattern_count: Dict[int, int], code_pattern: List[int]) -> Feedback:
+    def check_guess(self, guess: Guess, pattern_count: Dict[int, int],
+                    code_pattern: Union[List[int], PackedCode]) -> Feedback:
         """
         Compares a guess against the code pattern and generates feedback.
         
         Args:
             guess: The player's guess to evaluate
             pattern_count: Frequency map of numbers in code pattern
-            code_pattern: The secret code pattern to compare against
+            code_pattern: The secret code pattern to compare against, as a list or PackedCode
             
         Returns:
             Feedback about correct numbers and positions
@@ -83,21 +90,30 @@ class GameLogic:
         logger.debug("Checking guess %s against pattern", guess.get_numbers())
         
         guess_numbers = guess.get_numbers()
-        current_pattern_count = pattern_count.copy()
-        
-        correct_location = 0
-        correct_number = 0
-        
-        for idx in range(len(guess_numbers)):
-            if guess_numbers[idx] == code_pattern[idx]:
-                correct_location += 1
-                
-        for guess_num in guess_numbers:
-            if guess_num in current_pattern_count and current_pattern_count[guess_num] > 0:
-                correct_number += 1
-                current_pattern_count[guess_num] -= 1
-                
-        logger.debug("Feedback generated: numbers=%d, positions=%d", 
+        code_pattern = as_numbers(code_pattern)
+        correct_number, correct_location = self._scorer.score(guess_numbers, code_pattern, pattern_count)
+
+        logger.debug("Feedback generated: numbers=%d, positions=%d",
             correct_number, correct_location)
 
-        return Feedback(correct_number, correct_location)
\ No newline at end of file
+        return Feedback(correct_number, correct_location)
+
+    def check_guesses(self, guesses: CodeBatch, code_patterns: CodeBatch) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Scores a batch of guesses against a batch of code patterns at once.
+
+        Vectorized counterpart of check_guess for bots and analytics that need
+        to score many (guess, code) pairs. Results match check_guess exactly.
+
+        Args:
+            guesses: N guesses (Guess objects, integer lists or a 2-D array)
+            code_patterns: M code patterns to compare against
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (numbers_correct, positions_correct) as
+            (N, M) uint8 arrays
+
+        Raises:
+            ValueError: If a code has the wrong length or values outside the configured range
+        """
+        return score_batch(guesses, code_patterns, self.config)
\ No newline at end of file
@@ -3,4 +3,5 @@ from enum import Enum
 
 class Difficulty(Enum):
     NORMAL = "normal"
-    HARD = "hard"
\ No newline at end of file
+    HARD = "hard"
+    CUSTOM = "custom"
\ No newline at end of file
@@ -1,16 +1,19 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, replace
 from datetime import datetime
 import logging
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from src.core.config.game_config import GameConfig
 from src.core.models.feedback import Feedback
-from src.core.models.game_difficulty import Difficulty
 from src.core.models.guess import Guess
+from src.core.models.packed_code import PackedCode, as_numbers
 from src.core.models.game_status import GameStatus
 
 logger = logging.getLogger(__name__)
 
+# Format of created_at / updated_at in the database representation
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 @dataclass
 class GameState:
     """
@@ -25,26 +28,45 @@ class GameState:
     - Timestamp the game initialized
     - Timestamp the state updated
     - Game configuration setting
+    - Optionally, the player the game belongs to
     
     Attributes:
         game_id (str): Unique identifier for the game session
-        code_pattern (List[int]): The secret code players try to guess
+        code_pattern (List[int] | PackedCode): The secret code players try to guess
         status (GameStatus): Current state of the game
         attempts (int): Number of guesses made so far
         guess_records (List[Tuple[Guess, Feedback]]): History of all guesses and their feedback
         created_at (datetime): When the game was started
         updated_at (datetime): When the game was last modified
         config (GameConfig): Configuration settings for this game
+        player_id (Optional[str]): Player the game belongs to, None for anonymous games
     """
     
     game_id: str
-    code_pattern: List[int]
+    code_pattern: Union[List[int], PackedCode]
     status: GameStatus
     attempts: int
     guess_records: List[Tuple[Guess, Feedback]]
     created_at: datetime
     updated_at: datetime
     config: GameConfig
+    player_id: Optional[str] = None
+    
+    def copy(self) -> 'GameState':
+        """
+        Copy the state without sharing anything mutable with it.
+        
+        Guesses, feedback, packed codes and the config are never modified in
+        place, so only the containers are copied; Game appends to the
+        guess_records it restores.
+        
+        Returns:
+            GameState: An independent copy of the state
+        """
+        code_pattern = self.code_pattern
+        if isinstance(code_pattern, list):
+            code_pattern = list(code_pattern)
+        return replace(self, code_pattern=code_pattern, guess_records=list(self.guess_records))
     
     def to_db_format(self) -> Dict[str, Any]:
         """
@@ -75,15 +97,14 @@ class GameState:
         
         return {
                 "game_id": self.game_id,
-                "code_pattern": self.code_pattern,
+                "code_pattern": as_numbers(self.code_pattern),
                 "status": self.status.value,
                 "attempts": self.attempts,
                 "guess_records": temp_guess_records,
-                "created_at": self.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                "updated_at": self.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
-                "config": {
-                "difficulty": self.config.difficulty.value
-            }
+                "created_at": self.created_at.strftime(TIMESTAMP_FORMAT),
+                "updated_at": self.updated_at.strftime(TIMESTAMP_FORMAT),
+                "config": self.config.to_dict(),
+                "player_id": self.player_id
         }
     
     @classmethod
@@ -110,8 +131,7 @@ class GameState:
             )
             temp_guess_records.append(temp_tuple)
             
-        difficulty = Difficulty(data["config"].get("difficulty", Difficulty.NORMAL.value))
-        config = GameConfig(difficulty=difficulty)
+        config = GameConfig.from_dict(data["config"])
         
         logger.debug("Successfully reconstructed game state for ID: %s", data.get('game_id'))
         
@@ -121,7 +141,74 @@ class GameState:
             status = GameStatus(data["status"]),
             attempts = data["attempts"],
             guess_records = temp_guess_records,
-            created_at = datetime.strptime(data["created_at"], "%Y-%m-%d %H:%M:%S"),
-            updated_at = datetime.strptime(data["updated_at"], "%Y-%m-%d %H:%M:%S"),
-            config=config
-        )
\ No newline at end of file
+            created_at = datetime.strptime(data["created_at"], TIMESTAMP_FORMAT),
+            updated_at = datetime.strptime(data["updated_at"], TIMESTAMP_FORMAT),
+            config=config,
+            player_id=data.get("player_id")
+        )
+
+
+# History of a game as guess_records holds it
+GuessRecords = List[Tuple[Guess, Feedback]]
+
+
+class LazyGameState(GameState):
+    """
+    Header view of a stored game whose guess history is only decoded on first access.
+    
+    Everything but guess_records (id, code, status, attempts, timestamps,
+    config, player) is set up front. Reading guess_records calls the
+    loader once and keeps the result, so listings and status checks that
+    never look at the history never pay for decoding it. Anything that
+    reads every field (copy, ==, repr, encoding) loads the history too.
+    
+    The loader may read storage when called. If the game was saved again
+    in between, a loader may also update the header fields, so they always
+    describe the same save as the history (see SQLiteGameRepository).
+    """
+    def __init__(self, load_history: Callable[[], GuessRecords], **fields):
+        """
+        Args:
+            load_history: Returns the guess history, called at most once
+            **fields: Every GameState field except guess_records
+        """
+        self._load_history: Optional[Callable[[], GuessRecords]] = load_history
+        self._guess_records: Optional[GuessRecords] = None
+        super().__init__(guess_records=None, **fields)
+    
+    @property
+    def guess_records(self) -> GuessRecords:
+        if self._guess_records is None:
+            self._guess_records = self._load_history()
+            self._load_history = None
+        return self._guess_records
+    
+    @guess_records.setter
+    def guess_records(self, guess_records: Optional[GuessRecords]) -> None:
+        # GameState.__init__ assigns None; the history then stays lazy
+        if guess_records is not None:
+            self._guess_records = guess_records
+            self._load_history = None
+    
+    @property
+    def history_loaded(self) -> bool:
+        """
+        Whether guess_records has been decoded yet.
+        """
+        return self._guess_records is not None
+    
+    def __eq__(self, other: object) -> bool:
+        # equal to a plain GameState with the same fields, unlike the dataclass __eq__
+        if not isinstance(other, GameState):
+            return NotImplemented
+        return all(getattr(self, field.name) == getattr(other, field.name) for field in fields(GameState))
+    
+    def copy(self) -> GameState:
+        """
+        Copy the state as a plain, fully loaded GameState.
+        """
+        code_pattern = self.code_pattern
+        if isinstance(code_pattern, list):
+            code_pattern = list(code_pattern)
+        return GameState(self.game_id, code_pattern, self.status, self.attempts, list(self.guess_records),
+                         self.created_at, self.updated_at, self.config, self.player_id)
@@ -1,4 +1,7 @@
 import logging
+from typing import Union
+
+from src.core.models.packed_code import PackedCode, as_numbers
 
 logger = logging.getLogger(__name__)
 
@@ -6,14 +9,14 @@ class Guess:
     """
     A class representing a player's guess in mastermind in each round.
     """
-    def __init__(self, numbers: list[int]):
+    def __init__(self, numbers: Union[list[int], PackedCode]):
         """
         Initialize a new guess with the provided numbers. (Validated Input)
         
         Args:
-            numbers (List[int]): The sequence of numbers for this guess
+            numbers (List[int] | PackedCode): The sequence of numbers for this guess
         """
-        self.numbers = numbers
+        self.numbers = as_numbers(numbers)
         logger.debug("Created new guess with numbers: %s", self)
     
     def get_numbers(self) -> list[int]:
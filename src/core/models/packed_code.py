@@ -0,0 +1,128 @@
+from functools import total_ordering
+import logging
+from typing import Iterator, Sequence, Union
+
+from src.core.config.game_config import GameConfig
+from src.core.scoring.code_space import code_to_index
+
+logger = logging.getLogger(__name__)
+
+
+@total_ordering
+class PackedCode:
+    """
+    A code pattern stored as a single base-k integer.
+
+    The first position is the most significant digit and each digit is the
+    value minus min_number, so the packed value equals the code's index in the
+    code space (see src.core.scoring.code_space). Instances are immutable,
+    hashable and ordered by value, and behave as a read-only sequence of ints,
+    so they can be used wherever a List[int] code is read. Equality and hashing
+    only use the packed integer and shape, so sets and dicts of codes key on
+    ints; a PackedCode never equals a list or tuple, convert with as_numbers
+    to compare against one.
+
+    Attributes:
+        value (int): The packed base-k integer
+        pattern_length (int): Number of positions in the code
+        min_number (int): Smallest value a position can take
+        base (int): Number of distinct values per position
+    """
+    __slots__ = ("value", "pattern_length", "min_number", "base")
+
+    def __init__(self, value: int, pattern_length: int, min_number: int = 0, base: int = 8):
+        """
+        Initialize a packed code from its integer value.
+
+        Raises:
+            ValueError: If the value does not fit the given shape
+        """
+        if not 0 <= value < base ** pattern_length:
+            raise ValueError(f"Packed value {value} out of range for {pattern_length} positions in base {base}")
+        self.value = value
+        self.pattern_length = pattern_length
+        self.min_number = min_number
+        self.base = base
+
+    @classmethod
+    def from_numbers(cls, numbers: Sequence[int], config: GameConfig) -> 'PackedCode':
+        """
+        Pack a list of numbers using the value range of a game configuration.
+
+        Args:
+            numbers: The code to pack
+            config: Game configuration the code belongs to
+
+        Returns:
+            PackedCode: The packed code
+
+        Raises:
+            ValueError: If the code length or a value does not match the configuration
+        """
+        if len(numbers) != config.pattern_length:
+            raise ValueError(f"Code must have exactly {config.pattern_length} numbers")
+        if not all(config.min_number <= num <= config.max_number for num in numbers):
+            raise ValueError(f"Numbers must be between {config.min_number} and {config.max_number}")
+        return cls(code_to_index(numbers, config), config.pattern_length, config.min_number,
+                   config.max_number - config.min_number + 1)
+
+    def to_list(self) -> list[int]:
+        """
+        Unpack the code into a list of numbers.
+        """
+        numbers = [0] * self.pattern_length
+        value = self.value
+        for pos in range(self.pattern_length - 1, -1, -1):
+            value, digit = divmod(value, self.base)
+            numbers[pos] = digit + self.min_number
+        return numbers
+
+    def __int__(self) -> int:
+        return self.value
+
+    def __index__(self) -> int:
+        return self.value
+
+    def __len__(self) -> int:
+        return self.pattern_length
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.to_list())
+
+    def __getitem__(self, index):
+        return self.to_list()[index]
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PackedCode):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __lt__(self, other) -> bool:
+        if not isinstance(other, PackedCode):
+            return NotImplemented
+        return self._key() < other._key()
+
+    def _key(self) -> tuple:
+        return (self.pattern_length, self.base, self.min_number, self.value)
+
+    def __repr__(self) -> str:
+        return f"PackedCode({self.value}, pattern_length={self.pattern_length}, " \
+               f"min_number={self.min_number}, base={self.base})"
+
+    def __str__(self) -> str:
+        """
+        Space separated numbers, matching Guess's display format.
+        """
+        return " ".join(str(num) for num in self.to_list())
+
+
+def as_numbers(code: Union[Sequence[int], PackedCode]) -> list[int]:
+    """
+    Normalize a code given as a list or a PackedCode into a list of numbers.
+    """
+    if isinstance(code, PackedCode):
+        return code.to_list()
+    return code
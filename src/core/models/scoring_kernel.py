@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class ScoringKernel(Enum):
+    """
+    Algorithms GameLogic can use to score a single guess.
+    - STANDARD: Walks positions and a copied frequency dict in Python
+    - BITMASK: Compares precomputed per-color bitmasks with AND + popcount
+    """
+
+    STANDARD = "standard"
+    BITMASK = "bitmask"
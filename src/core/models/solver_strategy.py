@@ -0,0 +1,14 @@
+from enum import Enum
+
+
+class SolverStrategy(Enum):
+    """
+    Scoring rules the Solver uses to rank candidate next guesses.
+    - MINIMAX: Knuth's rule, minimize the largest remaining partition
+    - EXPECTED_SIZE: Minimize the expected number of codes left after the guess
+    - ENTROPY: Maximize the information gained from the feedback
+    """
+
+    MINIMAX = "minimax"
+    EXPECTED_SIZE = "expected_size"
+    ENTROPY = "entropy"
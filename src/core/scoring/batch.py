@@ -0,0 +1,125 @@
+import logging
+from typing import Iterable, Sequence, Tuple, Union
+import numpy as np
+from src.core.config.game_config import GameConfig
+from src.core.models.guess import Guess
+
+logger = logging.getLogger(__name__)
+
+CodeLike = Union[Guess, Sequence[int]]
+CodeBatch = Union[np.ndarray, Iterable[CodeLike]]
+
+# Upper bound on the number of intermediate elements materialised per chunk,
+# keeps peak memory around a few hundred MB for large N x M batches.
+DEFAULT_CHUNK_ELEMENTS = 1 << 24
+
+
+def as_code_array(codes: CodeBatch, config: GameConfig) -> np.ndarray:
+    """
+    Convert a batch of codes into a 2-D array of zero-based color indices.
+
+    Accepts a 2-D array, or any iterable of Guess objects / integer lists.
+    Values are shifted by config.min_number so that column values lie in
+    [0, number of colors).
+
+    Args:
+        codes: Batch of codes to convert
+        config: Game configuration the codes belong to
+
+    Returns:
+        np.ndarray: Array of shape (count, pattern_length)
+
+    Raises:
+        ValueError: If a code has the wrong length or contains values out of range
+    """
+    if isinstance(codes, np.ndarray):
+        array = codes.astype(np.int64, copy=False)
+    else:
+        rows = [code.get_numbers() if isinstance(code, Guess) else list(code) for code in codes]
+        array = np.array(rows, dtype=np.int64).reshape(len(rows), -1) if rows \
+            else np.empty((0, config.pattern_length), dtype=np.int64)
+
+    if array.ndim != 2 or array.shape[1] != config.pattern_length:
+        raise ValueError(f"Codes must have exactly {config.pattern_length} numbers")
+
+    array = array - config.min_number
+    color_count = config.max_number - config.min_number + 1
+    if array.size and (array.min() < 0 or array.max() >= color_count):
+        raise ValueError(f"Numbers must be between {config.min_number} and {config.max_number}")
+
+    return array
+
+
+def color_histograms(codes: np.ndarray, color_count: int,
+                     chunk_elements: int = DEFAULT_CHUNK_ELEMENTS) -> np.ndarray:
+    """
+    Count how many times each color appears in every code.
+
+    Codes are compared against every color a chunk of rows at a time, so
+    the intermediate stays within chunk_elements whatever the number of
+    colors; the result itself is one byte per code and color (colors are
+    capped by MAX_COLORS in GameConfig).
+
+    Args:
+        codes: Array of zero-based color indices, shape (count, pattern_length)
+        color_count: Number of distinct colors
+        chunk_elements: Maximum intermediate elements per processed chunk of codes
+
+    Returns:
+        np.ndarray: Array of shape (count, color_count) with per-color frequencies
+    """
+    histograms = np.empty((len(codes), color_count), dtype=np.uint8)
+    colors = np.arange(color_count)
+    rows_per_chunk = max(1, chunk_elements // max(1, codes.shape[1] * color_count))
+    for start in range(0, len(codes), rows_per_chunk):
+        stop = start + rows_per_chunk
+        histograms[start:stop] = (codes[start:stop, :, None] == colors).sum(axis=1, dtype=np.uint8)
+    return histograms
+
+
+def score_batch(guesses: CodeBatch, codes: CodeBatch, config: GameConfig,
+                chunk_elements: int = DEFAULT_CHUNK_ELEMENTS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score every guess against every code in one vectorized pass.
+
+    Produces exactly the same numbers as GameLogic.check_guess for each
+    (guess, code) pair: positions_correct counts exact hits and numbers_correct
+    counts color hits regardless of position (exact hits included).
+
+    Args:
+        guesses: N guesses to evaluate
+        codes: M code patterns to compare against
+        config: Game configuration shared by guesses and codes
+        chunk_elements: Maximum intermediate elements per processed chunk of guesses
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (numbers_correct, positions_correct), each an
+        (N, M) uint8 array
+    """
+    guess_array = as_code_array(guesses, config)
+    code_array = as_code_array(codes, config)
+    color_count = config.max_number - config.min_number + 1
+
+    guess_count, code_count = len(guess_array), len(code_array)
+    numbers_correct = np.empty((guess_count, code_count), dtype=np.uint8)
+    positions_correct = np.empty((guess_count, code_count), dtype=np.uint8)
+
+    # the guesses' histograms are built per chunk, only the codes' are kept whole
+    code_hist = color_histograms(code_array, color_count, chunk_elements)
+
+    width = max(config.pattern_length, color_count)
+    rows_per_chunk = max(1, chunk_elements // max(1, code_count * width))
+    logger.debug("Scoring %d guesses against %d codes in chunks of %d",
+                 guess_count, code_count, rows_per_chunk)
+
+    for start in range(0, guess_count, rows_per_chunk):
+        stop = min(start + rows_per_chunk, guess_count)
+        positions_correct[start:stop] = (
+            guess_array[start:stop, None, :] == code_array[None, :, :]
+        ).sum(axis=2, dtype=np.uint8)
+        guess_hist = color_histograms(guess_array[start:stop], color_count, chunk_elements)
+        numbers_correct[start:stop] = np.minimum(
+            guess_hist[:, None, :], code_hist[None, :, :]
+        ).sum(axis=2, dtype=np.uint8)
+
+    return numbers_correct, positions_correct
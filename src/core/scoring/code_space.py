@@ -0,0 +1,133 @@
+from typing import Sequence
+import numpy as np
+from src.core.config.game_config import GameConfig
+
+# Largest code space that is listed in full (candidate arrays, solver pools);
+# bigger configurations switch to sampling with bounded memory.
+MAX_ENUMERATED_CODES = 1 << 22
+
+
+def color_count(config: GameConfig) -> int:
+    """
+    Number of distinct values a single position can take.
+    """
+    return config.max_number - config.min_number + 1
+
+
+def code_space_size(config: GameConfig) -> int:
+    """
+    Total number of distinct codes for a configuration (colors ** pattern_length).
+    """
+    return color_count(config) ** config.pattern_length
+
+
+def is_enumerable(config: GameConfig) -> bool:
+    """
+    Whether the code space is small enough to be listed in full.
+    """
+    return code_space_size(config) <= MAX_ENUMERATED_CODES
+
+
+def random_codes(count: int, config: GameConfig, rng: np.random.Generator) -> np.ndarray:
+    """
+    Draw codes uniformly at random, without enumerating the code space.
+
+    Args:
+        count: Number of codes to draw (duplicates possible)
+        config: Game configuration the codes belong to
+        rng: Random generator to draw from
+
+    Returns:
+        np.ndarray: Array of shape (count, pattern_length) with code values
+    """
+    return rng.integers(config.min_number, config.max_number + 1, (count, config.pattern_length))
+
+
+def code_to_index(numbers: Sequence[int], config: GameConfig) -> int:
+    """
+    Map a code to its position in the code space.
+
+    Codes are ordered as base-k numbers with the first position being the most
+    significant digit, so index 0 is all min_number values.
+
+    Args:
+        numbers: The code to convert
+        config: Game configuration the code belongs to
+
+    Returns:
+        int: Index of the code in [0, code_space_size(config))
+    """
+    base = color_count(config)
+    index = 0
+    for num in numbers:
+        index = index * base + (num - config.min_number)
+    return index
+
+
+def index_to_code(index: int, config: GameConfig) -> list[int]:
+    """
+    Inverse of code_to_index.
+
+    Args:
+        index: Position of the code in the code space
+        config: Game configuration the code belongs to
+
+    Returns:
+        list[int]: The code at the given index
+    """
+    base = color_count(config)
+    numbers = [0] * config.pattern_length
+    for pos in range(config.pattern_length - 1, -1, -1):
+        index, digit = divmod(index, base)
+        numbers[pos] = digit + config.min_number
+    return numbers
+
+
+def codes_from_indices(indices: np.ndarray, config: GameConfig) -> np.ndarray:
+    """
+    Vectorized index_to_code for an array of indices.
+
+    Args:
+        indices: 1-D array of code indices
+        config: Game configuration the codes belong to
+
+    Returns:
+        np.ndarray: Array of shape (len(indices), pattern_length) with code values
+    """
+    base = color_count(config)
+    indices = np.asarray(indices, dtype=np.int64)
+    powers = base ** np.arange(config.pattern_length - 1, -1, -1, dtype=np.int64)
+    return (indices[:, None] // powers) % base + config.min_number
+
+
+def codes_to_indices(codes: np.ndarray, config: GameConfig) -> np.ndarray:
+    """
+    Vectorized code_to_index for a 2-D array of codes.
+
+    Args:
+        codes: Array of shape (count, pattern_length) with code values
+        config: Game configuration the codes belong to
+
+    Returns:
+        np.ndarray: 1-D int64 array of code indices
+    """
+    base = color_count(config)
+    powers = base ** np.arange(config.pattern_length - 1, -1, -1, dtype=np.int64)
+    return (np.asarray(codes, dtype=np.int64) - config.min_number) @ powers
+
+
+def all_codes(config: GameConfig) -> np.ndarray:
+    """
+    Enumerate the full code space in index order.
+
+    Only meant for configurations whose code space fits in memory.
+
+    Returns:
+        np.ndarray: Array of shape (code_space_size(config), pattern_length)
+
+    Raises:
+        ValueError: If the code space is larger than MAX_ENUMERATED_CODES
+    """
+    if not is_enumerable(config):
+        raise ValueError(f"Code space of {code_space_size(config)} codes is too large to enumerate")
+    return codes_from_indices(np.arange(code_space_size(config)), config)
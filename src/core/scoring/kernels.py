@@ -0,0 +1,141 @@
+from abc import ABC, abstractmethod
+import logging
+from typing import Dict, Optional, Sequence, Tuple
+from src.core.config.game_config import BITMASK_MAX_CODE_SPACE, GameConfig
+from src.core.models.scoring_kernel import ScoringKernel
+
+logger = logging.getLogger(__name__)
+
+try:
+    _popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def _popcount(value: int) -> int:
+        return bin(value).count("1")
+
+
+class GuessScorer(ABC):
+    """
+    Abstract base class for single-guess scoring kernels.
+    """
+    @abstractmethod
+    def score(self, guess_numbers: Sequence[int], code_pattern: Sequence[int],
+              pattern_count: Dict[int, int]) -> Tuple[int, int]:
+        """
+        Score one guess against one code pattern.
+
+        Args:
+            guess_numbers: The guessed numbers
+            code_pattern: The secret code pattern
+            pattern_count: Frequency map of numbers in code_pattern
+
+        Returns:
+            Tuple[int, int]: (numbers_correct, positions_correct)
+        """
+        pass
+
+
+class StandardScorer(GuessScorer):
+    """
+    Reference kernel: walks positions and a copied frequency dict.
+    """
+    def score(self, guess_numbers: Sequence[int], code_pattern: Sequence[int],
+              pattern_count: Dict[int, int]) -> Tuple[int, int]:
+        current_pattern_count = pattern_count.copy()
+
+        correct_location = 0
+        correct_number = 0
+
+        for idx in range(len(guess_numbers)):
+            if guess_numbers[idx] == code_pattern[idx]:
+                correct_location += 1
+
+        for guess_num in guess_numbers:
+            if guess_num in current_pattern_count and current_pattern_count[guess_num] > 0:
+                correct_number += 1
+                current_pattern_count[guess_num] -= 1
+
+        return correct_number, correct_location
+
+
+class BitmaskScorer(GuessScorer):
+    """
+    Bit-parallel kernel built on per-color bitmasks.
+
+    Every code is encoded once into two integers, each holding one block of
+    pattern_length bits per color:
+    - position mask: bit p of a color's block is set when that color sits at position p
+    - count mask: the lowest n bits of a color's block are set when the color occurs n times
+
+    Exact hits are popcount(guess_positions & code_positions). Because counts
+    are stored in unary, popcount(guess_counts & code_counts) is the sum over
+    colors of min(guess count, code count), i.e. the color hits.
+
+    Encodings are memoized in a bounded dict, so repeated guesses and codes
+    (solvers, simulations, a game's fixed secret) are encoded only once.
+
+    Attributes:
+        config (GameConfig): Configuration providing the value range
+        max_cached_codes (int): Maximum number of memoized encodings
+    """
+    def __init__(self, config: GameConfig, max_cached_codes: int = BITMASK_MAX_CODE_SPACE):
+        self.config = config
+        self.max_cached_codes = max_cached_codes
+        self._color_count = config.max_number - config.min_number + 1
+        self._fallback = StandardScorer()
+        self._encodings: Dict[Tuple[int, ...], Tuple[int, int]] = {}
+
+    def encode(self, numbers: Sequence[int]) -> Optional[Tuple[int, int]]:
+        """
+        Encode a code into its (position mask, count mask) pair.
+
+        Args:
+            numbers: The code to encode
+
+        Returns:
+            Tuple[int, int] or None if the code does not fit the configuration
+        """
+        key = tuple(numbers)
+        cached = self._encodings.get(key)
+        if cached is not None:
+            return cached
+
+        length = self.config.pattern_length
+        if len(key) != length:
+            return None
+
+        seen = [0] * self._color_count
+        positions = 0
+        counts = 0
+        for pos, num in enumerate(key):
+            color = num - self.config.min_number
+            if not 0 <= color < self._color_count:
+                return None
+            block = color * length
+            positions |= 1 << (block + pos)
+            counts |= 1 << (block + seen[color])
+            seen[color] += 1
+
+        if len(self._encodings) >= self.max_cached_codes:
+            self._encodings.clear()
+        self._encodings[key] = (positions, counts)
+        return positions, counts
+
+    def score(self, guess_numbers: Sequence[int], code_pattern: Sequence[int],
+              pattern_count: Dict[int, int]) -> Tuple[int, int]:
+        encodings = self._encodings
+        guess = encodings.get(tuple(guess_numbers)) or self.encode(guess_numbers)
+        code = encodings.get(tuple(code_pattern)) or self.encode(code_pattern)
+        if guess is None or code is None:
+            logger.debug("Code does not fit the configuration, using standard scorer")
+            return self._fallback.score(guess_numbers, code_pattern, pattern_count)
+
+        return _popcount(guess[1] & code[1]), _popcount(guess[0] & code[0])
+
+
+def create_scorer(config: GameConfig) -> GuessScorer:
+    """
+    Build the scoring kernel selected by config.scoring_kernel.
+    """
+    if config.scoring_kernel == ScoringKernel.BITMASK:
+        return BitmaskScorer(config)
+    return StandardScorer()
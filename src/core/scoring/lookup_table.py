@@ -0,0 +1,283 @@
+from collections import OrderedDict
+import logging
+import os
+from pathlib import Path
+import tempfile
+from typing import Sequence, Union
+import numpy as np
+from src.core.config.game_config import GameConfig
+from src.core.models.feedback import Feedback
+from src.core.scoring.batch import score_batch
+from src.core.scoring.code_space import all_codes, code_space_size, code_to_index, codes_from_indices, is_enumerable
+
+logger = logging.getLogger(__name__)
+
+# Tables above this many entries are not built in full, see feedback_table_for
+MAX_FULL_TABLE_ENTRIES = 1 << 26
+
+
+def pack_feedback(numbers_correct, positions_correct, pattern_length: int):
+    """
+    Pack a (numbers_correct, positions_correct) pair into one small integer.
+
+    Works on plain ints as well as NumPy arrays. The packed value is always
+    below (pattern_length + 1) ** 2, so it fits in one byte for any realistic
+    pattern length.
+    """
+    return numbers_correct * (pattern_length + 1) + positions_correct
+
+
+def unpack_feedback(packed: int, pattern_length: int) -> Feedback:
+    """
+    Inverse of pack_feedback, returning a Feedback object.
+    """
+    numbers_correct, positions_correct = divmod(int(packed), pattern_length + 1)
+    return Feedback(numbers_correct, positions_correct)
+
+
+def feedback_code_count(pattern_length: int) -> int:
+    """
+    Number of distinct packed feedback values for a pattern length.
+    """
+    return (pattern_length + 1) ** 2
+
+
+def table_file_name(config: GameConfig) -> str:
+    """
+    File name used for a configuration's precomputed table.
+    """
+    return f"feedback_{config.pattern_length}x{config.min_number}-{config.max_number}.npy"
+
+
+class FeedbackTable:
+    """
+    Full guess-by-code table of packed feedback values.
+
+    The table is indexed by code index (see code_space.code_to_index) on both
+    axes. When loaded from disk it is memory-mapped read-only, so worker
+    processes opening the same file share one copy through the page cache.
+
+    Attributes:
+        config (GameConfig): Configuration the table was built for
+        table (np.ndarray): (size, size) uint8 array of packed feedback
+    """
+    def __init__(self, config: GameConfig, table: np.ndarray):
+        size = code_space_size(config)
+        if table.shape != (size, size):
+            raise ValueError(f"Table shape {table.shape} does not match code space of size {size}")
+        self.config = config
+        self.table = table
+
+    @classmethod
+    def compute(cls, config: GameConfig, out: Union[np.ndarray, None] = None,
+                chunk_rows: int = 256) -> 'FeedbackTable':
+        """
+        Compute the full table in memory (or into a preallocated array).
+
+        Args:
+            config: Game configuration to build the table for
+            out: Optional (size, size) uint8 array to fill, e.g. a memmap
+            chunk_rows: Number of guess rows scored per batch call
+
+        Returns:
+            FeedbackTable: The computed table
+        """
+        codes = all_codes(config)
+        size = len(codes)
+        table = out if out is not None else np.empty((size, size), dtype=np.uint8)
+
+        for start in range(0, size, chunk_rows):
+            stop = min(start + chunk_rows, size)
+            numbers, positions = score_batch(codes[start:stop], codes, config)
+            table[start:stop] = pack_feedback(numbers, positions, config.pattern_length)
+
+        logger.info("Computed feedback table with %d x %d entries", size, size)
+        return cls(config, table)
+
+    @classmethod
+    def build(cls, config: GameConfig, path: Union[str, Path], chunk_rows: int = 256) -> 'FeedbackTable':
+        """
+        Precompute the table and store it as a .npy file.
+
+        The file is written to a temporary name and atomically renamed, so
+        processes concurrently calling load never observe a partial table.
+
+        Args:
+            config: Game configuration to build the table for
+            path: Destination file
+            chunk_rows: Number of guess rows scored per batch call
+
+        Returns:
+            FeedbackTable: The table, memory-mapped from the written file
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        size = code_space_size(config)
+
+        fd, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            table = np.lib.format.open_memmap(temp_name, mode="w+", dtype=np.uint8, shape=(size, size))
+            cls.compute(config, out=table, chunk_rows=chunk_rows)
+            table.flush()
+            del table
+            os.replace(temp_name, path)
+        except BaseException:
+            if os.path.exists(temp_name):
+                os.remove(temp_name)
+            raise
+
+        logger.info("Feedback table written to %s", path)
+        return cls.load(config, path)
+
+    @classmethod
+    def load(cls, config: GameConfig, path: Union[str, Path]) -> 'FeedbackTable':
+        """
+        Memory-map a previously built table.
+
+        Args:
+            config: Game configuration the table was built for
+            path: File written by build
+
+        Returns:
+            FeedbackTable: Read-only, memory-mapped table
+        """
+        table = np.load(path, mmap_mode="r")
+        logger.debug("Feedback table loaded from %s", path)
+        return cls(config, table)
+
+    def lookup(self, guess_index: int, code_index: int) -> int:
+        """
+        Packed feedback for one (guess, code) pair.
+        """
+        return int(self.table[guess_index, code_index])
+
+    def row(self, guess_index: int) -> np.ndarray:
+        """
+        Packed feedback of one guess against every code.
+        """
+        return self.table[guess_index]
+
+    def block(self, guess_indices: np.ndarray, code_indices: np.ndarray) -> np.ndarray:
+        """
+        Packed feedback of several guesses against several codes.
+
+        Returns:
+            np.ndarray: (len(guess_indices), len(code_indices)) uint8 array
+        """
+        return np.asarray(self.table[np.ix_(guess_indices, code_indices)])
+
+    def feedback(self, guess: Sequence[int], code: Sequence[int]) -> Feedback:
+        """
+        Feedback for a guess against a code, as a Feedback object.
+        """
+        packed = self.lookup(code_to_index(guess, self.config), code_to_index(code, self.config))
+        return unpack_feedback(packed, self.config.pattern_length)
+
+
+class LazyFeedbackTable:
+    """
+    Row-on-demand variant of FeedbackTable for large code spaces.
+
+    Rows are computed with the batch scorer the first time they are requested
+    and kept in a bounded LRU cache, so memory stays at max_cached_rows rows.
+    Code spaces too large to enumerate have no rows at all: lookups and
+    blocks are scored directly from the decoded indices.
+
+    Attributes:
+        config (GameConfig): Configuration the table serves
+        max_cached_rows (int): Maximum number of rows kept in memory
+    """
+    def __init__(self, config: GameConfig, max_cached_rows: int = 1024):
+        self.config = config
+        self.max_cached_rows = max_cached_rows
+        self._codes = all_codes(config) if is_enumerable(config) else None
+        self._rows = OrderedDict()
+
+    def row(self, guess_index: int) -> np.ndarray:
+        """
+        Packed feedback of one guess against every code, computed on first use.
+
+        Raises:
+            ValueError: If the code space is too large to enumerate
+        """
+        if self._codes is None:
+            raise ValueError("Feedback rows are not available for code spaces too large to enumerate")
+        cached = self._rows.get(guess_index)
+        if cached is not None:
+            self._rows.move_to_end(guess_index)
+            return cached
+
+        guess = codes_from_indices(np.array([guess_index]), self.config)
+        numbers, positions = score_batch(guess, self._codes, self.config)
+        row = pack_feedback(numbers[0], positions[0], self.config.pattern_length)
+        row.flags.writeable = False
+
+        self._rows[guess_index] = row
+        if len(self._rows) > self.max_cached_rows:
+            self._rows.popitem(last=False)
+        return row
+
+    def lookup(self, guess_index: int, code_index: int) -> int:
+        """
+        Packed feedback for one (guess, code) pair.
+        """
+        if self._codes is None:
+            return int(self.block(np.array([guess_index]), np.array([code_index]))[0, 0])
+        return int(self.row(guess_index)[code_index])
+
+    def block(self, guess_indices: np.ndarray, code_indices: np.ndarray) -> np.ndarray:
+        """
+        Packed feedback of several guesses against several codes.
+
+        Returns:
+            np.ndarray: (len(guess_indices), len(code_indices)) uint8 array
+        """
+        if self._codes is None:
+            numbers, positions = score_batch(codes_from_indices(guess_indices, self.config),
+                                             codes_from_indices(code_indices, self.config), self.config)
+            return pack_feedback(numbers, positions, self.config.pattern_length).astype(np.uint8)
+
+        block = np.empty((len(guess_indices), len(code_indices)), dtype=np.uint8)
+        for row, guess_index in enumerate(guess_indices):
+            block[row] = self.row(int(guess_index))[code_indices]
+        return block
+
+    def feedback(self, guess: Sequence[int], code: Sequence[int]) -> Feedback:
+        """
+        Feedback for a guess against a code, as a Feedback object.
+        """
+        packed = self.lookup(code_to_index(guess, self.config), code_to_index(code, self.config))
+        return unpack_feedback(packed, self.config.pattern_length)
+
+
+def feedback_table_for(config: GameConfig, directory: Union[str, Path, None] = None,
+                       max_cached_rows: int = 1024) -> Union[FeedbackTable, LazyFeedbackTable]:
+    """
+    Get the appropriate feedback table for a configuration.
+
+    Small code spaces (e.g. Difficulty.NORMAL) get a full table, memory-mapped
+    from directory and built there on first use. Without a directory the full
+    table is computed in memory. Code spaces above MAX_FULL_TABLE_ENTRIES
+    (e.g. Difficulty.HARD) get a LazyFeedbackTable.
+
+    Args:
+        config: Game configuration to serve
+        directory: Where precomputed tables are stored
+        max_cached_rows: Row cache size for the lazy variant
+
+    Returns:
+        FeedbackTable or LazyFeedbackTable
+    """
+    size = code_space_size(config)
+    if size * size > MAX_FULL_TABLE_ENTRIES:
+        logger.info("Code space of %d codes too large for a full table, using lazy rows", size)
+        return LazyFeedbackTable(config, max_cached_rows=max_cached_rows)
+
+    if directory is None:
+        return FeedbackTable.compute(config)
+
+    path = Path(directory) / table_file_name(config)
+    if path.exists():
+        return FeedbackTable.load(config, path)
+    return FeedbackTable.build(config, path)
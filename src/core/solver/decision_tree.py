@@ -0,0 +1,279 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import os
+from pathlib import Path
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+from src.core.config.game_config import PRESET_DIFFICULTIES, GameConfig
+from src.core.models.feedback import Feedback
+from src.core.models.game_difficulty import Difficulty
+from src.core.models.guess import Guess
+from src.core.models.solver_strategy import SolverStrategy
+from src.core.scoring.batch import score_batch
+from src.core.scoring.code_space import code_space_size, code_to_index, codes_from_indices, index_to_code
+from src.core.scoring.lookup_table import FeedbackTable, feedback_table_for, pack_feedback, unpack_feedback
+from src.core.solver.opening_book import OPENING_BOOK_DIRECTORY, load_opening_book
+from src.core.solver.solver import Solver
+
+logger = logging.getLogger(__name__)
+
+_VERSION = 1
+
+# One node: guess index plus its outgoing (feedback, child) edges
+_Subtree = Tuple[List[int], List[List[Tuple[int, int]]]]
+
+
+class DecisionTree:
+    """
+    Complete solver strategy for a configuration, stored as flat arrays.
+
+    Node i plays guesses[i]. Its outgoing edges are
+    edge_feedback/edge_child[edge_start[i]:edge_start[i + 1]], sorted by
+    packed feedback, so following a feedback is a binary search over at most
+    (pattern_length + 1) ** 2 edges. The winning feedback has no edge. Node 0
+    is the opening guess.
+
+    Attributes:
+        config (GameConfig): Configuration the tree solves
+        strategy (SolverStrategy): Strategy the tree was built with
+        guesses (np.ndarray): int32 guess code index per node
+        edge_start (np.ndarray): int32 offsets into the edge arrays, one per node plus one
+        edge_feedback (np.ndarray): uint8 packed feedback per edge
+        edge_child (np.ndarray): int32 child node per edge
+    """
+    def __init__(self, config: GameConfig, strategy: SolverStrategy, guesses: np.ndarray,
+                 edge_start: np.ndarray, edge_feedback: np.ndarray, edge_child: np.ndarray):
+        self.config = config
+        self.strategy = strategy
+        self.guesses = guesses
+        self.edge_start = edge_start
+        self.edge_feedback = edge_feedback
+        self.edge_child = edge_child
+
+    def __len__(self) -> int:
+        return len(self.guesses)
+
+    @classmethod
+    def build(cls, config: GameConfig, strategy: SolverStrategy = SolverStrategy.MINIMAX,
+              workers: Optional[int] = None, table_dir: Optional[str] = None) -> 'DecisionTree':
+        """
+        Compute the full tree, one worker process per branch below the opening.
+
+        Args:
+            config: Configuration to solve, its code space must be enumerable
+            strategy: Strategy used to pick every guess
+            workers: Worker processes, defaults to the CPU count; 1 runs in-process
+            table_dir: Directory with a precomputed feedback table shared by the workers
+
+        Returns:
+            DecisionTree: The complete tree
+        """
+        started = time.perf_counter()
+        workers = workers or os.cpu_count() or 1
+        if table_dir:
+            feedback_table_for(config, table_dir)
+
+        _init_builder(config, strategy, table_dir)
+        candidates = np.arange(code_space_size(config))
+        root = _builder_solver.suggest([], candidates=candidates)
+        branches = _branches(config, [], root, candidates)
+
+        if workers == 1:
+            subtrees = [_build_subtree(records, branch) for _, records, branch in branches]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_builder,
+                                     initargs=(config, strategy, table_dir)) as executor:
+                subtrees = list(executor.map(_build_subtree, [records for _, records, _ in branches],
+                                             [branch for _, _, branch in branches]))
+
+        guesses = [code_to_index(root.get_numbers(), config)]
+        edges: List[List[Tuple[int, int]]] = [[]]
+        for (feedback, _, _), (sub_guesses, sub_edges) in zip(branches, subtrees):
+            offset = len(guesses)
+            edges[0].append((feedback, offset))
+            guesses.extend(sub_guesses)
+            edges.extend([[(value, child + offset) for value, child in node_edges] for node_edges in sub_edges])
+
+        tree = cls._from_nodes(config, strategy, guesses, edges)
+        logger.info("Built decision tree with %d nodes in %.1fs", len(tree), time.perf_counter() - started)
+        return tree
+
+    @classmethod
+    def _from_nodes(cls, config: GameConfig, strategy: SolverStrategy, guesses: List[int],
+                    edges: List[List[Tuple[int, int]]]) -> 'DecisionTree':
+        edge_start = np.zeros(len(guesses) + 1, dtype=np.int32)
+        edge_start[1:] = np.cumsum([len(node_edges) for node_edges in edges])
+        flat = [edge for node_edges in edges for edge in sorted(node_edges)]
+        return cls(config, strategy,
+                   np.array(guesses, dtype=np.int32),
+                   edge_start,
+                   np.array([value for value, _ in flat], dtype=np.uint8),
+                   np.array([child for _, child in flat], dtype=np.int32))
+
+    def next_guess(self, guess_records: List[Tuple[Guess, Feedback]]) -> Optional[Guess]:
+        """
+        Walk the tree along a game's history, in O(history length).
+
+        Args:
+            guess_records: The game's (guess, feedback) history
+
+        Returns:
+            Guess or None when the player left the tree by not playing its guesses
+        """
+        node = 0
+        for guess, feedback in guess_records:
+            if index_to_code(int(self.guesses[node]), self.config) != list(guess.get_numbers()):
+                return None
+            start, stop = self.edge_start[node], self.edge_start[node + 1]
+            packed = pack_feedback(feedback.numbers_correct, feedback.positions_correct,
+                                   self.config.pattern_length)
+            position = start + np.searchsorted(self.edge_feedback[start:stop], packed)
+            if position >= stop or self.edge_feedback[position] != packed:
+                return None
+            node = int(self.edge_child[position])
+
+        return Guess(index_to_code(int(self.guesses[node]), self.config))
+
+    def max_depth(self) -> int:
+        """
+        Worst-case number of guesses when following the tree, i.e. its height.
+        """
+        depth = 0
+        stack = [(0, 1)]
+        while stack:
+            node, level = stack.pop()
+            depth = max(depth, level)
+            start, stop = self.edge_start[node], self.edge_start[node + 1]
+            stack.extend((int(child), level + 1) for child in self.edge_child[start:stop])
+        return depth
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Write the tree arrays to an uncompressed .npz file (atomic rename).
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = np.array([_VERSION, self.config.pattern_length, self.config.min_number,
+                         self.config.max_number, list(SolverStrategy).index(self.strategy)], dtype=np.int32)
+        fd, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, meta=meta, guesses=self.guesses, edge_start=self.edge_start,
+                     edge_feedback=self.edge_feedback, edge_child=self.edge_child)
+        os.replace(temp_name, path)
+        logger.info("Decision tree written to %s", path)
+
+    @classmethod
+    def load(cls, config: GameConfig, path: Union[str, Path]) -> 'DecisionTree':
+        """
+        Read a tree written by save.
+
+        Raises:
+            ValueError: If the file is not a tree for this configuration
+        """
+        with np.load(path) as data:
+            version, length, min_number, max_number, strategy = data["meta"].tolist()
+            if version != _VERSION:
+                raise ValueError(f"{path} is not a version {_VERSION} decision tree")
+            if (length, min_number, max_number) != (config.pattern_length, config.min_number, config.max_number):
+                raise ValueError(f"{path} was built for a different configuration")
+            return cls(config, list(SolverStrategy)[strategy], data["guesses"], data["edge_start"],
+                       data["edge_feedback"], data["edge_child"])
+
+
+_builder_solver: Optional[Solver] = None
+
+
+def _init_builder(config: GameConfig, strategy: SolverStrategy, table_dir: Optional[str]) -> None:
+    global _builder_solver
+    table = feedback_table_for(config, table_dir) if table_dir else None
+    _builder_solver = Solver(config, strategy=strategy,
+                             table=table if isinstance(table, FeedbackTable) else None,
+                             opening_book=load_opening_book(config, strategy))
+
+
+def _branches(config: GameConfig, records: List[Tuple[Guess, Feedback]], guess: Guess,
+              candidates: np.ndarray) -> List[Tuple[int, List[Tuple[Guess, Feedback]], np.ndarray]]:
+    """
+    Split candidates by the feedback a guess would receive, skipping the win.
+    """
+    length = config.pattern_length
+    numbers, positions = score_batch([guess.get_numbers()], codes_from_indices(candidates, config), config)
+    packed = pack_feedback(numbers[0], positions[0], length)
+    winning = pack_feedback(length, length, length)
+    return [(int(value), records + [(guess, unpack_feedback(value, length))], candidates[packed == value])
+            for value in np.unique(packed) if value != winning]
+
+
+def _build_subtree(records: List[Tuple[Guess, Feedback]], candidates: np.ndarray) -> _Subtree:
+    """
+    Depth-first expansion of one branch, node 0 being the branch root.
+    """
+    config = _builder_solver.config
+    guesses: List[int] = []
+    edges: List[List[Tuple[int, int]]] = []
+
+    def expand(history: List[Tuple[Guess, Feedback]], remaining: np.ndarray) -> int:
+        node = len(guesses)
+        guess = _builder_solver.suggest(history, candidates=remaining)
+        guesses.append(code_to_index(guess.get_numbers(), config))
+        edges.append([])
+        for value, branch_history, branch in _branches(config, history, guess, remaining):
+            edges[node].append((value, expand(branch_history, branch)))
+        return node
+
+    expand(records, candidates)
+    return guesses, edges
+
+
+def tree_file_name(config: GameConfig, strategy: SolverStrategy = SolverStrategy.MINIMAX) -> str:
+    """
+    File name used for a configuration's decision tree.
+    """
+    return f"tree_{config.pattern_length}x{config.min_number}-{config.max_number}_{strategy.value}.npz"
+
+
+_loaded_trees: Dict[Path, Optional[DecisionTree]] = {}
+_loaded_trees_lock = threading.Lock()
+
+
+def load_decision_tree(config: GameConfig, strategy: SolverStrategy = SolverStrategy.MINIMAX,
+                       directory: Union[str, Path] = OPENING_BOOK_DIRECTORY) -> Optional[DecisionTree]:
+    """
+    Lazily load, and cache per process, the precomputed tree for a configuration.
+
+    Returns:
+        DecisionTree or None when no tree has been built for it
+    """
+    path = Path(directory) / tree_file_name(config, strategy)
+    with _loaded_trees_lock:
+        if path not in _loaded_trees:
+            try:
+                _loaded_trees[path] = DecisionTree.load(config, path) if path.exists() else None
+            except (ValueError, KeyError, OSError) as e:
+                logger.warning("Ignoring unreadable decision tree %s: %s", path, e)
+                _loaded_trees[path] = None
+        return _loaded_trees[path]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precompute the full solver decision tree")
+    parser.add_argument("--difficulty", choices=[d.value for d in PRESET_DIFFICULTIES], default=Difficulty.NORMAL.value)
+    parser.add_argument("--strategy", choices=[s.value for s in SolverStrategy], default=SolverStrategy.MINIMAX.value)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--table-dir", default=None, help="directory for precomputed feedback tables")
+    parser.add_argument("--out", default=str(OPENING_BOOK_DIRECTORY))
+    args = parser.parse_args()
+
+    config = GameConfig(Difficulty(args.difficulty))
+    strategy = SolverStrategy(args.strategy)
+    tree = DecisionTree.build(config, strategy=strategy, workers=args.workers, table_dir=args.table_dir)
+    tree.save(Path(args.out) / tree_file_name(config, strategy))
+    print(f"{args.difficulty}: {len(tree)} nodes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import argparse
+import logging
+import os
+from pathlib import Path
+import struct
+import tempfile
+import threading
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+from src.core.config.game_config import PRESET_DIFFICULTIES, GameConfig
+from src.core.models.feedback import Feedback
+from src.core.models.game_difficulty import Difficulty
+from src.core.models.guess import Guess
+from src.core.models.solver_strategy import SolverStrategy
+from src.core.scoring.batch import score_batch
+from src.core.scoring.code_space import code_space_size, code_to_index, codes_from_indices, index_to_code
+from src.core.scoring.lookup_table import pack_feedback, unpack_feedback
+from src.core.solver.solver import Solver
+
+logger = logging.getLogger(__name__)
+
+# Books shipped with the package, rebuild with: python -m src.core.solver.opening_book
+OPENING_BOOK_DIRECTORY = Path(__file__).parent / "books"
+
+_MAGIC = b"MMOB"
+_VERSION = 1
+# magic, version, pattern_length, min_number, max_number, depth, strategy, entry count
+_HEADER = struct.Struct("<4sBBhhBBI")
+_STRATEGIES = list(SolverStrategy)
+
+
+class OpeningBook:
+    """
+    Precomputed solver answers for the first moves of a configuration.
+
+    The book maps the feedback received so far (while the book's own guesses
+    were played) to the next guess. Entries are keyed by the sequence of
+    packed feedback values, since the guesses themselves are implied by the
+    book.
+
+    Attributes:
+        config (GameConfig): Configuration the book was computed for
+        strategy (SolverStrategy): Strategy used to pick the guesses
+        depth (int): Number of moves covered
+        entries (Dict[Tuple[int, ...], int]): Feedback path to guess code index
+    """
+    def __init__(self, config: GameConfig, strategy: SolverStrategy, depth: int,
+                 entries: Dict[Tuple[int, ...], int]):
+        self.config = config
+        self.strategy = strategy
+        self.depth = depth
+        self.entries = entries
+
+    @classmethod
+    def compute(cls, config: GameConfig, depth: int = 2,
+                strategy: SolverStrategy = SolverStrategy.MINIMAX,
+                solver: Optional[Solver] = None) -> 'OpeningBook':
+        """
+        Compute the book by running the solver on every reachable branch.
+
+        Args:
+            config: Game configuration to compute the book for
+            depth: Number of moves to cover (1 = opening guess only)
+            strategy: Strategy used to pick guesses
+            solver: Solver to use, one without a time budget is created by default
+
+        Returns:
+            OpeningBook: The computed book
+        """
+        solver = solver or Solver(config, strategy=strategy)
+        length = config.pattern_length
+        winning = pack_feedback(length, length, length)
+        entries = {}
+
+        def expand(key: Tuple[int, ...], records: List[Tuple[Guess, Feedback]],
+                   candidates: np.ndarray) -> None:
+            guess = solver.suggest(records, candidates=candidates)
+            entries[key] = code_to_index(guess.get_numbers(), config)
+            if len(key) + 1 >= depth:
+                return
+
+            numbers, positions = score_batch([guess.get_numbers()], codes_from_indices(candidates, config), config)
+            packed = pack_feedback(numbers[0], positions[0], length)
+            for value in np.unique(packed):
+                if value == winning:
+                    continue
+                branch = candidates[packed == value]
+                expand(key + (int(value),), records + [(guess, unpack_feedback(value, length))], branch)
+
+        expand((), [], np.arange(code_space_size(config)))
+        logger.info("Computed opening book with %d entries for depth %d", len(entries), depth)
+        return cls(config, strategy, depth, entries)
+
+    def lookup(self, guess_records: List[Tuple[Guess, Feedback]]) -> Optional[Guess]:
+        """
+        Book answer for a guess history.
+
+        Args:
+            guess_records: The game's (guess, feedback) history
+
+        Returns:
+            Guess or None when the history left the book or is deeper than it
+        """
+        key = ()
+        for guess, feedback in guess_records:
+            expected = self.entries.get(key)
+            if expected is None or index_to_code(expected, self.config) != list(guess.get_numbers()):
+                return None
+            key += (pack_feedback(feedback.numbers_correct, feedback.positions_correct,
+                                  self.config.pattern_length),)
+
+        index = self.entries.get(key)
+        return None if index is None else Guess(index_to_code(index, self.config))
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Write the book to a compact binary file.
+
+        The file holds a fixed header followed by one record per entry:
+        key length (1 byte), packed feedback key (1 byte each), guess index
+        (4 bytes). It is written to a temporary name and renamed atomically.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        chunks = [_HEADER.pack(_MAGIC, _VERSION, self.config.pattern_length, self.config.min_number,
+                               self.config.max_number, self.depth, _STRATEGIES.index(self.strategy),
+                               len(self.entries))]
+        for key, index in sorted(self.entries.items()):
+            chunks.append(struct.pack(f"<B{len(key)}BI", len(key), *key, index))
+
+        fd, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"".join(chunks))
+        os.replace(temp_name, path)
+        logger.info("Opening book written to %s", path)
+
+    @classmethod
+    def load(cls, config: GameConfig, path: Union[str, Path]) -> 'OpeningBook':
+        """
+        Read a book written by save.
+
+        Raises:
+            ValueError: If the file is not a book for this configuration
+        """
+        data = Path(path).read_bytes()
+        magic, version, length, min_number, max_number, depth, strategy, count = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a version {_VERSION} opening book")
+        if (length, min_number, max_number) != (config.pattern_length, config.min_number, config.max_number):
+            raise ValueError(f"{path} was built for a different configuration")
+
+        entries = {}
+        offset = _HEADER.size
+        for _ in range(count):
+            key_length = data[offset]
+            key = tuple(data[offset + 1:offset + 1 + key_length])
+            offset += 1 + key_length
+            entries[key], = struct.unpack_from("<I", data, offset)
+            offset += 4
+
+        logger.debug("Opening book loaded from %s with %d entries", path, count)
+        return cls(config, _STRATEGIES[strategy], depth, entries)
+
+
+def book_file_name(config: GameConfig, strategy: SolverStrategy = SolverStrategy.MINIMAX) -> str:
+    """
+    File name used for a configuration's opening book.
+    """
+    return f"opening_{config.pattern_length}x{config.min_number}-{config.max_number}_{strategy.value}.book"
+
+
+_loaded_books: Dict[Path, Optional[OpeningBook]] = {}
+_loaded_books_lock = threading.Lock()
+
+
+def load_opening_book(config: GameConfig, strategy: SolverStrategy = SolverStrategy.MINIMAX,
+                      directory: Union[str, Path] = OPENING_BOOK_DIRECTORY) -> Optional[OpeningBook]:
+    """
+    Lazily load, and cache per process, the precomputed book for a configuration.
+
+    Returns:
+        OpeningBook or None when no book has been built for it
+    """
+    path = Path(directory) / book_file_name(config, strategy)
+    with _loaded_books_lock:
+        if path not in _loaded_books:
+            try:
+                _loaded_books[path] = OpeningBook.load(config, path) if path.exists() else None
+            except (ValueError, struct.error) as e:
+                logger.warning("Ignoring unreadable opening book %s: %s", path, e)
+                _loaded_books[path] = None
+        return _loaded_books[path]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precompute opening books")
+    parser.add_argument("--difficulty", choices=[d.value for d in PRESET_DIFFICULTIES], action="append")
+    parser.add_argument("--strategy", choices=[s.value for s in SolverStrategy], default=SolverStrategy.MINIMAX.value)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--out", default=str(OPENING_BOOK_DIRECTORY))
+    args = parser.parse_args()
+
+    strategy = SolverStrategy(args.strategy)
+    for difficulty in args.difficulty or [d.value for d in PRESET_DIFFICULTIES]:
+        config = GameConfig(Difficulty(difficulty))
+        book = OpeningBook.compute(config, depth=args.depth, strategy=strategy)
+        book.save(Path(args.out) / book_file_name(config, strategy))
+        print(f"{difficulty}: {len(book.entries)} entries")
+
+
+if __name__ == "__main__":
+    main()
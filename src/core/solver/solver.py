@@ -0,0 +1,256 @@
+import logging
+import time
+from typing import TYPE_CHECKING, List, Optional, Tuple
+import numpy as np
+from src.core.candidate_set import candidate_set_for
+from src.core.config.game_config import GameConfig
+from src.core.models.feedback import Feedback
+from src.core.models.guess import Guess
+from src.core.models.solver_strategy import SolverStrategy
+from src.core.scoring.batch import score_batch
+from src.core.scoring.code_space import (all_codes, code_space_size, code_to_index, codes_from_indices, color_count,
+                                         is_enumerable)
+from src.core.scoring.lookup_table import FeedbackTable, feedback_code_count, pack_feedback
+
+if TYPE_CHECKING:
+    from src.core.solver.opening_book import OpeningBook
+
+logger = logging.getLogger(__name__)
+
+
+class Solver:
+    """
+    Suggests the next guess for a game from its guess history.
+
+    The solver keeps the codes consistent with every (guess, feedback) pair and
+    ranks possible next guesses by how they partition those codes, using the
+    selected SolverStrategy. Partition sizes are counted for a whole chunk of
+    guesses at once from a packed-feedback matrix, taken from a precomputed
+    FeedbackTable when one is given, or from the vectorized batch scorer.
+
+    Large searches (e.g. Difficulty.HARD with 100,000 codes) are pruned:
+    - the first guess only considers one code per color-repetition shape, since
+      all other codes are equivalent to one of them by symmetry
+    - later guesses consider consistent candidates first, then a random sample
+      of other codes, up to max_guess_pool guesses
+    - partitions are estimated on a random sample of at most
+      max_partition_sample consistent codes
+    Custom configurations too large to enumerate (e.g. 8 positions and 12
+    colors) work on a sampled set of consistent codes and never list the
+    code space.
+    When time_budget is set the search stops at the deadline and returns the
+    best guess found so far. Histories covered by an opening book are answered
+    from the book without any search.
+
+    Attributes:
+        config (GameConfig): Configuration of the games being solved
+        strategy (SolverStrategy): Rule used to rank guesses
+        time_budget (Optional[float]): Seconds allowed per suggestion, None for unlimited
+        table (Optional[FeedbackTable]): Precomputed feedback table for the configuration
+        max_guess_pool (int): Maximum number of guesses evaluated per suggestion
+        max_partition_sample (int): Maximum number of consistent codes used to size partitions
+        opening_book (Optional[OpeningBook]): Precomputed answers for the first moves
+    """
+    GUESS_CHUNK = 64
+
+    def __init__(self, config: GameConfig,
+                 strategy: SolverStrategy = SolverStrategy.MINIMAX,
+                 time_budget: Optional[float] = None,
+                 table: Optional[FeedbackTable] = None,
+                 max_guess_pool: int = 4096,
+                 max_partition_sample: int = 2048,
+                 opening_book: Optional['OpeningBook'] = None,
+                 seed: int = 0):
+        self.config = config
+        self.strategy = strategy
+        self.time_budget = time_budget
+        self.table = table
+        self.max_guess_pool = max_guess_pool
+        self.max_partition_sample = max_partition_sample
+        self.opening_book = opening_book
+        self._rng = np.random.default_rng(seed)
+        self._codes = None
+
+    @property
+    def codes(self) -> np.ndarray:
+        """
+        The full code space in index order, enumerated on first use.
+        """
+        if self._codes is None:
+            self._codes = all_codes(self.config)
+        return self._codes
+
+    def consistent_candidates(self, guess_records: List[Tuple[Guess, Feedback]]) -> np.ndarray:
+        """
+        Indices of every code that would have produced the recorded feedback.
+
+        For code spaces too large to enumerate this is a bounded sample of
+        them, see SampledCandidateSet.
+
+        Args:
+            guess_records: The game's (guess, feedback) history
+
+        Returns:
+            np.ndarray: Sorted code indices still possible
+        """
+        return candidate_set_for(self.config, guess_records).indices
+
+    def suggest(self, guess_records: List[Tuple[Guess, Feedback]],
+                candidates: Optional[np.ndarray] = None) -> Guess:
+        """
+        Suggest the next guess.
+
+        Args:
+            guess_records: The game's (guess, feedback) history
+            candidates: Already known consistent code indices, computed from
+                guess_records when omitted
+
+        Returns:
+            Guess: The suggested next guess
+
+        Raises:
+            ValueError: If no code is consistent with the history
+        """
+        if self.opening_book is not None:
+            book_guess = self.opening_book.lookup(guess_records)
+            if book_guess is not None:
+                logger.debug("Suggested guess %s from the opening book", book_guess)
+                return book_guess
+
+        started = time.monotonic()
+        deadline = None if self.time_budget is None else started + self.time_budget
+
+        if candidates is None:
+            candidates = self.consistent_candidates(guess_records)
+        if len(candidates) == 0:
+            raise ValueError("No code is consistent with the guess history")
+        if len(candidates) <= 2:
+            return self._to_guess(candidates[0])
+
+        pool, pool_is_candidate = self._guess_pool(guess_records, candidates)
+        targets = candidates
+        if len(targets) > self.max_partition_sample:
+            targets = np.sort(self._rng.choice(targets, self.max_partition_sample, replace=False))
+
+        best_index = self._search(pool, pool_is_candidate, targets, deadline)
+        logger.debug("Suggested guess %d from %d candidates in %.3fs",
+                     best_index, len(candidates), time.monotonic() - started)
+        return self._to_guess(best_index)
+
+    def _search(self, pool: np.ndarray, pool_is_candidate: np.ndarray,
+                targets: np.ndarray, deadline: Optional[float]) -> int:
+        """
+        Evaluate the guess pool chunk by chunk and return the best guess index.
+
+        Ties are broken in favour of consistent candidates, since those can
+        still win on this move.
+        """
+        feedback_count = feedback_code_count(self.config.pattern_length)
+        best_key = None
+        best_index = int(pool[0])
+
+        for start in range(0, len(pool), self.GUESS_CHUNK):
+            chunk = pool[start:start + self.GUESS_CHUNK]
+            packed = self._feedback_matrix(chunk, targets).astype(np.int64)
+            offsets = packed + (np.arange(len(chunk)) * feedback_count)[:, None]
+            sizes = np.bincount(offsets.ravel(), minlength=len(chunk) * feedback_count)
+            scores = self._scores(sizes.reshape(len(chunk), feedback_count), len(targets))
+
+            not_candidate = ~pool_is_candidate[start:start + len(chunk)]
+            pick = np.lexsort((not_candidate, scores))[0]
+            key = (scores[pick], not_candidate[pick])
+            if best_key is None or key < best_key:
+                best_key = key
+                best_index = int(chunk[pick])
+
+            if deadline is not None and time.monotonic() >= deadline:
+                logger.info("Solver time budget reached after %d of %d guesses",
+                            start + len(chunk), len(pool))
+                break
+
+        return best_index
+
+    def _scores(self, sizes: np.ndarray, total: int) -> np.ndarray:
+        """
+        Strategy score for each row of partition sizes, lower is better.
+        """
+        if self.strategy == SolverStrategy.MINIMAX:
+            return sizes.max(axis=1)
+        if self.strategy == SolverStrategy.EXPECTED_SIZE:
+            return (sizes * sizes).sum(axis=1) / total
+
+        probabilities = sizes / total
+        with np.errstate(divide="ignore", invalid="ignore"):
+            information = np.where(probabilities > 0, probabilities * np.log2(probabilities), 0.0)
+        return information.sum(axis=1)
+
+    def _guess_pool(self, guess_records: List[Tuple[Guess, Feedback]],
+                    candidates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Guesses worth evaluating, consistent candidates first.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Guess indices and whether each is a consistent candidate
+        """
+        if not guess_records:
+            pool = self._symmetric_openings()
+            return pool, np.isin(pool, candidates)
+
+        size = code_space_size(self.config)
+        if size <= self.max_guess_pool:
+            is_candidate = np.zeros(size, dtype=bool)
+            is_candidate[candidates] = True
+            pool = np.concatenate([candidates, np.flatnonzero(~is_candidate)])
+            return pool, is_candidate[pool]
+
+        candidate_part = candidates
+        if len(candidate_part) > self.max_guess_pool // 2:
+            candidate_part = self._rng.choice(candidates, self.max_guess_pool // 2, replace=False)
+        others = self._rng.integers(0, size, self.max_guess_pool - len(candidate_part))
+        others = np.setdiff1d(others, candidates)
+        pool = np.concatenate([candidate_part, others])
+        is_candidate = np.concatenate([np.ones(len(candidate_part), dtype=bool),
+                                       np.zeros(len(others), dtype=bool)])
+        return pool, is_candidate
+
+    def _symmetric_openings(self) -> np.ndarray:
+        """
+        One opening guess per color-repetition shape.
+
+        Before any feedback every color and every position is interchangeable,
+        so e.g. for 4 positions only 1111, 1112, 1122, 1123 and 1234 (up to
+        relabelling) need to be compared.
+        """
+        length = self.config.pattern_length
+        colors = color_count(self.config)
+        openings = []
+
+        def partitions(remaining: int, largest: int, parts: List[int]) -> None:
+            if remaining == 0:
+                if len(parts) <= colors:
+                    numbers = [self.config.min_number + color
+                               for color, count in enumerate(parts) for _ in range(count)]
+                    openings.append(code_to_index(numbers, self.config))
+                return
+            for part in range(min(remaining, largest), 0, -1):
+                partitions(remaining - part, part, parts + [part])
+
+        partitions(length, length, [])
+        return np.array(sorted(openings))
+
+    def _feedback_matrix(self, guess_indices: np.ndarray, code_indices: np.ndarray) -> np.ndarray:
+        """
+        Packed feedback of each guess against each code.
+        """
+        if self.table is not None:
+            return self.table.block(guess_indices, code_indices)
+        if is_enumerable(self.config):
+            guesses, codes = self.codes[guess_indices], self.codes[code_indices]
+        else:
+            guesses = codes_from_indices(guess_indices, self.config)
+            codes = codes_from_indices(code_indices, self.config)
+        numbers, positions = score_batch(guesses, codes, self.config)
+        return pack_feedback(numbers, positions, self.config.pattern_length)
+
+    def _to_guess(self, index) -> Guess:
+        return Guess(codes_from_indices(np.array([index]), self.config)[0].tolist())
@@ -1,5 +1,6 @@
 import logging
-from typing import Optional
+from typing import Dict, Iterable, List, Optional
+from src.repository.async_base import AsyncGameRepository
 from src.repository.base import GameRepository
 from src.core.models.game_state import GameState
 from src.core.models.game_status import GameStatus
@@ -7,7 +8,38 @@ from src.services.exceptions.exceptions import GameNotFoundError
 
 logger = logging.getLogger(__name__)
 
-class StateManager:
+class _StateManagerBase:
+    """
+    Logging shared by StateManager and AsyncStateManager around their repository calls.
+    """
+    @staticmethod
+    def _saved(game_state: GameState) -> None:
+        logger.info("Saving game state - ID: %s, Status: %s, Attempts: %d",
+                    game_state.game_id, game_state.status, game_state.attempts)
+
+    @staticmethod
+    def _loaded(state: GameState) -> GameState:
+        logger.info("Game state loaded - Status: %s, Attempts: %d", state.status, state.attempts)
+        return state
+
+    @staticmethod
+    def _not_found(game_id: str) -> None:
+        logger.error("Game %s not found", game_id)
+
+    @staticmethod
+    def _saved_many(game_states: List[GameState]) -> None:
+        logger.info("Saved %d game states", len(game_states))
+
+    @staticmethod
+    def _loaded_many(game_ids: List[str], states: Dict[str, GameState]) -> Dict[str, GameState]:
+        missing = len(set(game_ids)) - len(states)
+        if missing:
+            logger.warning("%d of the requested games were not found", missing)
+        logger.info("Loaded %d game states", len(states))
+        return states
+
+
+class StateManager(_StateManagerBase):
     """
     Manages the persistence and retrieval of game states.
     
@@ -28,8 +60,7 @@ class StateManager:
             game_state: Current state of the game to be saved
         """
         self.repository.save_game(game_state)
-        logger.info("Saving game state - ID: %s, Status: %s, Attempts: %d",
-                       game_state.game_id, game_state.status, game_state.attempts)
+        self._saved(game_state)
         
     def load_state(self, game_id: str) -> Optional[GameStatus]:
         """
@@ -45,10 +76,82 @@ class StateManager:
             GameNotFoundError: If no game exists with the given ID
         """
         try:
-            state = self.repository.load_game(game_id)
-            logger.info("Game state loaded - Status: %s, Attempts: %d",
-                    state.status, state.attempts)
-            return state
+            return self._loaded(self.repository.load_game(game_id))
+        except GameNotFoundError:
+            self._not_found(game_id)
+            raise
+        
+    def load_status(self, game_id: str) -> GameStatus:
+        """
+        Look up the status of a saved game without decoding its guess history.
+        
+        Args:
+            game_id: Unique identifier of the game
+
+        Returns:
+            GameStatus: Current status of the game
+
+        Raises:
+            GameNotFoundError: If no game exists with the given ID
+        """
+        return self.repository.load_header(game_id).status
+        
+    def save_states(self, game_states: List[GameState]) -> None:
+        """
+        Persist several game states in one repository call.
+        
+        Args:
+            game_states: Game states to be saved
+        """
+        self.repository.save_many(game_states)
+        self._saved_many(game_states)
+        
+    def load_states(self, game_ids: Iterable[str]) -> Dict[str, GameState]:
+        """
+        Retrieve several previously saved game states in one repository call.
+        
+        Args:
+            game_ids: Unique identifiers of the games to load
+
+        Returns:
+            Dict[str, GameState]: Loaded game states by ID; IDs without a saved
+                game are left out
+        """
+        game_ids = list(game_ids)
+        return self._loaded_many(game_ids, self.repository.load_many(game_ids))
+
+
+class AsyncStateManager(_StateManagerBase):
+    """
+    Asyncio counterpart of StateManager, on top of an AsyncGameRepository.
+    
+    Only the repository calls differ: both share their logging, see
+    StateManager for the behavior of each method.
+    
+    Attributes:
+        repository (AsyncGameRepository): The storage backend used for persisting game states
+    """
+    def __init__(self, repository: AsyncGameRepository):
+        """
+        Initialize a new async state manager.
+        """
+        self.repository = repository
+        
+    async def save_state(self, game_state: GameState) -> None:
+        await self.repository.save_game(game_state)
+        self._saved(game_state)
+        
+    async def load_state(self, game_id: str) -> GameState:
+        try:
+            return self._loaded(await self.repository.load_game(game_id))
         except GameNotFoundError:
-            logger.error("Game %s not found", game_id)
-            raise 
\ No newline at end of file
+            self._not_found(game_id)
+            raise
+        
+    async def save_states(self, game_states: List[GameState]) -> None:
+        await self.repository.save_many(game_states)
+        self._saved_many(game_states)
+        
+    async def load_states(self, game_ids: Iterable[str]) -> Dict[str, GameState]:
+        game_ids = list(game_ids)
+        return self._loaded_many(game_ids, await self.repository.load_many(game_ids))
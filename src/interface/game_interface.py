@@ -110,6 +110,7 @@ class GameInterface:
         logger.info("Starting game session")
         print("Type 'exit' to return to main menu")
         print("Type 'id' to see your game ID")
+        print("Type 'hint' to get a suggested guess")
         
         while self.game.get_status() == GameStatus.IN_PROGRESS:
             self._display_game_state()
@@ -118,6 +119,9 @@ class GameInterface:
             if guess_input == 'id':
                 print(f"\nYour game ID is: {self.game.game_id}")
                 continue
+            elif guess_input == 'hint':
+                print(f"\nHint: try \"{self.game.get_hint()}\"")
+                continue
             elif guess_input == 'exit':
                 logger.info("User chose to exit current game: %s", self.game.game_id)
                 print(f"\nExiting game. Your game ID is: {self.game.game_id}")
@@ -0,0 +1,450 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+import logging
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+import zlib
+
+from src.core.models.game_state import GameState
+from src.core.models.game_status import GameStatus
+from src.repository.base import GamePage, GameRepository
+from src.repository.codec import decode_state, encode_state
+from src.repository.migrations import Migration, migrate
+from src.services.exceptions.exceptions import DatabaseError, GameNotFoundError, LoadError, SaveError
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_BLOCK_GAMES = 128
+TIER_BATCH_SIZE = 500
+FINISHED_STATUSES = (GameStatus.WON, GameStatus.LOST)
+
+# A block is the zlib-compressed concatenation of encode_state() records;
+# the index points every archived game at its slice of the decompressed block
+CREATE_ARCHIVE_TABLES = (
+    """
+    CREATE TABLE IF NOT EXISTS archive_blocks (
+        block_id INTEGER PRIMARY KEY,
+        data BLOB NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS archived_games (
+        game_id TEXT PRIMARY KEY,
+        block_id INTEGER NOT NULL,
+        offset INTEGER NOT NULL,
+        length INTEGER NOT NULL
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS archived_games_by_block ON archived_games (block_id)",
+)
+INSERT_BLOCK = "INSERT INTO archive_blocks (data) VALUES (?)"
+UPSERT_ARCHIVED_GAME = """
+    INSERT INTO archived_games (game_id, block_id, offset, length) VALUES (?, ?, ?, ?)
+    ON CONFLICT (game_id) DO UPDATE SET
+        block_id = excluded.block_id, offset = excluded.offset, length = excluded.length
+"""
+SELECT_ARCHIVED_GAME = "SELECT block_id, offset, length FROM archived_games WHERE game_id = ?"
+SELECT_BLOCK = "SELECT data FROM archive_blocks WHERE block_id = ?"
+DELETE_ARCHIVED_GAME = "DELETE FROM archived_games WHERE game_id = ?"
+# blocks none of whose games are still archived there
+DELETE_UNUSED_BLOCK = """
+    DELETE FROM archive_blocks WHERE block_id = ?
+    AND NOT EXISTS (SELECT 1 FROM archived_games WHERE block_id = ?)
+"""
+
+
+def _create_archive_tables(connection: sqlite3.Connection) -> None:
+    for statement in CREATE_ARCHIVE_TABLES:
+        connection.execute(statement)
+
+
+# Archive schema steps, versioned under ARCHIVE_SCHEMA so the tables can share
+# a database file with the hot games and their user_version. Archives from
+# before versioning already have the tables, hence IF NOT EXISTS.
+ARCHIVE_SCHEMA = "archive"
+ARCHIVE_MIGRATIONS = (
+    Migration(1, "archive blocks and archived games index", _create_archive_tables),
+)
+
+
+class SQLiteArchiveRepository(GameRepository):
+    """
+    Cold storage for games that are rarely read again, as compressed blocks in SQLite.
+
+    save_many packs up to block_games states, binary-encoded, into one block
+    and compresses it with zlib, which finds far more repetition across
+    games (configs, timestamps, similar guesses) than within a single one.
+    A load reads and decompresses the game's block and decodes its slice;
+    load_many decompresses each block once. Saving a game again moves it to
+    a new block, and blocks left without games are deleted, so the archive
+    does not grow with rewrites.
+
+    The tables may live in the same database file as the hot games, or in
+    a file of their own; their ARCHIVE_MIGRATIONS are versioned by name, so
+    they leave the games schema's user_version alone. The repository is safe to share between threads;
+    calls are serialized on one connection.
+
+    Attributes:
+        db_name (str): Name of the SQLite database file
+        block_games (int): Most games per compressed block
+        compression_level (int): zlib level, 1 (fastest) to 9 (smallest)
+    """
+    def __init__(self, db_name: str = "mastermind_archive.db", block_games: int = ARCHIVE_BLOCK_GAMES,
+                 compression_level: int = 6):
+        """
+        Open the archive tables, creating or migrating them as needed.
+
+        Args:
+            db_name (str): Name of the SQLite database file
+            block_games (int): Most games per compressed block
+            compression_level (int): zlib level, 1 (fastest) to 9 (smallest)
+
+        Raises:
+            ValueError: If a setting is out of range
+            DatabaseError: If the tables cannot be created, or were written by a newer version
+        """
+        if block_games < 1 or not 1 <= compression_level <= 9:
+            raise ValueError("block_games must be positive and compression_level in [1, 9]")
+        self.db_name = db_name
+        self.block_games = block_games
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        try:
+            self._connection = sqlite3.connect(db_name, check_same_thread=False)
+            migrate(self._connection, ARCHIVE_MIGRATIONS, ARCHIVE_SCHEMA)
+        except sqlite3.Error as e:
+            logger.error("Failed to create archive tables: %s", str(e))
+            raise DatabaseError(f"Cannot create archive tables: {str(e)}")
+        logger.info("Opened game archive in %s", db_name)
+
+    def __enter__(self) -> 'SQLiteArchiveRepository':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def save_game(self, game_state: GameState) -> None:
+        """
+        Archive a single game, in a block of its own.
+
+        Args:
+            game_state (GameState): The game state to archive
+
+        Raises:
+            SaveError: If archiving fails
+        """
+        self.save_many([game_state])
+
+    def save_many(self, game_states: Iterable[GameState]) -> None:
+        """
+        Archive several games in one transaction, block_games per compressed block.
+
+        Args:
+            game_states (Iterable[GameState]): The game states to archive
+
+        Raises:
+            SaveError: If archiving fails, in which case none of the states are archived
+        """
+        # the last state of a game wins, as with consecutive saves
+        by_id = {game_state.game_id: game_state for game_state in game_states}
+        try:
+            encoded = [(game_id, encode_state(game_state)) for game_id, game_state in by_id.items()]
+        except ValueError as e:
+            raise SaveError(str(e))
+        if not encoded:
+            return
+
+        with self._lock:
+            try:
+                with self._connection:
+                    replaced = self._block_ids(game_id for game_id, _ in encoded)
+                    for start in range(0, len(encoded), self.block_games):
+                        self._write_block(encoded[start:start + self.block_games])
+                    self._delete_unused_blocks(replaced)
+            except sqlite3.Error as e:
+                logger.error("Failed to archive %d game(s): %s", len(encoded), str(e))
+                raise SaveError(f"Cannot archive games: {str(e)}")
+        logger.debug("Archived %d game(s)", len(encoded))
+
+    def _write_block(self, records: List[Tuple[str, bytes]]) -> None:
+        """
+        Compress records into a new block and point their games at it, in the caller's transaction.
+        """
+        rows = []
+        offset = 0
+        for game_id, data in records:
+            rows.append((game_id, offset, len(data)))
+            offset += len(data)
+        block = zlib.compress(b"".join(data for _, data in records), self.compression_level)
+        block_id = self._connection.execute(INSERT_BLOCK, (block,)).lastrowid
+        self._connection.executemany(UPSERT_ARCHIVED_GAME,
+                                     [(game_id, block_id, offset, length) for game_id, offset, length in rows])
+
+    def _block_ids(self, game_ids: Iterable[str]) -> set:
+        """
+        Blocks currently holding any of the games.
+        """
+        block_ids = set()
+        for game_id in game_ids:
+            row = self._connection.execute(SELECT_ARCHIVED_GAME, (game_id,)).fetchone()
+            if row is not None:
+                block_ids.add(row[0])
+        return block_ids
+
+    def _delete_unused_blocks(self, block_ids: Iterable[int]) -> None:
+        self._connection.executemany(DELETE_UNUSED_BLOCK, [(block_id, block_id) for block_id in block_ids])
+
+    def load_game(self, game_id: str) -> GameState:
+        """
+        Load an archived game.
+
+        Args:
+            game_id (str): The unique identifier of the game to load
+
+        Returns:
+            GameState: The archived game state
+
+        Raises:
+            GameNotFoundError: If the game is not archived
+            LoadError: If reading or decoding the block fails
+        """
+        game_states = self.load_many([game_id])
+        if game_id not in game_states:
+            logger.warning("Game not found in archive - ID: %s", game_id)
+            raise GameNotFoundError(game_id)
+        return game_states[game_id]
+
+    def load_many(self, game_ids: Iterable[str]) -> Dict[str, GameState]:
+        """
+        Load several archived games, decompressing each block they share once.
+
+        Args:
+            game_ids (Iterable[str]): The unique identifiers of the games to load
+
+        Returns:
+            Dict[str, GameState]: The archived game states by ID, in request order;
+                IDs not archived are left out
+
+        Raises:
+            LoadError: If reading or decoding a block fails
+        """
+        game_ids = list(dict.fromkeys(game_ids))
+        by_block: Dict[int, List[Tuple[str, int, int]]] = defaultdict(list)
+        loaded: Dict[str, GameState] = {}
+        with self._lock:
+            try:
+                # one read transaction, so no block is replaced between index and block reads
+                self._connection.execute("BEGIN")
+                try:
+                    for game_id in game_ids:
+                        row = self._connection.execute(SELECT_ARCHIVED_GAME, (game_id,)).fetchone()
+                        if row is not None:
+                            by_block[row[0]].append((game_id, row[1], row[2]))
+                    blocks = {block_id: self._connection.execute(SELECT_BLOCK, (block_id,)).fetchone()[0]
+                              for block_id in by_block}
+                finally:
+                    self._connection.rollback()
+            except sqlite3.Error as e:
+                logger.error("Failed to read archive blocks: %s", str(e))
+                raise LoadError()
+
+        try:
+            for block_id, games in by_block.items():
+                data = memoryview(zlib.decompress(blocks[block_id]))
+                for game_id, offset, length in games:
+                    loaded[game_id] = decode_state(data[offset:offset + length])
+        except (zlib.error, ValueError) as e:
+            logger.error("Corrupt archive block: %s", str(e))
+            raise LoadError()
+        return {game_id: loaded[game_id] for game_id in game_ids if game_id in loaded}
+
+    def delete_many(self, game_ids: Iterable[str], updated_before: Optional[datetime] = None) -> List[str]:
+        """
+        Remove games from the archive, deleting blocks left empty.
+
+        Args:
+            game_ids (Iterable[str]): The unique identifiers of the games to delete
+            updated_before (Optional[datetime]): Only delete games last updated before this time
+
+        Returns:
+            List[str]: IDs of the games actually deleted
+
+        Raises:
+            SaveError: If the delete fails, in which case nothing is deleted
+        """
+        game_ids = list(dict.fromkeys(game_ids))
+        if updated_before is not None:
+            game_ids = [game_id for game_id, game_state in self.load_many(game_ids).items()
+                        if game_state.updated_at < updated_before]
+        deleted = []
+        with self._lock:
+            try:
+                with self._connection:
+                    block_ids = self._block_ids(game_ids)
+                    for game_id in game_ids:
+                        if self._connection.execute(DELETE_ARCHIVED_GAME, (game_id,)).rowcount:
+                            deleted.append(game_id)
+                    self._delete_unused_blocks(block_ids)
+            except sqlite3.Error as e:
+                logger.error("Failed to delete %d archived game(s): %s", len(game_ids), str(e))
+                raise SaveError(f"Cannot delete archived games: {str(e)}")
+        return deleted
+
+    def close(self) -> None:
+        """
+        Close the archive's connection; the repository cannot be used afterwards.
+        """
+        with self._lock:
+            self._connection.close()
+
+
+class TieredGameRepository(GameRepository):
+    """
+    Hot repository for live games in front of an archive for finished ones.
+
+    Saves always go to the hot tier. archive_finished() moves finished
+    games, in batches, from the hot tier into the archive, so the hot
+    tables only hold what is being played and stay small and cache
+    friendly. Loads try the hot tier first and fall back to the archive,
+    so callers cannot tell where a game lives; a game saved again after
+    it was archived is served from the hot tier. Saves do not touch the
+    archive, so its copy of such a game goes stale: it is never read while
+    the hot copy exists, and is replaced when the game is archived again
+    or removed by delete_many.
+
+    Listings only cover the hot tier: the archive keeps no secondary index.
+
+    Attributes:
+        hot (GameRepository): Storage for games being played
+        archive (GameRepository): Storage for finished games
+    """
+    def __init__(self, hot: GameRepository, archive: GameRepository):
+        """
+        Args:
+            hot (GameRepository): Storage for games being played
+            archive (GameRepository): Storage for finished games, e.g. a SQLiteArchiveRepository
+        """
+        self.hot = hot
+        self.archive = archive
+
+    def save_game(self, game_state: GameState) -> None:
+        """
+        Save a game state to the hot tier.
+
+        Raises:
+            SaveError: If saving the game state fails
+        """
+        self.hot.save_game(game_state)
+
+    def save_many(self, game_states: Iterable[GameState]) -> None:
+        """
+        Save several game states to the hot tier.
+
+        Raises:
+            SaveError: If saving the game states fails
+        """
+        self.hot.save_many(game_states)
+
+    def load_game(self, game_id: str) -> GameState:
+        """
+        Load a game from the hot tier, or from the archive if it was moved there.
+
+        Args:
+            game_id (str): The unique identifier of the game to load
+
+        Returns:
+            GameState: The loaded game state
+
+        Raises:
+            GameNotFoundError: If neither tier has the game
+            LoadError: If loading or decoding the game data fails
+        """
+        try:
+            return self.hot.load_game(game_id)
+        except GameNotFoundError:
+            logger.debug("Game %s not in the hot tier, trying the archive", game_id)
+            return self.archive.load_game(game_id)
+
+    def load_header(self, game_id: str) -> GameState:
+        """
+        Load a game's header from the hot tier, or the game from the archive.
+        """
+        try:
+            return self.hot.load_header(game_id)
+        except GameNotFoundError:
+            return self.archive.load_header(game_id)
+
+    def load_many(self, game_ids: Iterable[str]) -> Dict[str, GameState]:
+        """
+        Load several games, looking up the ones missing from the hot tier in the archive.
+
+        Returns:
+            Dict[str, GameState]: The loaded game states by ID, in request order;
+                IDs found in neither tier are left out
+        """
+        game_ids = list(dict.fromkeys(game_ids))
+        loaded = self.hot.load_many(game_ids)
+        missing = [game_id for game_id in game_ids if game_id not in loaded]
+        if missing:
+            loaded.update(self.archive.load_many(missing))
+        return {game_id: loaded[game_id] for game_id in game_ids if game_id in loaded}
+
+    def list_games(self, **filters) -> GamePage:
+        """
+        List games of the hot tier, see GameRepository.list_games.
+        """
+        return self.hot.list_games(**filters)
+
+    def delete_many(self, game_ids: Iterable[str], updated_before: Optional[datetime] = None) -> List[str]:
+        """
+        Delete games from both tiers.
+
+        Returns:
+            List[str]: IDs of the games deleted from either tier
+        """
+        game_ids = list(dict.fromkeys(game_ids))
+        deleted = set(self.hot.delete_many(game_ids, updated_before))
+        deleted.update(self.archive.delete_many(game_ids, updated_before))
+        return [game_id for game_id in game_ids if game_id in deleted]
+
+    def archive_finished(self, min_age: timedelta = timedelta(0), batch_size: int = TIER_BATCH_SIZE,
+                         now: Optional[datetime] = None) -> int:
+        """
+        Move finished games last saved more than min_age ago into the archive.
+
+        Each batch is written to the archive first and only then deleted
+        from the hot tier, guarded by the same cutoff: an interruption
+        leaves a game in both tiers (the hot copy wins) rather than in
+        neither, and a later run simply archives it again. Listings only
+        return headers, so each batch is loaded in bulk before archiving.
+
+        Args:
+            min_age (timedelta): Time since their last save after which finished games move
+            batch_size (int): Most games per batch
+            now (Optional[datetime]): Current time, datetime.now() when None
+
+        Returns:
+            int: Games moved out of the hot tier
+
+        Raises:
+            ValueError: If batch_size is not positive
+            DatabaseError: If a batch fails; earlier batches stay moved
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        cutoff = (now or datetime.now()) - min_age
+        moved = 0
+        for status in FINISHED_STATUSES:
+            cursor = None
+            while True:
+                page = self.hot.list_games(status=status, updated_before=cutoff, limit=batch_size, after=cursor)
+                if page.games:
+                    game_states = self.hot.load_many(game_state.game_id for game_state in page.games)
+                    self.archive.save_many(game_states.values())
+                    moved += len(self.hot.delete_many(game_states, cutoff))
+                cursor = page.next_cursor
+                if cursor is None:
+                    break
+        logger.info("Moved %d finished game(s) to the archive", moved)
+        return moved
@@ -0,0 +1,79 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable
+
+from src.core.models.game_state import GameState
+from src.services.exceptions.exceptions import GameNotFoundError
+
+
+class AsyncGameRepository(ABC):
+    """
+    Abstract base class for game state persistence from an asyncio event loop.
+    
+    Mirrors GameRepository with coroutine methods, so implementations must
+    never block the loop while they wait on storage.
+    """
+    @abstractmethod
+    async def save_game(self, game_state: GameState) -> None:
+        """
+        Save the current game state.
+        
+        Args:
+            game_state: Current state of the game to be persisted
+        """
+        pass
+    
+    @abstractmethod
+    async def load_game(self, game_id: str) -> GameState:
+        """
+        Load a previously saved game state.
+        
+        Args:
+            game_id: Unique identifier of the game to load
+
+        Returns:
+            GameState: The loaded game state
+
+        Raises:
+            GameNotFoundError: If no game exists with the given ID
+        """
+        pass
+    
+    async def save_many(self, game_states: Iterable[GameState]) -> None:
+        """
+        Save several game states at once, one by one unless overridden.
+        
+        Args:
+            game_states: Game states to be persisted
+        """
+        for game_state in game_states:
+            await self.save_game(game_state)
+    
+    async def load_many(self, game_ids: Iterable[str]) -> Dict[str, GameState]:
+        """
+        Load several game states at once, one by one unless overridden.
+        
+        Args:
+            game_ids: Unique identifiers of the games to load
+
+        Returns:
+            Dict[str, GameState]: Found game states by game ID, missing IDs are left out
+        """
+        game_states = {}
+        for game_id in game_ids:
+            try:
+                game_states[game_id] = await self.load_game(game_id)
+            except GameNotFoundError:
+                continue
+        return game_states
+    
+    async def close(self) -> None:
+        """
+        Release the resources held by the repository.
+        """
+        pass
+    
+    async def __aenter__(self) -> 'AsyncGameRepository':
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
@@ -0,0 +1,138 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import logging
+from typing import Callable, Dict, Iterable, TypeVar
+
+from src.core.models.game_state import GameState
+from src.repository.async_base import AsyncGameRepository
+from src.repository.sqlite import SQLiteGameRepository
+from src.services.exceptions.exceptions import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncSQLiteGameRepository(AsyncGameRepository):
+    """
+    Asyncio front end to SQLiteGameRepository.
+    
+    Every call runs on one dedicated executor thread, which owns the only
+    connection, so the event loop never waits on SQLite and calls reach the
+    database in the order they were awaited. Any number of coroutines can
+    share the repository; their calls queue on the executor.
+    
+    Attributes:
+        _executor (ThreadPoolExecutor): Single worker thread running the database calls
+        _repository (SQLiteGameRepository): Synchronous repository used by that thread
+    """
+    def __init__(self, db_name: str = "mastermind.db", **options):
+        """
+        Open the database on the executor thread.
+        
+        Args:
+            db_name (str): Name of the database file. Defaults to "mastermind.db"
+            **options: Passed on to SQLiteGameRepository (wal, write_behind, ...)
+            
+        Raises:
+            DatabaseError: If database initialization fails
+        """
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-async")
+        try:
+            self._repository = self._executor.submit(SQLiteGameRepository, db_name, **options).result()
+        except BaseException:
+            self._executor.shutdown()
+            raise
+        self._closed = False
+        logger.info("Async SQLite repository ready on %s", db_name)
+    
+    async def _run(self, function: Callable[..., T], *args) -> T:
+        """
+        Run a repository method on the executor thread and await its result.
+        
+        Raises:
+            DatabaseError: If the repository has been closed
+        """
+        if self._closed:
+            raise DatabaseError("Repository is closed")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(function, *args))
+    
+    async def save_game(self, game_state: GameState) -> None:
+        """
+        Save or update a game state in the database.
+        
+        Args:
+            game_state (GameState): The game state to save
+            
+        Raises:
+            SaveError: If saving the game state fails
+        """
+        await self._run(self._repository.save_game, game_state)
+    
+    async def load_game(self, game_id: str) -> GameState:
+        """
+        Load a game state from the database by its ID.
+        
+        Args:
+            game_id (str): The unique identifier of the game to load
+            
+        Returns:
+            GameState: The loaded game state
+            
+        Raises:
+            GameNotFoundError: If no game exists with the given ID
+            LoadError: If loading or decoding the game data fails
+        """
+        return await self._run(self._repository.load_game, game_id)
+    
+    async def save_many(self, game_states: Iterable[GameState]) -> None:
+        """
+        Save or update several game states in one transaction.
+        
+        Args:
+            game_states (Iterable[GameState]): The game states to save
+            
+        Raises:
+            SaveError: If saving fails
+        """
+        await self._run(self._repository.save_many, list(game_states))
+    
+    async def load_many(self, game_ids: Iterable[str]) -> Dict[str, GameState]:
+        """
+        Load several game states from the database by their IDs.
+        
+        Args:
+            game_ids (Iterable[str]): The unique identifiers of the games to load
+            
+        Returns:
+            Dict[str, GameState]: The loaded game states by ID, missing IDs are left out
+            
+        Raises:
+            LoadError: If loading or decoding the game data fails
+        """
+        return await self._run(self._repository.load_many, list(game_ids))
+    
+    async def flush(self) -> None:
+        """
+        Commit every save queued by write_behind, see SQLiteGameRepository.flush.
+        """
+        await self._run(self._repository.flush)
+    
+    async def close(self) -> None:
+        """
+        Flush and close the database, then stop the executor thread.
+        
+        Safe to call more than once.
+        
+        Raises:
+            SaveError: If queued saves could not be committed
+        """
+        if self._closed:
+            return
+        try:
+            await self._run(self._repository.close)
+        finally:
+            self._closed = True
+            self._executor.shutdown(wait=False)
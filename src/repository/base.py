@@ -1,8 +1,29 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
 
+from src.core.models.game_difficulty import Difficulty
 from src.core.models.game_state import GameState
 from src.core.models.game_status import GameStatus
+from src.services.exceptions.exceptions import GameNotFoundError
+
+
+# Keyset pagination position: (updated_at, game_id) of the last game of a page
+PageCursor = Tuple[datetime, str]
+
+
+@dataclass
+class GamePage:
+    """
+    One page of a game listing, newest first.
+    
+    Attributes:
+        games (List[GameState]): The games on this page
+        next_cursor (Optional[PageCursor]): Pass as `after` for the next page, None on the last page
+    """
+    games: List[GameState]
+    next_cursor: Optional[PageCursor] = None
 
 
 class GameRepository(ABC):
@@ -32,4 +53,143 @@ class GameRepository(ABC):
         """
         pass
     
-    
\ No newline at end of file
+    def save_many(self, game_states: Iterable[GameState]) -> None:
+        """
+        Save several game states at once.
+        
+        The default saves them one by one; backends override it to write the
+        whole batch in one operation.
+        
+        Args:
+            game_states: Game states to be persisted
+        """
+        for game_state in game_states:
+            self.save_game(game_state)
+    
+    def load_header(self, game_id: str) -> GameState:
+        """
+        Load a game for callers that only need its header fields.
+        
+        Backends can override it to return a LazyGameState, whose
+        guess history is only decoded if guess_records is read; the
+        default loads the full state.
+        
+        Args:
+            game_id: Unique identifier of the game to load
+            
+        Returns:
+            GameState: The game, possibly with its history not decoded yet
+            
+        Raises:
+            GameNotFoundError: If no game exists with the given ID
+        """
+        return self.load_game(game_id)
+    
+    def load_many(self, game_ids: Iterable[str]) -> Dict[str, GameState]:
+        """
+        Load several previously saved game states at once.
+        
+        The default loads them one by one; backends override it to fetch the
+        whole batch in one operation.
+        
+        Args:
+            game_ids: Unique identifiers of the games to load
+
+        Returns:
+            Dict[str, GameState]: Found game states by game ID, missing IDs are left out
+        """
+        game_states = {}
+        for game_id in game_ids:
+            try:
+                game_states[game_id] = self.load_game(game_id)
+            except GameNotFoundError:
+                continue
+        return game_states
+    
+    def list_games(self, *, status: Optional[GameStatus] = None, difficulty: Optional[Difficulty] = None,
+                   player_id: Optional[str] = None, updated_before: Optional[datetime] = None,
+                   updated_after: Optional[datetime] = None, limit: int = 100,
+                   after: Optional[PageCursor] = None) -> GamePage:
+        """
+        List games matching every given filter, most recently updated first.
+        
+        Pages are keyset-paginated on (updated_at, game_id): pass the
+        previous page's next_cursor as `after` to continue where it ended,
+        so no page ever skips or re-reads rows before it.
+        
+        Args:
+            status: Only games with this status
+            difficulty: Only games of this difficulty
+            player_id: Only games of this player
+            updated_before: Only games last updated before this time
+            updated_after: Only games last updated at or after this time
+            limit: Most games per page
+            after: Cursor of the previous page
+            
+        Returns:
+            GamePage: The games of the page and the cursor of the next one
+            
+        Raises:
+            NotImplementedError: If the backend cannot list games
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support listing games")
+    
+    def delete_many(self, game_ids: Iterable[str], updated_before: Optional[datetime] = None) -> List[str]:
+        """
+        Delete several games at once, e.g. to expire abandoned ones.
+        
+        With updated_before, a game saved again since it was picked (its
+        updated_at is no longer before the cutoff) is kept, so a sweep
+        never deletes a game a player just came back to.
+        
+        Args:
+            game_ids: Unique identifiers of the games to delete
+            updated_before: Only delete games last updated before this time
+            
+        Returns:
+            List[str]: IDs of the games actually deleted
+            
+        Raises:
+            NotImplementedError: If the backend cannot delete games
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support deleting games")
+
+
+def page_games(game_states: Iterable[GameState], *, status: Optional[GameStatus] = None,
+               difficulty: Optional[Difficulty] = None, player_id: Optional[str] = None,
+               updated_before: Optional[datetime] = None, updated_after: Optional[datetime] = None,
+               limit: int = 100, after: Optional[PageCursor] = None) -> GamePage:
+    """
+    Filter, sort and page game states in memory, as list_games would.
+    
+    Only header fields are read, so LazyGameState candidates stay lazy.
+    
+    For backends without an index to query, and for merging the pages of
+    several backends.
+    
+    Args:
+        game_states: Candidate games, in any order
+        (other arguments): See GameRepository.list_games
+        
+    Returns:
+        GamePage: The games of the page and the cursor of the next one
+        
+    Raises:
+        ValueError: If limit is not positive
+    """
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    matches = [
+        game_state for game_state in game_states
+        if (status is None or game_state.status == status)
+        and (difficulty is None or game_state.config.difficulty == difficulty)
+        and (player_id is None or game_state.player_id == player_id)
+        and (updated_before is None or game_state.updated_at < updated_before)
+        and (updated_after is None or game_state.updated_at >= updated_after)
+        and (after is None or (game_state.updated_at, game_state.game_id) < after)
+    ]
+    matches.sort(key=lambda game_state: (game_state.updated_at, game_state.game_id), reverse=True)
+    next_cursor = None
+    if len(matches) > limit:
+        next_cursor = (matches[limit - 1].updated_at, matches[limit - 1].game_id)
+    return GamePage(matches[:limit], next_cursor)
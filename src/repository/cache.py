@@ -0,0 +1,363 @@
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import datetime
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.core.models.game_state import GameState
+from src.repository.base import GamePage, GameRepository
+
+logger = logging.getLogger(__name__)
+
+# Rough footprint of a hydrated GameState (object, id, timestamps, config
+# reference) and of one guess record per position, used for the memory cap
+STATE_BASE_BYTES = 400
+RECORD_BASE_BYTES = 200
+RECORD_BYTES_PER_POSITION = 32
+
+
+def estimate_state_size(game_state: GameState) -> int:
+    """
+    Approximate memory held by a hydrated game state, in bytes.
+    
+    Args:
+        game_state (GameState): The state to measure
+        
+    Returns:
+        int: Estimated size, linear in the number of guess records
+    """
+    record_bytes = RECORD_BASE_BYTES + RECORD_BYTES_PER_POSITION * game_state.config.pattern_length
+    return STATE_BASE_BYTES + record_bytes * len(game_state.guess_records)
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters of a CachingGameRepository since it was created.
+    
+    Attributes:
+        hits (int): Loads served from the cache
+        misses (int): Loads that went to the wrapped repository
+        evictions (int): Entries dropped for the entry limit, memory cap or TTL
+        entries (int): Games currently cached
+        size_bytes (int): Estimated memory of the cached games
+    """
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+    
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CachingGameRepository(GameRepository):
+    """
+    Read-through, write-through cache of hydrated game states in front of any repository.
+    
+    A cache hit returns without touching storage or rebuilding the state
+    from its stored form. Entries are evicted least recently used first
+    once there are more than max_entries or their estimated size passes
+    max_bytes, and are dropped ttl seconds after they were cached. Saves go
+    to the wrapped repository first and are cached only once it accepted
+    them, so the cache never holds a state storage does not have. Writes
+    that bypass this repository (another process, another repository
+    instance) are not seen until the entry expires or is invalidated.
+    
+    A miss loads outside the lock so other games are served meanwhile;
+    every write to a game (save, invalidate, delete) bumps its generation,
+    and a load only fills the cache if no write happened while it ran, so
+    an older loaded state never overwrites a newer save.
+    
+    States are copied on the way in and out: callers such as Game append
+    to the guess history they get, which must not change the cached entry.
+    The repository is safe to share between threads.
+    
+    Attributes:
+        repository (GameRepository): The wrapped storage
+        max_entries (int): Most games kept at once
+        max_bytes (Optional[int]): Cap on the estimated size of the cached games
+        ttl (Optional[float]): Seconds an entry stays valid, forever when None
+    """
+    def __init__(self, repository: GameRepository, max_entries: int = 1024,
+                 max_bytes: Optional[int] = None, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Wrap a repository with a cache.
+        
+        Args:
+            repository (GameRepository): The storage to cache
+            max_entries (int): Most games kept at once
+            max_bytes (Optional[int]): Cap on the estimated cache size, unbounded when None
+            ttl (Optional[float]): Seconds an entry stays valid, forever when None
+            clock (Callable[[], float]): Monotonic time source, for tests
+            
+        Raises:
+            ValueError: If a limit is not positive
+        """
+        if max_entries < 1 or (max_bytes is not None and max_bytes < 1) or (ttl is not None and ttl <= 0):
+            raise ValueError("Cache limits must be positive")
+        self.repository = repository
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        # game_id -> (state, estimated size, expiry time), least recently used first
+        self._entries: "OrderedDict[str, Tuple[GameState, int, float]]" = OrderedDict()
+        self._size_bytes = 0
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+        # generation and number of loads in flight, only for games being loaded
+        self._generations: Dict[str, int] = {}
+        self._loading: Dict[str, int] = {}
+    
+    @property
+    def stats(self) -> CacheStats:
+        """
+        Snapshot of the hit, miss and eviction counters and current occupancy.
+        """
+        with self._lock:
+            return replace(self._stats, entries=len(self._entries), size_bytes=self._size_bytes)
+    
+    def save_game(self, game_state: GameState) -> None:
+        """
+        Save the state to the wrapped repository, then cache it.
+        
+        Args:
+            game_state (GameState): The game state to save
+            
+        Raises:
+            Whatever the wrapped repository raises; the cached entry is dropped
+        """
+        try:
+            self.repository.save_game(game_state)
+        except Exception:
+            self.invalidate(game_state.game_id)
+            raise
+        with self._lock:
+            self._bump(game_state.game_id)
+            self._put(game_state.copy())
+    
+    def save_many(self, game_states: Iterable[GameState]) -> None:
+        """
+        Save the states to the wrapped repository in one call, then cache them.
+        
+        Args:
+            game_states (Iterable[GameState]): The game states to save
+        """
+        game_states = list(game_states)
+        try:
+            self.repository.save_many(game_states)
+        except Exception:
+            for game_state in game_states:
+                self.invalidate(game_state.game_id)
+            raise
+        with self._lock:
+            for game_state in game_states:
+                self._bump(game_state.game_id)
+                self._put(game_state.copy())
+    
+    def load_game(self, game_id: str) -> GameState:
+        """
+        Load a game state from the cache, or from the wrapped repository on a miss.
+        
+        Args:
+            game_id (str): The unique identifier of the game to load
+            
+        Returns:
+            GameState: A copy of the game state
+            
+        Raises:
+            GameNotFoundError: If no game exists with the given ID
+        """
+        with self._lock:
+            cached = self._get(game_id)
+            if cached is None:
+                generations = self._begin_load([game_id])
+        if cached is not None:
+            return cached.copy()
+        
+        game_state = None
+        try:
+            game_state = self.repository.load_game(game_id)
+        finally:
+            with self._lock:
+                self._end_load(generations, [game_state] if game_state is not None else [])
+        return game_state
+    
+    def load_header(self, game_id: str) -> GameState:
+        """
+        Load a game for its header: a copy of the cached state on a hit,
+        otherwise the wrapped repository's header, which is not cached.
+        
+        Args:
+            game_id (str): The unique identifier of the game to load
+            
+        Returns:
+            GameState: The game, possibly with its history not decoded yet
+        """
+        with self._lock:
+            cached = self._get(game_id)
+        if cached is not None:
+            return cached.copy()
+        return self.repository.load_header(game_id)
+    
+    def load_many(self, game_ids: Iterable[str]) -> Dict[str, GameState]:
+        """
+        Load several game states, fetching all misses in one wrapped call.
+        
+        Args:
+            game_ids (Iterable[str]): The unique identifiers of the games to load
+            
+        Returns:
+            Dict[str, GameState]: Copies of the found states by ID, in request order;
+                missing IDs are left out
+        """
+        game_ids = list(dict.fromkeys(game_ids))
+        cached: Dict[str, GameState] = {}
+        with self._lock:
+            for game_id in game_ids:
+                game_state = self._get(game_id)
+                if game_state is not None:
+                    cached[game_id] = game_state
+            missing: List[str] = [game_id for game_id in game_ids if game_id not in cached]
+            generations = self._begin_load(missing)
+        
+        loaded: Dict[str, GameState] = {}
+        try:
+            if missing:
+                loaded = self.repository.load_many(missing)
+        finally:
+            with self._lock:
+                self._end_load(generations, loaded.values())
+        
+        game_states = {}
+        for game_id in game_ids:
+            if game_id in cached:
+                game_states[game_id] = cached[game_id].copy()
+            elif game_id in loaded:
+                game_states[game_id] = loaded[game_id]
+        return game_states
+    
+    def list_games(self, **filters) -> GamePage:
+        """
+        List games through the wrapped repository, see GameRepository.list_games.
+        
+        Listings are not cached and do not fill the cache: a filtered scan
+        would otherwise evict the games that are actually being played.
+        
+        Returns:
+            GamePage: The games of the page and the cursor of the next one
+        """
+        return self.repository.list_games(**filters)
+    
+    def delete_many(self, game_ids: Iterable[str], updated_before: Optional[datetime] = None) -> List[str]:
+        """
+        Delete games from the wrapped repository and drop them from the cache.
+        
+        Args:
+            game_ids (Iterable[str]): The unique identifiers of the games to delete
+            updated_before (Optional[datetime]): Only delete games last updated before this time
+            
+        Returns:
+            List[str]: IDs of the games actually deleted
+        """
+        deleted = self.repository.delete_many(game_ids, updated_before)
+        with self._lock:
+            for game_id in deleted:
+                self._bump(game_id)
+                self._remove(game_id)
+        return deleted
+    
+    def invalidate(self, game_id: str) -> None:
+        """
+        Drop a game from the cache, e.g. after it was changed behind the cache's back.
+        
+        Args:
+            game_id (str): The game to forget
+        """
+        with self._lock:
+            self._bump(game_id)
+            self._remove(game_id)
+    
+    def clear(self) -> None:
+        """
+        Drop every cached game; the counters are kept.
+        """
+        with self._lock:
+            for game_id in self._generations:
+                self._generations[game_id] += 1
+            self._entries.clear()
+            self._size_bytes = 0
+    
+    def _begin_load(self, game_ids: List[str]) -> Dict[str, int]:
+        """
+        Register loads of missed games, returning the generation each started at.
+        """
+        for game_id in game_ids:
+            self._loading[game_id] = self._loading.get(game_id, 0) + 1
+            self._generations.setdefault(game_id, 0)
+        return {game_id: self._generations[game_id] for game_id in game_ids}
+    
+    def _end_load(self, generations: Dict[str, int], game_states: Iterable[GameState]) -> None:
+        """
+        Cache the loaded states no write overtook, and unregister the loads.
+        """
+        for game_state in game_states:
+            if self._generations.get(game_state.game_id) == generations.get(game_state.game_id):
+                self._put(game_state.copy())
+        for game_id in generations:
+            self._loading[game_id] -= 1
+            if not self._loading[game_id]:
+                del self._loading[game_id]
+                del self._generations[game_id]
+    
+    def _bump(self, game_id: str) -> None:
+        """
+        Record a write to a game, so loads of it still in flight are not cached.
+        """
+        if game_id in self._generations:
+            self._generations[game_id] += 1
+    
+    def _get(self, game_id: str) -> Optional[GameState]:
+        """
+        Look up a live entry and mark it most recently used, counting the hit or miss.
+        """
+        entry = self._entries.get(game_id)
+        if entry is not None and entry[2] <= self._clock():
+            self._remove(game_id)
+            self._stats.evictions += 1
+            entry = None
+        if entry is None:
+            self._stats.misses += 1
+            return None
+        self._entries.move_to_end(game_id)
+        self._stats.hits += 1
+        return entry[0]
+    
+    def _put(self, game_state: GameState) -> None:
+        """
+        Cache a state as most recently used, then evict down to the limits.
+        """
+        self._remove(game_state.game_id)
+        size = estimate_state_size(game_state)
+        expires_at = self._clock() + self.ttl if self.ttl is not None else float("inf")
+        self._entries[game_state.game_id] = (game_state, size, expires_at)
+        self._size_bytes += size
+        
+        while len(self._entries) > self.max_entries or \
+                (self.max_bytes is not None and self._size_bytes > self.max_bytes and self._entries):
+            game_id, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._size_bytes -= evicted_size
+            self._stats.evictions += 1
+            logger.debug("Evicted game %s from the cache", game_id)
+    
+    def _remove(self, game_id: str) -> None:
+        entry = self._entries.pop(game_id, None)
+        if entry is not None:
+            self._size_bytes -= entry[1]
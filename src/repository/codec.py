@@ -0,0 +1,226 @@
+"""
+Compact, versioned binary encoding of GameState.
+
+Layout of version 3 (little endian):
+    header          version B, status B, difficulty B (high nibble: scoring
+                    kernel, 0 for the default of the rules), number width B,
+                    created_at q, updated_at q (microseconds since 1970-01-01),
+                    attempts I, record count I, game ID length H,
+                    player ID length H (0xFFFF for no player)
+    custom rules    pattern_length B, min_number Q, max_number Q, max_attempts I
+                    (only for Difficulty.CUSTOM)
+    game ID         UTF-8
+    player ID       UTF-8
+    code pattern    pattern_length numbers
+    guesses         record count * pattern_length numbers
+    feedback        one byte per record, numbers_correct << 4 | positions_correct
+
+Numbers take the smallest width (1, 2, 4 or 8 bytes) that holds max_number,
+so a Normal game stores a whole guess in 4 bytes. Timestamps keep their
+microseconds, unlike the text format, and are stored as given (naive).
+Version 2 has no scoring kernel and version 1 neither a player ID; both
+are still decoded.
+"""
+from datetime import datetime, timedelta
+import struct
+from typing import List, Optional, Tuple, Union
+
+from src.core.config.game_config import GameConfig
+from src.core.models.feedback import Feedback
+from src.core.models.game_difficulty import Difficulty
+from src.core.models.game_state import GameState, GuessRecords, LazyGameState
+from src.core.models.game_status import GameStatus
+from src.core.models.guess import Guess
+from src.core.models.packed_code import as_numbers
+from src.core.models.scoring_kernel import ScoringKernel
+
+CODEC_VERSION = 3
+
+HEADER = struct.Struct("<BBBBqqIIHH")
+HEADER_V1 = struct.Struct("<BBBBqqIIH")
+NO_PLAYER = 0xFFFF
+CUSTOM_RULES = struct.Struct("<BQQI")
+
+# Stored codes, append only: a code must keep its meaning in existing data
+STATUS_CODES: Tuple[GameStatus, ...] = (GameStatus.IN_PROGRESS, GameStatus.WON, GameStatus.LOST)
+DIFFICULTY_CODES: Tuple[Difficulty, ...] = (Difficulty.NORMAL, Difficulty.HARD, Difficulty.CUSTOM)
+KERNEL_CODES: Tuple[Optional[ScoringKernel], ...] = (None, ScoringKernel.STANDARD, ScoringKernel.BITMASK)
+# struct format per number width in bytes
+NUMBER_FORMATS = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _number_width(max_number: int) -> int:
+    for width in NUMBER_FORMATS:
+        if max_number < 1 << (8 * width):
+            return width
+    raise ValueError(f"max_number {max_number} does not fit in 8 bytes")
+
+
+def _pack_numbers(numbers: List[int], width: int) -> bytes:
+    if width == 1:
+        return bytes(numbers)
+    return struct.pack(f"<{len(numbers)}{NUMBER_FORMATS[width]}", *numbers)
+
+
+def _unpack_numbers(data: Union[bytes, memoryview], offset: int, count: int, width: int) -> List[int]:
+    if width == 1:
+        return list(data[offset:offset + count])
+    return list(struct.unpack_from(f"<{count}{NUMBER_FORMATS[width]}", data, offset))
+
+
+def encode_state(game_state: GameState) -> bytes:
+    """
+    Encode a game state in the binary format.
+
+    Args:
+        game_state (GameState): The state to encode
+
+    Returns:
+        bytes: The encoded state
+
+    Raises:
+        ValueError: If the state holds values the format cannot represent
+    """
+    config = game_state.config
+    width = _number_width(config.max_number)
+    game_id = game_state.game_id.encode("utf-8")
+    player_id = game_state.player_id.encode("utf-8") if game_state.player_id is not None else b""
+    if len(player_id) >= NO_PLAYER:
+        raise ValueError(f"Player ID of game {game_state.game_id} is too long")
+    records = game_state.guess_records
+    kernel = config.scoring_kernel if config.scoring_kernel != config.default_scoring_kernel() else None
+    try:
+        parts = [HEADER.pack(
+            CODEC_VERSION,
+            STATUS_CODES.index(game_state.status),
+            KERNEL_CODES.index(kernel) << 4 | DIFFICULTY_CODES.index(config.difficulty),
+            width,
+            (game_state.created_at - EPOCH) // _MICROSECOND,
+            (game_state.updated_at - EPOCH) // _MICROSECOND,
+            game_state.attempts,
+            len(records),
+            len(game_id),
+            len(player_id) if game_state.player_id is not None else NO_PLAYER,
+        )]
+        if config.difficulty == Difficulty.CUSTOM:
+            parts.append(CUSTOM_RULES.pack(config.pattern_length, config.min_number, config.max_number,
+                                           config.max_attempts))
+        parts.append(game_id)
+        parts.append(player_id)
+        parts.append(_pack_numbers(as_numbers(game_state.code_pattern), width))
+        parts.append(_pack_numbers([number for guess, _ in records for number in guess.get_numbers()], width))
+        parts.append(bytes(feedback.numbers_correct << 4 | feedback.positions_correct for _, feedback in records))
+    except (struct.error, TypeError, AttributeError) as e:
+        raise ValueError(f"Cannot encode game state {game_state.game_id}: {str(e)}")
+    return b"".join(parts)
+
+
+def _decode_header(data: Union[bytes, memoryview]) -> Tuple[dict, int, int, int]:
+    """
+    Decode everything but the guess history, checking the data is complete.
+
+    Returns:
+        Tuple[dict, int, int, int]: GameState fields without guess_records,
+            then offset of the guesses, record count and number width
+    """
+    try:
+        version = data[0]
+        if version in (CODEC_VERSION, 2):
+            (_, status, difficulty, width, created_at, updated_at,
+             attempts, record_count, id_length, player_length) = HEADER.unpack_from(data, 0)
+            offset = HEADER.size
+        elif version == 1:
+            (_, status, difficulty, width, created_at, updated_at,
+             attempts, record_count, id_length) = HEADER_V1.unpack_from(data, 0)
+            player_length = NO_PLAYER
+            offset = HEADER_V1.size
+        else:
+            raise ValueError(f"Unknown game state codec version {version}")
+
+        status = STATUS_CODES[status]
+        kernel = KERNEL_CODES[difficulty >> 4]
+        difficulty = DIFFICULTY_CODES[difficulty & 0x0F]
+        if difficulty == Difficulty.CUSTOM:
+            pattern_length, min_number, max_number, max_attempts = CUSTOM_RULES.unpack_from(data, offset)
+            offset += CUSTOM_RULES.size
+            config = GameConfig(difficulty, kernel, pattern_length=pattern_length, min_number=min_number,
+                                max_number=max_number, max_attempts=max_attempts)
+        else:
+            config = GameConfig(difficulty, kernel)
+
+        game_id = str(data[offset:offset + id_length], "utf-8")
+        offset += id_length
+        player_id = None
+        if player_length != NO_PLAYER:
+            player_id = str(data[offset:offset + player_length], "utf-8")
+            offset += player_length
+        length = config.pattern_length
+        code_pattern = _unpack_numbers(data, offset, length, width)
+        offset += length * width
+        # code, guesses and one feedback byte per record
+        if len(data) < offset + record_count * (length * width + 1) or len(code_pattern) != length:
+            raise ValueError("Truncated game state data")
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"Corrupt game state data: {str(e)}")
+
+    header = {
+        "game_id": game_id,
+        "code_pattern": code_pattern,
+        "status": status,
+        "attempts": attempts,
+        "created_at": EPOCH + created_at * _MICROSECOND,
+        "updated_at": EPOCH + updated_at * _MICROSECOND,
+        "config": config,
+        "player_id": player_id,
+    }
+    return header, offset, record_count, width
+
+
+def _decode_history(data: Union[bytes, memoryview], offset: int, record_count: int, length: int,
+                    width: int) -> GuessRecords:
+    numbers = _unpack_numbers(data, offset, record_count * length, width)
+    feedback = data[offset + record_count * length * width:][:record_count]
+    return [
+        (Guess(numbers[index * length:(index + 1) * length]), Feedback(packed >> 4, packed & 0x0F))
+        for index, packed in enumerate(feedback)
+    ]
+
+
+def decode_state(data: Union[bytes, memoryview]) -> GameState:
+    """
+    Decode a game state encoded by encode_state.
+
+    Args:
+        data: The encoded state; a memoryview is read without copying it
+
+    Returns:
+        GameState: The decoded state
+
+    Raises:
+        ValueError: If the data is truncated, corrupt or of an unknown version
+    """
+    header, offset, record_count, width = _decode_header(data)
+    guess_records = _decode_history(data, offset, record_count, header["config"].pattern_length, width)
+    return GameState(guess_records=guess_records, **header)
+
+
+def decode_header(data: Union[bytes, memoryview]) -> LazyGameState:
+    """
+    Decode a game state but its guess history, which is decoded on first access.
+
+    Args:
+        data: The encoded state; a memoryview is copied, so the view may be released
+
+    Returns:
+        LazyGameState: The decoded header
+
+    Raises:
+        ValueError: If the data is truncated, corrupt or of an unknown version
+    """
+    header, offset, record_count, width = _decode_header(data)
+    length = header["config"].pattern_length
+    history = bytes(data[offset:offset + record_count * (length * width + 1)])
+    return LazyGameState(lambda: _decode_history(history, 0, record_count, length, width), **header)
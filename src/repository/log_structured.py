@@ -0,0 +1,599 @@
+from datetime import datetime
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import zlib
+
+from src.core.models.game_difficulty import Difficulty
+from src.core.models.game_state import GameState
+from src.core.models.game_status import GameStatus
+from src.repository.base import GamePage, GameRepository, PageCursor, page_games
+from src.repository.codec import decode_header, decode_state, encode_state
+from src.services.exceptions.exceptions import DatabaseError, GameNotFoundError, LoadError, SaveError
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_FILE_PATTERN = re.compile(r"^segment-(\d{8})\.log$")
+# crc32 of key + payload, key length, payload length (0 for a tombstone)
+RECORD_HEADER = struct.Struct("<IHI")
+# suffix of a compacted copy of a segment until it replaces the segment
+COMPACTED_SUFFIX = ".compact"
+# Reads past the map of a growing segment use a plain file read until the
+# segment has grown this far past the map, then it is remapped
+REMAP_STEP = 1 << 20
+
+
+def segment_file_name(number: int) -> str:
+    return f"segment-{number:08d}.log"
+
+
+def encode_record(game_state: GameState) -> bytes:
+    """
+    Serialize a game state into one self-describing log record.
+
+    Args:
+        game_state (GameState): The state to serialize
+
+    Returns:
+        bytes: Header, UTF-8 game ID and the binary encoding of the state (see codec)
+
+    Raises:
+        SaveError: If the state cannot be serialized
+    """
+    try:
+        key = game_state.game_id.encode("utf-8")
+        payload = encode_state(game_state)
+    except ValueError as e:
+        raise SaveError(f"Invalid game state data: {str(e)}")
+    return RECORD_HEADER.pack(zlib.crc32(payload, zlib.crc32(key)), len(key), len(payload)) + key + payload
+
+
+def encode_tombstone(game_id: str) -> bytes:
+    """
+    Serialize the record marking a game as deleted: its key without a payload.
+    """
+    key = game_id.encode("utf-8")
+    return RECORD_HEADER.pack(zlib.crc32(key), len(key), 0) + key
+
+
+def _is_tombstone(record: bytes) -> bool:
+    return RECORD_HEADER.unpack_from(record)[2] == 0
+
+
+class _Segment:
+    """
+    One append-only segment file and a read-only map of it.
+
+    The map is replaced, never closed, when the file has grown past it:
+    readers may still hold views of the old one, which is released once
+    they are done with it.
+    """
+    def __init__(self, number: int, path: str, size: int):
+        self.number = number
+        self.path = path
+        self.size = size
+        self.live_bytes = 0
+        self._map: Optional[mmap.mmap] = None
+
+    def view(self, offset: int, length: int) -> memoryview:
+        """
+        A view of the bytes [offset, offset + length) of the file.
+
+        Within the map the view slices it without copying. A record
+        appended since the map was made is read from the file instead,
+        until the file has grown REMAP_STEP past the map, so reading each
+        new record of the active segment does not remap the whole segment.
+        """
+        end = offset + length
+        if self._map is not None and end <= len(self._map):
+            return memoryview(self._map)[offset:end]
+        if self._map is not None and end - len(self._map) < REMAP_STEP:
+            with open(self.path, "rb") as file:
+                file.seek(offset)
+                return memoryview(file.read(length))
+        with open(self.path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._map)[offset:end]
+
+    def release(self) -> None:
+        self._map = None
+
+
+class LogStructuredGameRepository(GameRepository):
+    """
+    Log-structured game repository: every save appends a record to a segment file.
+
+    A save never rewrites data in place. It appends one record (header,
+    game ID, binary-encoded state) to the active segment and points the in-memory
+    index game_id -> (segment, offset, length) at it; a new segment is
+    started once the active one reaches segment_size. Loads read the record
+    through a read-only mmap of its segment, slicing it without copying
+    until the payload is decoded. delete_many appends a tombstone (the
+    game ID without a payload) per game. There is no secondary index:
+    list_games decodes the header of every game.
+
+    Records superseded by a newer save of the same game are garbage. A
+    background thread (or compact()) rewrites sealed segments whose live
+    share fell below compaction_ratio: their live records and tombstones
+    are copied, as raw bytes and without holding the lock, into a new file
+    that then replaces the segment under the same number, so replay order
+    is kept. Tombstones are only dropped from the oldest segment, once no
+    older record of their game can be left.
+
+    The index only lives in memory. Opening a directory replays every
+    segment in order, later records winning; a torn record at the end of
+    the last segment (a crash mid-append) is cut off, so the log recovers
+    to the last complete save. Without fsync, saves survive a process
+    crash but not necessarily a power loss.
+
+    Attributes:
+        directory (str): Directory holding the segment files
+        segment_size (int): Bytes after which the active segment is sealed
+        compaction_ratio (float): Live share below which a sealed segment is compacted
+        fsync (bool): Whether every append is synced to disk
+    """
+    def __init__(self, directory: str = "mastermind_log", segment_size: int = 16 << 20,
+                 compaction_ratio: float = 0.5, compact_interval: Optional[float] = 1.0,
+                 fsync: bool = False):
+        """
+        Open the log, rebuilding the index from its segments.
+
+        Args:
+            directory (str): Directory holding the segment files
+            segment_size (int): Bytes after which the active segment is sealed
+            compaction_ratio (float): Live share below which a sealed segment is compacted
+            compact_interval (Optional[float]): Seconds between background compaction
+                passes, no background thread when None
+            fsync (bool): Sync every append to disk
+
+        Raises:
+            ValueError: If a setting is out of range
+            DatabaseError: If the segments cannot be read
+        """
+        if segment_size < 1 or not 0 < compaction_ratio <= 1:
+            raise ValueError("segment_size must be positive and compaction_ratio in (0, 1]")
+        self.directory = directory
+        self.segment_size = segment_size
+        self.compaction_ratio = compaction_ratio
+        self.fsync = fsync
+        self._index: Dict[str, Tuple[_Segment, int, int]] = {}
+        # deleted games whose older records may remain in earlier segments
+        self._tombstones: Dict[str, Tuple[_Segment, int, int]] = {}
+        self._segments: Dict[int, _Segment] = {}
+        self._active: Optional[_Segment] = None
+        self._file = None
+        self._lock = threading.Lock()
+        self._compaction_lock = threading.Lock()
+        self._closed = False
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+            self._recover()
+        except OSError as e:
+            raise DatabaseError(f"Cannot open log in {directory}: {str(e)}")
+
+        self._stop = threading.Event()
+        self._compactor = None
+        if compact_interval is not None:
+            self._compactor = threading.Thread(target=self._compact_loop, args=(compact_interval,),
+                                               name="log-compaction", daemon=True)
+            self._compactor.start()
+
+    def __enter__(self) -> 'LogStructuredGameRepository':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _recover(self) -> None:
+        """
+        Rebuild the index by replaying every segment, cutting off a torn tail.
+        """
+        names = os.listdir(self.directory)
+        for name in names:
+            if name.endswith(COMPACTED_SUFFIX):
+                # a compaction interrupted before its swap, the segment is intact
+                os.remove(os.path.join(self.directory, name))
+        numbers = sorted(int(match.group(1)) for match in map(SEGMENT_FILE_PATTERN.match, names) if match)
+        for position, number in enumerate(numbers):
+            path = os.path.join(self.directory, segment_file_name(number))
+            segment = _Segment(number, path, os.path.getsize(path))
+            self._segments[number] = segment
+            end = self._replay(segment)
+            if end < segment.size:
+                if position == len(numbers) - 1:
+                    logger.warning("Cutting torn record off %s at byte %d of %d", path, end, segment.size)
+                    os.truncate(path, end)
+                    segment.size = end
+                    segment.release()
+                else:
+                    logger.error("Corrupt record in %s at byte %d, rest of the segment skipped", path, end)
+
+        if numbers:
+            self._open_active(self._segments[numbers[-1]])
+        else:
+            self._roll()
+        logger.info("Recovered %d game(s) from %d segment(s) in %s", len(self._index), len(numbers), self.directory)
+
+    def _replay(self, segment: _Segment) -> int:
+        """
+        Index every intact record of a segment.
+
+        Returns:
+            int: Offset just past the last intact record
+        """
+        if segment.size == 0:
+            return 0
+        offset = 0
+        with segment.view(0, segment.size) as view:
+            while offset + RECORD_HEADER.size <= segment.size:
+                checksum, key_length, payload_length = RECORD_HEADER.unpack_from(view, offset)
+                start = offset + RECORD_HEADER.size
+                end = start + key_length + payload_length
+                if end > segment.size:
+                    break
+                key = view[start:start + key_length]
+                if zlib.crc32(view[start + key_length:end], zlib.crc32(key)) != checksum:
+                    break
+                self._index_record(str(key, "utf-8"), segment, offset, end - offset, payload_length == 0)
+                offset = end
+        return offset
+
+    def _index_record(self, game_id: str, segment: _Segment, offset: int, length: int,
+                      tombstone: bool = False) -> None:
+        previous = self._index.pop(game_id, None) or self._tombstones.pop(game_id, None)
+        if previous is not None:
+            previous[0].live_bytes -= previous[2]
+        (self._tombstones if tombstone else self._index)[game_id] = (segment, offset, length)
+        segment.live_bytes += length
+
+    def _open_active(self, segment: _Segment) -> None:
+        if self._file is not None:
+            self._file.close()
+        self._active = segment
+        self._file = open(segment.path, "ab", buffering=0)
+
+    def _roll(self) -> None:
+        """
+        Seal the active segment and start a new, empty one.
+        """
+        number = max(self._segments, default=0) + 1
+        segment = _Segment(number, os.path.join(self.directory, segment_file_name(number)), 0)
+        self._segments[number] = segment
+        self._open_active(segment)
+        logger.debug("Started segment %s", segment.path)
+
+    def _append(self, records: List[Tuple[str, bytes]]) -> None:
+        """
+        Append records to the active segment in one write and index them.
+
+        Caller holds the lock.
+        """
+        if self._closed:
+            raise DatabaseError("Repository is closed")
+        if self._active.size >= self.segment_size:
+            self._roll()
+        segment = self._active
+        data = memoryview(b"".join(record for _, record in records))
+        try:
+            written = 0
+            while written < len(data):
+                written += self._file.write(data[written:])
+            if self.fsync:
+                os.fsync(self._file.fileno())
+        except OSError:
+            # cut a partial append off again, replay would stop at it and
+            # drop every record appended after it
+            os.ftruncate(self._file.fileno(), segment.size)
+            raise
+        offset = segment.size
+        for game_id, record in records:
+            self._index_record(game_id, segment, offset, len(record), _is_tombstone(record))
+            offset += len(record)
+        segment.size = offset
+
+    def save_game(self, game_state: GameState) -> None:
+        """
+        Append the game state to the log.
+
+        Args:
+            game_state (GameState): The game state to save
+
+        Raises:
+            SaveError: If the state cannot be serialized or written
+        """
+        self.save_many([game_state])
+
+    def save_many(self, game_states: Iterable[GameState]) -> None:
+        """
+        Append several game states to the log with a single write.
+
+        Args:
+            game_states (Iterable[GameState]): The game states to save
+
+        Raises:
+            SaveError: If a state cannot be serialized or the write fails
+        """
+        records = [(game_state.game_id, encode_record(game_state)) for game_state in game_states]
+        if not records:
+            return
+        try:
+            with self._lock:
+                self._append(records)
+        except OSError as e:
+            logger.error("Failed to append %d game state(s): %s", len(records), str(e))
+            raise SaveError(f"Cannot save the game: {str(e)}")
+        logger.debug("%d game state(s) appended to the log", len(records))
+
+    def load_game(self, game_id: str) -> GameState:
+        """
+        Read the latest record of a game through the segment's mmap.
+
+        Args:
+            game_id (str): The unique identifier of the game to load
+
+        Returns:
+            GameState: The loaded game state
+
+        Raises:
+            GameNotFoundError: If no game exists with the given ID
+            LoadError: If the record cannot be read or decoded
+        """
+        return self._load(game_id, decode_state)
+
+    def load_header(self, game_id: str) -> GameState:
+        """
+        Read the latest record of a game, leaving its history undecoded until first access.
+
+        Args:
+            game_id (str): The unique identifier of the game to load
+
+        Returns:
+            GameState: A LazyGameState of the game
+
+        Raises:
+            GameNotFoundError: If no game exists with the given ID
+            LoadError: If the record cannot be read or decoded
+        """
+        return self._load(game_id, decode_header)
+
+    def _load(self, game_id: str, decode: Callable[[memoryview], GameState]) -> GameState:
+        with self._lock:
+            location = self._index.get(game_id)
+            if location is None:
+                logger.warning("Game not found - ID: %s", game_id)
+                raise GameNotFoundError(game_id)
+            view = self._view(location)
+        # decoded outside the lock; the map stays valid while referenced
+        return self._decode(game_id, view, decode)
+
+    def _view(self, location: Tuple[_Segment, int, int]) -> memoryview:
+        segment, offset, length = location
+        try:
+            return segment.view(offset, length)
+        except (OSError, ValueError) as e:
+            logger.error("Failed to map %s: %s", segment.path, str(e))
+            raise LoadError()
+
+    @staticmethod
+    def _decode(game_id: str, record: memoryview, decode: Callable[[memoryview], GameState]) -> GameState:
+        start = RECORD_HEADER.size + len(game_id.encode("utf-8"))
+        try:
+            with record:
+                return decode(record[start:])
+        except ValueError as e:
+            logger.error("Failed to decode game %s: %s", game_id, str(e))
+            raise LoadError()
+
+    def load_many(self, game_ids: Iterable[str]) -> Dict[str, GameState]:
+        """
+        Load several game states, missing IDs are left out.
+
+        Args:
+            game_ids (Iterable[str]): The unique identifiers of the games to load
+
+        Returns:
+            Dict[str, GameState]: The loaded game states by ID
+        """
+        game_states = {}
+        for game_id in game_ids:
+            try:
+                game_states[game_id] = self.load_game(game_id)
+            except GameNotFoundError:
+                continue
+        return game_states
+
+    def list_games(self, *, status: Optional[GameStatus] = None, difficulty: Optional[Difficulty] = None,
+                   player_id: Optional[str] = None, updated_before: Optional[datetime] = None,
+                   updated_after: Optional[datetime] = None, limit: int = 100,
+                   after: Optional[PageCursor] = None) -> GamePage:
+        """
+        List games matching every given filter, most recently updated first.
+
+        There is no index: the header of every game in the log is decoded
+        and filtered; the listed games decode their history on first access.
+
+        Returns:
+            GamePage: The games of the page and the cursor of the next one
+        """
+        with self._lock:
+            views = [(game_id, self._view(location)) for game_id, location in self._index.items()]
+        game_states = (self._decode(game_id, view, decode_header) for game_id, view in views)
+        return page_games(game_states, status=status, difficulty=difficulty, player_id=player_id,
+                          updated_before=updated_before, updated_after=updated_after, limit=limit, after=after)
+
+    def delete_many(self, game_ids: Iterable[str], updated_before: Optional[datetime] = None) -> List[str]:
+        """
+        Delete several games by appending a tombstone for each, with a single write.
+
+        Args:
+            game_ids (Iterable[str]): The unique identifiers of the games to delete
+            updated_before (Optional[datetime]): Only delete games last updated before this time
+
+        Returns:
+            List[str]: IDs of the games actually deleted
+
+        Raises:
+            LoadError: If a game's record cannot be read to check updated_before
+            SaveError: If the write fails, in which case nothing is deleted
+        """
+        deleted = []
+        try:
+            with self._lock:
+                for game_id in dict.fromkeys(game_ids):
+                    location = self._index.get(game_id)
+                    if location is None:
+                        continue
+                    if updated_before is not None and \
+                            self._decode(game_id, self._view(location), decode_header).updated_at >= updated_before:
+                        continue
+                    deleted.append(game_id)
+                if deleted:
+                    self._append([(game_id, encode_tombstone(game_id)) for game_id in deleted])
+        except OSError as e:
+            logger.error("Failed to delete %d game(s): %s", len(deleted), str(e))
+            raise SaveError(f"Cannot delete games: {str(e)}")
+        logger.debug("Deleted %d game(s) from the log", len(deleted))
+        return deleted
+
+    def game_ids(self) -> List[str]:
+        """
+        IDs of every game in the log, in ID order.
+        """
+        with self._lock:
+            return sorted(self._index)
+
+    def garbage_ratio(self) -> float:
+        """
+        Share of the log's bytes held by superseded records.
+        """
+        with self._lock:
+            total = sum(segment.size for segment in self._segments.values())
+            live = sum(segment.live_bytes for segment in self._segments.values())
+        return 1 - live / total if total else 0.0
+
+    def compact(self) -> int:
+        """
+        Rewrite every sealed segment whose live share is below compaction_ratio.
+
+        One segment at a time, its live records are copied as raw bytes
+        into a new file without holding the lock, so saves and loads go on
+        meanwhile. Under the lock, the new file then replaces the segment
+        (or the segment is deleted when nothing was live) and the records
+        still live there are pointed at it. A crash before the swap leaves
+        the segment as it was.
+
+        Returns:
+            int: Number of segments rewritten or removed
+
+        Raises:
+            DatabaseError: If a segment cannot be rewritten
+        """
+        compacted = 0
+        with self._compaction_lock:
+            while True:
+                with self._lock:
+                    victim = self._compaction_victim()
+                    if victim is None:
+                        return compacted
+                    live = self._live_records(victim)
+                try:
+                    path = self._copy_records(victim, live)
+                    with self._lock:
+                        self._swap(victim, path, live)
+                except OSError as e:
+                    logger.error("Failed to compact %s: %s", victim.path, str(e))
+                    raise DatabaseError(f"Cannot compact {victim.path}: {str(e)}")
+                compacted += 1
+
+    def _compaction_victim(self) -> Optional[_Segment]:
+        if self._closed:
+            return None
+        sealed = [segment for segment in self._segments.values() if segment is not self._active]
+        candidates = [segment for segment in sealed if segment.live_bytes < self.compaction_ratio * segment.size
+                      or segment.size == 0]
+        return min(candidates, key=lambda segment: segment.live_bytes / max(segment.size, 1), default=None)
+
+    def _live_records(self, segment: _Segment) -> List[Tuple[int, int, str]]:
+        """
+        (offset, length, game_id) of the records a rewrite of the segment keeps. Caller holds the lock.
+        """
+        tables = [self._index]
+        if segment.number != min(self._segments):
+            # an older segment may still hold a record the tombstone deletes
+            tables.append(self._tombstones)
+        return sorted((offset, length, game_id) for table in tables
+                      for game_id, (owner, offset, length) in table.items() if owner is segment)
+
+    def _copy_records(self, segment: _Segment, live: List[Tuple[int, int, str]]) -> Optional[str]:
+        """
+        Copy records of a sealed segment into a new file, without the lock.
+
+        Returns:
+            Optional[str]: Path of the copy, None when there is nothing to copy
+        """
+        if not live:
+            return None
+        path = segment.path + COMPACTED_SUFFIX
+        with segment.view(0, segment.size) as view, open(path, "wb") as file:
+            for offset, length, _ in live:
+                file.write(view[offset:offset + length])
+            file.flush()
+            if self.fsync:
+                os.fsync(file.fileno())
+        return path
+
+    def _swap(self, segment: _Segment, path: Optional[str], live: List[Tuple[int, int, str]]) -> None:
+        """
+        Replace a segment with its compacted copy and move the records still live to it. Caller holds the lock.
+        """
+        del self._segments[segment.number]
+        segment.release()
+        if path is None:
+            os.remove(segment.path)
+            logger.info("Removed %s, no live records", segment.path)
+            return
+
+        os.replace(path, segment.path)
+        replacement = _Segment(segment.number, segment.path, sum(length for _, length, _ in live))
+        self._segments[segment.number] = replacement
+        moved = 0
+        new_offset = 0
+        for offset, length, game_id in live:
+            for table in (self._index, self._tombstones):
+                # records saved again or deleted since the copy stay garbage in the new file
+                if table.get(game_id) == (segment, offset, length):
+                    table[game_id] = (replacement, new_offset, length)
+                    replacement.live_bytes += length
+                    moved += 1
+            new_offset += length
+        logger.info("Compacted %s, %d live record(s) kept", segment.path, moved)
+
+    def _compact_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.compact()
+            except DatabaseError:
+                pass
+
+    def close(self) -> None:
+        """
+        Stop background compaction and close the log.
+
+        Safe to call more than once; the repository cannot be used afterwards.
+        """
+        if self._compactor is not None:
+            self._stop.set()
+            self._compactor.join()
+            self._compactor = None
+        with self._lock:
+            self._closed = True
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            for segment in self._segments.values():
+                segment.release()
@@ -1,6 +1,12 @@
-from typing import Optional
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Union
+from src.core.models.game_difficulty import Difficulty
 from src.core.models.game_state import GameState
-from src.repository.base import GameRepository
+from src.core.models.game_status import GameStatus
+from src.repository.base import GamePage, GameRepository, PageCursor, page_games
+from src.repository.cache import estimate_state_size
+from src.repository.codec import decode_header, decode_state, encode_state
 import logging
 
 from src.services.exceptions.exceptions import GameNotFoundError
@@ -12,15 +18,54 @@ logger = logging.getLogger(__name__)
 class InMemoryGameRepository(GameRepository):
     """
     In memeory implementation of the game repository for storing and retrieving game states.
+    
+    By default every save stores a binary snapshot (see codec) and every
+    load decodes it, like a real database would. Unlike the text format
+    the SQLite backend stores, snapshots keep timestamp microseconds. With
+    snapshot=False the repository keeps GameState objects instead, copying
+    only their containers (see GameState.copy) on save and load, so nothing
+    is serialized or parsed.
+    
+    max_games and max_bytes (estimated, see estimate_state_size) bound the
+    store for long-running processes. Past a limit, finished games are
+    evicted, least recently saved or loaded first. Games in progress are
+    never evicted: once only they are left, the store grows past the limit
+    with a warning rather than lose a live player's game.
+    
+    Attributes:
+        _store (dict): Stored games by ID, encoded bytes or GameState copies
+        _snapshot (bool): Whether games are stored encoded
+        _max_games (Optional[int]): Most games kept at once
+        _max_bytes (Optional[int]): Cap on the estimated size of the stored games
     """
-    def __init__(self):
+    def __init__(self, snapshot: bool = True, max_games: Optional[int] = None,
+                 max_bytes: Optional[int] = None):
         """
         Initialize InMemoryGameRepository with a dictionary.
         
         Args:
-            _store (dict): 
+            snapshot (bool): Store encoded snapshots rather than state objects
+            max_games (Optional[int]): Most games kept at once, unbounded when None
+            max_bytes (Optional[int]): Cap on the estimated store size, unbounded when None
+            
+        Raises:
+            ValueError: If a limit is not positive
         """
-        self._store = {}
+        if (max_games is not None and max_games < 1) or (max_bytes is not None and max_bytes < 1):
+            raise ValueError("Repository limits must be positive")
+        self._store: Dict[str, Union[bytes, GameState]] = {}
+        self._snapshot = snapshot
+        self._max_games = max_games
+        self._max_bytes = max_bytes
+        # eviction order of the finished games, least recently used first
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._size_bytes = 0
+        self.evictions = 0
+    
+    @property
+    def _bounded(self) -> bool:
+        return self._max_games is not None or self._max_bytes is not None
         
     def save_game(self, game_state: GameState) -> None:
         """
@@ -29,8 +74,8 @@ class InMemoryGameRepository(GameRepository):
         Args:
             game_state (GameState): The game state to save            
         """
-        game_id = game_state.game_id
-        self._store[game_id] = game_state.to_db_format()
+        self._put(game_state)
+        self._evict()
         logger.debug("Game state saved successfully")
     
     
@@ -51,4 +96,144 @@ class InMemoryGameRepository(GameRepository):
             raise GameNotFoundError(game_id)
             
         logger.debug("Game state loaded successfully")
-        return GameState.from_db_format(stored_data)
\ No newline at end of file
+        return self._get(game_id, stored_data)
+    
+    def load_header(self, game_id: str) -> GameState:
+        """
+        Load a game from memory, decoding its history only on first access.
+        
+        Args:
+            game_id (str): The unique identifier of the game to load
+            
+        Returns:
+            GameState: A LazyGameState in snapshot mode, a full copy otherwise
+        """
+        stored_data = self._store.get(game_id)
+        if stored_data is None:
+            logger.warning("Game not found - ID: %s", game_id)
+            raise GameNotFoundError(game_id)
+        return self._get(game_id, stored_data, decode_header)
+    
+    def save_many(self, game_states: Iterable[GameState]) -> None:
+        """
+        Save or update several game states in memory.
+    
+        Args:
+            game_states (Iterable[GameState]): The game states to save
+        """
+        for game_state in game_states:
+            self._put(game_state)
+        self._evict()
+        logger.debug("Game states saved successfully")
+    
+    def load_many(self, game_ids: Iterable[str]) -> Dict[str, GameState]:
+        """
+        Load several game states from memory by their IDs.
+        
+        Args:
+            game_ids (Iterable[str]): The unique identifiers of the games to load
+            
+        Returns:
+            Dict[str, GameState]: The loaded game states by ID, missing IDs are left out
+        """
+        return {game_id: self._get(game_id, self._store[game_id])
+                for game_id in game_ids if game_id in self._store}
+    
+    def list_games(self, *, status: Optional[GameStatus] = None, difficulty: Optional[Difficulty] = None,
+                   player_id: Optional[str] = None, updated_before: Optional[datetime] = None,
+                   updated_after: Optional[datetime] = None, limit: int = 100,
+                   after: Optional[PageCursor] = None) -> GamePage:
+        """
+        List stored games matching every given filter, most recently updated first.
+        
+        There is no index: every stored game's header is decoded and
+        filtered, which is fine for tests and small stores; the listed games
+        decode their history on first access. Listing does not count as
+        use for eviction.
+        
+        Returns:
+            GamePage: The games of the page and the cursor of the next one
+        """
+        # a list, so saves from other threads (e.g. next to a sweeper) cannot break the iteration
+        stored = list(self._store.values())
+        if self._snapshot:
+            game_states = (decode_header(stored_data) for stored_data in stored)
+        else:
+            game_states = (stored_data.copy() for stored_data in stored)
+        return page_games(game_states, status=status, difficulty=difficulty, player_id=player_id,
+                          updated_before=updated_before, updated_after=updated_after, limit=limit, after=after)
+    
+    def delete_many(self, game_ids: Iterable[str], updated_before: Optional[datetime] = None) -> List[str]:
+        """
+        Delete several games from memory.
+        
+        Args:
+            game_ids (Iterable[str]): The unique identifiers of the games to delete
+            updated_before (Optional[datetime]): Only delete games last updated before this time
+            
+        Returns:
+            List[str]: IDs of the games actually deleted
+        """
+        deleted = []
+        for game_id in dict.fromkeys(game_ids):
+            stored_data = self._store.get(game_id)
+            if stored_data is None:
+                continue
+            if updated_before is not None:
+                updated_at = (decode_header(stored_data) if self._snapshot else stored_data).updated_at
+                if updated_at >= updated_before:
+                    continue
+            del self._store[game_id]
+            if self._bounded:
+                self._finished.pop(game_id, None)
+                self._size_bytes -= self._sizes.pop(game_id)
+            deleted.append(game_id)
+        logger.debug("Deleted %d game(s) from memory", len(deleted))
+        return deleted
+    
+    def _put(self, game_state: GameState) -> None:
+        """
+        Store a game without applying the limits.
+        """
+        game_id = game_state.game_id
+        if self._snapshot:
+            self._store[game_id] = encode_state(game_state)
+        else:
+            self._store[game_id] = game_state.copy()
+        
+        if self._bounded:
+            size = estimate_state_size(game_state)
+            self._size_bytes += size - self._sizes.get(game_id, 0)
+            self._sizes[game_id] = size
+            self._finished.pop(game_id, None)
+            if game_state.status != GameStatus.IN_PROGRESS:
+                self._finished[game_id] = None
+    
+    def _get(self, game_id: str, stored_data: Union[bytes, GameState],
+             decode: Callable[[bytes], GameState] = decode_state) -> GameState:
+        """
+        Rebuild (with decode) or copy a stored game and mark it recently used.
+        """
+        if self._bounded and game_id in self._finished:
+            self._finished.move_to_end(game_id)
+        if self._snapshot:
+            return decode(stored_data)
+        return stored_data.copy()
+    
+    def _evict(self) -> None:
+        """
+        Drop finished games until the store is within max_games and max_bytes, or none is left.
+        """
+        if not self._bounded:
+            return
+        while (self._max_games is not None and len(self._store) > self._max_games) or \
+                (self._max_bytes is not None and self._size_bytes > self._max_bytes):
+            if not self._finished:
+                logger.warning("Memory store over its limits with %d game(s) in progress, none evicted",
+                               len(self._store))
+                return
+            game_id, _ = self._finished.popitem(last=False)
+            del self._store[game_id]
+            self._size_bytes -= self._sizes.pop(game_id)
+            self.evictions += 1
+            logger.debug("Evicted game %s from memory", game_id)
@@ -0,0 +1,130 @@
+from dataclasses import dataclass
+import logging
+import sqlite3
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from src.services.exceptions.exceptions import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+# Versions of schemas that share a database file with another one and so
+# cannot use PRAGMA user_version, which belongs to the main schema
+CREATE_SCHEMA_VERSIONS = """
+    CREATE TABLE IF NOT EXISTS schema_versions (
+        schema TEXT PRIMARY KEY,
+        version INTEGER NOT NULL
+    )
+"""
+SELECT_SCHEMA_VERSION = "SELECT version FROM schema_versions WHERE schema = ?"
+UPSERT_SCHEMA_VERSION = """
+    INSERT INTO schema_versions (schema, version) VALUES (?, ?)
+    ON CONFLICT (schema) DO UPDATE SET version = excluded.version
+"""
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    One step of a database schema, identified by the user_version it leads to.
+
+    Attributes:
+        version (int): PRAGMA user_version of the database once the step is applied
+        description (str): What the step changes, for the logs
+        apply (Callable[[sqlite3.Connection], None]): Runs the step inside the migration's transaction
+    """
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Connection], None]
+
+
+def schema_version(connection: sqlite3.Connection, schema: Optional[str] = None) -> int:
+    """
+    The database's PRAGMA user_version, 0 for a new or unversioned database.
+
+    A named schema reads its version from the schema_versions table instead,
+    0 when it has never been migrated.
+    """
+    if schema is None:
+        return connection.execute("PRAGMA user_version").fetchone()[0]
+    if connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'schema_versions'").fetchone() is None:
+        return 0
+    row = connection.execute(SELECT_SCHEMA_VERSION, (schema,)).fetchone()
+    return row[0] if row is not None else 0
+
+
+def _set_schema_version(connection: sqlite3.Connection, schema: Optional[str], version: int) -> None:
+    if schema is None:
+        # PRAGMA does not take parameters; the version is an int from code
+        connection.execute(f"PRAGMA user_version = {int(version)}")
+        return
+    connection.execute(CREATE_SCHEMA_VERSIONS)
+    connection.execute(UPSERT_SCHEMA_VERSION, (schema, version))
+
+
+def migrate(connection: sqlite3.Connection, migrations: Sequence[Migration], schema: Optional[str] = None) -> int:
+    """
+    Apply every migration the database has not seen yet, in version order.
+
+    Each step runs in its own immediate transaction together with the
+    user_version bump, so a failed step leaves the database at the
+    previous version and a concurrent opener either waits or finds the
+    step done. Steps must also cope with databases created before
+    versioning (user_version 0), whatever shape those are in.
+
+    Several schemas can share one database file: the main one is versioned
+    by user_version, the others by name (see schema_version).
+
+    Args:
+        connection: Connection to the database, outside any transaction
+        migrations: Every step of the schema, ascending versions from 1
+        schema: Name of a schema sharing the file, None for the main schema
+
+    Returns:
+        int: The database's version afterwards
+
+    Raises:
+        DatabaseError: If the database was written by a newer schema
+        sqlite3.Error: If a step fails
+    """
+    latest = migrations[-1].version if migrations else 0
+    version = schema_version(connection, schema)
+    if version > latest:
+        raise DatabaseError(f"Database schema version {version} is newer than the supported {latest}")
+
+    for migration in migrations:
+        if migration.version <= version:
+            continue
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            version = schema_version(connection, schema)
+            if migration.version <= version:
+                connection.rollback()
+                continue
+            migration.apply(connection)
+            _set_schema_version(connection, schema, migration.version)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        version = migration.version
+        logger.info("Migrated %s to schema version %d: %s", schema or "database", version, migration.description)
+    return version
+
+
+def upgrade_records(connection: sqlite3.Connection, upgrades: Dict[int, str], keys: Iterable[str]) -> None:
+    """
+    Bring records to the latest format, inside the caller's transaction.
+
+    upgrades maps a record format version to the statement moving one
+    record, bound by its key, to the next version. Each statement must only
+    touch records still at its version, so applying them all in order
+    moves every record the whole way and is a no-op for current ones.
+
+    Args:
+        connection: Connection inside a write transaction
+        upgrades: Statement per format version
+        keys: Keys of the records to upgrade
+    """
+    parameters: List[tuple] = [(key,) for key in keys]
+    for version in sorted(upgrades):
+        connection.executemany(upgrades[version], parameters)
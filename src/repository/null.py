@@ -0,0 +1,60 @@
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from src.core.models.game_state import GameState
+from src.repository.base import GamePage, GameRepository
+from src.services.exceptions.exceptions import GameNotFoundError
+
+logger = logging.getLogger(__name__)
+
+
+class NullGameRepository(GameRepository):
+    """
+    Repository that discards every save, for headless runs such as simulations
+    where game states never need to be reloaded.
+    """
+    def save_game(self, game_state: GameState) -> None:
+        """
+        Accept and drop the game state.
+
+        Args:
+            game_state (GameState): The game state to discard
+        """
+        pass
+
+    def load_game(self, game_id: str) -> GameState:
+        """
+        Nothing is ever stored, so every load fails.
+
+        Raises:
+            GameNotFoundError: Always
+        """
+        logger.warning("Game not found - ID: %s", game_id)
+        raise GameNotFoundError(game_id)
+
+    def load_many(self, game_ids: Iterable[str]) -> Dict[str, GameState]:
+        """
+        Nothing is ever stored, so no game is found.
+
+        Returns:
+            Dict[str, GameState]: Always empty
+        """
+        return {}
+
+    def list_games(self, **filters) -> GamePage:
+        """
+        Nothing is ever stored, so every listing is empty.
+
+        Returns:
+            GamePage: Always an empty last page
+        """
+        return GamePage([])
+
+    def delete_many(self, game_ids: Iterable[str], updated_before: Optional[datetime] = None) -> List[str]:
+        """
+        Nothing is ever stored, so nothing is deleted.
+
+        Returns:
+            List[str]: Always empty
+        """
+        return []
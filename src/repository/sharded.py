@@ -0,0 +1,366 @@
+import argparse
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import logging
+import os
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+import zlib
+
+from src.core.models.game_state import GameState
+from src.repository.base import GamePage, GameRepository, PageCursor, page_games
+from src.repository.sqlite import SQLiteGameRepository
+from src.services.exceptions.exceptions import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Shard files carry the shard count, so a layout for another count can sit
+# next to them while rebalance copies the games over
+SHARD_FILE_PATTERN = re.compile(r"^shard-(\d+)-of-(\d+)\.db$")
+REBALANCE_BATCH_SIZE = 500
+
+
+def shard_file_name(index: int, shard_count: int) -> str:
+    """
+    File name of one shard, e.g. shard-02-of-04.db.
+    """
+    return f"shard-{index:02d}-of-{shard_count:02d}.db"
+
+
+def shard_index(game_id: str, shard_count: int) -> int:
+    """
+    Shard a game lives in.
+
+    CRC-32 of the ID rather than hash(), which is salted per process and
+    would send the same game to different shards in different processes.
+
+    Args:
+        game_id: Unique identifier of the game
+        shard_count: Number of shards
+
+    Returns:
+        int: Shard index in [0, shard_count)
+    """
+    return zlib.crc32(game_id.encode("utf-8")) % shard_count
+
+
+def existing_shard_counts(directory: str) -> List[int]:
+    """
+    Shard counts of the shard files found in a directory.
+
+    Returns:
+        List[int]: Distinct counts, ascending; empty for a new directory
+    """
+    if not os.path.isdir(directory):
+        return []
+    counts = {int(match.group(2)) for match in map(SHARD_FILE_PATTERN.match, os.listdir(directory)) if match}
+    return sorted(counts)
+
+
+class ShardedSQLiteGameRepository(GameRepository):
+    """
+    Game repository spread over several SQLite files by a hash of the game ID.
+
+    Each shard is a SQLiteGameRepository with its own database file, its own
+    connections and, with write_behind, its own writer thread, so writers of
+    different games rarely wait on the same file lock: throughput grows with
+    the number of shards for threads as well as for separate processes
+    sharing the directory (a process saving a game it has not loaded or
+    saved itself rewrites the game's whole history, see
+    SQLiteGameRepository). Bulk calls split their games by shard and run the
+    shards in parallel. A bulk save is one transaction per shard, not one
+    transaction overall.
+
+    The shard count is part of every file name. Opening a directory that
+    holds shards for another count raises; use rebalance() to move the
+    games to the new count first.
+
+    Attributes:
+        directory (str): Directory holding the shard files
+        shard_count (int): Number of shards
+        shards (List[SQLiteGameRepository]): One repository per shard
+    """
+    def __init__(self, directory: str = "mastermind_shards", shard_count: int = 4, **options):
+        """
+        Open (or create) every shard.
+
+        Args:
+            directory (str): Directory holding the shard files
+            shard_count (int): Number of shards
+            **options: Passed on to each SQLiteGameRepository (wal, write_behind, ...)
+
+        Raises:
+            ValueError: If shard_count is not positive
+            DatabaseError: If the directory holds shards for another count,
+                or a shard cannot be opened
+        """
+        if shard_count < 1:
+            raise ValueError("shard_count must be positive")
+        other_counts = [count for count in existing_shard_counts(directory) if count != shard_count]
+        if other_counts:
+            raise DatabaseError(f"{directory} holds shards for {other_counts}, rebalance it to {shard_count} first")
+
+        self._open_shards(directory, shard_count, options)
+
+    def _open_shards(self, directory: str, shard_count: int, options: dict) -> None:
+        """
+        Open the shard files for shard_count, whatever else is in the directory.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.shard_count = shard_count
+        self.shards: List[SQLiteGameRepository] = []
+        # worker threads start lazily, on the first bulk call spanning shards
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if shard_count > 1:
+            self._executor = ThreadPoolExecutor(max_workers=shard_count, thread_name_prefix="sqlite-shard")
+        try:
+            for index in range(shard_count):
+                self.shards.append(SQLiteGameRepository(
+                    os.path.join(directory, shard_file_name(index, shard_count)), **options))
+        except Exception:
+            self.close()
+            raise
+        logger.info("Opened %d SQLite shard(s) in %s", shard_count, directory)
+
+    def __enter__(self) -> 'ShardedSQLiteGameRepository':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def shard_for(self, game_id: str) -> SQLiteGameRepository:
+        """
+        The shard repository holding a game.
+        """
+        return self.shards[shard_index(game_id, self.shard_count)]
+
+    def save_game(self, game_state: GameState) -> None:
+        """
+        Save or update a game state in its shard.
+
+        Args:
+            game_state (GameState): The game state to save
+
+        Raises:
+            SaveError: If saving the game state fails
+        """
+        self.shard_for(game_state.game_id).save_game(game_state)
+
+    def load_game(self, game_id: str) -> GameState:
+        """
+        Load a game state from its shard.
+
+        Args:
+            game_id (str): The unique identifier of the game to load
+
+        Returns:
+            GameState: The loaded game state
+
+        Raises:
+            GameNotFoundError: If no game exists with the given ID
+            LoadError: If loading or decoding the game data fails
+        """
+        return self.shard_for(game_id).load_game(game_id)
+
+    def load_header(self, game_id: str) -> GameState:
+        """
+        Load a game's header from its shard, see SQLiteGameRepository.load_header.
+        """
+        return self.shard_for(game_id).load_header(game_id)
+
+    def save_many(self, game_states: Iterable[GameState]) -> None:
+        """
+        Save several game states, one transaction per shard, shards in parallel.
+
+        Args:
+            game_states (Iterable[GameState]): The game states to save
+
+        Raises:
+            SaveError: If a shard fails; the other shards may have committed
+        """
+        by_shard: Dict[int, List[GameState]] = defaultdict(list)
+        for game_state in game_states:
+            by_shard[shard_index(game_state.game_id, self.shard_count)].append(game_state)
+        self._map_shards(lambda index: self.shards[index].save_many(by_shard[index]), list(by_shard))
+
+    def load_many(self, game_ids: Iterable[str]) -> Dict[str, GameState]:
+        """
+        Load several game states, querying the shards in parallel.
+
+        Args:
+            game_ids (Iterable[str]): The unique identifiers of the games to load
+
+        Returns:
+            Dict[str, GameState]: The loaded game states by ID, in request order;
+                missing IDs are left out
+
+        Raises:
+            LoadError: If loading or decoding the game data fails
+        """
+        game_ids = list(dict.fromkeys(game_ids))
+        by_shard: Dict[int, List[str]] = defaultdict(list)
+        for game_id in game_ids:
+            by_shard[shard_index(game_id, self.shard_count)].append(game_id)
+
+        loaded: Dict[str, GameState] = {}
+        for found in self._map_shards(lambda index: self.shards[index].load_many(by_shard[index]), list(by_shard)):
+            loaded.update(found)
+        return {game_id: loaded[game_id] for game_id in game_ids if game_id in loaded}
+
+    def delete_many(self, game_ids: Iterable[str], updated_before: Optional[datetime] = None) -> List[str]:
+        """
+        Delete several games, one transaction per shard, shards in parallel.
+        
+        Args:
+            game_ids (Iterable[str]): The unique identifiers of the games to delete
+            updated_before (Optional[datetime]): Only delete games last updated before this time
+            
+        Returns:
+            List[str]: IDs of the games actually deleted
+            
+        Raises:
+            SaveError: If a shard fails; the other shards may have committed
+        """
+        by_shard: Dict[int, List[str]] = defaultdict(list)
+        for game_id in dict.fromkeys(game_ids):
+            by_shard[shard_index(game_id, self.shard_count)].append(game_id)
+        deleted = self._map_shards(lambda index: self.shards[index].delete_many(by_shard[index], updated_before),
+                                   list(by_shard))
+        return [game_id for shard_deleted in deleted for game_id in shard_deleted]
+    
+    def game_ids(self) -> List[str]:
+        """
+        IDs of every committed game across all shards, in ID order.
+        """
+        return sorted(game_id for ids in self._map_shards(lambda index: self.shards[index].game_ids(),
+                                                          range(self.shard_count)) for game_id in ids)
+
+    def list_games(self, *, limit: int = 100, after: Optional[PageCursor] = None, **filters) -> GamePage:
+        """
+        List games across all shards, most recently updated first.
+        
+        Every shard lists one page from the same cursor, in parallel, and
+        the newest `limit` games of their union form the page; a shard's
+        page can only contribute up to `limit` games, so nothing is missed.
+        
+        Args:
+            limit: Most games per page
+            after: Cursor of the previous page
+            **filters: See GameRepository.list_games
+            
+        Returns:
+            GamePage: The games of the page and the cursor of the next one
+        """
+        pages = self._map_shards(lambda index: self.shards[index].list_games(limit=limit, after=after, **filters),
+                                 range(self.shard_count))
+        page = page_games((game_state for shard_page in pages for game_state in shard_page.games), limit=limit)
+        if page.next_cursor is None and len(page.games) == limit and any(p.next_cursor for p in pages):
+            page.next_cursor = (page.games[-1].updated_at, page.games[-1].game_id)
+        return page
+    
+    def flush(self) -> None:
+        """
+        Commit the saves queued by write_behind in every shard.
+        """
+        self._map_shards(lambda index: self.shards[index].flush(), range(self.shard_count))
+
+    def close(self) -> None:
+        """
+        Flush and close every shard; the repository cannot be used afterwards.
+
+        Raises:
+            SaveError: If queued saves of a shard could not be committed,
+                after every shard has been closed
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        error = None
+        for shard in self.shards:
+            try:
+                shard.close()
+            except DatabaseError as e:
+                error = error or e
+        if error is not None:
+            raise error
+
+    def _map_shards(self, call: Callable[[int], T], indices: Sequence[int]) -> List[T]:
+        """
+        Run a call per shard index, in parallel when more than one shard is involved.
+
+        Each worker thread gets its own connection to every shard it touches.
+        """
+        if len(indices) <= 1:
+            return [call(index) for index in indices]
+        return list(self._executor.map(call, indices))
+
+
+def rebalance(directory: str, shard_count: int, batch_size: int = REBALANCE_BATCH_SIZE,
+              **options) -> Tuple[int, int]:
+    """
+    Move every game in a directory to a layout with a new shard count.
+
+    Games are copied batch by batch into the new shard files, which are
+    only complete once every old shard was copied; the old files are then
+    deleted. An interrupted run leaves the old files untouched and can
+    simply be run again, copies are idempotent. Nothing may write to the
+    directory meanwhile.
+
+    Args:
+        directory: Directory holding the shard files
+        shard_count: The new number of shards
+        batch_size: Games read and written per bulk call
+        **options: Passed on to the SQLiteGameRepository of each shard
+
+    Returns:
+        Tuple[int, int]: Games moved and old shard files removed
+    """
+    old_counts = [count for count in existing_shard_counts(directory) if count != shard_count]
+    moved = 0
+    removed = 0
+    # the new layout is opened next to the old one, bypassing the constructor's check
+    target = ShardedSQLiteGameRepository.__new__(ShardedSQLiteGameRepository)
+    target._open_shards(directory, shard_count, options)
+    try:
+        for old_count in old_counts:
+            for index in range(old_count):
+                source = SQLiteGameRepository(os.path.join(directory, shard_file_name(index, old_count)), **options)
+                try:
+                    game_ids = source.game_ids()
+                    for start in range(0, len(game_ids), batch_size):
+                        target.save_many(source.load_many(game_ids[start:start + batch_size]).values())
+                    moved += len(game_ids)
+                finally:
+                    source.close()
+        target.flush()
+    finally:
+        target.close()
+
+    for old_count in old_counts:
+        for index in range(old_count):
+            path = os.path.join(directory, shard_file_name(index, old_count))
+            for suffix in ("", "-wal", "-shm", "-journal"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+            removed += 1
+    logger.info("Rebalanced %d game(s) in %s from %s to %d shard(s)", moved, directory, old_counts, shard_count)
+    return moved, removed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Move sharded SQLite games to a new shard count")
+    parser.add_argument("--directory", default="mastermind_shards")
+    parser.add_argument("--shards", type=int, required=True, help="the new shard count")
+    parser.add_argument("--batch-size", type=int, default=REBALANCE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    moved, removed = rebalance(args.directory, args.shards, batch_size=args.batch_size)
+    print(f"{args.directory}: moved {moved} games, removed {removed} old shard files")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,125 +1,660 @@
 import json
 import logging
 import sqlite3
-from typing import Optional
-from src.core.models.game_state import GameState
-from src.repository.base import GameRepository
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.core.config.game_config import GameConfig
+from src.core.models.feedback import Feedback
+from src.core.models.game_difficulty import Difficulty
+from src.core.models.game_state import TIMESTAMP_FORMAT, GameState, LazyGameState
+from src.core.models.game_status import GameStatus
+from src.core.models.guess import Guess
+from src.core.models.packed_code import as_numbers
+from src.repository.base import GamePage, GameRepository, PageCursor
+from src.repository.migrations import Migration, migrate, upgrade_records
 from src.services.exceptions.exceptions import DatabaseError, GameNotFoundError, LoadError, SaveError
 
 logger = logging.getLogger(__name__)
 
+SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+# Statements are kept as module constants so every call passes the exact same
+# text and hits the per-connection prepared statement cache.
+CREATE_GAMES_TABLE = """
+    CREATE TABLE IF NOT EXISTS games (
+        game_id TEXT PRIMARY KEY,
+        code_pattern TEXT NOT NULL,
+        status TEXT NOT NULL,
+        attempts INTEGER NOT NULL,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        config TEXT NOT NULL,
+        player_id TEXT,
+        difficulty TEXT,
+        format_version INTEGER NOT NULL DEFAULT 1
+    )
+"""
+# Listing indexes: each ends in (updated_at, game_id), the keyset order of
+# list_games, so a filtered page is a range scan of one index
+CREATE_GAMES_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS games_by_updated ON games (updated_at, game_id)",
+    "CREATE INDEX IF NOT EXISTS games_by_status ON games (status, updated_at, game_id)",
+    "CREATE INDEX IF NOT EXISTS games_by_difficulty ON games (difficulty, status, updated_at, game_id)",
+    "CREATE INDEX IF NOT EXISTS games_by_player ON games (player_id, updated_at, game_id)",
+    "CREATE INDEX IF NOT EXISTS games_by_format_version ON games (format_version)",
+)
+# One row per guess, clustered by (game_id, attempt) so a game's history is
+# one contiguous range scan
+CREATE_GUESSES_TABLE = """
+    CREATE TABLE IF NOT EXISTS guesses (
+        game_id TEXT NOT NULL,
+        attempt INTEGER NOT NULL,
+        guess TEXT NOT NULL,
+        numbers_correct INTEGER NOT NULL,
+        positions_correct INTEGER NOT NULL,
+        PRIMARY KEY (game_id, attempt)
+    ) WITHOUT ROWID
+"""
+UPSERT_GAME = """
+    INSERT INTO games (
+        game_id, code_pattern, status, attempts,
+        created_at, updated_at, config, player_id, difficulty, format_version
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (game_id) DO UPDATE SET
+        code_pattern = excluded.code_pattern,
+        status = excluded.status,
+        attempts = excluded.attempts,
+        created_at = excluded.created_at,
+        updated_at = excluded.updated_at,
+        config = excluded.config,
+        player_id = excluded.player_id,
+        difficulty = excluded.difficulty,
+        format_version = excluded.format_version
+"""
+# replaces a stored guess at the same attempt, written by another instance
+INSERT_GUESS = """
+    INSERT OR REPLACE INTO guesses (
+        game_id, attempt, guess, numbers_correct, positions_correct
+    ) VALUES (?, ?, ?, ?, ?)
+"""
+DELETE_GUESSES_FROM = "DELETE FROM guesses WHERE game_id = ? AND attempt >= ?"
+DELETE_GAME = "DELETE FROM games WHERE game_id = ?"
+DELETE_GAME_BEFORE = "DELETE FROM games WHERE game_id = ? AND updated_at < ?"
+DELETE_GUESSES = "DELETE FROM guesses WHERE game_id = ?"
+SELECT_GAME = """
+    SELECT code_pattern, status, attempts,
+           created_at, updated_at, config, player_id, format_version
+    FROM games WHERE game_id = ?
+"""
+SELECT_GUESSES = """
+    SELECT attempt, guess, numbers_correct, positions_correct
+    FROM guesses WHERE game_id = ? ORDER BY attempt
+"""
+SELECT_GAME_IDS = "SELECT game_id FROM games ORDER BY game_id"
+# Bulk loads bind one of a few fixed numbers of ids per statement, the
+# smallest that fits the chunk, padding it with repeats, so only a handful of
+# statement texts exist and small loads do not bind 500 parameters. The
+# largest stays below SQLite's default limit of 999 bound parameters.
+LOAD_CHUNK_SIZES = (8, 64, 500)
+LOAD_CHUNK_SIZE = LOAD_CHUNK_SIZES[-1]
+SELECT_GAMES_IN = {size: f"""
+    SELECT game_id, code_pattern, status, attempts,
+           created_at, updated_at, config, player_id, format_version
+    FROM games WHERE game_id IN ({", ".join("?" * size)})
+""" for size in LOAD_CHUNK_SIZES}
+SELECT_GUESSES_IN = {size: f"""
+    SELECT game_id, attempt, guess, numbers_correct, positions_correct
+    FROM guesses WHERE game_id IN ({", ".join("?" * size)}) ORDER BY game_id, attempt
+""" for size in LOAD_CHUNK_SIZES}
+SELECT_OUTDATED_GAME_IDS = "SELECT game_id FROM games WHERE format_version < ? LIMIT ?"
+# games of a batch (bound as a JSON array) still outdated after its upgrade
+SELECT_STILL_OUTDATED = """
+    SELECT game_id, format_version FROM games
+    WHERE format_version < ? AND game_id IN (SELECT value FROM json_each(?))
+"""
+
+# Format of the games rows written by this version. Older rows are upgraded
+# when loaded, when saved again, or by the background pass, one step per
+# version; each statement only touches rows still at its version.
+RECORD_FORMAT_VERSION = 2
+RECORD_UPGRADES = {
+    # 1: rows from before the listing columns, difficulty not filled in
+    1: """
+        UPDATE games SET difficulty = json_extract(config, '$.difficulty'), format_version = 2
+        WHERE game_id = ? AND format_version = 1
+    """,
+}
+UPGRADE_BATCH_SIZE = 500
+# Games whose stored guess count is remembered; a forgotten game's next save
+# rewrites its whole history
+GUESS_COUNT_CACHE_SIZE = 10_000
+
+# list_games filters, combined with AND in this order
+_LIST_FILTERS = (
+    ("status", "status = ?"),
+    ("difficulty", "difficulty = ?"),
+    ("player_id", "player_id = ?"),
+    ("updated_before", "updated_at < ?"),
+    ("updated_after", "updated_at >= ?"),
+    ("after", "(updated_at, game_id) < (?, ?)"),
+)
+# difficulty filter while rows of format 1, without the column, remain that
+# upgrade_outdated_records could not upgrade; it cannot use the index
+_DIFFICULTY_FALLBACK = "coalesce(difficulty, json_extract(config, '$.difficulty')) = ?"
+
+
+def _create_tables(connection: sqlite3.Connection) -> None:
+    connection.execute(CREATE_GAMES_TABLE)
+    connection.execute(CREATE_GUESSES_TABLE)
+
+
+def _has_guess_records_column(connection: sqlite3.Connection) -> bool:
+    return any(column[1] == "guess_records" for column in connection.execute("PRAGMA table_info(games)"))
+
+
+def _move_guess_records(connection: sqlite3.Connection) -> None:
+    """
+    Move guess_records JSON from the old games schema into the guesses table.
+    """
+    if not _has_guess_records_column(connection):
+        return
+    migrated = 0
+    try:
+        for game_id, guess_records in connection.execute("SELECT game_id, guess_records FROM games").fetchall():
+            connection.executemany(INSERT_GUESS, [
+                (game_id, attempt, json.dumps(record["guess"]),
+                 record["feedback"]["numbers_correct"], record["feedback"]["positions_correct"])
+                for attempt, record in enumerate(json.loads(guess_records))
+            ])
+            migrated += 1
+    except (ValueError, KeyError, TypeError) as e:
+        raise sqlite3.DatabaseError(f"guess_records migration failed: {str(e)}")
+    connection.execute("ALTER TABLE games RENAME TO games_guess_records")
+    connection.execute(CREATE_GAMES_TABLE)
+    connection.execute("""
+        INSERT INTO games (game_id, code_pattern, status, attempts, created_at, updated_at, config)
+        SELECT game_id, code_pattern, status, attempts, created_at, updated_at, config
+        FROM games_guess_records
+    """)
+    connection.execute("DROP TABLE games_guess_records")
+    logger.info("Moved guess history of %d game(s) into the guesses table", migrated)
+
+
+def _add_listing_columns(connection: sqlite3.Connection) -> None:
+    """
+    Add the player_id, difficulty and format_version columns and the listing indexes.
+    
+    Existing rows keep format 1 and get their difficulty from the record
+    upgrade, not from a rewrite of the whole table here.
+    """
+    columns = {column[1] for column in connection.execute("PRAGMA table_info(games)")}
+    for column, definition in (("player_id", "TEXT"), ("difficulty", "TEXT"),
+                               ("format_version", "INTEGER NOT NULL DEFAULT 1")):
+        if column not in columns:
+            connection.execute(f"ALTER TABLE games ADD COLUMN {column} {definition}")
+    for statement in CREATE_GAMES_INDEXES:
+        connection.execute(statement)
+
+
+# Schema steps by PRAGMA user_version. Databases from before versioning are
+# at 0 in any of the older shapes, so every step checks what is there.
+SCHEMA_MIGRATIONS = (
+    Migration(1, "games and guesses tables", _create_tables),
+    Migration(2, "guess history moved from games.guess_records into guesses", _move_guess_records),
+    Migration(3, "player, difficulty and record format columns, listing indexes", _add_listing_columns),
+)
+
+# Serialized save: games row, guess rows not yet stored, total history length
+_SaveRows = Tuple[tuple, List[tuple], int]
+
 class SQLiteGameRepository(GameRepository):
     """
     SQLite implementation of the game repository for storing and retrieving game states.
 
+    Each thread that uses the repository gets one long-lived connection,
+    opened on its first call and reused afterwards, so a save no longer pays
+    for opening the database, reading the schema and closing it again.
+    Statements are prepared once per connection and served from SQLite's
+    statement cache. Call close(), or use the repository as a context
+    manager, to release every connection.
+
+    Guesses live in their own append-only table: a save inserts only the
+    guesses the database does not have yet (one row per new guess) and
+    upserts the games row, so its cost does not grow with the length of the
+    game. What is stored is known per game once this instance has saved or
+    loaded it; the first save of any other game (after a restart, from
+    another process or shard instance) writes its whole history and deletes
+    stored guesses past its end, so it never builds on rows it has not seen.
+
+    The schema is versioned with PRAGMA user_version: opening a database
+    applies the SCHEMA_MIGRATIONS it has not seen, one transaction each,
+    including databases from before versioning. Games rows also carry a
+    format_version; rows in an older format are still read as is and are
+    upgraded (RECORD_UPGRADES) when loaded or saved again, or in the
+    background with upgrade_pause, a batch at a time, so a format change
+    never rewrites the whole table at once.
+
+    By default every save is its own committed transaction. Two opt-in
+    settings trade durability for throughput:
+    - wal / synchronous switch the journal to write-ahead logging and set
+      the synchronous pragma (e.g. "NORMAL" only fsyncs at checkpoints)
+    - write_behind queues saves in memory and lets a background writer
+      thread commit them in groups, once batch_size saves are queued or
+      flush_interval seconds after the oldest one. Saves of the same game
+      coalesce, load_game sees queued saves, and flush()/close() block
+      until everything queued has been committed. A save acknowledged in
+      this mode is only lost if the process dies before the next flush.
+
     Attributes:
         _db_name (str): Name of the SQLite database file
+        _cached_statements (int): Prepared statements cached per connection
+        _wal (bool): Whether connections use write-ahead logging
+        _synchronous (Optional[str]): synchronous pragma for every connection
+        _batch_size (int): Queued saves that trigger a group commit
+        _flush_interval (float): Seconds a queued save may wait for its commit
+        schema_version (int): PRAGMA user_version of the database once opened
     """
-    def __init__(self, db_name: str = "mastermind.db"):
+    def __init__(self, db_name: str = "mastermind.db", cached_statements: int = 128,
+                 wal: bool = False, synchronous: Optional[str] = None,
+                 write_behind: bool = False, batch_size: int = 256, flush_interval: float = 0.05,
+                 upgrade_pause: Optional[float] = None):
         """
         Initialize the SQLite repository with specified database name.
         
         Args:
             db_name (str): Name of the database file. Defaults to "mastermind.db"
+            cached_statements (int): Size of each connection's prepared statement cache
+            wal (bool): Use journal_mode=WAL
+            synchronous (Optional[str]): One of SYNCHRONOUS_LEVELS, SQLite's default when None
+            write_behind (bool): Queue saves and commit them from a background thread
+            batch_size (int): Queued saves that trigger a group commit
+            flush_interval (float): Maximum seconds between a queued save and its commit
+            upgrade_pause (Optional[float]): Upgrade outdated rows in a background thread,
+                sleeping this many seconds between batches; no background pass when None
             
         Raises:
-            DatabaseConnectionError: If database initialization fails
+            ValueError: If synchronous is not a known level
+            DatabaseError: If database initialization or migration fails
         """
+        if synchronous is not None and synchronous.upper() not in SYNCHRONOUS_LEVELS:
+            raise ValueError(f"synchronous must be one of {SYNCHRONOUS_LEVELS}")
         self._db_name = db_name
+        self._cached_statements = cached_statements
+        self._wal = wal
+        self._synchronous = synchronous.upper() if synchronous else None
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        # guesses known to be stored per game, so saves only insert the new ones;
+        # least recently saved or loaded games are forgotten first
+        self._guess_counts: "OrderedDict[str, int]" = OrderedDict()
+        self._guess_counts_lock = threading.Lock()
         logger.info("Initializing SQLite repository with database: %s", db_name)
         self._create_table() 
+        
+        self._pending: Dict[str, _SaveRows] = {}
+        self._in_flight: Dict[str, _SaveRows] = {}
+        self._oldest_pending = 0.0
+        self._queue_condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._writer_error: Optional[sqlite3.Error] = None
+        self._stopping = False
+        self._writer = None
+        if write_behind:
+            self._writer = threading.Thread(target=self._write_behind_loop, name="sqlite-write-behind",
+                                            daemon=True)
+            self._writer.start()
+        
+        self._stop_upgrade = threading.Event()
+        self._upgrader = None
+        if upgrade_pause is not None and self._outdated_records:
+            self._upgrader = threading.Thread(target=self._upgrade_loop, args=(upgrade_pause,),
+                                              name="sqlite-record-upgrade", daemon=True)
+            self._upgrader.start()
     
-    def _create_table(self):
+    def __enter__(self) -> 'SQLiteGameRepository':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def _connection(self) -> sqlite3.Connection:
         """
-        Create the games table if it doesn't exist.
+        The calling thread's connection, opened on first use.
         
         Raises:
-            DatabaseConnectionError: If table creation fails
+            DatabaseError: If the repository has been closed
+            sqlite3.Error: If the database cannot be opened
         """
-        connection = None
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            return connection
+        
+        with self._lock:
+            if self._closed:
+                raise DatabaseError("Repository is closed")
+            # check_same_thread is off only so close() may run on any thread,
+            # each connection is otherwise used by the thread that opened it
+            connection = sqlite3.connect(self._db_name, cached_statements=self._cached_statements,
+                                         check_same_thread=False)
+            if self._wal:
+                connection.execute("PRAGMA journal_mode=WAL")
+            if self._synchronous:
+                connection.execute(f"PRAGMA synchronous={self._synchronous}")
+            self._connections.append(connection)
+        self._local.connection = connection
+        logger.debug("Opened connection %d to %s", len(self._connections), self._db_name)
+        return connection
+    
+    def close(self) -> None:
+        """
+        Flush queued saves and close every connection opened by the repository.
         
+        Safe to call more than once; the repository cannot be used afterwards.
+        
+        Raises:
+            SaveError: If queued saves could not be committed
+        """
         try:
-            logger.debug("Attempting to create games table")
-            connection = sqlite3.connect(self._db_name)
-            connection.execute("""
-                CREATE TABLE IF NOT EXISTS games (
-                    game_id TEXT PRIMARY KEY,
-                    code_pattern TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    attempts INTEGER NOT NULL,
-                    guess_records TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    config TEXT NOT NULL
-                )
-            """)
-            connection.commit()
-            logger.info("Games table created successfully")
+            if self._upgrader is not None:
+                self._stop_upgrade.set()
+                self._upgrader.join()
+                self._upgrader = None
+            if self._writer is not None:
+                with self._queue_condition:
+                    self._stopping = True
+                    self._queue_condition.notify_all()
+                self._writer.join()
+                self._writer = None
+            if not self._closed:
+                self.flush()
+        finally:
+            with self._lock:
+                self._closed = True
+                connections, self._connections = self._connections, []
+            for connection in connections:
+                connection.close()
+            self._local = threading.local()
+            logger.info("Closed %d connection(s) to %s", len(connections), self._db_name)
+    
+    def _create_table(self):
+        """
+        Create or migrate the schema to the latest SCHEMA_MIGRATIONS version.
+        
+        Raises:
+            DatabaseError: If creation or migration fails, or the database is newer
+        """
+        try:
+            connection = self._connection()
+            self.schema_version = migrate(connection, SCHEMA_MIGRATIONS)
+            self._outdated_records = connection.execute(
+                SELECT_OUTDATED_GAME_IDS, (RECORD_FORMAT_VERSION, 1)).fetchone() is not None
+            logger.info("Games schema at version %d", self.schema_version)
             
         except sqlite3.Error as e:
             logger.error("Failed to create table: %s", str(e))
             raise DatabaseError(f"Cannot create initial table: {str(e)}")
 
-        finally:
-            if connection:
-                    connection.close()
+    def _to_rows(self, game_state: GameState) -> _SaveRows:
+        """
+        Serialize a game state into its games row and the guess rows not stored yet.
+        
+        Raises:
+            SaveError: If the state holds data that cannot be serialized
+        """
+        game_id = game_state.game_id
+        records = game_state.guess_records
+        # unknown count: the stored rows may be another writer's, rewrite them all
+        start = min(self._guess_counts.get(game_id, 0), len(records))
+        try:
+            game_row = (
+                game_id,
+                json.dumps(as_numbers(game_state.code_pattern)),
+                game_state.status.value,
+                game_state.attempts,
+                game_state.created_at.strftime(TIMESTAMP_FORMAT),
+                game_state.updated_at.strftime(TIMESTAMP_FORMAT),
+                json.dumps(game_state.config.to_dict()),
+                game_state.player_id,
+                game_state.config.difficulty.value,
+                RECORD_FORMAT_VERSION
+            )
+            guess_rows = [
+                (game_id, attempt, json.dumps(guess.get_numbers()),
+                 feedback.numbers_correct, feedback.positions_correct)
+                for attempt, (guess, feedback) in enumerate(records[start:], start)
+            ]
+        except (TypeError, AttributeError) as e:
+            logger.error("Failed to save the state %s: %s", game_id, str(e))
+            raise SaveError(f"Invalid game state data: {str(e)}")
+        return game_row, guess_rows, len(records)
+
+    def _write(self, connection: sqlite3.Connection, saves: List[_SaveRows]) -> None:
+        """
+        Execute the statements for a list of saves inside the caller's transaction.
+        """
+        connection.executemany(UPSERT_GAME, [game_row for game_row, _, _ in saves])
+        for game_row, _, history_length in saves:
+            # a game saved again with a shorter history (e.g. restarted under the same id),
+            # or whose stored history this instance does not know
+            stored = self._guess_counts.get(game_row[0])
+            if stored is None or stored > history_length:
+                connection.execute(DELETE_GUESSES_FROM, (game_row[0], history_length))
+        connection.executemany(INSERT_GUESS, [row for _, guess_rows, _ in saves for row in guess_rows])
+
+    def _saved(self, saves: List[_SaveRows]) -> None:
+        """
+        Remember how many guesses each saved game has stored, after its commit.
+        """
+        for game_row, _, history_length in saves:
+            self._remember_guess_count(game_row[0], history_length)
+
+    def _remember_guess_count(self, game_id: str, count: int) -> None:
+        """
+        Record a game's stored guess count, forgetting the least recent games beyond GUESS_COUNT_CACHE_SIZE.
+        """
+        with self._guess_counts_lock:
+            self._guess_counts[game_id] = count
+            self._guess_counts.move_to_end(game_id)
+            while len(self._guess_counts) > GUESS_COUNT_CACHE_SIZE:
+                self._guess_counts.popitem(last=False)
+
+    @staticmethod
+    def _from_rows(game_id: str, game_data: tuple, guess_data: List[tuple]) -> GameState:
+        """
+        Rebuild a game state from its SELECT_GAME and SELECT_GUESSES rows.
+        """
+        data = {
+            "game_id": game_id,
+            "code_pattern": json.loads(game_data[0]),
+            "status": game_data[1],
+            "attempts": game_data[2],
+            "guess_records": [
+                {
+                    "guess": json.loads(guess),
+                    "feedback": {
+                        "numbers_correct": numbers_correct,
+                        "positions_correct": positions_correct
+                    }
+                }
+                for _, guess, numbers_correct, positions_correct in guess_data
+            ],
+            "created_at": game_data[3],
+            "updated_at": game_data[4],
+            "config": json.loads(game_data[5]),
+            "player_id": game_data[6]
+        }
+        return GameState.from_db_format(data)
+
+    @classmethod
+    def _from_queued(cls, game_id: str, queued: _SaveRows, guess_data: List[tuple]) -> GameState:
+        """
+        Rebuild a game state from a queued save and the guess rows already stored.
+        """
+        # the queued save only holds guesses missing from the database
+        game_row, guess_rows, history_length = queued
+        history = {row[0]: row for row in guess_data}
+        history.update({row[1]: row[1:] for row in guess_rows})
+        return cls._from_rows(game_id, game_row[1:], [history[attempt] for attempt in range(history_length)])
 
     def save_game(self, game_state: GameState) -> None:
         """
         Save or update a game state in the database.
+        
+        With write_behind the state is queued and committed by the
+        background writer, see flush().
     
         Args:
             game_state (GameState): The game state to save
             
         Raises:
-            SaveError: If saving the game state fails
+            SaveError: If saving the game state fails, or an earlier queued
+                save failed in the background
             
         """
+        logger.debug("Saving game state - ID: %s, Status: %s, Attempts: %d",
+                    game_state.game_id, game_state.status, game_state.attempts)
+        self._save_rows([self._to_rows(game_state)])
+    
+    def save_many(self, game_states: Iterable[GameState]) -> None:
+        """
+        Save or update several game states in one transaction.
+        
+        Every games row goes through one executemany upsert and every new
+        guess through one executemany insert, so the batch pays for a single
+        commit. With write_behind the states are queued together.
+        
+        Args:
+            game_states (Iterable[GameState]): The game states to save
+            
+        Raises:
+            SaveError: If saving fails, in which case none of the states are
+                saved, or an earlier queued save failed in the background
+        """
+        saves = [self._to_rows(game_state) for game_state in game_states]
+        logger.debug("Saving %d game states", len(saves))
+        if saves:
+            self._save_rows(saves)
+    
+    def _save_rows(self, saves: List[_SaveRows]) -> None:
+        """
+        Commit serialized saves in one transaction, or queue them for write-behind.
+        
+        Raises:
+            SaveError: If the commit fails, or an earlier queued save failed
+        """
+        if self._writer is not None:
+            self._raise_writer_error()
+            with self._queue_condition:
+                # wake the writer to start the time trigger, or to commit a full batch
+                wake = not self._pending or len(self._pending) + len(saves) >= self._batch_size
+                if not self._pending:
+                    self._oldest_pending = time.monotonic()
+                for save in saves:
+                    self._pending[save[0][0]] = save
+                if wake:
+                    self._queue_condition.notify_all()
+            logger.debug("%d game state(s) queued for write-behind", len(saves))
+            return
+        
         connection = None
         
         try: 
-            logger.debug("Saving game state - ID: %s, Status: %s, Attempts: %d",
-                        game_state.game_id, game_state.status, game_state.attempts)
-            connection = sqlite3.connect(self._db_name)
-            data = game_state.to_db_format()
-            
-            try:
-                connection.execute("""
-                    INSERT OR REPLACE INTO games (
-                        game_id, code_pattern, status, attempts,
-                        guess_records, created_at, updated_at, config
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    data["game_id"],
-                    json.dumps(data["code_pattern"]),
-                    data["status"],
-                    data["attempts"],
-                    json.dumps(data["guess_records"]),
-                    data["created_at"],
-                    data["updated_at"],
-                    json.dumps(data["config"])
-                ))
-            except TypeError as e:
-                logger.error("Failed to save the state %s: %s", game_state.game_id, str(e))
-                raise SaveError(f"Invalid game state data: {str(e)}")
-            
+            connection = self._connection()
+            self._write(connection, saves)
             connection.commit()
-            logger.debug("Game state saved successfully")
+            self._saved(saves)
+            logger.debug("%d game state(s) saved successfully", len(saves))
             
         except sqlite3.Error as e:
-            logger.error("Failed to save game %s: %s", game_state.game_id, str(e))
+            logger.error("Failed to save %d game state(s) starting with %s: %s", len(saves), saves[0][0][0], str(e))
             if connection:
                 connection.rollback()
             raise SaveError(f"Cannot save the game: {str(e)}")
-
-        finally:
-            if connection:
-                    connection.close()
+    
+    def flush(self) -> None:
+        """
+        Commit every queued save now, in one transaction.
+        
+        A no-op without write_behind. Returns once all saves queued before
+        the call are committed, including a batch the writer is committing.
+        
+        Raises:
+            SaveError: If the commit fails
+        """
+        self._commit_pending()
+        self._raise_writer_error()
+    
+    def _raise_writer_error(self) -> None:
+        error, self._writer_error = self._writer_error, None
+        if error is not None:
+            raise SaveError(f"Cannot save queued games: {str(error)}")
+    
+    def _commit_pending(self) -> None:
+        """
+        Take the queued saves and commit them as one group.
+        
+        Failed batches are put back in the queue (unless a newer save of the
+        same game arrived) and the error is kept for the next save or flush.
+        """
+        with self._write_lock:
+            with self._queue_condition:
+                if not self._pending:
+                    return
+                self._in_flight, self._pending = self._pending, {}
+            
+            connection = None
+            try:
+                connection = self._connection()
+                saves = list(self._in_flight.values())
+                with connection:
+                    self._write(connection, saves)
+                self._saved(saves)
+                logger.debug("Group commit of %d game state(s)", len(self._in_flight))
+            except (sqlite3.Error, DatabaseError) as e:
+                logger.error("Failed to commit %d queued game state(s): %s", len(self._in_flight), str(e))
+                with self._queue_condition:
+                    for game_id, save in self._in_flight.items():
+                        self._pending.setdefault(game_id, save)
+                    self._oldest_pending = time.monotonic()
+                self._writer_error = e
+            finally:
+                with self._queue_condition:
+                    self._in_flight = {}
+    
+    def _write_behind_loop(self) -> None:
+        """
+        Background writer: group-commit on the size or time trigger until close().
+        """
+        while True:
+            with self._queue_condition:
+                while not self._stopping:
+                    if len(self._pending) >= self._batch_size:
+                        break
+                    if self._pending:
+                        remaining = self._oldest_pending + self._flush_interval - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._queue_condition.wait(remaining)
+                    else:
+                        self._queue_condition.wait()
+                if self._stopping:
+                    return
+            self._commit_pending()
                 
     def load_game(self, game_id: str) -> GameState:
         """
         Load a game state from the database by its ID.
         
+        Saves still queued by write_behind are returned without waiting for
+        their commit.
+        
         Args:
             game_id (str): The unique identifier of the game to load
             
@@ -131,40 +666,414 @@ class SQLiteGameRepository(GameRepository):
             LoadError: If loading or decoding the game data fails
 
         """
-        connection = None
+        if self._writer is not None:
+            with self._queue_condition:
+                queued = self._pending.get(game_id) or self._in_flight.get(game_id)
+        else:
+            queued = None
         
         try:
-            connection = sqlite3.connect(self._db_name)
-            cursor = connection.execute("""
-                SELECT code_pattern, status, attempts,
-                       guess_records, created_at, updated_at, config
-                FROM games WHERE game_id = ?
-            """, (game_id,))
+            connection = self._connection()
+            game_data = connection.execute(SELECT_GAME, (game_id,)).fetchone()
+            guess_data = connection.execute(SELECT_GUESSES, (game_id,)).fetchall()
             
-            game_data = cursor.fetchone()
+            if queued is not None:
+                logger.debug("Game state loaded from the write-behind queue")
+                return self._from_queued(game_id, queued, guess_data)
             
             if game_data is None:
                 logger.warning("Game not found - ID: %s", game_id)
                 raise GameNotFoundError(game_id)
-
-            data = {
-                "game_id": game_id,
-                "code_pattern": json.loads(game_data[0]),
-                "status": game_data[1],
-                "attempts": game_data[2],
-                "guess_records": json.loads(game_data[3]),
-                "created_at": game_data[4],
-                "updated_at": game_data[5],
-                "config": json.loads(game_data[6])
-            }
             
-            logger.debug("Game state loaded successfully")
-            return GameState.from_db_format(data)
+            self._remember_guess_count(game_id, len(guess_data))
+            game_state = self._from_rows(game_id, game_data, guess_data)
+            
+        except sqlite3.Error as e:
+            logger.error("Failed to load game %s: %s", game_id, str(e))
+            raise LoadError()
+        
+        if game_data[7] < RECORD_FORMAT_VERSION:
+            self._upgrade_loaded([game_id])
+        logger.debug("Game state loaded successfully")
+        return game_state
+    
+    def load_header(self, game_id: str) -> GameState:
+        """
+        Load a game's games row only; its guesses are queried on first access.
+        
+        A game with a save still queued by write_behind is loaded in full.
+        A game saved after the header was read is reloaded when its history
+        is first accessed, header included, see _load_history.
         
+        Args:
+            game_id (str): The unique identifier of the game to load
+            
+        Returns:
+            GameState: A LazyGameState, or the full state of a queued game
+            
+        Raises:
+            GameNotFoundError: If no game exists with the given ID
+            LoadError: If loading or decoding the game data fails
+        """
+        if self._writer is not None:
+            with self._queue_condition:
+                if game_id in self._pending or game_id in self._in_flight:
+                    return self.load_game(game_id)
+        
+        try:
+            game_data = self._connection().execute(SELECT_GAME, (game_id,)).fetchone()
+            if game_data is None:
+                logger.warning("Game not found - ID: %s", game_id)
+                raise GameNotFoundError(game_id)
+            game_state = self._header_from_row(game_id, game_data)
         except sqlite3.Error as e:
             logger.error("Failed to load game %s: %s", game_id, str(e))
             raise LoadError()
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error("Failed to decode game %s: %s", game_id, str(e))
+            raise LoadError()
         
-        finally:
-            if connection:
-                connection.close()
+        if game_data[7] < RECORD_FORMAT_VERSION:
+            self._upgrade_loaded([game_id])
+        return game_state
+    
+    def _header_from_row(self, game_id: str, game_data: tuple) -> LazyGameState:
+        """
+        Build a header view from a SELECT_GAME row, with a history loader for its guesses.
+        """
+        header = LazyGameState(
+            lambda: self._load_history(header, game_data),
+            game_id=game_id,
+            code_pattern=json.loads(game_data[0]),
+            status=GameStatus(game_data[1]),
+            attempts=game_data[2],
+            created_at=datetime.strptime(game_data[3], TIMESTAMP_FORMAT),
+            updated_at=datetime.strptime(game_data[4], TIMESTAMP_FORMAT),
+            config=GameConfig.from_dict(json.loads(game_data[5])),
+            player_id=game_data[6],
+        )
+        return header
+    
+    def _load_history(self, header: LazyGameState, game_data: tuple) -> List[Tuple[Guess, Feedback]]:
+        """
+        Query and decode a header's guesses, on its first access to its history.
+        
+        The games row is read again in the same transaction as the guesses.
+        If the game was saved since the header was read (a changed row, or a
+        save queued by write_behind), the stored guesses would not match the
+        header; the game is then loaded in full and the header's fields move
+        to that state too, so the result is never a mix of two saves.
+        
+        Raises:
+            GameNotFoundError: If the game was deleted since the header was read
+            LoadError: If the query fails
+        """
+        game_id = header.game_id
+        try:
+            connection = self._connection()
+            connection.execute("BEGIN")
+            try:
+                current = connection.execute(SELECT_GAME, (game_id,)).fetchone()
+                guess_data = connection.execute(SELECT_GUESSES, (game_id,)).fetchall()
+            finally:
+                connection.rollback()
+        except (sqlite3.Error, DatabaseError) as e:
+            logger.error("Failed to load the guesses of game %s: %s", game_id, str(e))
+            raise LoadError()
+        
+        queued = False
+        if self._writer is not None:
+            with self._queue_condition:
+                queued = game_id in self._pending or game_id in self._in_flight
+        # format_version may have been bumped by the header's own record upgrade
+        if not queued and current is not None and current[:7] == game_data[:7]:
+            return [(Guess(json.loads(guess)), Feedback(numbers_correct, positions_correct))
+                    for _, guess, numbers_correct, positions_correct in guess_data]
+        
+        logger.debug("Game %s was saved again since its header was read, reloading it", game_id)
+        latest = self.load_game(game_id)
+        for field in ("code_pattern", "status", "attempts", "created_at", "updated_at", "config", "player_id"):
+            setattr(header, field, getattr(latest, field))
+        return latest.guess_records
+    
+    def load_many(self, game_ids: Iterable[str]) -> Dict[str, GameState]:
+        """
+        Load several game states from the database by their IDs.
+        
+        Ids are looked up LOAD_CHUNK_SIZE at a time with one IN query for the
+        games rows and one for their guesses, bound to the smallest of
+        LOAD_CHUNK_SIZES that fits the chunk, all inside one read
+        transaction so every chunk sees the same snapshot. Saves still queued
+        by write_behind are returned without waiting for their commit.
+        
+        Args:
+            game_ids (Iterable[str]): The unique identifiers of the games to load
+            
+        Returns:
+            Dict[str, GameState]: The loaded game states by ID, in request order;
+                IDs without a saved game are left out
+            
+        Raises:
+            LoadError: If loading or decoding the game data fails
+        """
+        game_ids = list(dict.fromkeys(game_ids))
+        queued = {}
+        if self._writer is not None:
+            with self._queue_condition:
+                for game_id in game_ids:
+                    save = self._pending.get(game_id) or self._in_flight.get(game_id)
+                    if save is not None:
+                        queued[game_id] = save
+        
+        connection = None
+        try:
+            connection = self._connection()
+            game_data = {}
+            guess_data = defaultdict(list)
+            connection.execute("BEGIN")
+            try:
+                for start in range(0, len(game_ids), LOAD_CHUNK_SIZE):
+                    chunk = game_ids[start:start + LOAD_CHUNK_SIZE]
+                    size = next(size for size in LOAD_CHUNK_SIZES if size >= len(chunk))
+                    parameters = chunk + chunk[-1:] * (size - len(chunk))
+                    for row in connection.execute(SELECT_GAMES_IN[size], parameters):
+                        game_data[row[0]] = row[1:]
+                    for row in connection.execute(SELECT_GUESSES_IN[size], parameters):
+                        guess_data[row[0]].append(row[1:])
+            finally:
+                connection.rollback()
+            
+            game_states = {}
+            for game_id in game_ids:
+                if game_id in queued:
+                    game_states[game_id] = self._from_queued(game_id, queued[game_id], guess_data[game_id])
+                elif game_id in game_data:
+                    self._remember_guess_count(game_id, len(guess_data[game_id]))
+                    game_states[game_id] = self._from_rows(game_id, game_data[game_id], guess_data[game_id])
+        
+        except sqlite3.Error as e:
+            logger.error("Failed to load %d games: %s", len(game_ids), str(e))
+            raise LoadError()
+        
+        outdated = [game_id for game_id, row in game_data.items() if row[7] < RECORD_FORMAT_VERSION]
+        if outdated:
+            self._upgrade_loaded(outdated)
+        logger.debug("Loaded %d of %d game states", len(game_states), len(game_ids))
+        return game_states
+    
+    def game_ids(self) -> List[str]:
+        """
+        IDs of every game committed to the database, in ID order.
+        
+        Saves still queued by write_behind are not included; flush() first.
+        
+        Returns:
+            List[str]: The stored game IDs
+            
+        Raises:
+            LoadError: If the query fails
+        """
+        try:
+            return [row[0] for row in self._connection().execute(SELECT_GAME_IDS)]
+        except sqlite3.Error as e:
+            logger.error("Failed to list games: %s", str(e))
+            raise LoadError()
+    
+    def delete_many(self, game_ids: Iterable[str], updated_before: Optional[datetime] = None) -> List[str]:
+        """
+        Delete several games and their guesses in one transaction.
+        
+        Games with a save still queued by write_behind are in use and are
+        kept; the transaction holds the write lock, so the background
+        writer cannot commit a save of a game while it is being deleted.
+        
+        Args:
+            game_ids (Iterable[str]): The unique identifiers of the games to delete
+            updated_before (Optional[datetime]): Only delete games last updated before this time
+            
+        Returns:
+            List[str]: IDs of the games actually deleted
+            
+        Raises:
+            SaveError: If the delete fails, in which case nothing is deleted
+        """
+        game_ids = list(dict.fromkeys(game_ids))
+        cutoff = updated_before.strftime(TIMESTAMP_FORMAT) if updated_before is not None else None
+        with self._write_lock:
+            if self._writer is not None:
+                with self._queue_condition:
+                    game_ids = [game_id for game_id in game_ids if game_id not in self._pending]
+            
+            connection = None
+            deleted = []
+            try:
+                connection = self._connection()
+                with connection:
+                    for game_id in game_ids:
+                        if cutoff is None:
+                            cursor = connection.execute(DELETE_GAME, (game_id,))
+                        else:
+                            cursor = connection.execute(DELETE_GAME_BEFORE, (game_id, cutoff))
+                        if cursor.rowcount:
+                            deleted.append(game_id)
+                    connection.executemany(DELETE_GUESSES, [(game_id,) for game_id in deleted])
+            except sqlite3.Error as e:
+                logger.error("Failed to delete %d game(s): %s", len(game_ids), str(e))
+                raise SaveError(f"Cannot delete games: {str(e)}")
+            with self._guess_counts_lock:
+                for game_id in deleted:
+                    self._guess_counts.pop(game_id, None)
+        logger.debug("Deleted %d of %d game(s)", len(deleted), len(game_ids))
+        return deleted
+    
+    def list_games(self, *, status: Optional[GameStatus] = None, difficulty: Optional[Difficulty] = None,
+                   player_id: Optional[str] = None, updated_before: Optional[datetime] = None,
+                   updated_after: Optional[datetime] = None, limit: int = 100,
+                   after: Optional[PageCursor] = None) -> GamePage:
+        """
+        List games matching every given filter, most recently updated first.
+        
+        The page is one range scan of the listing index that matches the
+        filters, seeking past the cursor instead of counting an OFFSET. Only
+        the games rows are read: the listed states are LazyGameState headers
+        that query their guesses on first access. With write_behind, queued
+        saves are flushed first so the listing sees them. Rows older than
+        format 2 have no difficulty column yet, so a difficulty filter first
+        upgrades them (upgrade_outdated_records) and can then use its index;
+        only rows that cannot be upgraded fall back to a full scan.
+        
+        Args:
+            status: Only games with this status
+            difficulty: Only games of this difficulty
+            player_id: Only games of this player
+            updated_before: Only games last updated before this time
+            updated_after: Only games last updated at or after this time
+            limit: Most games per page
+            after: Cursor of the previous page
+            
+        Returns:
+            GamePage: The games of the page and the cursor of the next one
+            
+        Raises:
+            ValueError: If limit is not positive
+            LoadError: If the query fails
+        """
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        if self._writer is not None:
+            self.flush()
+        if difficulty is not None and self._outdated_records:
+            try:
+                self.upgrade_outdated_records()
+            except SaveError:
+                logger.warning("Listing by difficulty with a full scan while outdated rows remain")
+        
+        filters = {
+            "status": status.value if status is not None else None,
+            "difficulty": difficulty.value if difficulty is not None else None,
+            "player_id": player_id,
+            "updated_before": updated_before.strftime(TIMESTAMP_FORMAT) if updated_before else None,
+            "updated_after": updated_after.strftime(TIMESTAMP_FORMAT) if updated_after else None,
+            "after": (after[0].strftime(TIMESTAMP_FORMAT), after[1]) if after else None,
+        }
+        clauses = []
+        parameters = []
+        for name, clause in _LIST_FILTERS:
+            if filters[name] is not None:
+                if name == "difficulty" and self._outdated_records:
+                    clause = _DIFFICULTY_FALLBACK
+                clauses.append(clause)
+                parameters.extend(filters[name] if name == "after" else (filters[name],))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = f"""
+            SELECT game_id, code_pattern, status, attempts,
+                   created_at, updated_at, config, player_id, format_version
+            FROM games {where}
+            ORDER BY updated_at DESC, game_id DESC LIMIT ?
+        """
+        
+        try:
+            rows = self._connection().execute(query, (*parameters, limit + 1)).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Failed to list games: %s", str(e))
+            raise LoadError()
+        
+        try:
+            games = [self._header_from_row(row[0], row[1:]) for row in rows[:limit]]
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error("Failed to decode listed games: %s", str(e))
+            raise LoadError()
+        outdated = [row[0] for row in rows[:limit] if row[8] < RECORD_FORMAT_VERSION]
+        if outdated:
+            self._upgrade_loaded(outdated)
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = (games[limit - 1].updated_at, games[limit - 1].game_id)
+        logger.debug("Listed %d game(s)", len(games))
+        return GamePage(games, next_cursor)
+    
+    def _upgrade_loaded(self, game_ids: List[str]) -> None:
+        """
+        Upgrade rows just loaded in an older format; a failure only postpones it.
+        """
+        try:
+            connection = self._connection()
+            with connection:
+                upgrade_records(connection, RECORD_UPGRADES, game_ids)
+            logger.debug("Upgraded %d loaded game(s) to format %d", len(game_ids), RECORD_FORMAT_VERSION)
+        except sqlite3.Error as e:
+            logger.warning("Failed to upgrade %d loaded game(s), will retry: %s", len(game_ids), str(e))
+    
+    def upgrade_outdated_records(self, batch_size: int = UPGRADE_BATCH_SIZE, pause: float = 0.0) -> int:
+        """
+        Upgrade every row still in an older format, batch_size rows per transaction.
+        
+        Throttled by pause seconds between batches so live saves get the
+        write lock in between; close() stops a background pass after the
+        current batch. A row no RECORD_UPGRADES step applies to (e.g. an
+        unknown older format) stops the pass with an error rather than
+        being selected again forever.
+        
+        Args:
+            batch_size (int): Most rows per transaction
+            pause (float): Seconds to sleep between batches
+            
+        Returns:
+            int: Rows upgraded
+            
+        Raises:
+            SaveError: If a batch fails or leaves rows outdated; earlier batches stay committed
+        """
+        upgraded = 0
+        connection = self._connection()
+        while True:
+            try:
+                with connection:
+                    game_ids = [row[0] for row in connection.execute(
+                        SELECT_OUTDATED_GAME_IDS, (RECORD_FORMAT_VERSION, batch_size))]
+                    upgrade_records(connection, RECORD_UPGRADES, game_ids)
+                    stuck = connection.execute(
+                        SELECT_STILL_OUTDATED, (RECORD_FORMAT_VERSION, json.dumps(game_ids))).fetchall()
+            except sqlite3.Error as e:
+                logger.error("Failed to upgrade outdated games: %s", str(e))
+                raise SaveError(f"Cannot upgrade games: {str(e)}")
+            upgraded += len(game_ids) - len(stuck)
+            if stuck:
+                # the same rows would come back in every batch
+                versions = sorted({version for _, version in stuck})
+                logger.error("No record upgrade for %d game(s) in format(s) %s, e.g. %s",
+                             len(stuck), versions, stuck[0][0])
+                raise SaveError(f"Cannot upgrade games from record format(s) {versions}")
+            if len(game_ids) < batch_size:
+                self._outdated_records = False
+                break
+            if self._stop_upgrade.wait(pause):
+                break
+        logger.info("Upgraded %d game(s) to format %d", upgraded, RECORD_FORMAT_VERSION)
+        return upgraded
+    
+    def _upgrade_loop(self, pause: float) -> None:
+        try:
+            self.upgrade_outdated_records(pause=pause)
+        except DatabaseError:
+            pass
@@ -0,0 +1,202 @@
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+import logging
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+from src.core.models.game_status import GameStatus
+from src.repository.base import GameRepository, PageCursor
+from src.services.exceptions.exceptions import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_AGE = timedelta(days=7)
+SWEEP_BATCH_SIZE = 500
+
+
+@dataclass
+class SweepStats:
+    """
+    Counters of an ExpirySweeper since it was created.
+
+    Attributes:
+        passes (int): Completed sweeps over every stale game
+        batches (int): Batches committed
+        swept (int): Games deleted
+        archived (int): Games saved to the archive before their deletion
+        kept (int): Stale games picked but kept, because they were saved again meanwhile
+        errors (int): Batches that failed
+        total_seconds (float): Time spent in batches
+        last_batch_seconds (float): Duration of the latest batch
+        max_batch_seconds (float): Duration of the longest batch
+    """
+    passes: int = 0
+    batches: int = 0
+    swept: int = 0
+    archived: int = 0
+    kept: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    last_batch_seconds: float = 0.0
+    max_batch_seconds: float = 0.0
+
+    @property
+    def mean_batch_seconds(self) -> float:
+        return self.total_seconds / self.batches if self.batches else 0.0
+
+
+class ExpirySweeper:
+    """
+    Expires games in progress that nobody saved for max_age.
+
+    A sweep pages through the stale games with list_games (in SQLite a
+    range scan of the status, updated_at index) batch_size games at a time.
+    Each batch is optionally saved to an archive repository, then deleted
+    with delete_many guarded by the same cutoff, which is one transaction
+    per batch (per shard when sharded): live saves wait for one batch at
+    most, and a game saved again after it was picked is kept. The archive
+    may then hold an older copy of a game that is still live.
+
+    With an interval, a background thread sweeps every interval seconds,
+    sleeping pause seconds between batches to let live traffic through.
+    Call close(), or use the sweeper as a context manager, to stop it.
+
+    Attributes:
+        repository (GameRepository): The store to sweep
+        archive (Optional[GameRepository]): Where expired games are kept, deleted outright when None
+        max_age (timedelta): Time since the last save after which a game in progress expires
+        batch_size (int): Most games per batch
+        pause (float): Seconds between two batches of a background sweep
+    """
+    def __init__(self, repository: GameRepository, max_age: timedelta = DEFAULT_MAX_AGE,
+                 batch_size: int = SWEEP_BATCH_SIZE, archive: Optional[GameRepository] = None,
+                 interval: Optional[float] = None, pause: float = 0.0,
+                 clock: Callable[[], datetime] = datetime.now):
+        """
+        Set up the sweeper, starting the background thread when an interval is given.
+
+        Args:
+            repository (GameRepository): The store to sweep
+            max_age (timedelta): Time since the last save after which a game in progress expires
+            batch_size (int): Most games per batch
+            archive (Optional[GameRepository]): Where expired games are kept, deleted outright when None
+            interval (Optional[float]): Seconds between background sweeps, no background thread when None
+            pause (float): Seconds between two batches of a background sweep
+            clock (Callable[[], datetime]): Source of the current time, in the timestamps' time zone
+
+        Raises:
+            ValueError: If a setting is out of range
+        """
+        if max_age <= timedelta(0) or batch_size < 1 or pause < 0 or (interval is not None and interval <= 0):
+            raise ValueError("max_age, batch_size and interval must be positive and pause not negative")
+        self.repository = repository
+        self.archive = archive
+        self.max_age = max_age
+        self.batch_size = batch_size
+        self.pause = pause
+        self._clock = clock
+        self._stats = SweepStats()
+        self._stats_lock = threading.Lock()
+        # one sweep at a time, whether background or called directly
+        self._sweep_lock = threading.Lock()
+
+        self._stop = threading.Event()
+        self._thread = None
+        if interval is not None:
+            self._thread = threading.Thread(target=self._sweep_loop, args=(interval,),
+                                            name="expiry-sweeper", daemon=True)
+            self._thread.start()
+
+    def __enter__(self) -> 'ExpirySweeper':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @property
+    def stats(self) -> SweepStats:
+        """
+        Snapshot of the sweep counters and batch timings.
+        """
+        with self._stats_lock:
+            return replace(self._stats)
+
+    def sweep(self) -> int:
+        """
+        Expire every game in progress last saved more than max_age ago.
+
+        Returns:
+            int: Games deleted
+
+        Raises:
+            DatabaseError: If a batch fails; earlier batches stay committed
+        """
+        with self._sweep_lock:
+            cutoff = self._clock() - self.max_age
+            swept = 0
+            cursor = None
+            while True:
+                deleted, cursor = self._sweep_batch(cutoff, cursor)
+                swept += deleted
+                if cursor is None or (self.pause and self._stop.wait(self.pause)):
+                    break
+            with self._stats_lock:
+                self._stats.passes += 1
+        if swept:
+            logger.info("Expired %d game(s) in progress last saved before %s", swept, cutoff)
+        return swept
+
+    def _sweep_batch(self, cutoff: datetime, after: Optional[PageCursor]) -> Tuple[int, Optional[PageCursor]]:
+        """
+        Archive and delete one page of stale games.
+
+        Returns:
+            Tuple[int, Optional[PageCursor]]: Games deleted and the cursor of the next page
+        """
+        started = time.perf_counter()
+        try:
+            page = self.repository.list_games(status=GameStatus.IN_PROGRESS, updated_before=cutoff,
+                                              limit=self.batch_size, after=after)
+            game_ids = [game_state.game_id for game_state in page.games]
+            if game_ids and self.archive is not None:
+                # listed headers load their history lazily, one query each
+                game_states = self.repository.load_many(game_ids)
+                self.archive.save_many(game_states.values())
+                game_ids = list(game_states)
+            deleted = self.repository.delete_many(game_ids, cutoff)
+        except DatabaseError:
+            with self._stats_lock:
+                self._stats.errors += 1
+            raise
+        seconds = time.perf_counter() - started
+
+        with self._stats_lock:
+            stats = self._stats
+            stats.batches += 1
+            stats.swept += len(deleted)
+            stats.archived += len(game_ids) if self.archive is not None else 0
+            stats.kept += len(page.games) - len(deleted)
+            stats.total_seconds += seconds
+            stats.last_batch_seconds = seconds
+            stats.max_batch_seconds = max(stats.max_batch_seconds, seconds)
+        logger.debug("Swept %d of %d stale game(s) in %.3fs", len(deleted), len(page.games), seconds)
+        return len(deleted), page.next_cursor
+
+    def _sweep_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.sweep()
+            except DatabaseError as e:
+                logger.error("Expiry sweep failed: %s", str(e))
+
+    def close(self) -> None:
+        """
+        Stop the background sweeps, letting a running batch finish.
+
+        Safe to call more than once.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,30 @@
+import logging
+from typing import List
+from src.core.config.game_config import GameConfig
+from .base import NumberGenerator
+
+logger = logging.getLogger(__name__)
+
+
+class FixedCodeGenerator(NumberGenerator):
+    """
+    Number generator that always returns a predetermined code, used to replay
+    or simulate games against a known secret.
+
+    Attributes:
+        code (List[int]): The code returned by every generate call
+    """
+    def __init__(self, code: List[int]):
+        self.code = list(code)
+
+    def generate(self, config: GameConfig) -> List[int]:
+        """
+        Return a copy of the fixed code.
+
+        Args:
+            config: Game configuration (unused, the code is fixed)
+
+        Returns:
+            List of integers making up the fixed code
+        """
+        return list(self.code)
@@ -0,0 +1,213 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from src.core.config.game_config import GameConfig
+from src.core.game import Game
+from src.core.models.game_difficulty import Difficulty
+from src.core.models.game_status import GameStatus
+from src.core.models.guess import Guess
+from src.core.models.solver_strategy import SolverStrategy
+from src.core.scoring.code_space import code_space_size, index_to_code
+from src.core.scoring.lookup_table import FeedbackTable, feedback_table_for, pack_feedback
+from src.core.solver.opening_book import load_opening_book
+from src.core.solver.solver import Solver
+from src.repository.base import GameRepository
+from src.repository.memory import InMemoryGameRepository
+from src.repository.null import NullGameRepository
+from src.services.generators.fixed import FixedCodeGenerator
+
+logger = logging.getLogger(__name__)
+
+# Strategy that plays the lowest still-consistent code, no search at all
+CONSISTENT_STRATEGY = "consistent"
+STRATEGIES = [strategy.value for strategy in SolverStrategy] + [CONSISTENT_STRATEGY]
+
+REPOSITORIES = {
+    "null": NullGameRepository,
+    "memory": InMemoryGameRepository,
+}
+
+
+@dataclass
+class SimulationReport:
+    """
+    Aggregated results of a simulation run.
+
+    Attributes:
+        difficulty (Difficulty): Difficulty that was simulated
+        strategy (str): Guessing strategy used
+        games (int): Number of games played
+        wins (int): Games won within max_attempts
+        total_guesses (int): Guesses made over all games
+        worst_guesses (int): Most guesses used by a single game
+        elapsed (float): Wall-clock seconds for the whole run
+        guess_histogram (Dict[int, int]): Number of games won with each guess count
+    """
+    difficulty: Difficulty
+    strategy: str
+    games: int = 0
+    wins: int = 0
+    total_guesses: int = 0
+    worst_guesses: int = 0
+    elapsed: float = 0.0
+    guess_histogram: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def average_guesses(self) -> float:
+        return self.total_guesses / self.games if self.games else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+    def add(self, guesses: int, won: bool) -> None:
+        """
+        Record the outcome of one game.
+        """
+        self.games += 1
+        self.total_guesses += guesses
+        self.worst_guesses = max(self.worst_guesses, guesses)
+        if won:
+            self.wins += 1
+            self.guess_histogram[guesses] = self.guess_histogram.get(guesses, 0) + 1
+
+    def __str__(self) -> str:
+        lines = [
+            f"Difficulty: {self.difficulty.value}, strategy: {self.strategy}",
+            f"Games: {self.games} in {self.elapsed:.2f}s ({self.games_per_second:,.1f} games/s)",
+            f"Guesses: average {self.average_guesses:.3f}, worst {self.worst_guesses}",
+            f"Win rate: {self.win_rate:.2%}",
+        ]
+        for guesses in sorted(self.guess_histogram):
+            lines.append(f"  won in {guesses}: {self.guess_histogram[guesses]}")
+        return "\n".join(lines)
+
+
+class _Player:
+    """
+    Plays games headlessly with one strategy, memoizing suggestions by history.
+
+    Every secret shares the same opening, and many share longer prefixes, so
+    the memo removes most solver calls across a full-space run.
+    """
+    def __init__(self, difficulty: Difficulty, strategy: str, repository: str,
+                 table_dir: Optional[str]):
+        self.config = GameConfig(difficulty)
+        self.strategy = strategy
+        self.repository: GameRepository = REPOSITORIES[repository]()
+        self.solver = None
+        if strategy != CONSISTENT_STRATEGY:
+            table = feedback_table_for(self.config, table_dir) if table_dir else None
+            self.solver = Solver(self.config, strategy=SolverStrategy(strategy),
+                                 table=table if isinstance(table, FeedbackTable) else None,
+                                 opening_book=load_opening_book(self.config, SolverStrategy(strategy)))
+        self._memo: Dict[Tuple, List[int]] = {}
+
+    def play(self, secret: List[int]) -> Tuple[int, bool]:
+        """
+        Play one game against a secret through the real Game class.
+
+        Returns:
+            Tuple[int, bool]: Guesses used and whether the game was won
+        """
+        game = Game(repository=self.repository, generator=FixedCodeGenerator(secret), config=self.config)
+        history: Tuple = ()
+        while game.get_status() == GameStatus.IN_PROGRESS:
+            numbers = self._memo.get(history)
+            if numbers is None:
+                numbers = self._next_guess(game)
+                self._memo[history] = numbers
+            game.make_guess(Guess(list(numbers)))
+            feedback = game.guess_records[-1][1]
+            history += ((tuple(numbers), pack_feedback(feedback.numbers_correct, feedback.positions_correct,
+                                                       self.config.pattern_length)),)
+        return game.attempts, game.get_status() == GameStatus.WON
+
+    def _next_guess(self, game: Game) -> List[int]:
+        if self.solver is None:
+            return index_to_code(int(game.candidates.indices[0]), self.config)
+        return self.solver.suggest(game.guess_records, candidates=game.candidates.indices).get_numbers()
+
+
+_worker_player: Optional[_Player] = None
+
+
+def _init_worker(difficulty: Difficulty, strategy: str, repository: str, table_dir: Optional[str]) -> None:
+    global _worker_player
+    _worker_player = _Player(difficulty, strategy, repository, table_dir)
+
+
+def _play_chunk(secret_indices: Sequence[int]) -> List[Tuple[int, bool]]:
+    config = _worker_player.config
+    return [_worker_player.play(index_to_code(index, config)) for index in secret_indices]
+
+
+def run_simulation(difficulty: Difficulty = Difficulty.NORMAL,
+                   strategy: str = SolverStrategy.MINIMAX.value,
+                   workers: Optional[int] = None,
+                   limit: Optional[int] = None,
+                   chunk_size: int = 64,
+                   repository: str = "null",
+                   table_dir: Optional[str] = None) -> SimulationReport:
+    """
+    Play every possible secret of a difficulty against one strategy.
+
+    Secrets are split into chunks and spread over a ProcessPoolExecutor; each
+    worker process builds its own solver once and drives real Game objects.
+
+    Args:
+        difficulty: Difficulty whose code space is simulated
+        strategy: A SolverStrategy value or "consistent"
+        workers: Worker processes, defaults to the CPU count; 1 runs in-process
+        limit: Only play the first limit secrets (evenly spaced over the code space)
+        chunk_size: Secrets per task sent to a worker
+        repository: "null" or "memory", the repository backing each Game
+        table_dir: Directory holding precomputed feedback tables for the solver
+
+    Returns:
+        SimulationReport: Aggregated results
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy}, expected one of {STRATEGIES}")
+    if repository not in REPOSITORIES:
+        raise ValueError(f"Unknown repository {repository}, expected one of {list(REPOSITORIES)}")
+
+    size = code_space_size(GameConfig(difficulty))
+    if limit is not None and limit < size:
+        secrets = [index * size // limit for index in range(limit)]
+    else:
+        secrets = list(range(size))
+    chunks = [secrets[start:start + chunk_size] for start in range(0, len(secrets), chunk_size)]
+    workers = workers or os.cpu_count() or 1
+
+    report = SimulationReport(difficulty=difficulty, strategy=strategy)
+    logger.info("Simulating %d secrets for %s with %s on %d workers",
+                len(secrets), difficulty.value, strategy, workers)
+    started = time.perf_counter()
+
+    if table_dir:
+        # build the shared table once up front instead of racing in every worker
+        feedback_table_for(GameConfig(difficulty), table_dir)
+
+    initargs = (difficulty, strategy, repository, table_dir)
+    if workers == 1:
+        _init_worker(*initargs)
+        results = list(map(_play_chunk, chunks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+            results = list(executor.map(_play_chunk, chunks))
+
+    for chunk_results in results:
+        for guesses, won in chunk_results:
+            report.add(guesses, won)
+
+    report.elapsed = time.perf_counter() - started
+    logger.info("Simulation finished: %d games in %.2fs", report.games, report.elapsed)
+    return report
@@ -71,11 +71,12 @@ class InputValidator:
                 error_code="NON_NUMERIC"
             )
 
-        num_count = len([c for c in guess_input if c.isdigit()])
+        num_count = len(self._split_tokens(guess_input))
         if num_count != self.config.pattern_length:
+            separator_hint = " separated by spaces" if self.config.max_number > 9 else ""
             return ValidationResult(
                 is_valid=False,
-                message=f"Must enter exactly {self.config.pattern_length} numbers",
+                message=f"Must enter exactly {self.config.pattern_length} numbers{separator_hint}",
                 error_code="INVALID_LENGTH"
             )
             
@@ -92,14 +93,31 @@ class InputValidator:
         Returns:
             List[int] format of guess.
         """
-        if " " in guess_input:
-            numbers = guess_input.split()
-        else:
-            numbers = list(guess_input)
+        numbers = self._split_tokens(guess_input)
             
         logger.debug("Prase Guess input successful")
         return [int(_) for _ in numbers]
     
+    @staticmethod
+    def _split_tokens(guess_input: str) -> List[str]:
+        """
+        Splits input into one token per position.
+        
+        Whitespace-separated input is split on whitespace, so multi-digit
+        numbers (custom configurations above 9) are one token each; input
+        without whitespace has one digit per position.
+        
+        Args:
+            guess_input: Raw string input from user
+            
+        Returns:
+            List[str]: The number tokens
+        """
+        stripped = guess_input.strip()
+        if any(c.isspace() for c in stripped):
+            return stripped.split()
+        return list(stripped)
+    
     def validate_number_range(self, numbers: List[int]) -> ValidationResult:
         """
         Validates that all numbers are within the allowed range.
@@ -0,0 +1,139 @@
+import asyncio
+import threading
+from unittest.mock import Mock
+import pytest
+
+from src.core.async_game import AsyncGame
+from src.core.models.game_status import GameStatus
+from src.core.models.guess import Guess
+from src.repository.async_sqlite import AsyncSQLiteGameRepository
+from src.services.exceptions.exceptions import GameNotFoundError
+
+
+class TestAsyncGame:
+    @pytest.fixture
+    def generator(self):
+        generator = Mock()
+        generator.generate.return_value = [1, 2, 3, 4]
+        return generator
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return str(tmp_path / "async_game.db")
+
+    def test_guesses_are_saved(self, db_path, generator):
+        """
+        Test a game played through the facade is persisted and resumes
+        """
+        async def scenario():
+            async with AsyncSQLiteGameRepository(db_path) as repository:
+                game = await AsyncGame.create(repository, generator=generator)
+                await game.make_guess(Guess([0, 0, 0, 0]))
+                await game.make_guess(Guess([1, 2, 3, 4]))
+                return game, await AsyncGame.load(repository, game.game_id)
+
+        game, reloaded = asyncio.run(scenario())
+        assert game.get_status() == GameStatus.WON
+        assert reloaded.get_status() == GameStatus.WON
+        assert reloaded.get_code_pattern() == [1, 2, 3, 4]
+        assert [guess.get_numbers() for guess, _ in reloaded.get_guess_history()] == \
+            [[0, 0, 0, 0], [1, 2, 3, 4]]
+
+    def test_concurrent_sessions(self, db_path, generator):
+        """
+        Test many games progress concurrently on one loop and each history is kept intact
+        """
+        async def play(repository):
+            game = await AsyncGame.create(repository, generator=generator)
+            for numbers in ([0, 0, 0, 0], [5, 5, 5, 5], [4, 3, 2, 1]):
+                await game.make_guess(Guess(numbers))
+            return game.game_id
+
+        async def scenario():
+            async with AsyncSQLiteGameRepository(db_path) as repository:
+                game_ids = await asyncio.gather(*(play(repository) for _ in range(50)))
+                return await repository.load_many(game_ids)
+
+        states = asyncio.run(scenario())
+        assert len(states) == 50
+        assert all(state.attempts == 3 and len(state.guess_records) == 3 for state in states.values())
+
+    def test_hint_and_candidates(self, db_path, generator):
+        async def scenario():
+            async with AsyncSQLiteGameRepository(db_path) as repository:
+                game = await AsyncGame.create(repository, generator=generator)
+                await game.make_guess(Guess([1, 2, 4, 3]))
+                hint = await game.get_hint()
+                return game, hint, await game.get_remaining_candidates(), \
+                    await game.is_consistent_guess(Guess([1, 2, 3, 4]))
+
+        game, hint, remaining, consistent = asyncio.run(scenario())
+        assert len(hint.get_numbers()) == game.config.pattern_length
+        assert 0 < remaining < 8 ** 4
+        assert consistent
+        assert game.get_remaining_attempts() == game.config.max_attempts - 1
+
+    def test_load_missing_game(self, db_path):
+        async def scenario():
+            async with AsyncSQLiteGameRepository(db_path) as repository:
+                await AsyncGame.load(repository, "wrong_id")
+
+        with pytest.raises(GameNotFoundError):
+            asyncio.run(scenario())
+
+    def test_guess_narrows_candidates_off_the_loop(self, db_path, generator):
+        """
+        Test a guess runs in the executor once the game tracks its candidate set
+        """
+        async def scenario():
+            async with AsyncSQLiteGameRepository(db_path) as repository:
+                game = await AsyncGame.create(repository, generator=generator)
+                before = await game.get_remaining_candidates()
+                original = game._game.make_guess
+                threads = []
+
+                def make_guess(guess):
+                    threads.append(threading.current_thread())
+                    original(guess)
+
+                game._game.make_guess = make_guess
+                await game.make_guess(Guess([1, 2, 4, 3]))
+                return threads, before, await game.get_remaining_candidates()
+
+        threads, before, after = asyncio.run(scenario())
+        assert threads and threads[0] is not threading.main_thread()
+        assert after < before
+
+    def test_cancelled_call_keeps_the_lock_until_its_thread_is_done(self, db_path, generator):
+        """
+        Test a guess waits for a cancelled hint's thread instead of racing it
+        """
+        async def scenario():
+            async with AsyncSQLiteGameRepository(db_path) as repository:
+                game = await AsyncGame.create(repository, generator=generator)
+                started = threading.Event()
+                release = threading.Event()
+                events = []
+
+                def slow_count():
+                    started.set()
+                    release.wait(5)
+                    events.append("count")
+                    return 0
+
+                game._game.get_remaining_candidates = slow_count
+                count = asyncio.ensure_future(game.get_remaining_candidates())
+                await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+                count.cancel()
+                guess = asyncio.ensure_future(game.make_guess(Guess([0, 0, 0, 0])))
+                await asyncio.sleep(0.05)
+                events.append("guessed" if guess.done() else "waiting")
+                release.set()
+                await guess
+                with pytest.raises(asyncio.CancelledError):
+                    await count
+                return events, game.get_guess_history()
+
+        events, history = asyncio.run(scenario())
+        assert events == ["waiting", "count"]
+        assert len(history) == 1
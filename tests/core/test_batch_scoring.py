@@ -0,0 +1,80 @@
+import random
+import numpy as np
+import pytest
+
+from src.core.config.game_config import GameConfig
+from src.core.game_logic import GameLogic
+from src.core.models.game_difficulty import Difficulty
+from src.core.models.guess import Guess
+from src.core.scoring.batch import as_code_array, color_histograms, score_batch
+
+
+class TestBatchScoring:
+    @pytest.fixture(params=[Difficulty.NORMAL, Difficulty.HARD])
+    def config(self, request):
+        return GameConfig(difficulty=request.param)
+
+    def _random_codes(self, config, count, seed):
+        rng = random.Random(seed)
+        return [[rng.randint(config.min_number, config.max_number) for _ in range(config.pattern_length)]
+                for _ in range(count)]
+
+    def test_matches_scalar_check_guess(self, config):
+        """
+        Test every batch result equals the scalar check_guess result
+        """
+        game_logic = GameLogic(config)
+        guesses = self._random_codes(config, 40, seed=1)
+        codes = self._random_codes(config, 30, seed=2)
+
+        numbers, positions = game_logic.check_guesses([Guess(g) for g in guesses], codes)
+
+        assert numbers.shape == positions.shape == (40, 30)
+        for i, guess in enumerate(guesses):
+            for j, code in enumerate(codes):
+                feedback = game_logic.check_guess(
+                    Guess(guess), game_logic.calculate_pattern_counts(code), code)
+                assert numbers[i, j] == feedback.numbers_correct
+                assert positions[i, j] == feedback.positions_correct
+
+    def test_small_chunks_give_same_result(self, config):
+        """
+        Test chunking does not change the scores
+        """
+        guesses = self._random_codes(config, 25, seed=3)
+        codes = self._random_codes(config, 25, seed=4)
+
+        full = score_batch(guesses, codes, config)
+        chunked = score_batch(guesses, codes, config, chunk_elements=1)
+
+        assert np.array_equal(full[0], chunked[0])
+        assert np.array_equal(full[1], chunked[1])
+
+    def test_chunked_histograms(self):
+        codes = np.array([[0, 3, 3, 1], [2, 2, 2, 2], [7, 0, 7, 0]])
+        full = color_histograms(codes, 8)
+        assert np.array_equal(color_histograms(codes, 8, chunk_elements=1), full)
+        assert full[1].tolist() == [0, 0, 4, 0, 0, 0, 0, 0]
+
+    def test_compact_dtype(self, game_config):
+        numbers, positions = score_batch([[1, 2, 3, 4]], [[4, 3, 2, 1]], game_config)
+        assert numbers.dtype == np.uint8
+        assert positions.dtype == np.uint8
+        assert (numbers[0, 0], positions[0, 0]) == (4, 0)
+
+    def test_empty_batch(self, game_config):
+        numbers, positions = score_batch([], [[1, 2, 3, 4]], game_config)
+        assert numbers.shape == (0, 1)
+        assert positions.shape == (0, 1)
+
+    @pytest.mark.parametrize("codes", [
+        [[1, 2, 3]],
+        [[1, 2, 3, 8]],
+        [[-1, 2, 3, 4]],
+    ])
+    def test_invalid_codes(self, game_config, codes):
+        """
+        Test codes with wrong length or out of range values are rejected
+        """
+        with pytest.raises(ValueError):
+            as_code_array(codes, game_config)
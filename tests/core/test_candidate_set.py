@@ -0,0 +1,85 @@
+from unittest.mock import Mock, patch
+import pytest
+
+from src.core.candidate_set import CandidateSet
+from src.core.game import Game
+from src.core.game_logic import GameLogic
+from src.core.models.feedback import Feedback
+from src.core.models.guess import Guess
+
+
+class TestCandidateSet:
+    def _records(self, game_config, secret, guesses):
+        game_logic = GameLogic(game_config)
+        pattern_count = game_logic.calculate_pattern_counts(secret)
+        return [(Guess(g), game_logic.check_guess(Guess(g), pattern_count, secret)) for g in guesses]
+
+    def test_starts_with_full_code_space(self, game_config):
+        candidates = CandidateSet(game_config)
+        assert len(candidates) == 4096
+        assert candidates.contains([7, 7, 7, 7])
+
+    def test_incremental_matches_rebuild(self, game_config):
+        """
+        Test applying records one by one gives the same set as a full rebuild
+        """
+        records = self._records(game_config, [2, 2, 5, 0], [[0, 0, 1, 1], [2, 3, 4, 5], [2, 2, 0, 5]])
+        incremental = CandidateSet(game_config)
+        for guess, feedback in records:
+            before = len(incremental)
+            incremental.apply(guess, feedback)
+            assert len(incremental) <= before
+
+        rebuilt = CandidateSet.from_history(game_config, records)
+        assert incremental.indices.tolist() == rebuilt.indices.tolist()
+        assert incremental.contains([2, 2, 5, 0])
+
+    def test_removed_codes_are_not_contained(self, game_config):
+        candidates = CandidateSet(game_config)
+        candidates.apply(Guess([1, 2, 3, 4]), Feedback(0, 0))
+
+        assert not candidates.contains([1, 0, 0, 0])
+        assert candidates.contains([0, 5, 6, 7])
+        assert len(candidates) == 4 ** 4
+
+    @pytest.mark.parametrize("numbers", [[1, 2, 3], [8, 0, 0, 0]])
+    def test_contains_rejects_invalid_codes(self, game_config, numbers):
+        assert not CandidateSet(game_config).contains(numbers)
+
+    def test_indices_are_read_only(self, game_config):
+        with pytest.raises(ValueError):
+            CandidateSet(game_config).indices[0] = 5
+
+
+class TestGameCandidates:
+    @pytest.fixture
+    def game(self):
+        generator = Mock()
+        generator.generate.return_value = [1, 2, 3, 4]
+        return Game(generator=generator)
+
+    def test_game_tracks_candidates_incrementally(self, game):
+        assert game.get_remaining_candidates() == 4096
+
+        game.make_guess(Guess([1, 1, 2, 2]))
+        after_one = game.get_remaining_candidates()
+        game.make_guess(Guess([3, 4, 5, 6]))
+
+        assert game.get_remaining_candidates() < after_one
+        assert game.is_consistent_guess(Guess([1, 2, 3, 4]))
+        assert not game.is_consistent_guess(Guess([1, 1, 2, 2]))
+
+    def test_candidates_not_built_until_needed(self, game):
+        game.make_guess(Guess([1, 1, 2, 2]))
+        assert game._candidates is None
+
+    def test_restored_game_rebuilds_lazily(self, game):
+        game.make_guess(Guess([1, 1, 2, 2]))
+        game.make_guess(Guess([3, 4, 5, 6]))
+        expected = game.get_remaining_candidates()
+
+        with patch.object(CandidateSet, "from_history", wraps=CandidateSet.from_history) as rebuild:
+            reloaded = Game(game_id=game.game_id)
+            rebuild.assert_not_called()
+            assert reloaded.get_remaining_candidates() == expected
+            rebuild.assert_called_once()
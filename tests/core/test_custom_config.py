@@ -0,0 +1,138 @@
+from unittest.mock import Mock
+import numpy as np
+import pytest
+
+from src.core.candidate_set import CandidateSet, SampledCandidateSet, candidate_set_for
+from src.core.config.game_config import GameConfig
+from src.core.game import Game
+from src.core.game_logic import GameLogic
+from src.core.models.game_difficulty import Difficulty
+from src.core.models.game_status import GameStatus
+from src.core.models.guess import Guess
+from src.core.scoring.code_space import all_codes, code_space_size, codes_to_indices, codes_from_indices, is_enumerable
+from src.core.scoring.lookup_table import feedback_table_for, pack_feedback
+from src.repository.memory import InMemoryGameRepository
+
+
+@pytest.fixture
+def large_config():
+    return GameConfig(Difficulty.CUSTOM, pattern_length=8, max_number=11, max_attempts=14)
+
+
+SECRET = [3, 11, 0, 7, 7, 2, 9, 5]
+
+
+class TestCustomGameConfig:
+    def test_custom_rules(self, large_config):
+        assert large_config.pattern_length == 8
+        assert large_config.min_number == 0
+        assert large_config.max_number == 11
+        assert large_config.max_attempts == 14
+        assert code_space_size(large_config) == 12 ** 8
+
+    def test_unset_rules_default_to_normal(self):
+        config = GameConfig(Difficulty.CUSTOM, pattern_length=6)
+        assert (config.min_number, config.max_number, config.max_attempts) == (0, 7, 10)
+
+    def test_presets_reject_custom_rules(self):
+        with pytest.raises(ValueError):
+            GameConfig(Difficulty.NORMAL, pattern_length=6)
+
+    @pytest.mark.parametrize("rules", [
+        {"pattern_length": 0},
+        {"pattern_length": 16},
+        {"min_number": 5, "max_number": 4},
+        {"min_number": -1},
+        {"max_attempts": 0},
+        {"pattern_length": 15, "max_number": 99},
+        {"pattern_length": 1, "max_number": 1 << 40},
+    ])
+    def test_invalid_rules(self, rules):
+        with pytest.raises(ValueError):
+            GameConfig(Difficulty.CUSTOM, **rules)
+
+    def test_dict_round_trip(self, large_config):
+        restored = GameConfig.from_dict(large_config.to_dict())
+        assert restored.to_dict() == large_config.to_dict()
+        assert GameConfig.from_dict({}).difficulty == Difficulty.NORMAL
+
+
+class TestLargeCodeSpace:
+    def _records(self, config, guesses):
+        game_logic = GameLogic(config)
+        pattern_count = game_logic.calculate_pattern_counts(SECRET)
+        return [(Guess(g), game_logic.check_guess(Guess(g), pattern_count, SECRET)) for g in guesses]
+
+    def test_code_space_is_not_enumerated(self, large_config):
+        assert not is_enumerable(large_config)
+        with pytest.raises(ValueError):
+            all_codes(large_config)
+
+    def test_index_conversions_round_trip(self, large_config):
+        codes = np.array([SECRET, [11] * 8, [0] * 8])
+        assert codes_from_indices(codes_to_indices(codes, large_config), large_config).tolist() == codes.tolist()
+
+    def test_sampled_candidates_are_consistent(self, large_config):
+        """
+        Test every sampled code matches all feedback, and the secret is recognised
+        """
+        records = self._records(large_config, [[0, 0, 0, 1, 1, 2, 3, 4], [8, 0, 5, 0, 10, 6, 11, 4],
+                                               [10, 7, 7, 1, 1, 0, 9, 6]])
+        candidates = candidate_set_for(large_config, records)
+
+        assert isinstance(candidates, SampledCandidateSet)
+        assert 0 < len(candidates) <= candidates.sample_size
+        assert candidates.contains(SECRET)
+        assert not candidates.contains([0, 0, 0, 1, 1, 2, 3, 4])
+        assert not candidates.contains([12, 0, 0, 0, 0, 0, 0, 0])
+
+        game_logic = GameLogic(large_config)
+        for code in candidates.codes()[:50].tolist():
+            pattern_count = game_logic.calculate_pattern_counts(code)
+            for guess, feedback in records:
+                expected = game_logic.check_guess(guess, pattern_count, code)
+                assert (expected.numbers_correct, expected.positions_correct) == \
+                    (feedback.numbers_correct, feedback.positions_correct)
+
+    def test_apply_filters_sample(self, large_config):
+        records = self._records(large_config, [[0, 0, 0, 1, 1, 2, 3, 4], [8, 0, 5, 0, 10, 6, 11, 4]])
+        candidates = SampledCandidateSet.from_history(large_config, records[:1])
+        first = set(candidates.indices.tolist())
+
+        candidates.apply(*records[1])
+        assert candidates.contains(SECRET)
+        assert len(candidates) > 0
+        assert len(first) == candidates.sample_size
+
+    def test_small_spaces_stay_exact(self, game_config):
+        assert isinstance(candidate_set_for(game_config, []), CandidateSet)
+
+    def test_lazy_table_scores_without_rows(self, large_config):
+        table = feedback_table_for(large_config)
+        guesses = np.array([0, 12 ** 8 - 1])
+        codes = codes_to_indices(np.array([SECRET, [0] * 8]), large_config)
+
+        block = table.block(guesses, codes)
+        assert block[0, 1] == pack_feedback(8, 8, 8)
+        assert table.lookup(int(guesses[1]), int(codes[1])) == 0
+        with pytest.raises(ValueError):
+            table.row(0)
+
+
+class TestLargeGame:
+    def test_hints_solve_large_game(self, large_config):
+        """
+        Test hints win an 8 position, 12 color game and the state round-trips
+        """
+        repository = InMemoryGameRepository()
+        generator = Mock()
+        generator.generate.return_value = SECRET
+        game = Game(repository=repository, generator=generator, config=large_config)
+
+        while game.get_status() == GameStatus.IN_PROGRESS:
+            game.make_guess(game.get_hint())
+
+        assert game.get_status() == GameStatus.WON
+        reloaded = Game(repository=repository, game_id=game.game_id)
+        assert reloaded.config.to_dict() == large_config.to_dict()
+        assert reloaded.get_code_pattern() == SECRET
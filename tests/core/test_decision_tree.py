@@ -0,0 +1,107 @@
+from unittest.mock import Mock, patch
+import pytest
+
+from src.core.config.game_config import GameConfig
+from src.core.game import Game
+from src.core.game_logic import GameLogic
+from src.core.models.game_difficulty import Difficulty
+from src.core.models.game_status import GameStatus
+from src.core.models.guess import Guess
+from src.core.models.solver_strategy import SolverStrategy
+from src.core.scoring.code_space import code_space_size, index_to_code
+from src.core.solver.decision_tree import DecisionTree, load_decision_tree, tree_file_name
+from src.core.solver.solver import Solver
+from src.repository.sqlite import SQLiteGameRepository
+
+
+class TestDecisionTree:
+    @pytest.fixture(scope="class")
+    def tree(self):
+        return load_decision_tree(GameConfig())
+
+    def _play(self, tree, secret):
+        game_logic = GameLogic(tree.config)
+        pattern_count = game_logic.calculate_pattern_counts(secret)
+        records = []
+        while True:
+            guess = tree.next_guess(records)
+            feedback = game_logic.check_guess(guess, pattern_count, secret)
+            records.append((guess, feedback))
+            if feedback.positions_correct == tree.config.pattern_length:
+                return records
+
+    def test_shipped_tree_is_loaded_once(self, tree):
+        assert tree is not None
+        assert load_decision_tree(GameConfig()) is tree
+        assert tree.strategy == SolverStrategy.MINIMAX
+
+    @pytest.mark.parametrize("secret_index", range(0, 4096, 97))
+    def test_tree_solves_secrets(self, tree, secret_index):
+        """
+        Test following the tree wins within the allowed attempts
+        """
+        records = self._play(tree, index_to_code(secret_index, tree.config))
+        assert len(records) <= tree.config.max_attempts
+
+    def test_worst_case_depth(self, tree):
+        assert tree.max_depth() <= tree.config.max_attempts
+        assert len(tree) < code_space_size(tree.config) * 2
+
+    def test_opening_matches_solver(self, tree):
+        assert tree.next_guess([]).get_numbers() == Solver(GameConfig()).suggest([]).get_numbers()
+
+    def test_history_off_the_tree(self, tree):
+        records = self._play(tree, [3, 1, 4, 1])
+        off_tree = [(Guess([7, 7, 7, 7]), records[0][1])]
+
+        assert tree.next_guess(off_tree) is None
+        assert tree.next_guess(records[:-1]).get_numbers() == records[-1][0].get_numbers()
+
+    def test_save_and_load(self, tree, tmp_path):
+        path = tmp_path / tree_file_name(tree.config)
+        tree.save(path)
+        loaded = DecisionTree.load(GameConfig(), path)
+
+        assert loaded.guesses.tolist() == tree.guesses.tolist()
+        assert loaded.edge_child.tolist() == tree.edge_child.tolist()
+        assert loaded.strategy == tree.strategy
+
+    def test_load_rejects_other_config(self, tree, tmp_path):
+        path = tmp_path / "tree.npz"
+        tree.save(path)
+        with pytest.raises(ValueError):
+            DecisionTree.load(GameConfig(Difficulty.HARD), path)
+
+    def test_missing_tree(self, tmp_path):
+        assert load_decision_tree(GameConfig(), directory=tmp_path) is None
+
+
+class TestGameHintFromTree:
+    def test_sqlite_game_hint_skips_search(self, tmp_path):
+        """
+        Test a game reloaded from SQLite gets hints by walking the tree
+        """
+        repository = SQLiteGameRepository(str(tmp_path / "games.db"))
+        generator = Mock()
+        generator.generate.return_value = [5, 0, 2, 6]
+        game = Game(repository=repository, generator=generator)
+        game.make_guess(game.get_hint())
+
+        reloaded = Game(repository=repository, game_id=game.game_id)
+        with patch.object(Solver, "suggest") as suggest:
+            hint = reloaded.get_hint()
+            suggest.assert_not_called()
+
+        tree = load_decision_tree(GameConfig())
+        assert hint.get_numbers() == tree.next_guess(reloaded.guess_records).get_numbers()
+        assert reloaded.get_status() == GameStatus.IN_PROGRESS
+
+    def test_off_tree_game_falls_back_to_solver(self):
+        generator = Mock()
+        generator.generate.return_value = [5, 0, 2, 6]
+        game = Game(generator=generator)
+        game.make_guess(Guess([7, 7, 7, 6]))
+
+        with patch.object(Solver, "suggest", return_value=Guess([5, 0, 2, 6])) as suggest:
+            assert game.get_hint().get_numbers() == [5, 0, 2, 6]
+            suggest.assert_called_once()
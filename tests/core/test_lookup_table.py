@@ -0,0 +1,97 @@
+import random
+import numpy as np
+import pytest
+
+from src.core.config.game_config import GameConfig
+from src.core.game_logic import GameLogic
+from src.core.models.game_difficulty import Difficulty
+from src.core.models.guess import Guess
+from src.core.scoring.code_space import code_space_size, code_to_index, index_to_code
+from src.core.scoring.lookup_table import (FeedbackTable, LazyFeedbackTable, feedback_table_for,
+                                           pack_feedback, table_file_name, unpack_feedback)
+
+
+class TestCodeSpace:
+    @pytest.mark.parametrize("difficulty,expected_size", [
+        (Difficulty.NORMAL, 4096),
+        (Difficulty.HARD, 100000),
+    ])
+    def test_code_space_size(self, difficulty, expected_size):
+        assert code_space_size(GameConfig(difficulty)) == expected_size
+
+    def test_index_round_trip(self, game_config):
+        for index in [0, 1, 7, 8, 511, 4095]:
+            assert code_to_index(index_to_code(index, game_config), game_config) == index
+        assert index_to_code(0, game_config) == [0, 0, 0, 0]
+        assert index_to_code(4095, game_config) == [7, 7, 7, 7]
+
+
+class TestFeedbackTable:
+    @pytest.fixture(scope="class")
+    def table_dir(self, tmp_path_factory):
+        return tmp_path_factory.mktemp("tables")
+
+    @pytest.fixture(scope="class")
+    def normal_table(self, table_dir):
+        return FeedbackTable.build(GameConfig(), table_dir / table_file_name(GameConfig()))
+
+    def test_pack_round_trip(self):
+        for numbers in range(5):
+            for positions in range(numbers + 1):
+                feedback = unpack_feedback(pack_feedback(numbers, positions, 4), 4)
+                assert (feedback.numbers_correct, feedback.positions_correct) == (numbers, positions)
+
+    def test_built_table_is_memory_mapped(self, normal_table):
+        assert isinstance(normal_table.table, np.memmap)
+        assert normal_table.table.shape == (4096, 4096)
+        assert normal_table.table.dtype == np.uint8
+
+    def test_table_matches_scalar_path(self, normal_table, game_config):
+        """
+        Test random table entries against GameLogic.check_guess
+        """
+        game_logic = GameLogic(game_config)
+        rng = random.Random(7)
+        for _ in range(200):
+            guess = index_to_code(rng.randrange(4096), game_config)
+            code = index_to_code(rng.randrange(4096), game_config)
+            expected = game_logic.check_guess(
+                Guess(guess), game_logic.calculate_pattern_counts(code), code)
+            feedback = normal_table.feedback(guess, code)
+            assert feedback.numbers_correct == expected.numbers_correct
+            assert feedback.positions_correct == expected.positions_correct
+
+    def test_factory_loads_existing_file(self, normal_table, table_dir):
+        table = feedback_table_for(GameConfig(), table_dir)
+        assert isinstance(table, FeedbackTable)
+        assert np.array_equal(table.row(123), normal_table.row(123))
+
+    def test_load_rejects_other_config(self, normal_table, table_dir):
+        with pytest.raises(ValueError):
+            FeedbackTable.load(GameConfig(Difficulty.HARD), table_dir / table_file_name(GameConfig()))
+
+
+class TestLazyFeedbackTable:
+    def test_factory_uses_lazy_table_for_hard(self, tmp_path):
+        table = feedback_table_for(GameConfig(Difficulty.HARD), tmp_path)
+        assert isinstance(table, LazyFeedbackTable)
+        assert not any(tmp_path.iterdir())
+
+    def test_lazy_rows_match_scalar_path(self):
+        config = GameConfig(Difficulty.HARD)
+        game_logic = GameLogic(config)
+        table = LazyFeedbackTable(config, max_cached_rows=2)
+
+        guess = [1, 2, 3, 4, 5]
+        for code in ([1, 2, 3, 4, 5], [5, 4, 3, 2, 1], [1, 1, 9, 9, 0]):
+            expected = game_logic.check_guess(
+                Guess(guess), game_logic.calculate_pattern_counts(code), code)
+            feedback = table.feedback(guess, code)
+            assert feedback.numbers_correct == expected.numbers_correct
+            assert feedback.positions_correct == expected.positions_correct
+
+    def test_row_cache_is_bounded(self):
+        table = LazyFeedbackTable(GameConfig(Difficulty.HARD), max_cached_rows=2)
+        for guess_index in range(5):
+            table.row(guess_index)
+        assert len(table._rows) == 2
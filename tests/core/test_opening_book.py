@@ -0,0 +1,82 @@
+from unittest.mock import patch
+import pytest
+
+from src.core.config.game_config import GameConfig
+from src.core.game_logic import GameLogic
+from src.core.models.feedback import Feedback
+from src.core.models.game_difficulty import Difficulty
+from src.core.models.guess import Guess
+from src.core.models.solver_strategy import SolverStrategy
+from src.core.solver.opening_book import OpeningBook, book_file_name, load_opening_book
+from src.core.solver.solver import Solver
+
+
+class TestOpeningBook:
+    @pytest.fixture(scope="class")
+    def book(self):
+        return OpeningBook.compute(GameConfig(), depth=2)
+
+    def _feedback(self, guess, secret):
+        game_logic = GameLogic(GameConfig())
+        return game_logic.check_guess(guess, game_logic.calculate_pattern_counts(secret), secret)
+
+    def test_book_matches_solver(self, book):
+        """
+        Test book answers equal what the solver computes on the same history
+        """
+        solver = Solver(GameConfig())
+        opening = book.lookup([])
+        assert opening.get_numbers() == solver.suggest([]).get_numbers()
+
+        records = [(opening, self._feedback(opening, [6, 1, 6, 3]))]
+        assert book.lookup(records).get_numbers() == solver.suggest(records).get_numbers()
+
+    def test_has_reply_for_every_branch(self, book):
+        replies = [key for key in book.entries if len(key) == 1]
+        assert len(book.entries) == 1 + len(replies)
+        assert len(replies) > 5
+
+    def test_lookup_outside_book(self, book):
+        opening = book.lookup([])
+        other = Guess([7, 7, 7, 7])
+        second = book.lookup([(opening, Feedback(1, 0))])
+
+        assert book.lookup([(other, Feedback(1, 0))]) is None
+        assert book.lookup([(opening, Feedback(1, 0)), (second, Feedback(1, 1))]) is None
+
+    def test_save_and_load(self, book, tmp_path):
+        path = tmp_path / book_file_name(book.config)
+        book.save(path)
+        loaded = OpeningBook.load(GameConfig(), path)
+
+        assert loaded.entries == book.entries
+        assert loaded.depth == 2
+        assert loaded.strategy == SolverStrategy.MINIMAX
+        assert path.stat().st_size < 200
+
+    def test_load_rejects_other_config(self, book, tmp_path):
+        path = tmp_path / "book.book"
+        book.save(path)
+        with pytest.raises(ValueError):
+            OpeningBook.load(GameConfig(Difficulty.HARD), path)
+
+    def test_solver_skips_search_in_book(self, book):
+        solver = Solver(GameConfig(), opening_book=book)
+        with patch.object(Solver, "_search") as search:
+            assert solver.suggest([]).get_numbers() == book.lookup([]).get_numbers()
+            search.assert_not_called()
+
+    @pytest.mark.parametrize("difficulty", [Difficulty.NORMAL, Difficulty.HARD])
+    def test_shipped_books(self, difficulty):
+        """
+        Test the packaged books load lazily and cover the opening
+        """
+        config = GameConfig(difficulty)
+        book = load_opening_book(config)
+
+        assert book is not None
+        assert load_opening_book(config) is book
+        assert book.lookup([]) is not None
+
+    def test_missing_book(self, tmp_path):
+        assert load_opening_book(GameConfig(), directory=tmp_path) is None
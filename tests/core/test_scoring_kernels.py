@@ -0,0 +1,92 @@
+import itertools
+import random
+import pytest
+
+from src.core.config.game_config import GameConfig
+from src.core.game_logic import GameLogic
+from src.core.models.game_difficulty import Difficulty
+from src.core.models.guess import Guess
+from src.core.models.scoring_kernel import ScoringKernel
+from src.core.scoring.kernels import BitmaskScorer, StandardScorer, create_scorer
+
+
+class TestScoringKernels:
+    @pytest.fixture(params=[Difficulty.NORMAL, Difficulty.HARD])
+    def config(self, request):
+        return GameConfig(difficulty=request.param)
+
+    def _counts(self, code):
+        counts = {}
+        for num in code:
+            counts[num] = counts.get(num, 0) + 1
+        return counts
+
+    def test_bitmask_matches_standard(self, config):
+        """
+        Test the bitmask kernel against the reference kernel on random pairs
+        """
+        rng = random.Random(11)
+        standard = StandardScorer()
+        bitmask = BitmaskScorer(config)
+        values = range(config.min_number, config.max_number + 1)
+
+        for _ in range(2000):
+            guess = [rng.choice(values) for _ in range(config.pattern_length)]
+            code = [rng.choice(values) for _ in range(config.pattern_length)]
+            counts = self._counts(code)
+            assert bitmask.score(guess, code, counts) == standard.score(guess, code, counts)
+
+    def test_bitmask_matches_standard_with_repeats(self, game_config):
+        """
+        Test every combination of a few heavily repeated colors
+        """
+        standard = StandardScorer()
+        bitmask = BitmaskScorer(game_config)
+        codes = list(itertools.product([0, 1, 7], repeat=4))
+
+        for guess in codes:
+            for code in codes:
+                counts = self._counts(code)
+                assert bitmask.score(guess, code, counts) == standard.score(guess, code, counts)
+
+    def test_out_of_range_falls_back(self, game_config):
+        bitmask = BitmaskScorer(game_config)
+        assert bitmask.encode([5, 6, 7, 8]) is None
+        assert bitmask.score([5, 6, 7, 8], [1, 2, 3, 4], {1: 1, 2: 1, 3: 1, 4: 1}) == (0, 0)
+
+    def test_encoding_cache_is_bounded(self, game_config):
+        bitmask = BitmaskScorer(game_config, max_cached_codes=4)
+        for code in itertools.product(range(3), repeat=4):
+            bitmask.encode(code)
+        assert len(bitmask._encodings) <= 4
+
+    @pytest.mark.parametrize("kernel,expected_type", [
+        (ScoringKernel.STANDARD, StandardScorer),
+        (ScoringKernel.BITMASK, BitmaskScorer),
+    ])
+    def test_game_logic_selects_kernel_by_config(self, kernel, expected_type):
+        game_logic = GameLogic(GameConfig(scoring_kernel=kernel))
+        assert isinstance(game_logic._scorer, expected_type)
+        assert isinstance(create_scorer(GameConfig(scoring_kernel=kernel)), expected_type)
+
+        feedback = game_logic.check_guess(Guess([1, 1, 2, 2]), {1: 2, 2: 2}, [1, 2, 1, 2])
+        assert (feedback.numbers_correct, feedback.positions_correct) == (4, 2)
+
+    def test_default_kernel_depends_on_code_space(self):
+        """
+        Test bitmask is the default only while its memo holds the code space
+        """
+        assert GameConfig().scoring_kernel == ScoringKernel.BITMASK
+        assert GameConfig(Difficulty.HARD).scoring_kernel == ScoringKernel.STANDARD
+        assert GameConfig(Difficulty.CUSTOM, pattern_length=8, max_number=3).scoring_kernel == ScoringKernel.BITMASK
+        assert GameConfig(Difficulty.CUSTOM, pattern_length=9, max_number=3).scoring_kernel == ScoringKernel.STANDARD
+
+    def test_kernel_round_trips_through_dict(self):
+        """
+        Test a kernel other than the default is persisted, the default is not
+        """
+        hard_bitmask = GameConfig(Difficulty.HARD, ScoringKernel.BITMASK)
+        assert hard_bitmask.to_dict() == {"difficulty": "hard", "scoring_kernel": "bitmask"}
+        assert GameConfig.from_dict(hard_bitmask.to_dict()).scoring_kernel == ScoringKernel.BITMASK
+        assert GameConfig(Difficulty.HARD).to_dict() == {"difficulty": "hard"}
+        assert GameConfig.from_dict({"difficulty": "hard"}).scoring_kernel == ScoringKernel.STANDARD
@@ -0,0 +1,114 @@
+import time
+from unittest.mock import Mock
+import pytest
+
+from src.core.config.game_config import GameConfig
+from src.core.game import Game
+from src.core.game_logic import GameLogic
+from src.core.models.game_difficulty import Difficulty
+from src.core.models.guess import Guess
+from src.core.models.solver_strategy import SolverStrategy
+from src.core.scoring.code_space import index_to_code
+from src.core.scoring.lookup_table import FeedbackTable
+from src.core.solver.solver import Solver
+
+
+def play(solver, game_logic, secret, max_attempts):
+    """
+    Let the solver play against a secret, returning the guess history
+    """
+    records = []
+    pattern_count = game_logic.calculate_pattern_counts(secret)
+    for _ in range(max_attempts):
+        guess = solver.suggest(records)
+        feedback = game_logic.check_guess(guess, pattern_count, secret)
+        records.append((guess, feedback))
+        if feedback.is_winning_guess(len(secret)):
+            break
+    return records
+
+
+class TestSolver:
+    @pytest.fixture
+    def solver(self, game_config):
+        return Solver(game_config)
+
+    def test_symmetric_openings(self, solver):
+        openings = [index_to_code(int(i), solver.config) for i in solver._symmetric_openings()]
+        assert sorted(openings) == sorted([[0, 0, 0, 0], [0, 0, 0, 1], [0, 0, 1, 1],
+                                           [0, 0, 1, 2], [0, 1, 2, 3]])
+
+    def test_consistent_candidates(self, solver, game_config):
+        game_logic = GameLogic(game_config)
+        secret = [3, 1, 4, 1]
+        records = []
+        for numbers in ([0, 0, 1, 1], [2, 3, 4, 5]):
+            guess = Guess(numbers)
+            records.append((guess, game_logic.check_guess(
+                guess, game_logic.calculate_pattern_counts(secret), secret)))
+
+        candidates = [index_to_code(int(i), game_config) for i in solver.consistent_candidates(records)]
+
+        assert secret in candidates
+        for code in candidates:
+            for guess, feedback in records:
+                result = game_logic.check_guess(guess, game_logic.calculate_pattern_counts(code), code)
+                assert (result.numbers_correct, result.positions_correct) == \
+                    (feedback.numbers_correct, feedback.positions_correct)
+
+    @pytest.mark.parametrize("strategy", list(SolverStrategy))
+    @pytest.mark.parametrize("secret", [[0, 0, 0, 0], [7, 6, 5, 4], [1, 2, 1, 2]])
+    def test_solves_normal_games(self, game_config, strategy, secret):
+        """
+        Test every strategy cracks NORMAL codes within the attempt limit
+        """
+        solver = Solver(game_config, strategy=strategy)
+        records = play(solver, GameLogic(game_config), secret, game_config.max_attempts)
+
+        assert records[-1][0].get_numbers() == secret
+        assert len(records) <= game_config.max_attempts
+
+    def test_table_and_batch_kernels_agree(self, game_config):
+        table = FeedbackTable.compute(game_config)
+        game_logic = GameLogic(game_config)
+        secret = [5, 2, 2, 7]
+
+        with_table = play(Solver(game_config, table=table), game_logic, secret, 10)
+        without_table = play(Solver(game_config), game_logic, secret, 10)
+
+        assert [g.get_numbers() for g, _ in with_table] == [g.get_numbers() for g, _ in without_table]
+
+    def test_hard_respects_time_budget(self):
+        """
+        Test a HARD suggestion returns close to its budget with a usable guess
+        """
+        config = GameConfig(Difficulty.HARD)
+        game_logic = GameLogic(config)
+        secret = [9, 3, 3, 0, 5]
+        first = Guess([0, 0, 1, 1, 2])
+        records = [(first, game_logic.check_guess(first, game_logic.calculate_pattern_counts(secret), secret))]
+        solver = Solver(config, time_budget=0.2)
+
+        started = time.monotonic()
+        hint = solver.suggest(records)
+
+        assert time.monotonic() - started < 2.0
+        assert len(hint.get_numbers()) == config.pattern_length
+        assert all(config.min_number <= n <= config.max_number for n in hint.get_numbers())
+
+    def test_inconsistent_history(self, solver):
+        records = [(Guess([0, 0, 0, 0]), Mock(numbers_correct=4, positions_correct=0))]
+        with pytest.raises(ValueError):
+            solver.suggest(records)
+
+    def test_game_hint(self):
+        generator = Mock()
+        generator.generate.return_value = [1, 2, 3, 4]
+        game = Game(generator=generator)
+
+        game.make_guess(Guess([1, 1, 2, 2]))
+        hint = game.get_hint()
+
+        assert isinstance(hint, Guess)
+        assert [1, 2, 3, 4] in [index_to_code(int(i), game.config)
+                                for i in game._solver.consistent_candidates(game.guess_records)]
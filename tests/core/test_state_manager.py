@@ -1,8 +1,9 @@
-from unittest.mock import Mock
+import asyncio
+from unittest.mock import AsyncMock, Mock
 import pytest
 
 from src.core.models.game_status import GameStatus
-from src.core.state_manager import StateManager
+from src.core.state_manager import AsyncStateManager, StateManager
 from src.services.exceptions.exceptions import GameNotFoundError
 
 
@@ -57,4 +58,51 @@ class TestStateManager:
         Test state manager initialization with repository
         """
         manager = StateManager(mock_repository)
-        assert manager.repository == mock_repository
\ No newline at end of file
+        assert manager.repository == mock_repository
+
+    def test_save_states(self, mock_state_manager, mock_repository, sample_game_state):
+        """
+        Test bulk saving goes through a single repository call
+        """
+        mock_state_manager.save_states([sample_game_state])
+        mock_repository.save_many.assert_called_once_with([sample_game_state])
+        mock_repository.save_game.assert_not_called()
+        
+    def test_load_states_skips_missing(self, mock_state_manager, mock_repository, sample_game_state):
+        mock_repository.load_many.return_value = {"test-123": sample_game_state}
+        states = mock_state_manager.load_states(["test-123", "wrong_id"])
+        
+        mock_repository.load_many.assert_called_once_with(["test-123", "wrong_id"])
+        assert states == {"test-123": sample_game_state}
+
+    def test_load_status_uses_header(self, mock_state_manager, mock_repository, sample_game_state):
+        mock_repository.load_header.return_value = sample_game_state
+        assert mock_state_manager.load_status("test-123") == GameStatus.IN_PROGRESS
+        mock_repository.load_header.assert_called_once_with("test-123")
+        mock_repository.load_game.assert_not_called()
+
+
+class TestAsyncStateManager:
+    @pytest.fixture
+    def async_repository(self):
+        return AsyncMock()
+
+    def test_save_and_load(self, async_repository, sample_game_state):
+        async_repository.load_game.return_value = sample_game_state
+        manager = AsyncStateManager(async_repository)
+
+        asyncio.run(manager.save_state(sample_game_state))
+        assert asyncio.run(manager.load_state("test-123")) == sample_game_state
+        async_repository.save_game.assert_awaited_once_with(sample_game_state)
+
+    def test_load_state_not_found(self, async_repository):
+        async_repository.load_game.side_effect = GameNotFoundError("wrong_id")
+        with pytest.raises(GameNotFoundError):
+            asyncio.run(AsyncStateManager(async_repository).load_state("wrong_id"))
+
+    def test_load_states_skips_missing(self, async_repository, sample_game_state):
+        async_repository.load_many.return_value = {"test-123": sample_game_state}
+        states = asyncio.run(AsyncStateManager(async_repository).load_states(iter(["test-123", "wrong_id"])))
+
+        async_repository.load_many.assert_awaited_once_with(["test-123", "wrong_id"])
+        assert states == {"test-123": sample_game_state}
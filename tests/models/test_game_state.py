@@ -1,10 +1,12 @@
 from datetime import datetime
 import pytest
 
+from src.core.config.game_config import GameConfig
 from src.core.models.feedback import Feedback
+from src.core.models.game_difficulty import Difficulty
 from src.core.models.game_status import GameStatus
 from src.core.models.guess import Guess
-from src.core.models.game_state import GameState
+from src.core.models.game_state import GameState, LazyGameState
 
 
 class TestGameState:
@@ -62,4 +64,41 @@ class TestGameState:
         assert reconstructed_guess[0].get_numbers() == original_guess[0].get_numbers()
         assert reconstructed_guess[1].numbers_correct == original_guess[1].numbers_correct
         assert reconstructed_guess[1].positions_correct == original_guess[1].positions_correct
-    
\ No newline at end of file
+    
+
+    def test_preset_config_stores_only_difficulty(self, sample_game_state):
+        assert sample_game_state.to_db_format()["config"] == {"difficulty": "normal"}
+
+    def test_custom_config_round_trip(self, sample_game_state):
+        """
+        Test custom rules survive conversion to and from the database format
+        """
+        sample_game_state.config = GameConfig(Difficulty.CUSTOM, pattern_length=8, max_number=11, max_attempts=14)
+        sample_game_state.code_pattern = [3, 11, 0, 7, 7, 2, 9, 5]
+        sample_game_state.guess_records = [(Guess([0, 0, 0, 1, 1, 2, 3, 4]), Feedback(3, 2))]
+
+        reconstructed = GameState.from_db_format(sample_game_state.to_db_format())
+
+        assert reconstructed.config.difficulty == Difficulty.CUSTOM
+        assert (reconstructed.config.pattern_length, reconstructed.config.min_number,
+                reconstructed.config.max_number, reconstructed.config.max_attempts) == (8, 0, 11, 14)
+        assert reconstructed.code_pattern == [3, 11, 0, 7, 7, 2, 9, 5]
+
+    def test_lazy_state_loads_history_once(self, sample_game_state):
+        """
+        Test a LazyGameState decodes its history on first access only, and compares like a GameState
+        """
+        history = [(Guess([1, 2, 3, 4]), Feedback(4, 4))]
+        calls = []
+        header = {field: getattr(sample_game_state, field) for field in
+                  ("game_id", "code_pattern", "status", "attempts", "created_at", "updated_at", "config")}
+        lazy = LazyGameState(lambda: calls.append(1) or history, **header)
+
+        assert lazy.status == GameStatus.IN_PROGRESS and not lazy.history_loaded and calls == []
+        assert lazy.guess_records is history and lazy.guess_records is history
+        assert calls == [1]
+
+        sample_game_state.guess_records = list(history)
+        copied = lazy.copy()
+        assert type(copied) is GameState
+        assert lazy == sample_game_state and sample_game_state == lazy and copied == lazy
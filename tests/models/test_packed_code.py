@@ -0,0 +1,101 @@
+from dataclasses import replace
+import pytest
+
+from src.core.config.game_config import GameConfig
+from src.core.game_logic import GameLogic
+from src.core.models.game_difficulty import Difficulty
+from src.core.models.guess import Guess
+from src.core.models.packed_code import PackedCode, as_numbers
+from src.core.scoring.batch import score_batch
+from src.core.scoring.code_space import code_to_index
+from src.repository.memory import InMemoryGameRepository
+from src.repository.sqlite import SQLiteGameRepository
+
+
+class TestPackedCode:
+    @pytest.fixture
+    def packed(self, game_config):
+        return PackedCode.from_numbers([1, 2, 3, 4], game_config)
+
+    def test_round_trip(self, packed):
+        assert packed.to_list() == [1, 2, 3, 4]
+        assert list(packed) == [1, 2, 3, 4]
+        assert len(packed) == 4
+        assert packed[2] == 3
+        assert str(packed) == "1 2 3 4"
+
+    def test_value_matches_code_space_index(self, packed, game_config):
+        assert int(packed) == code_to_index([1, 2, 3, 4], game_config)
+
+    @pytest.mark.parametrize("difficulty", [Difficulty.NORMAL, Difficulty.HARD])
+    def test_extreme_codes(self, difficulty):
+        config = GameConfig(difficulty)
+        lowest = [config.min_number] * config.pattern_length
+        highest = [config.max_number] * config.pattern_length
+
+        assert int(PackedCode.from_numbers(lowest, config)) == 0
+        assert PackedCode.from_numbers(highest, config).to_list() == highest
+
+    def test_hashing_and_equality(self, packed, game_config):
+        same = PackedCode.from_numbers([1, 2, 3, 4], game_config)
+        other = PackedCode.from_numbers([4, 3, 2, 1], game_config)
+
+        assert packed == same
+        assert packed != other
+        assert hash(packed) == hash(int(packed))
+        assert len({packed, same, other}) == 2
+
+    def test_never_equals_lists(self, packed):
+        """
+        Test identity is the packed value and shape only, so equality stays transitive
+        """
+        wider = PackedCode(int(packed), pattern_length=4, min_number=0, base=9)
+        assert packed != [1, 2, 3, 4]
+        assert packed != (1, 2, 3, 4)
+        assert packed != wider
+        assert as_numbers(packed) == [1, 2, 3, 4]
+
+    def test_ordering(self, game_config):
+        codes = [PackedCode.from_numbers(numbers, game_config)
+                 for numbers in ([7, 0, 0, 0], [0, 0, 0, 1], [0, 0, 0, 0])]
+        assert [code.to_list() for code in sorted(codes)] == [[0, 0, 0, 0], [0, 0, 0, 1], [7, 0, 0, 0]]
+
+    @pytest.mark.parametrize("numbers", [[1, 2, 3], [1, 2, 3, 8]])
+    def test_invalid_numbers(self, game_config, numbers):
+        with pytest.raises(ValueError):
+            PackedCode.from_numbers(numbers, game_config)
+
+    def test_as_numbers(self, packed):
+        assert as_numbers(packed) == [1, 2, 3, 4]
+        assert as_numbers([5, 6, 7, 0]) == [5, 6, 7, 0]
+
+
+class TestPackedCodeIntegration:
+    @pytest.fixture
+    def packed(self, game_config):
+        return PackedCode.from_numbers([1, 1, 2, 2], game_config)
+
+    def test_game_logic_accepts_packed_code(self, game_config, packed):
+        game_logic = GameLogic(game_config)
+        pattern_count = game_logic.calculate_pattern_counts(packed)
+        feedback = game_logic.check_guess(Guess([1, 2, 1, 2]), pattern_count, packed)
+
+        assert pattern_count == {1: 2, 2: 2}
+        assert (feedback.numbers_correct, feedback.positions_correct) == (4, 2)
+
+    def test_guess_and_batch_accept_packed_code(self, game_config, packed):
+        assert Guess(packed).get_numbers() == [1, 1, 2, 2]
+
+        numbers, positions = score_batch([packed], [packed], game_config)
+        assert (numbers[0, 0], positions[0, 0]) == (4, 4)
+
+    @pytest.mark.parametrize("repository_factory", [
+        lambda tmp_path: InMemoryGameRepository(),
+        lambda tmp_path: SQLiteGameRepository(str(tmp_path / "packed.db")),
+    ])
+    def test_repositories_accept_packed_code(self, repository_factory, tmp_path, sample_game_state, packed):
+        repository = repository_factory(tmp_path)
+        repository.save_game(replace(sample_game_state, code_pattern=packed))
+
+        loaded_state = repository.load_game(sample_game_state.game_id)
+        assert as_numbers(loaded_state.code_pattern) == [1, 1, 2, 2]
@@ -0,0 +1,157 @@
+import copy
+from datetime import datetime, timedelta
+import sqlite3
+import pytest
+
+from src.core.models.feedback import Feedback
+from src.core.models.game_status import GameStatus
+from src.core.models.guess import Guess
+from src.repository.archive import (ARCHIVE_MIGRATIONS, ARCHIVE_SCHEMA, SQLiteArchiveRepository,
+                                    TieredGameRepository)
+from src.repository.migrations import schema_version
+from src.repository.sqlite import SCHEMA_MIGRATIONS, SQLiteGameRepository
+from src.repository.sweeper import ExpirySweeper
+from src.services.exceptions.exceptions import DatabaseError, GameNotFoundError, LoadError
+
+NOW = datetime(2024, 1, 10)
+
+
+class TestSQLiteArchiveRepository:
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return str(tmp_path / "archive.db")
+
+    def _states(self, sample_game_state, count, status=GameStatus.WON, prefix="game"):
+        states = []
+        for number in range(count):
+            state = copy.deepcopy(sample_game_state)
+            state.game_id = f"{prefix}-{number:04d}"
+            state.status = status
+            state.updated_at = NOW - timedelta(days=1, minutes=number)
+            state.guess_records = [(Guess([number % 8, 1, 2, 3]), Feedback(3, 1)), (Guess([1, 2, 3, 4]), Feedback(4, 4))]
+            states.append(state)
+        return states
+
+    def test_games_are_packed_into_compressed_blocks(self, db_path, sample_game_state):
+        states = self._states(sample_game_state, 10)
+        with SQLiteArchiveRepository(db_path, block_games=4) as archive:
+            archive.save_many(states)
+            loaded = archive.load_many([state.game_id for state in reversed(states)] + ["wrong_id"])
+            assert list(loaded) == [state.game_id for state in reversed(states)]
+            assert loaded["game-0005"].guess_records[0][0].get_numbers() == [5, 1, 2, 3]
+            assert archive.load_game("game-0009").status == GameStatus.WON
+            with pytest.raises(GameNotFoundError):
+                archive.load_game("wrong_id")
+
+        with sqlite3.connect(db_path) as conn:
+            blocks = conn.execute("SELECT data FROM archive_blocks").fetchall()
+        conn.close()
+        assert len(blocks) == 3
+
+    def test_rewritten_and_deleted_games_free_their_blocks(self, db_path, sample_game_state):
+        states = self._states(sample_game_state, 4)
+        with SQLiteArchiveRepository(db_path, block_games=2) as archive:
+            archive.save_many(states)
+            states[0].attempts = 9
+            archive.save_many(states[:2])
+            assert archive.load_game("game-0000").attempts == 9
+            assert archive.delete_many(["game-0002", "game-0003", "wrong_id"]) == ["game-0002", "game-0003"]
+            assert archive.delete_many(["game-0000"], updated_before=NOW - timedelta(days=2)) == []
+
+            count = archive._connection.execute("SELECT COUNT(*) FROM archive_blocks").fetchone()[0]
+            assert count == 1
+
+    def test_corrupt_block(self, db_path, sample_game_state):
+        with SQLiteArchiveRepository(db_path) as archive:
+            archive.save_game(self._states(sample_game_state, 1)[0])
+            with archive._connection:
+                archive._connection.execute("UPDATE archive_blocks SET data = x'00'")
+            with pytest.raises(LoadError):
+                archive.load_game("game-0000")
+
+    def test_invalid_settings(self, db_path):
+        with pytest.raises(ValueError):
+            SQLiteArchiveRepository(db_path, block_games=0)
+
+    def test_tables_are_a_versioned_schema(self, tmp_path, sample_game_state):
+        """
+        Test the archive schema is migrated by name, next to the games schema in a shared file
+        """
+        db_path = str(tmp_path / "games.db")
+        SQLiteGameRepository(db_path).close()
+        with SQLiteArchiveRepository(db_path) as archive:
+            archive.save_game(self._states(sample_game_state, 1)[0])
+        with SQLiteArchiveRepository(db_path) as archive:
+            assert archive.load_game("game-0000").status == GameStatus.WON
+
+        with sqlite3.connect(db_path) as conn:
+            assert schema_version(conn, ARCHIVE_SCHEMA) == ARCHIVE_MIGRATIONS[-1].version
+            assert schema_version(conn) == SCHEMA_MIGRATIONS[-1].version
+            conn.execute("UPDATE schema_versions SET version = 99 WHERE schema = ?", (ARCHIVE_SCHEMA,))
+        conn.close()
+        with pytest.raises(DatabaseError):
+            SQLiteArchiveRepository(db_path)
+
+
+class TestTieredGameRepository:
+    @pytest.fixture
+    def tiers(self, tmp_path):
+        hot = SQLiteGameRepository(str(tmp_path / "games.db"))
+        # the archive tables share the hot database file
+        archive = SQLiteArchiveRepository(str(tmp_path / "games.db"), block_games=8)
+        yield TieredGameRepository(hot, archive)
+        hot.close()
+        archive.close()
+
+    def _states(self, sample_game_state, count, status, prefix):
+        return TestSQLiteArchiveRepository()._states(sample_game_state, count, status, prefix)
+
+    def test_finished_games_move_to_the_archive(self, tiers, sample_game_state):
+        tiers.save_many(self._states(sample_game_state, 7, GameStatus.WON, "won"))
+        tiers.save_many(self._states(sample_game_state, 5, GameStatus.LOST, "lost"))
+        tiers.save_many(self._states(sample_game_state, 3, GameStatus.IN_PROGRESS, "playing"))
+
+        assert tiers.archive_finished(batch_size=3, now=NOW) == 12
+        assert sorted(tiers.hot.game_ids()) == ["playing-0000", "playing-0001", "playing-0002"]
+        assert tiers.load_game("won-0004").guess_records[1][1].positions_correct == 4
+        loaded = tiers.load_many(["lost-0001", "playing-0002", "wrong_id"])
+        assert list(loaded) == ["lost-0001", "playing-0002"]
+        with pytest.raises(GameNotFoundError):
+            tiers.load_game("wrong_id")
+        assert tiers.archive_finished(now=NOW) == 0
+
+    def test_batches_load_full_games_in_bulk(self, tiers, sample_game_state, monkeypatch):
+        """
+        Test archiving does not load each listed header's history on its own
+        """
+        tiers.save_many(self._states(sample_game_state, 5, GameStatus.WON, "won"))
+
+        def per_game_query(*args):
+            raise AssertionError("History loaded on its own")
+        monkeypatch.setattr(tiers.hot, "_load_history", per_game_query)
+
+        assert tiers.archive_finished(batch_size=2, now=NOW) == 5
+        assert len(tiers.archive.load_game("won-0003").guess_records) == 2
+
+    def test_min_age_keeps_recent_games_hot(self, tiers, sample_game_state):
+        tiers.save_many(self._states(sample_game_state, 4, GameStatus.WON, "won"))
+        assert tiers.archive_finished(min_age=timedelta(days=1, seconds=90), now=NOW) == 2
+        assert sorted(tiers.hot.game_ids()) == ["won-0000", "won-0001"]
+
+    def test_hot_copy_wins_and_delete_covers_both_tiers(self, tiers, sample_game_state):
+        state = self._states(sample_game_state, 1, GameStatus.WON, "won")[0]
+        tiers.save_game(state)
+        tiers.archive_finished(now=NOW)
+        state.attempts = 5
+        tiers.save_game(state)
+        assert tiers.load_game("won-0000").attempts == 5
+
+        assert tiers.delete_many(["won-0000"]) == ["won-0000"]
+        with pytest.raises(GameNotFoundError):
+            tiers.load_game("won-0000")
+
+    def test_sweeper_archives_into_the_archive_tier(self, tiers, sample_game_state):
+        tiers.save_many(self._states(sample_game_state, 3, GameStatus.IN_PROGRESS, "playing"))
+        ExpirySweeper(tiers.hot, max_age=timedelta(hours=1), archive=tiers.archive, clock=lambda: NOW).sweep()
+        assert tiers.hot.game_ids() == []
+        assert tiers.load_game("playing-0001").status == GameStatus.IN_PROGRESS
@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+
+from src.repository.async_sqlite import AsyncSQLiteGameRepository
+from src.services.exceptions.exceptions import DatabaseError, GameNotFoundError
+
+
+class TestAsyncSQLiteGameRepository:
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return str(tmp_path / "async.db")
+
+    def test_save_and_load_game(self, db_path, sample_game_state):
+        async def scenario():
+            async with AsyncSQLiteGameRepository(db_path) as repository:
+                await repository.save_game(sample_game_state)
+                return await repository.load_game(sample_game_state.game_id)
+
+        loaded = asyncio.run(scenario())
+        assert loaded.game_id == sample_game_state.game_id
+        assert loaded.attempts == sample_game_state.attempts
+
+    def test_load_non_existent_game(self, db_path):
+        async def scenario():
+            async with AsyncSQLiteGameRepository(db_path) as repository:
+                await repository.load_game("wrong_id")
+
+        with pytest.raises(GameNotFoundError):
+            asyncio.run(scenario())
+
+    def test_calls_run_on_one_executor_thread(self, db_path, sample_game_state):
+        """
+        Test the database is only touched by the dedicated thread, never the loop's
+        """
+        async def scenario(repository):
+            await asyncio.gather(*(repository.save_game(sample_game_state) for _ in range(20)))
+            return await repository.load_many([sample_game_state.game_id, "wrong_id"])
+
+        repository = AsyncSQLiteGameRepository(db_path)
+        loaded = asyncio.run(scenario(repository))
+        assert list(loaded) == [sample_game_state.game_id]
+        assert len(repository._repository._connections) == 1
+        assert getattr(repository._repository._local, "connection", None) is None
+        asyncio.run(repository.close())
+
+    def test_closed_repository_rejects_calls(self, db_path, sample_game_state):
+        async def scenario():
+            repository = AsyncSQLiteGameRepository(db_path)
+            await repository.close()
+            await repository.close()
+            await repository.save_game(sample_game_state)
+
+        with pytest.raises(DatabaseError):
+            asyncio.run(scenario())
@@ -0,0 +1,153 @@
+import copy
+from unittest.mock import Mock
+import pytest
+
+from src.core.models.feedback import Feedback
+from src.core.models.guess import Guess
+from src.repository.base import GameRepository
+from src.repository.cache import CachingGameRepository, estimate_state_size
+from src.repository.memory import InMemoryGameRepository
+from src.services.exceptions.exceptions import GameNotFoundError, SaveError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCachingGameRepository:
+    @pytest.fixture
+    def storage(self):
+        return Mock(wraps=InMemoryGameRepository(), spec=GameRepository)
+
+    def _state(self, sample_game_state, game_id, guesses=0):
+        state = copy.deepcopy(sample_game_state)
+        state.game_id = game_id
+        state.guess_records = [(Guess([1, 1, 2, 2]), Feedback(2, 1)) for _ in range(guesses)]
+        state.attempts = guesses
+        return state
+
+    def test_save_is_write_through_and_load_hits(self, storage, sample_game_state):
+        """
+        Test a saved game is stored, then reloaded from the cache without storage
+        """
+        cache = CachingGameRepository(storage)
+        cache.save_game(sample_game_state)
+        loaded = cache.load_game(sample_game_state.game_id)
+
+        storage.save_game.assert_called_once_with(sample_game_state)
+        storage.load_game.assert_not_called()
+        assert loaded == sample_game_state
+        assert (cache.stats.hits, cache.stats.misses) == (1, 0)
+
+    def test_miss_reads_through(self, storage, sample_game_state):
+        storage.save_game(sample_game_state)
+        cache = CachingGameRepository(storage)
+
+        cache.load_game(sample_game_state.game_id)
+        cache.load_game(sample_game_state.game_id)
+        assert storage.load_game.call_count == 1
+        assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+        with pytest.raises(GameNotFoundError):
+            cache.load_game("wrong_id")
+
+    def test_callers_cannot_change_cached_state(self, storage, sample_game_state):
+        """
+        Test appending to a loaded or saved history leaves the cached entry unchanged
+        """
+        cache = CachingGameRepository(storage)
+        cache.save_game(sample_game_state)
+        sample_game_state.guess_records.append((Guess([1, 2, 3, 4]), Feedback(4, 4)))
+        loaded = cache.load_game(sample_game_state.game_id)
+        loaded.guess_records.append((Guess([1, 2, 3, 4]), Feedback(4, 4)))
+
+        assert cache.load_game(sample_game_state.game_id).guess_records == []
+
+    def test_lru_eviction(self, storage, sample_game_state):
+        cache = CachingGameRepository(storage, max_entries=2)
+        for game_id in ("a", "b"):
+            cache.save_game(self._state(sample_game_state, game_id))
+        cache.load_game("a")
+        cache.save_game(self._state(sample_game_state, "c"))
+
+        assert cache.stats.evictions == 1
+        assert cache.stats.entries == 2
+        cache.load_game("a")
+        storage.load_game.assert_not_called()
+        cache.load_game("b")
+        storage.load_game.assert_called_once_with("b")
+
+    def test_memory_cap(self, storage, sample_game_state):
+        small = self._state(sample_game_state, "small")
+        large = self._state(sample_game_state, "large", guesses=10)
+        cache = CachingGameRepository(storage, max_bytes=estimate_state_size(large))
+
+        cache.save_game(small)
+        cache.save_game(large)
+        assert cache.stats.entries == 1
+        assert cache.stats.size_bytes == estimate_state_size(large)
+        assert estimate_state_size(large) > estimate_state_size(small)
+
+    def test_ttl_expiry(self, storage, sample_game_state):
+        clock = FakeClock()
+        cache = CachingGameRepository(storage, ttl=10, clock=clock)
+        cache.save_game(sample_game_state)
+
+        clock.now = 9.5
+        cache.load_game(sample_game_state.game_id)
+        clock.now = 10.0
+        cache.load_game(sample_game_state.game_id)
+
+        assert storage.load_game.call_count == 1
+        assert (cache.stats.hits, cache.stats.misses, cache.stats.evictions) == (1, 1, 1)
+
+    def test_failed_save_drops_entry(self, storage, sample_game_state):
+        cache = CachingGameRepository(storage)
+        cache.save_game(sample_game_state)
+        storage.save_game.side_effect = SaveError()
+
+        with pytest.raises(SaveError):
+            cache.save_game(sample_game_state)
+        assert cache.stats.entries == 0
+
+    def test_load_many_fetches_misses_together(self, storage, sample_game_state):
+        cache = CachingGameRepository(storage)
+        cache.save_game(self._state(sample_game_state, "a"))
+        storage.save_many([self._state(sample_game_state, "b"), self._state(sample_game_state, "c")])
+
+        loaded = cache.load_many(["c", "a", "b", "wrong_id"])
+        assert list(loaded) == ["c", "a", "b"]
+        storage.load_many.assert_called_once_with(["c", "b", "wrong_id"])
+        assert cache.stats.entries == 3
+
+    def test_save_during_miss_is_not_overwritten(self, storage, sample_game_state):
+        """
+        Test a load that read the old state does not cache it over a save that finished meanwhile
+        """
+        cache = CachingGameRepository(storage)
+        backing = InMemoryGameRepository()
+        backing.save_many([self._state(sample_game_state, "a"), self._state(sample_game_state, "b")])
+
+        def load_then_save(game_id):
+            stale = backing.load_game(game_id)
+            cache.save_game(self._state(sample_game_state, game_id, guesses=2))
+            return stale
+
+        storage.load_game.side_effect = load_then_save
+        storage.load_many.side_effect = lambda game_ids: {game_id: load_then_save(game_id) for game_id in game_ids}
+
+        assert cache.load_game("a").attempts == 0
+        assert cache.load_game("a").attempts == 2
+        assert cache.load_many(["b"])["b"].attempts == 0
+        assert cache.load_many(["b"])["b"].attempts == 2
+        assert cache._generations == {} and cache._loading == {}
+
+    def test_invalid_limits(self, storage):
+        with pytest.raises(ValueError):
+            CachingGameRepository(storage, max_entries=0)
+        with pytest.raises(ValueError):
+            CachingGameRepository(storage, ttl=0)
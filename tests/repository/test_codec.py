@@ -0,0 +1,103 @@
+from datetime import datetime
+import pytest
+
+from src.core.config.game_config import GameConfig
+from src.core.models.feedback import Feedback
+from src.core.models.game_difficulty import Difficulty
+from src.core.models.game_state import GameState
+from src.core.models.game_status import GameStatus
+from src.core.models.guess import Guess
+from src.core.models.packed_code import PackedCode
+from src.core.models.scoring_kernel import ScoringKernel
+from src.repository.codec import HEADER, HEADER_V1, decode_header, decode_state, encode_state
+
+
+class TestGameStateCodec:
+    @pytest.fixture
+    def finished_state(self):
+        return GameState(
+            game_id="3f2b8c1e-0000-4000-8000-000000000000",
+            code_pattern=[1, 2, 3, 4, 9],
+            status=GameStatus.WON,
+            attempts=3,
+            guess_records=[(Guess([0, 0, 1, 1, 0]), Feedback(1, 0)), (Guess([1, 2, 4, 3, 9]), Feedback(5, 3)),
+                           (Guess([1, 2, 3, 4, 9]), Feedback(5, 5))],
+            created_at=datetime(2024, 5, 1, 12, 30, 15, 123456),
+            updated_at=datetime(2024, 5, 1, 12, 31, 2, 999999),
+            config=GameConfig(Difficulty.HARD)
+        )
+
+    def test_round_trip(self, finished_state):
+        """
+        Test decoding restores every field, including timestamp microseconds
+        """
+        decoded = decode_state(encode_state(finished_state))
+
+        assert decoded.to_db_format() == finished_state.to_db_format()
+        assert decoded.created_at == finished_state.created_at
+        assert decoded.updated_at == finished_state.updated_at
+        assert decoded.config.difficulty == Difficulty.HARD
+
+    def test_compact_size(self, finished_state):
+        """
+        Test a guess takes one byte per position plus one feedback byte
+        """
+        encoded = encode_state(finished_state)
+        assert len(encoded) == HEADER.size + 36 + 5 + 3 * (5 + 1)
+
+    def test_custom_config_and_wide_numbers(self):
+        config = GameConfig(Difficulty.CUSTOM, pattern_length=3, min_number=1, max_number=1000, max_attempts=20)
+        state = GameState("custom", PackedCode.from_numbers([1000, 1, 500], config), GameStatus.IN_PROGRESS, 1,
+                          [(Guess([999, 2, 3]), Feedback(0, 0))], datetime(2024, 1, 1), datetime(2024, 1, 1), config)
+
+        decoded = decode_state(memoryview(encode_state(state)))
+        assert decoded.code_pattern == [1000, 1, 500]
+        assert decoded.guess_records[0][0].get_numbers() == [999, 2, 3]
+        assert decoded.config.to_dict() == config.to_dict()
+
+    def test_scoring_kernel(self, finished_state):
+        """
+        Test a kernel other than the default survives, and the default is
+        still picked from the rules
+        """
+        assert decode_state(encode_state(finished_state)).config.scoring_kernel == ScoringKernel.STANDARD
+
+        finished_state.config = GameConfig(Difficulty.HARD, ScoringKernel.BITMASK)
+        assert decode_state(encode_state(finished_state)).config.scoring_kernel == ScoringKernel.BITMASK
+
+    def test_player_id_and_version_1(self, finished_state):
+        """
+        Test the player ID round-trips and version 1 data, which has none, still decodes
+        """
+        finished_state.player_id = "player-7"
+        assert decode_state(encode_state(finished_state)).player_id == "player-7"
+
+        finished_state.player_id = None
+        encoded = encode_state(finished_state)
+        version_1 = bytes([1]) + HEADER_V1.pack(*HEADER.unpack_from(encoded)[:-1])[1:] + encoded[HEADER.size:]
+        decoded = decode_state(version_1)
+        assert decoded.player_id is None
+        assert decoded.to_db_format() == finished_state.to_db_format()
+
+    @pytest.mark.parametrize("corrupt", [
+        lambda data: data[:-1],
+        lambda data: data[:5],
+        lambda data: bytes([99]) + data[1:],
+        lambda data: data[:1] + bytes([7]) + data[2:],
+    ])
+    def test_corrupt_data(self, finished_state, corrupt):
+        with pytest.raises(ValueError):
+            decode_state(corrupt(encode_state(finished_state)))
+        with pytest.raises(ValueError):
+            decode_header(corrupt(encode_state(finished_state)))
+
+    def test_header_decodes_history_on_access(self, finished_state):
+        data = bytearray(encode_state(finished_state))
+        with memoryview(data) as view:
+            header = decode_header(view)
+        # the header keeps its own copy of the history bytes
+        data[:] = bytes(len(data))
+
+        assert header.status == GameStatus.WON and header.attempts == 3
+        assert not header.history_loaded
+        assert header.to_db_format() == finished_state.to_db_format()
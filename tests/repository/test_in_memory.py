@@ -1,4 +1,11 @@
+import copy
+from unittest.mock import patch
 import pytest
+from src.core.models.feedback import Feedback
+from src.core.models.game_state import GameState
+from src.core.models.game_status import GameStatus
+from src.core.models.guess import Guess
+from src.repository.cache import estimate_state_size
 from src.repository.memory import InMemoryGameRepository
 from src.services.exceptions.exceptions import GameNotFoundError
 
@@ -39,6 +46,15 @@ class TestInMemoryRepository:
         loaded_state = mock_repository.load_game(sample_game_state.game_id)
         assert loaded_state.attempts == sample_game_state.attempts
         
+    def test_snapshot_keeps_timestamp_microseconds(self, mock_repository, sample_game_state):
+        """
+        Test snapshots round-trip timestamps exactly, unlike the SQLite text format
+        """
+        sample_game_state.updated_at = sample_game_state.updated_at.replace(microsecond=123456)
+        mock_repository.save_game(sample_game_state)
+        assert isinstance(mock_repository._store[sample_game_state.game_id], bytes)
+        assert mock_repository.load_game(sample_game_state.game_id).updated_at == sample_game_state.updated_at
+
     def test_memory_persistence(self, mock_repository, sample_game_state):
         """
         Test game storage, in memory doesn't have persistence
@@ -48,4 +64,112 @@ class TestInMemoryRepository:
         
         new_repository = InMemoryGameRepository()
         with pytest.raises(GameNotFoundError):
-            new_repository.load_game("wrong_id")
\ No newline at end of file
+            new_repository.load_game("wrong_id")
+
+    def test_save_many_and_load_many(self, mock_repository, sample_game_state):
+        """
+        Test bulk save and load, missing ids are left out
+        """
+        other_state = copy.deepcopy(sample_game_state)
+        other_state.game_id = "test-456"
+        mock_repository.save_many([sample_game_state, other_state])
+
+        loaded = mock_repository.load_many(["test-456", "wrong_id", "test-123"])
+        assert list(loaded) == ["test-456", "test-123"]
+        assert loaded["test-123"].attempts == sample_game_state.attempts
+
+
+class TestInMemoryObjectMode:
+    def _state(self, sample_game_state, game_id, status=GameStatus.IN_PROGRESS):
+        state = copy.deepcopy(sample_game_state)
+        state.game_id = game_id
+        state.status = status
+        return state
+
+    def test_objects_are_stored_without_serialization(self, sample_game_state):
+        """
+        Test object mode never converts to or from db format, and copies on the way in and out
+        """
+        repository = InMemoryGameRepository(snapshot=False)
+        with patch.object(GameState, "to_db_format") as to_db_format, \
+                patch.object(GameState, "from_db_format") as from_db_format:
+            repository.save_game(sample_game_state)
+            loaded = repository.load_game(sample_game_state.game_id)
+        to_db_format.assert_not_called()
+        from_db_format.assert_not_called()
+
+        assert loaded == sample_game_state
+        loaded.guess_records.append((Guess([1, 2, 3, 4]), Feedback(4, 4)))
+        sample_game_state.code_pattern.append(5)
+        reloaded = repository.load_game(sample_game_state.game_id)
+        assert reloaded.guess_records == []
+        assert reloaded.code_pattern == [1, 2, 3, 4]
+
+    def test_finished_games_are_evicted_first(self, sample_game_state):
+        repository = InMemoryGameRepository(snapshot=False, max_games=2)
+        repository.save_game(self._state(sample_game_state, "active"))
+        repository.save_game(self._state(sample_game_state, "won", GameStatus.WON))
+        repository.save_game(self._state(sample_game_state, "new"))
+
+        assert set(repository._store) == {"active", "new"}
+        assert repository.evictions == 1
+
+    def test_least_recently_used_finished_game_is_evicted(self, sample_game_state):
+        repository = InMemoryGameRepository(max_games=2)
+        repository.save_many([self._state(sample_game_state, "a", GameStatus.WON),
+                              self._state(sample_game_state, "b", GameStatus.LOST)])
+        repository.load_game("a")
+        repository.save_game(self._state(sample_game_state, "c", GameStatus.WON))
+
+        assert set(repository._store) == {"a", "c"}
+        with pytest.raises(GameNotFoundError):
+            repository.load_game("b")
+
+    def test_games_in_progress_are_never_evicted(self, sample_game_state, caplog):
+        """
+        Test the store grows past its limit rather than drop a game in progress
+        """
+        repository = InMemoryGameRepository(max_games=2)
+        repository.save_game(self._state(sample_game_state, "won", GameStatus.WON))
+        repository.save_many([self._state(sample_game_state, game_id) for game_id in "abc"])
+
+        assert set(repository._store) == {"a", "b", "c"}
+        assert repository.evictions == 1
+        assert "none evicted" in caplog.text
+        repository.save_game(self._state(sample_game_state, "a", GameStatus.WON))
+        assert set(repository._store) == {"b", "c"}
+
+    def test_byte_cap(self, sample_game_state):
+        state = self._state(sample_game_state, "a", GameStatus.LOST)
+        repository = InMemoryGameRepository(snapshot=False, max_bytes=2 * estimate_state_size(state))
+        for game_id in "abc":
+            repository.save_game(self._state(sample_game_state, game_id, GameStatus.LOST))
+            repository.save_game(self._state(sample_game_state, game_id, GameStatus.LOST))
+
+        assert list(repository._store) == ["b", "c"]
+        assert repository._size_bytes == 2 * estimate_state_size(state)
+
+    def test_invalid_limits(self):
+        with pytest.raises(ValueError):
+            InMemoryGameRepository(max_games=0)
+
+    def test_list_games(self, sample_game_state):
+        repository = InMemoryGameRepository()
+        for game_id, player_id in (("a", "alice"), ("b", None), ("c", "alice")):
+            state = self._state(sample_game_state, game_id, GameStatus.LOST)
+            state.player_id = player_id
+            repository.save_game(state)
+
+        page = repository.list_games(player_id="alice", limit=1)
+        assert [state.game_id for state in page.games] == ["c"]
+        page = repository.list_games(player_id="alice", limit=1, after=page.next_cursor)
+        assert [state.game_id for state in page.games] == ["a"]
+        assert page.next_cursor is None
+
+    def test_load_header_is_lazy(self, sample_game_state):
+        repository = InMemoryGameRepository()
+        repository.save_game(sample_game_state)
+        header = repository.load_header("test-123")
+        assert not header.history_loaded
+        assert repository.list_games().games[0].history_loaded is False
+        assert InMemoryGameRepository(snapshot=False).list_games().games == []
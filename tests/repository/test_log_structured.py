@@ -0,0 +1,180 @@
+import copy
+from datetime import datetime, timedelta
+import os
+import time
+from unittest.mock import patch
+import pytest
+
+from src.core.models.feedback import Feedback
+from src.core.models.game_status import GameStatus
+from src.core.models.guess import Guess
+from src.repository.log_structured import COMPACTED_SUFFIX, LogStructuredGameRepository
+from src.repository.sweeper import ExpirySweeper
+from src.services.exceptions.exceptions import DatabaseError, GameNotFoundError
+
+
+class TestLogStructuredGameRepository:
+    @pytest.fixture
+    def directory(self, tmp_path):
+        return str(tmp_path / "log")
+
+    def _play(self, repository, game_state, guesses):
+        for _ in range(guesses):
+            game_state.guess_records.append((Guess([game_state.attempts % 8, 1, 2, 3]), Feedback(2, 1)))
+            game_state.attempts += 1
+            repository.save_game(game_state)
+
+    def test_save_and_load_game(self, directory, sample_game_state):
+        with LogStructuredGameRepository(directory, compact_interval=None) as repository:
+            repository.save_game(sample_game_state)
+            self._play(repository, sample_game_state, 3)
+            loaded = repository.load_game(sample_game_state.game_id)
+
+            assert loaded.attempts == 5
+            assert [guess.get_numbers() for guess, _ in loaded.guess_records] == \
+                [[2, 1, 2, 3], [3, 1, 2, 3], [4, 1, 2, 3]]
+            with pytest.raises(GameNotFoundError):
+                repository.load_game("wrong_id")
+
+    def test_segments_roll_and_compact(self, directory, sample_game_state):
+        """
+        Test superseded records are dropped by compaction and the latest state survives
+        """
+        with LogStructuredGameRepository(directory, segment_size=256, compact_interval=None) as repository:
+            other_state = copy.deepcopy(sample_game_state)
+            other_state.game_id = "other"
+            repository.save_many([sample_game_state, other_state])
+            self._play(repository, sample_game_state, 10)
+            segments = len(os.listdir(directory))
+            assert segments > 2
+            assert repository.garbage_ratio() > 0.5
+
+            assert repository.compact() > 0
+            assert len(os.listdir(directory)) < segments
+            assert repository.load_game(sample_game_state.game_id).attempts == 12
+            assert repository.load_game("other").attempts == 2
+
+        with LogStructuredGameRepository(directory, compact_interval=None) as repository:
+            assert repository.game_ids() == ["other", sample_game_state.game_id]
+            assert repository.load_game(sample_game_state.game_id).attempts == 12
+
+    def test_background_compaction(self, directory, sample_game_state):
+        with LogStructuredGameRepository(directory, segment_size=256, compact_interval=0.01) as repository:
+            self._play(repository, sample_game_state, 8)
+            deadline = time.monotonic() + 5
+            while repository.garbage_ratio() > 0.5 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert repository.garbage_ratio() <= 0.5
+            assert repository.load_game(sample_game_state.game_id).attempts == 10
+
+    def test_recovery_cuts_torn_tail(self, directory, sample_game_state):
+        """
+        Test a crash mid-append loses only the torn record and later appends survive reopening
+        """
+        with LogStructuredGameRepository(directory, compact_interval=None) as repository:
+            self._play(repository, sample_game_state, 2)
+            path = repository._active.path
+        size = os.path.getsize(path)
+        with open(path, "ab") as file:
+            file.write(b"\x00\x01torn")
+
+        with LogStructuredGameRepository(directory, compact_interval=None) as repository:
+            assert os.path.getsize(path) == size
+            assert repository.load_game(sample_game_state.game_id).attempts == 4
+            self._play(repository, sample_game_state, 1)
+        with LogStructuredGameRepository(directory, compact_interval=None) as repository:
+            assert repository.load_game(sample_game_state.game_id).attempts == 5
+
+    def test_closed_repository_rejects_saves(self, directory, sample_game_state):
+        repository = LogStructuredGameRepository(directory, compact_interval=None)
+        repository.close()
+        repository.close()
+        with pytest.raises(DatabaseError):
+            repository.save_game(sample_game_state)
+
+    def test_delete_many_survives_reopening(self, directory, sample_game_state):
+        """
+        Test deleted games stay deleted after replay, also once their segments are compacted
+        """
+        with LogStructuredGameRepository(directory, segment_size=256, compact_interval=None) as repository:
+            other_state = copy.deepcopy(sample_game_state)
+            other_state.game_id = "other"
+            repository.save_many([sample_game_state, other_state])
+            self._play(repository, other_state, 6)
+            assert repository.delete_many(["test-123", "wrong_id"], updated_before=datetime(2024, 1, 1)) == []
+            assert repository.delete_many(["test-123", "wrong_id"]) == ["test-123"]
+            # more games so the tombstone's segment is sealed and not the oldest
+            self._play(repository, other_state, 6)
+            repository.compact()
+            with pytest.raises(GameNotFoundError):
+                repository.load_game("test-123")
+
+        with LogStructuredGameRepository(directory, compact_interval=None) as repository:
+            assert repository.game_ids() == ["other"]
+            repository.save_game(sample_game_state)
+            assert repository.load_game("test-123").attempts == sample_game_state.attempts
+
+    def test_compaction_keeps_tombstones_of_older_records(self, directory, sample_game_state):
+        """
+        Test a compacted tombstone still hides the game's record in an older, live segment
+        """
+        with LogStructuredGameRepository(directory, segment_size=200, compact_interval=None) as repository:
+            keeper = copy.deepcopy(sample_game_state)
+            keeper.game_id = "keeper"
+            keeper.guess_records = [(Guess([1, 2, 3, 4]), Feedback(4, 4))] * 80
+            repository.save_many([keeper, sample_game_state])
+            churn = copy.deepcopy(sample_game_state)
+            churn.game_id = "churn"
+            repository.delete_many(["test-123"])
+            self._play(repository, churn, 8)
+            tombstone_segment = repository._tombstones["test-123"][0]
+            assert tombstone_segment.number == 2 and repository._active.number > 2
+
+            assert repository.compact() > 0
+            assert 1 in repository._segments
+            assert repository._tombstones["test-123"][0].number == 2
+
+        with LogStructuredGameRepository(directory, compact_interval=None) as repository:
+            assert repository.game_ids() == ["churn", "keeper"]
+
+    def test_list_games_and_sweeper(self, directory, sample_game_state):
+        with LogStructuredGameRepository(directory, compact_interval=None) as repository:
+            states = []
+            for number in range(5):
+                state = copy.deepcopy(sample_game_state)
+                state.game_id = f"game-{number}"
+                state.updated_at = datetime(2024, 1, 1, 12, number)
+                state.status = GameStatus.WON if number % 2 else GameStatus.IN_PROGRESS
+                states.append(state)
+            repository.save_many(states)
+
+            page = repository.list_games(status=GameStatus.IN_PROGRESS, limit=2)
+            assert [state.game_id for state in page.games] == ["game-4", "game-2"]
+            assert [state.game_id for state in repository.list_games(after=page.next_cursor).games] == \
+                ["game-1", "game-0"]
+
+            sweeper = ExpirySweeper(repository, max_age=timedelta(minutes=30), clock=lambda: datetime(2024, 1, 2))
+            assert sweeper.sweep() == 3
+            assert repository.game_ids() == ["game-1", "game-3"]
+
+    def test_compaction_copies_without_the_lock(self, directory, sample_game_state):
+        with LogStructuredGameRepository(directory, segment_size=256, compact_interval=None) as repository:
+            self._play(repository, sample_game_state, 10)
+            copy_records = repository._copy_records
+
+            def unlocked_copy(segment, live):
+                assert not repository._lock.locked()
+                return copy_records(segment, live)
+            with patch.object(repository, "_copy_records", side_effect=unlocked_copy):
+                assert repository.compact() > 0
+            assert not any(name.endswith(COMPACTED_SUFFIX) for name in os.listdir(directory))
+            assert repository.load_game(sample_game_state.game_id).attempts == 12
+
+    def test_new_records_are_read_without_remapping(self, directory, sample_game_state):
+        with LogStructuredGameRepository(directory, compact_interval=None) as repository:
+            repository.save_game(sample_game_state)
+            repository.load_game(sample_game_state.game_id)
+            with patch("src.repository.log_structured.mmap.mmap", side_effect=AssertionError("remapped")):
+                for _ in range(5):
+                    self._play(repository, sample_game_state, 1)
+                    assert repository.load_game(sample_game_state.game_id).attempts == sample_game_state.attempts
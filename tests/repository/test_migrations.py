@@ -0,0 +1,70 @@
+import sqlite3
+import pytest
+
+from src.repository.migrations import Migration, migrate, schema_version, upgrade_records
+from src.services.exceptions.exceptions import DatabaseError
+
+
+class TestMigrate:
+    @pytest.fixture
+    def connection(self):
+        connection = sqlite3.connect(":memory:")
+        yield connection
+        connection.close()
+
+    def _migrations(self, fail_at=None):
+        def step(version, statement):
+            def apply(connection):
+                if version == fail_at:
+                    raise sqlite3.OperationalError("step failed")
+                connection.execute(statement)
+            return Migration(version, f"step {version}", apply)
+
+        return (
+            step(1, "CREATE TABLE records (key TEXT PRIMARY KEY, value TEXT, format_version INTEGER)"),
+            step(2, "ALTER TABLE records ADD COLUMN note TEXT"),
+            step(3, "CREATE INDEX records_by_format ON records (format_version)"),
+        )
+
+    def test_applies_pending_steps_once(self, connection):
+        assert migrate(connection, self._migrations()[:2]) == 2
+        assert migrate(connection, self._migrations()) == 3
+        assert migrate(connection, self._migrations()) == 3
+        assert schema_version(connection) == 3
+
+    def test_failed_step_keeps_previous_version(self, connection):
+        with pytest.raises(sqlite3.OperationalError):
+            migrate(connection, self._migrations(fail_at=3))
+        assert schema_version(connection) == 2
+        assert migrate(connection, self._migrations()) == 3
+
+    def test_newer_database_is_refused(self, connection):
+        connection.execute("PRAGMA user_version = 7")
+        with pytest.raises(DatabaseError):
+            migrate(connection, self._migrations())
+
+    def test_named_schemas_share_a_database(self, connection):
+        """
+        Test a named schema keeps its own version and leaves user_version to the main one
+        """
+        assert schema_version(connection, "extra") == 0
+        assert migrate(connection, self._migrations()[:1]) == 1
+        extra = (Migration(1, "extra table", lambda conn: conn.execute("CREATE TABLE extra (key TEXT)")),)
+        assert migrate(connection, extra, "extra") == 1
+        assert migrate(connection, extra, "extra") == 1
+        assert schema_version(connection) == 1
+        assert schema_version(connection, "extra") == 1
+        assert migrate(connection, self._migrations()) == 3
+
+    def test_record_upgrades_step_through_versions(self, connection):
+        migrate(connection, self._migrations())
+        connection.executemany("INSERT INTO records (key, value, format_version) VALUES (?, ?, ?)",
+                               [("a", "x", 1), ("b", "y", 2), ("c", "z", 3)])
+        upgrades = {
+            1: "UPDATE records SET value = upper(value), format_version = 2 WHERE key = ? AND format_version = 1",
+            2: "UPDATE records SET note = 'v3', format_version = 3 WHERE key = ? AND format_version = 2",
+        }
+        with connection:
+            upgrade_records(connection, upgrades, ["a", "b", "c"])
+        rows = connection.execute("SELECT key, value, note, format_version FROM records ORDER BY key").fetchall()
+        assert rows == [("a", "X", "v3", 3), ("b", "y", "v3", 3), ("c", "z", None, 3)]
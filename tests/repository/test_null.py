@@ -0,0 +1,15 @@
+import pytest
+from src.repository.null import NullGameRepository
+from src.services.exceptions.exceptions import GameNotFoundError
+
+
+class TestNullRepository:
+    def test_save_is_discarded(self, sample_game_state):
+        """
+        Test saved games can never be loaded back
+        """
+        repository = NullGameRepository()
+        repository.save_game(sample_game_state)
+
+        with pytest.raises(GameNotFoundError):
+            repository.load_game(sample_game_state.game_id)
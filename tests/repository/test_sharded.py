@@ -0,0 +1,92 @@
+import copy
+from datetime import datetime, timedelta
+import os
+import pytest
+
+from src.repository.sharded import (ShardedSQLiteGameRepository, existing_shard_counts, rebalance,
+                                    shard_file_name, shard_index)
+from src.services.exceptions.exceptions import DatabaseError, GameNotFoundError
+
+
+class TestShardedSQLiteGameRepository:
+    @pytest.fixture
+    def directory(self, tmp_path):
+        return str(tmp_path / "shards")
+
+    def _states(self, sample_game_state, count):
+        states = []
+        for number in range(count):
+            state = copy.deepcopy(sample_game_state)
+            state.game_id = f"game-{number:04d}"
+            states.append(state)
+        return states
+
+    def test_shard_index_is_stable(self):
+        """
+        Test the shard of a game does not depend on the process (unlike hash())
+        """
+        assert shard_index("test-123", 4) == shard_index("test-123", 4)
+        assert shard_index("test-123", 4) == 2
+        assert {shard_index(f"game-{n}", 4) for n in range(100)} == {0, 1, 2, 3}
+
+    def test_games_are_spread_over_shards(self, directory, sample_game_state):
+        states = self._states(sample_game_state, 40)
+        with ShardedSQLiteGameRepository(directory, shard_count=4) as repository:
+            for state in states:
+                repository.save_game(state)
+            assert repository.load_game("game-0007").game_id == "game-0007"
+            assert all(shard.game_ids() for shard in repository.shards)
+            assert repository.game_ids() == [state.game_id for state in states]
+            with pytest.raises(GameNotFoundError):
+                repository.load_game("wrong_id")
+
+        assert sorted(os.listdir(directory)) == [shard_file_name(index, 4) for index in range(4)]
+
+    def test_bulk_calls_span_shards(self, directory, sample_game_state):
+        states = self._states(sample_game_state, 25)
+        with ShardedSQLiteGameRepository(directory, shard_count=3, write_behind=True) as repository:
+            repository.save_many(states)
+            game_ids = [state.game_id for state in reversed(states)] + ["wrong_id"]
+            assert list(repository.load_many(game_ids)) == game_ids[:-1]
+
+        with ShardedSQLiteGameRepository(directory, shard_count=3) as repository:
+            assert len(repository.load_many(state.game_id for state in states)) == 25
+
+    def test_list_games_merges_shards(self, directory, sample_game_state):
+        states = self._states(sample_game_state, 17)
+        for number, state in enumerate(states):
+            state.updated_at = datetime(2024, 1, 1) + timedelta(minutes=number % 7)
+        expected = [state.game_id for state in
+                    sorted(states, key=lambda state: (state.updated_at, state.game_id), reverse=True)]
+        with ShardedSQLiteGameRepository(directory, shard_count=3) as repository:
+            repository.save_many(states)
+            listed = []
+            page = repository.list_games(limit=4)
+            listed += [state.game_id for state in page.games]
+            while page.next_cursor is not None:
+                page = repository.list_games(limit=4, after=page.next_cursor)
+                listed += [state.game_id for state in page.games]
+
+        assert listed == expected
+
+    def test_other_shard_count_requires_rebalance(self, directory, sample_game_state):
+        with ShardedSQLiteGameRepository(directory, shard_count=2):
+            pass
+        with pytest.raises(DatabaseError):
+            ShardedSQLiteGameRepository(directory, shard_count=3)
+
+    def test_rebalance(self, directory, sample_game_state):
+        """
+        Test rebalancing moves every game to the new layout and removes the old files
+        """
+        states = self._states(sample_game_state, 30)
+        with ShardedSQLiteGameRepository(directory, shard_count=2) as repository:
+            repository.save_many(states)
+
+        assert rebalance(directory, 5, batch_size=7) == (30, 2)
+        assert existing_shard_counts(directory) == [5]
+        with ShardedSQLiteGameRepository(directory, shard_count=5) as repository:
+            assert repository.game_ids() == [state.game_id for state in states]
+            assert repository.load_game("game-0011").attempts == sample_game_state.attempts
+
+        assert rebalance(directory, 5) == (0, 0)
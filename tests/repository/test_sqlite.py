@@ -1,9 +1,20 @@
+import copy
+from datetime import datetime, timedelta
 import os
 import sqlite3
+import threading
+import time
+from unittest.mock import patch
 import pytest
 
-from src.repository.sqlite import SQLiteGameRepository
-from src.services.exceptions.exceptions import GameNotFoundError, LoadError, SaveError
+from src.core.config.game_config import GameConfig
+from src.core.models.feedback import Feedback
+from src.core.models.game_difficulty import Difficulty
+from src.core.models.game_status import GameStatus
+from src.core.models.guess import Guess
+from src.repository.sqlite import (LOAD_CHUNK_SIZE, LOAD_CHUNK_SIZES, RECORD_FORMAT_VERSION, SCHEMA_MIGRATIONS,
+                                   SQLiteGameRepository)
+from src.services.exceptions.exceptions import DatabaseError, GameNotFoundError, LoadError, SaveError
 
 
 class TestSQLiteGameRepository:
@@ -99,4 +110,624 @@ class TestSQLiteGameRepository:
         mock_repository.save_game(sample_game_state)
         
         loaded_state = mock_repository.load_game(sample_game_state.game_id)
-        assert loaded_state.attempts == sample_game_state.attempts
\ No newline at end of file
+        assert loaded_state.attempts == sample_game_state.attempts
+
+    def test_connection_is_reused(self, mock_repository, sample_game_state):
+        """
+        Test saves and loads on one thread share a single connection
+        """
+        with patch("src.repository.sqlite.sqlite3.connect", wraps=sqlite3.connect) as connect:
+            for _ in range(3):
+                mock_repository.save_game(sample_game_state)
+                mock_repository.load_game(sample_game_state.game_id)
+            connect.assert_not_called()
+
+    def test_connection_per_thread(self, mock_repository, sample_game_state):
+        """
+        Test each thread gets its own connection and sees committed saves
+        """
+        mock_repository.save_game(sample_game_state)
+        connections, errors = [], []
+
+        def worker():
+            try:
+                connections.append(mock_repository._connection())
+                assert mock_repository.load_game(sample_game_state.game_id).game_id == sample_game_state.game_id
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        assert len({id(connection) for connection in connections}) == 3
+        assert mock_repository._connection() not in connections
+
+    def test_close_and_context_manager(self, db_path, sample_game_state):
+        with SQLiteGameRepository(db_path) as repository:
+            repository.save_game(sample_game_state)
+            connection = repository._connection()
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            connection.execute("SELECT 1")
+        with pytest.raises(DatabaseError):
+            repository.load_game(sample_game_state.game_id)
+        repository.close()
+
+
+class TestSQLiteDurabilityModes:
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return str(tmp_path / "durability.db")
+
+    def _count_rows(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def test_wal_and_synchronous_pragmas(self, db_path):
+        with SQLiteGameRepository(db_path, wal=True, synchronous="normal") as repository:
+            connection = repository._connection()
+            assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert connection.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+    def test_invalid_synchronous_level(self, db_path):
+        with pytest.raises(ValueError):
+            SQLiteGameRepository(db_path, synchronous="sometimes")
+
+    def test_write_behind_load_sees_queued_save(self, db_path, sample_game_state):
+        """
+        Test a queued save is visible to load_game before it is committed
+        """
+        repository = SQLiteGameRepository(db_path, write_behind=True, flush_interval=60)
+        try:
+            repository.save_game(sample_game_state)
+            assert self._count_rows(db_path) == 0
+            assert repository.load_game(sample_game_state.game_id).attempts == sample_game_state.attempts
+        finally:
+            repository.close()
+        assert self._count_rows(db_path) == 1
+
+    def test_write_behind_size_trigger(self, db_path, sample_game_state):
+        with SQLiteGameRepository(db_path, wal=True, write_behind=True, batch_size=5,
+                                  flush_interval=60) as repository:
+            for index in range(5):
+                sample_game_state.game_id = f"game-{index}"
+                repository.save_game(sample_game_state)
+            deadline = time.monotonic() + 5
+            while self._count_rows(db_path) < 5 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert self._count_rows(db_path) == 5
+
+    def test_write_behind_time_trigger(self, db_path, sample_game_state):
+        with SQLiteGameRepository(db_path, write_behind=True, flush_interval=0.01) as repository:
+            repository.save_game(sample_game_state)
+            deadline = time.monotonic() + 5
+            while self._count_rows(db_path) < 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert self._count_rows(db_path) == 1
+
+    def test_saves_coalesce_and_flush_on_close(self, db_path, sample_game_state):
+        """
+        Test repeated saves of one game keep only the newest state
+        """
+        with SQLiteGameRepository(db_path, write_behind=True, flush_interval=60) as repository:
+            for attempts in range(1, 4):
+                sample_game_state.attempts = attempts
+                repository.save_game(sample_game_state)
+            assert len(repository._pending) == 1
+
+        with SQLiteGameRepository(db_path) as repository:
+            assert repository.load_game(sample_game_state.game_id).attempts == 3
+
+    def test_failed_group_commit_is_reported_and_retried(self, db_path, sample_game_state):
+        repository = SQLiteGameRepository(db_path, write_behind=True, flush_interval=60)
+        repository.save_game(sample_game_state)
+        with patch.object(repository, "_connection", side_effect=sqlite3.OperationalError("disk I/O error")):
+            with pytest.raises(SaveError):
+                repository.flush()
+        assert sample_game_state.game_id in repository._pending
+
+        repository.close()
+        assert self._count_rows(db_path) == 1
+
+
+class TestSQLiteGuessTable:
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return str(tmp_path / "guesses.db")
+
+    def _add_guesses(self, game_state, count):
+        for _ in range(count):
+            game_state.guess_records.append((Guess([game_state.attempts % 8, 1, 2, 3]), Feedback(2, 1)))
+            game_state.attempts += 1
+
+    def test_save_inserts_only_new_guesses(self, db_path, sample_game_state):
+        """
+        Test each save appends one guess row instead of rewriting the history
+        """
+        with SQLiteGameRepository(db_path) as repository:
+            repository.save_game(sample_game_state)
+            self._add_guesses(sample_game_state, 1)
+            statements = []
+            repository._connection().set_trace_callback(statements.append)
+            repository.save_game(sample_game_state)
+
+            inserts = [sql for sql in statements if "INTO guesses" in sql]
+            assert len(inserts) == 1
+            loaded = repository.load_game(sample_game_state.game_id)
+
+        assert loaded.attempts == sample_game_state.attempts
+        assert [guess.get_numbers() for guess, _ in loaded.guess_records] == \
+            [guess.get_numbers() for guess, _ in sample_game_state.guess_records]
+        assert loaded.guess_records[-1][1].positions_correct == 1
+
+    def test_fresh_repository_resumes_history(self, db_path, sample_game_state):
+        self._add_guesses(sample_game_state, 2)
+        with SQLiteGameRepository(db_path) as repository:
+            repository.save_game(sample_game_state)
+
+        with SQLiteGameRepository(db_path) as repository:
+            state = repository.load_game(sample_game_state.game_id)
+            self._add_guesses(state, 1)
+            repository.save_game(state)
+
+        with sqlite3.connect(db_path) as conn:
+            attempts = [row[0] for row in conn.execute("SELECT attempt FROM guesses ORDER BY attempt")]
+        assert attempts == list(range(len(state.guess_records)))
+
+    def test_shorter_history_replaces_guesses(self, db_path, sample_game_state):
+        self._add_guesses(sample_game_state, 3)
+        with SQLiteGameRepository(db_path) as repository:
+            repository.save_game(sample_game_state)
+            sample_game_state.guess_records = sample_game_state.guess_records[:1]
+            sample_game_state.attempts = 1
+            repository.save_game(sample_game_state)
+            assert len(repository.load_game(sample_game_state.game_id).guess_records) == 1
+
+    def test_resave_from_another_instance_replaces_game(self, db_path, sample_game_state):
+        """
+        Test a game saved again by an instance that never loaded it keeps none of the old rows
+        """
+        first = copy.deepcopy(sample_game_state)
+        first.code_pattern = [1, 2, 3, 4]
+        first.guess_records = [(Guess([0, 0, 0, 0]), Feedback(0, 0)) for _ in range(3)]
+        first.attempts = 3
+        with SQLiteGameRepository(db_path) as repository:
+            repository.save_game(first)
+
+        second = copy.deepcopy(sample_game_state)
+        second.code_pattern = [7, 7, 7, 7]
+        second.player_id = "player-2"
+        second.guess_records = [(Guess([5, 5, 5, 5]), Feedback(0, 0))]
+        second.attempts = 1
+        with SQLiteGameRepository(db_path) as repository:
+            repository.save_game(second)
+
+        with SQLiteGameRepository(db_path) as repository:
+            loaded = repository.load_game(sample_game_state.game_id)
+        assert loaded.code_pattern == [7, 7, 7, 7]
+        assert loaded.player_id == "player-2"
+        assert loaded.attempts == 1
+        assert [guess.get_numbers() for guess, _ in loaded.guess_records] == [[5, 5, 5, 5]]
+
+    def test_write_behind_merges_queued_guesses(self, db_path, sample_game_state):
+        with SQLiteGameRepository(db_path, write_behind=True, flush_interval=60) as repository:
+            self._add_guesses(sample_game_state, 2)
+            repository.save_game(sample_game_state)
+            repository.flush()
+            self._add_guesses(sample_game_state, 1)
+            repository.save_game(sample_game_state)
+
+            loaded = repository.load_game(sample_game_state.game_id)
+            assert len(loaded.guess_records) == len(sample_game_state.guess_records)
+
+    def test_migrates_guess_records_column(self, db_path):
+        """
+        Test a database with the old guess_records column is migrated on open
+        """
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""
+                CREATE TABLE games (
+                    game_id TEXT PRIMARY KEY, code_pattern TEXT NOT NULL, status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL, guess_records TEXT NOT NULL, created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL, config TEXT NOT NULL
+                )
+            """)
+            conn.execute("INSERT INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (
+                "old-game", "[1, 2, 3, 4]", "in_progress", 2,
+                '[{"guess": [0, 0, 3, 4], "feedback": {"numbers_correct": 2, "positions_correct": 2}},'
+                ' {"guess": [1, 2, 4, 3], "feedback": {"numbers_correct": 4, "positions_correct": 2}}]',
+                "2024-01-01 12:00:00", "2024-01-01 12:05:00", '{"difficulty": "normal"}'))
+        conn.close()
+
+        with SQLiteGameRepository(db_path) as repository:
+            loaded = repository.load_game("old-game")
+
+        assert loaded.attempts == 2
+        assert [guess.get_numbers() for guess, _ in loaded.guess_records] == [[0, 0, 3, 4], [1, 2, 4, 3]]
+        with sqlite3.connect(db_path) as conn:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(games)")]
+        assert "guess_records" not in columns
+
+
+class TestSQLiteBulkOperations:
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return str(tmp_path / "bulk.db")
+
+    def _states(self, sample_game_state, count):
+        states = []
+        for number in range(count):
+            state = copy.deepcopy(sample_game_state)
+            state.game_id = f"bulk-{number:04d}"
+            state.guess_records = [(Guess([number % 8, 1, 2, 3]), Feedback(2, 1))]
+            state.attempts = 1
+            states.append(state)
+        return states
+
+    def test_save_many_commits_once(self, db_path, sample_game_state):
+        """
+        Test a batch is written with one commit and loads back in request order
+        """
+        states = self._states(sample_game_state, 20)
+        with SQLiteGameRepository(db_path) as repository:
+            statements = []
+            repository._connection().set_trace_callback(statements.append)
+            repository.save_many(states)
+            assert statements.count("COMMIT") == 1
+
+            ids = [state.game_id for state in reversed(states)]
+            loaded = repository.load_many(ids + ["missing"])
+
+        assert list(loaded) == ids
+        assert loaded["bulk-0003"].guess_records[0][0].get_numbers() == [3, 1, 2, 3]
+
+    def test_load_many_spans_chunks(self, db_path, sample_game_state):
+        states = self._states(sample_game_state, LOAD_CHUNK_SIZE + 7)
+        with SQLiteGameRepository(db_path) as repository:
+            repository.save_many(states)
+        with SQLiteGameRepository(db_path) as repository:
+            loaded = repository.load_many(state.game_id for state in states)
+            assert len(loaded) == len(states)
+            assert all(len(state.guess_records) == 1 for state in loaded.values())
+            assert repository._guess_counts[states[-1].game_id] == 1
+
+    def test_remembered_guess_counts_are_bounded(self, db_path, sample_game_state):
+        """
+        Test only the most recent games' counts are kept and a forgotten game still saves correctly
+        """
+        states = self._states(sample_game_state, 5)
+        with patch("src.repository.sqlite.GUESS_COUNT_CACHE_SIZE", 3), SQLiteGameRepository(db_path) as repository:
+            repository.save_many(states)
+            assert list(repository._guess_counts) == [state.game_id for state in states[2:]]
+
+            states[0].guess_records.append((Guess([7, 7, 7, 7]), Feedback(0, 0)))
+            states[0].attempts = 2
+            repository.save_game(states[0])
+            assert len(repository._guess_counts) == 3
+            loaded = repository.load_game(states[0].game_id)
+        assert [guess.get_numbers() for guess, _ in loaded.guess_records] == \
+            [guess.get_numbers() for guess, _ in states[0].guess_records]
+
+    def test_load_many_binds_smallest_chunk_size(self, db_path, sample_game_state):
+        states = self._states(sample_game_state, 10)
+        with SQLiteGameRepository(db_path) as repository:
+            repository.save_many(states)
+            for count, size in ((3, LOAD_CHUNK_SIZES[0]), (10, LOAD_CHUNK_SIZES[1])):
+                statements = []
+                repository._connection().set_trace_callback(statements.append)
+                loaded = repository.load_many(state.game_id for state in states[:count])
+                repository._connection().set_trace_callback(None)
+
+                assert len(loaded) == count
+                games_query = next(sql for sql in statements if "FROM games WHERE game_id IN" in sql)
+                assert games_query.count("'bulk-") == size
+
+    def test_failed_save_many_saves_nothing(self, db_path, sample_game_state):
+        states = self._states(sample_game_state, 3)
+        with SQLiteGameRepository(db_path) as repository:
+            with patch.object(repository, "_write", side_effect=sqlite3.OperationalError("disk full")):
+                with pytest.raises(SaveError):
+                    repository.save_many(states)
+            assert repository.load_many(state.game_id for state in states) == {}
+
+    def test_write_behind_bulk_operations(self, db_path, sample_game_state):
+        states = self._states(sample_game_state, 5)
+        with SQLiteGameRepository(db_path, write_behind=True, flush_interval=60) as repository:
+            repository.save_many(states)
+            assert set(repository.load_many(state.game_id for state in states)) == \
+                {state.game_id for state in states}
+        with SQLiteGameRepository(db_path) as repository:
+            assert len(repository.load_many(state.game_id for state in states)) == 5
+
+
+class TestSQLiteListGames:
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return str(tmp_path / "listing.db")
+
+    def _states(self, sample_game_state, count):
+        states = []
+        for number in range(count):
+            state = copy.deepcopy(sample_game_state)
+            state.game_id = f"list-{number:04d}"
+            state.updated_at = datetime(2024, 1, 1) + timedelta(minutes=number // 2)
+            state.status = GameStatus.WON if number % 3 == 0 else GameStatus.IN_PROGRESS
+            state.player_id = "alice" if number % 2 else None
+            if number % 5 == 0:
+                state.config = GameConfig(Difficulty.HARD)
+                state.code_pattern = [1, 2, 3, 4, 5]
+            states.append(state)
+        return states
+
+    def _expected(self, states, **filters):
+        matches = [state for state in states
+                   if all(getattr(state, name) == value for name, value in filters.items())]
+        return [state.game_id for state in
+                sorted(matches, key=lambda state: (state.updated_at, state.game_id), reverse=True)]
+
+    def _all_pages(self, repository, limit, **filters):
+        game_ids = []
+        page = repository.list_games(limit=limit, **filters)
+        game_ids += [state.game_id for state in page.games]
+        while page.next_cursor is not None:
+            assert len(page.games) == limit
+            page = repository.list_games(limit=limit, after=page.next_cursor, **filters)
+            game_ids += [state.game_id for state in page.games]
+        return game_ids
+
+    def test_pages_cover_every_game_once(self, db_path, sample_game_state):
+        """
+        Test keyset pages are newest first, ties broken by ID, without gaps or repeats
+        """
+        states = self._states(sample_game_state, 23)
+        with SQLiteGameRepository(db_path) as repository:
+            repository.save_many(states)
+            assert self._all_pages(repository, 5) == self._expected(states)
+            assert self._all_pages(repository, 23) == self._expected(states)
+
+    def test_filters(self, db_path, sample_game_state):
+        states = self._states(sample_game_state, 30)
+        with SQLiteGameRepository(db_path) as repository:
+            repository.save_many(states)
+            assert self._all_pages(repository, 4, status=GameStatus.WON) == \
+                self._expected(states, status=GameStatus.WON)
+            assert self._all_pages(repository, 4, player_id="alice") == self._expected(states, player_id="alice")
+
+            hard = [state for state in states if state.config.difficulty == Difficulty.HARD]
+            page = repository.list_games(difficulty=Difficulty.HARD, status=GameStatus.IN_PROGRESS)
+            assert [state.game_id for state in page.games] == \
+                self._expected(hard, status=GameStatus.IN_PROGRESS)
+
+            page = repository.list_games(updated_after=datetime(2024, 1, 1, 0, 3),
+                                         updated_before=datetime(2024, 1, 1, 0, 5))
+            assert sorted(state.game_id for state in page.games) == [f"list-{n:04d}" for n in range(6, 10)]
+            assert page.games[0].player_id == "alice"
+            assert page.next_cursor is None
+
+    def test_listing_uses_indexes(self, db_path):
+        with SQLiteGameRepository(db_path) as repository:
+            connection = repository._connection()
+            for column in ("status", "player_id"):
+                plan = connection.execute(f"""
+                    EXPLAIN QUERY PLAN SELECT game_id, code_pattern, status, attempts,
+                           created_at, updated_at, config, player_id, format_version
+                    FROM games WHERE {column} = ? AND (updated_at, game_id) < (?, ?)
+                    ORDER BY updated_at DESC, game_id DESC LIMIT 10
+                """, ("x", "2024-01-01 00:00:00", "x")).fetchall()
+                details = " ".join(row[3] for row in plan)
+                assert f"USING INDEX games_by_{column.split('_')[0]}" in details
+                assert "TEMP B-TREE" not in details
+
+    def test_listing_does_not_read_guesses(self, db_path, sample_game_state):
+        states = self._states(sample_game_state, 5)
+        for state in states:
+            state.guess_records = [(Guess([1, 2, 3, 4]), Feedback(4, 4))]
+        with SQLiteGameRepository(db_path) as repository:
+            repository.save_many(states)
+            statements = []
+            repository._connection().set_trace_callback(statements.append)
+            page = repository.list_games(limit=3)
+            assert [state.status for state in page.games]
+            assert not any("guesses" in statement for statement in statements)
+
+            assert page.games[0].guess_records[0][1].positions_correct == 4
+            assert sum("guesses" in statement for statement in statements) == 1
+            assert not page.games[1].history_loaded
+
+    def test_write_behind_saves_are_listed(self, db_path, sample_game_state):
+        with SQLiteGameRepository(db_path, write_behind=True, flush_interval=60) as repository:
+            repository.save_game(sample_game_state)
+            assert [state.game_id for state in repository.list_games().games] == ["test-123"]
+
+    def test_invalid_limit(self, db_path):
+        with SQLiteGameRepository(db_path) as repository:
+            with pytest.raises(ValueError):
+                repository.list_games(limit=0)
+
+    def test_adds_listing_columns_to_old_table(self, db_path):
+        """
+        Test a games table from before listings gets the new columns, backfilled from config
+        """
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""
+                CREATE TABLE games (
+                    game_id TEXT PRIMARY KEY, code_pattern TEXT NOT NULL, status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL, created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL, config TEXT NOT NULL
+                )
+            """)
+            conn.execute("INSERT INTO games VALUES (?, ?, ?, ?, ?, ?, ?)", (
+                "old-game", "[1, 2, 3, 4, 5]", "won", 0,
+                "2024-01-01 12:00:00", "2024-01-01 12:05:00", '{"difficulty": "hard"}'))
+        conn.close()
+
+        with SQLiteGameRepository(db_path) as repository:
+            page = repository.list_games(difficulty=Difficulty.HARD)
+
+        assert [state.game_id for state in page.games] == ["old-game"]
+        assert page.games[0].player_id is None
+
+    def test_delete_many(self, db_path, sample_game_state):
+        states = self._states(sample_game_state, 4)
+        with SQLiteGameRepository(db_path, write_behind=True, flush_interval=60) as repository:
+            repository.save_many(states[:3])
+            repository.flush()
+            repository.save_game(states[3])
+
+            deleted = repository.delete_many(["list-0000", "list-0002", "list-0003", "wrong_id"],
+                                             updated_before=datetime(2024, 1, 1, 0, 1))
+            # list-0002 was updated at the cutoff, list-0003 is still queued
+            assert deleted == ["list-0000"]
+            assert sorted(repository.load_many(state.game_id for state in states)) == \
+                ["list-0001", "list-0002", "list-0003"]
+            assert "list-0000" not in repository._guess_counts
+
+
+class TestSQLiteSchemaVersions:
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return str(tmp_path / "versions.db")
+
+    def _outdate(self, db_path, count, sample_game_state):
+        """
+        Store games, then turn their rows back into format 1 (no difficulty column value)
+        """
+        with SQLiteGameRepository(db_path) as repository:
+            for number in range(count):
+                state = copy.deepcopy(sample_game_state)
+                state.game_id = f"old-{number:04d}"
+                repository.save_game(state)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("UPDATE games SET difficulty = NULL, format_version = 1")
+        conn.close()
+
+    def _formats(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            rows = conn.execute("SELECT game_id, difficulty, format_version FROM games ORDER BY game_id").fetchall()
+        conn.close()
+        return rows
+
+    def test_new_database_is_at_latest_version(self, db_path, sample_game_state):
+        with SQLiteGameRepository(db_path) as repository:
+            assert repository.schema_version == SCHEMA_MIGRATIONS[-1].version
+            repository.save_game(sample_game_state)
+        assert self._formats(db_path) == [("test-123", "normal", RECORD_FORMAT_VERSION)]
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_MIGRATIONS[-1].version
+        conn.close()
+
+    def test_newer_database_is_refused(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(f"PRAGMA user_version = {SCHEMA_MIGRATIONS[-1].version + 1}")
+        conn.close()
+        with pytest.raises(DatabaseError):
+            SQLiteGameRepository(db_path)
+
+    def test_records_upgrade_when_loaded(self, db_path, sample_game_state):
+        self._outdate(db_path, 3, sample_game_state)
+        with SQLiteGameRepository(db_path) as repository:
+            assert repository.load_game("old-0000").config.difficulty == Difficulty.NORMAL
+            repository.load_many(["old-0001"])
+            assert self._formats(db_path) == [("old-0000", "normal", 2), ("old-0001", "normal", 2),
+                                              ("old-0002", None, 1)]
+            # listings still find outdated rows by difficulty, and upgrade them as they load them
+            assert len(repository.list_games(difficulty=Difficulty.NORMAL).games) == 3
+        assert self._formats(db_path)[2] == ("old-0002", "normal", 2)
+
+    def test_difficulty_listing_upgrades_rows_first(self, db_path, sample_game_state):
+        """
+        Test a difficulty filter upgrades outdated rows, then filters on the indexed column
+        """
+        self._outdate(db_path, 4, sample_game_state)
+        with SQLiteGameRepository(db_path) as repository:
+            statements = []
+            repository._connection().set_trace_callback(statements.append)
+            assert len(repository.list_games(difficulty=Difficulty.NORMAL).games) == 4
+            assert not repository._outdated_records
+            assert not any("coalesce" in statement for statement in statements)
+        assert all(row[1:] == ("normal", 2) for row in self._formats(db_path))
+
+    def test_background_pass_upgrades_in_batches(self, db_path, sample_game_state):
+        self._outdate(db_path, 7, sample_game_state)
+        with SQLiteGameRepository(db_path) as repository:
+            statements = []
+            repository._connection().set_trace_callback(statements.append)
+            assert repository.upgrade_outdated_records(batch_size=3) == 7
+            assert sum(statement.strip().startswith("COMMIT") for statement in statements) == 3
+            assert not repository._outdated_records
+            assert repository.upgrade_outdated_records() == 0
+        assert all(row[1:] == ("normal", 2) for row in self._formats(db_path))
+
+        self._outdate(db_path, 5, sample_game_state)
+        with SQLiteGameRepository(db_path, upgrade_pause=0.0) as repository:
+            repository._upgrader.join()
+        assert all(row[1:] == ("normal", 2) for row in self._formats(db_path))
+
+
+    def test_unknown_format_stops_the_pass(self, db_path, sample_game_state):
+        """
+        Test rows no upgrade applies to raise instead of being selected again forever
+        """
+        self._outdate(db_path, 4, sample_game_state)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("UPDATE games SET format_version = 0 WHERE game_id = 'old-0002'")
+        conn.close()
+        with SQLiteGameRepository(db_path) as repository:
+            with pytest.raises(SaveError):
+                repository.upgrade_outdated_records(batch_size=2)
+            assert repository._outdated_records
+        assert self._formats(db_path)[2] == ("old-0002", None, 0)
+
+        with SQLiteGameRepository(db_path, upgrade_pause=0.0) as repository:
+            repository._upgrader.join(timeout=5)
+            assert not repository._upgrader.is_alive()
+
+class TestSQLiteLoadHeader:
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return str(tmp_path / "header.db")
+
+    def test_header_defers_guess_query(self, db_path, sample_game_state):
+        sample_game_state.guess_records = [(Guess([1, 1, 2, 2]), Feedback(2, 1))]
+        with SQLiteGameRepository(db_path) as repository:
+            repository.save_game(sample_game_state)
+            statements = []
+            repository._connection().set_trace_callback(statements.append)
+            header = repository.load_header("test-123")
+
+            assert header.status == GameStatus.IN_PROGRESS and header.attempts == 2
+            assert not any("guesses" in statement for statement in statements)
+            assert header.guess_records[0][0].get_numbers() == [1, 1, 2, 2]
+            with pytest.raises(GameNotFoundError):
+                repository.load_header("wrong_id")
+
+    def test_queued_game_loads_in_full(self, db_path, sample_game_state):
+        with SQLiteGameRepository(db_path, write_behind=True, flush_interval=60) as repository:
+            repository.save_game(sample_game_state)
+            assert repository.load_header("test-123").attempts == 2
+
+    @pytest.mark.parametrize("write_behind,flush", [(False, False), (True, False), (True, True)])
+    def test_history_matches_header_after_a_later_save(self, db_path, sample_game_state, write_behind, flush):
+        """
+        Test a game saved between the header and its history access reloads as one consistent state
+        """
+        sample_game_state.guess_records = [(Guess([1, 1, 2, 2]), Feedback(2, 1))]
+        sample_game_state.attempts = 1
+        with SQLiteGameRepository(db_path, write_behind=write_behind, flush_interval=60) as repository:
+            repository.save_game(sample_game_state)
+            repository.flush()
+            header = repository.load_header("test-123")
+
+            sample_game_state.guess_records.append((Guess([1, 2, 3, 4]), Feedback(4, 4)))
+            sample_game_state.attempts = 2
+            sample_game_state.status = GameStatus.WON
+            repository.save_game(sample_game_state)
+            if flush:
+                repository.flush()
+
+            assert len(header.guess_records) == 2
+            assert (header.status, header.attempts) == (GameStatus.WON, 2)
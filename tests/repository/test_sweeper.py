@@ -0,0 +1,132 @@
+import copy
+from datetime import datetime, timedelta
+from unittest.mock import patch
+import pytest
+
+from src.core.models.game_status import GameStatus
+from src.repository.memory import InMemoryGameRepository
+from src.repository.sharded import ShardedSQLiteGameRepository
+from src.repository.sqlite import SQLiteGameRepository
+from src.repository.sweeper import ExpirySweeper
+from src.services.exceptions.exceptions import GameNotFoundError, SaveError
+
+NOW = datetime(2024, 1, 10)
+
+
+class TestExpirySweeper:
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return str(tmp_path / "sweep.db")
+
+    def _states(self, sample_game_state, count, age, status=GameStatus.IN_PROGRESS, prefix="game"):
+        states = []
+        for number in range(count):
+            state = copy.deepcopy(sample_game_state)
+            state.game_id = f"{prefix}-{number:04d}"
+            state.status = status
+            state.updated_at = NOW - age - timedelta(minutes=number)
+            states.append(state)
+        return states
+
+    def _fill(self, repository, sample_game_state):
+        stale = self._states(sample_game_state, 12, timedelta(days=2), prefix="stale")
+        repository.save_many(stale)
+        repository.save_many(self._states(sample_game_state, 3, timedelta(hours=1), prefix="fresh"))
+        repository.save_many(self._states(sample_game_state, 3, timedelta(days=2), GameStatus.WON, prefix="won"))
+        return stale
+
+    def test_sweeps_stale_games_in_batches(self, db_path, sample_game_state):
+        with SQLiteGameRepository(db_path) as repository:
+            self._fill(repository, sample_game_state)
+            sweeper = ExpirySweeper(repository, max_age=timedelta(days=1), batch_size=5, clock=lambda: NOW)
+
+            assert sweeper.sweep() == 12
+            assert sorted(repository.game_ids()) == [f"fresh-{n:04d}" for n in range(3)] + \
+                [f"won-{n:04d}" for n in range(3)]
+            assert repository._connection().execute(
+                "SELECT COUNT(*) FROM guesses WHERE game_id LIKE 'stale-%'").fetchone()[0] == 0
+
+            stats = sweeper.stats
+            assert (stats.passes, stats.batches, stats.swept, stats.kept) == (1, 3, 12, 0)
+            assert stats.max_batch_seconds >= stats.last_batch_seconds > 0
+            assert sweeper.sweep() == 0
+
+    def test_archives_before_deleting(self, sample_game_state):
+        repository = InMemoryGameRepository()
+        archive = InMemoryGameRepository()
+        stale = self._fill(repository, sample_game_state)
+        sweeper = ExpirySweeper(repository, max_age=timedelta(days=1), batch_size=4, archive=archive,
+                                clock=lambda: NOW)
+
+        assert sweeper.sweep() == 12
+        assert archive.load_game("stale-0003").updated_at == stale[3].updated_at
+        with pytest.raises(GameNotFoundError):
+            repository.load_game("stale-0003")
+        assert sweeper.stats.archived == 12
+
+    def test_archived_batches_load_in_bulk(self, db_path, sample_game_state):
+        """
+        Test archiving a page does not load each listed header's history on its own
+        """
+        archive = InMemoryGameRepository()
+        with SQLiteGameRepository(db_path) as repository:
+            stale = self._fill(repository, sample_game_state)
+            sweeper = ExpirySweeper(repository, max_age=timedelta(days=1), batch_size=5, archive=archive,
+                                    clock=lambda: NOW)
+            with patch.object(repository, "_load_history", side_effect=AssertionError("per-game history query")):
+                assert sweeper.sweep() == 12
+        assert archive.load_game("stale-0007").guess_records == stale[7].guess_records
+
+    def test_game_saved_again_is_kept(self, db_path, sample_game_state):
+        """
+        Test a game saved between being picked and the delete survives the sweep
+        """
+        with SQLiteGameRepository(db_path) as repository:
+            stale = self._fill(repository, sample_game_state)
+            list_games = repository.list_games
+
+            def list_then_play(**filters):
+                page = list_games(**filters)
+                stale[0].updated_at = NOW
+                repository.save_game(stale[0])
+                return page
+
+            sweeper = ExpirySweeper(repository, max_age=timedelta(days=1), batch_size=20, clock=lambda: NOW)
+            with patch.object(repository, "list_games", side_effect=list_then_play):
+                assert sweeper.sweep() == 11
+            assert repository.load_game("stale-0000").updated_at == NOW
+            assert sweeper.stats.kept == 1
+
+    def test_sharded_and_write_behind(self, tmp_path, sample_game_state):
+        with ShardedSQLiteGameRepository(str(tmp_path / "shards"), shard_count=3, write_behind=True) as repository:
+            self._fill(repository, sample_game_state)
+            sweeper = ExpirySweeper(repository, max_age=timedelta(days=1), batch_size=5, clock=lambda: NOW)
+            assert sweeper.sweep() == 12
+            assert len(repository.game_ids()) == 6
+
+    def test_failed_batch_is_counted(self, db_path, sample_game_state):
+        with SQLiteGameRepository(db_path) as repository:
+            self._fill(repository, sample_game_state)
+            sweeper = ExpirySweeper(repository, max_age=timedelta(days=1), clock=lambda: NOW)
+            with patch.object(repository, "delete_many", side_effect=SaveError("disk full")):
+                with pytest.raises(SaveError):
+                    sweeper.sweep()
+            assert sweeper.stats.errors == 1
+            assert len(repository.game_ids()) == 18
+
+    def test_background_sweeps(self, db_path, sample_game_state):
+        with SQLiteGameRepository(db_path) as repository:
+            self._fill(repository, sample_game_state)
+            with ExpirySweeper(repository, max_age=timedelta(days=1), interval=0.01, clock=lambda: NOW) as sweeper:
+                for _ in range(500):
+                    if sweeper.stats.passes:
+                        break
+                    sweeper._stop.wait(0.01)
+            assert sweeper.stats.swept == 12
+            assert sweeper._thread is None
+
+    def test_invalid_settings(self):
+        with pytest.raises(ValueError):
+            ExpirySweeper(InMemoryGameRepository(), batch_size=0)
+        with pytest.raises(ValueError):
+            ExpirySweeper(InMemoryGameRepository(), max_age=timedelta(0))
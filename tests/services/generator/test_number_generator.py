@@ -3,6 +3,7 @@ import requests
 from unittest.mock import patch, Mock
 from src.core.config.game_config import GameConfig
 from src.core.models.game_difficulty import Difficulty
+from src.services.generators.fixed import FixedCodeGenerator
 from src.services.generators.random_org import RandomOrgGenerator
 from src.services.exceptions.exceptions import GeneratorError
 
@@ -143,4 +144,13 @@ class TestRandomGenerator:
         error_msg = str(exc_info.value)
         assert "Both API and fallback generation failed" in error_msg
         assert "Network is unreachable" in error_msg
-        assert "Random generation failed" in error_msg
\ No newline at end of file
+        assert "Random generation failed" in error_msg
+
+class TestFixedCodeGenerator:
+    def test_generate_returns_copy_of_code(self, game_config):
+        generator = FixedCodeGenerator([3, 1, 4, 1])
+
+        first = generator.generate(game_config)
+        first.append(9)
+
+        assert generator.generate(game_config) == [3, 1, 4, 1]
@@ -0,0 +1,51 @@
+import pytest
+
+from src.core.models.game_difficulty import Difficulty
+from src.services.simulation.harness import SimulationReport, run_simulation
+
+
+class TestSimulation:
+    @pytest.mark.parametrize("strategy", ["minimax", "consistent"])
+    def test_in_process_run(self, strategy):
+        """
+        Test a small in-process run wins every game within the attempt limit
+        """
+        report = run_simulation(strategy=strategy, workers=1, limit=24, chunk_size=8)
+
+        assert report.games == 24
+        assert report.win_rate == 1.0
+        assert report.worst_guesses <= 10
+        assert sum(report.guess_histogram.values()) == 24
+        assert report.games_per_second > 0
+
+    def test_process_pool_matches_in_process(self):
+        """
+        Test spreading secrets over worker processes gives the same results
+        """
+        single = run_simulation(strategy="consistent", workers=1, limit=16, chunk_size=4, repository="memory")
+        pooled = run_simulation(strategy="consistent", workers=2, limit=16, chunk_size=4, repository="memory")
+
+        assert pooled.games == single.games
+        assert pooled.total_guesses == single.total_guesses
+        assert pooled.guess_histogram == single.guess_histogram
+
+    def test_uses_shared_table(self, tmp_path):
+        report = run_simulation(workers=1, limit=8, table_dir=str(tmp_path))
+        assert report.win_rate == 1.0
+        assert any(tmp_path.glob("*.npy"))
+
+    @pytest.mark.parametrize("kwargs", [{"strategy": "random"}, {"repository": "sqlite"}])
+    def test_invalid_options(self, kwargs):
+        with pytest.raises(ValueError):
+            run_simulation(workers=1, limit=1, **kwargs)
+
+    def test_report_lost_games(self):
+        report = SimulationReport(difficulty=Difficulty.NORMAL, strategy="minimax")
+        report.add(4, True)
+        report.add(10, False)
+
+        assert report.games == 2
+        assert report.win_rate == 0.5
+        assert report.average_guesses == 7
+        assert report.worst_guesses == 10
+        assert report.guess_histogram == {4: 1}
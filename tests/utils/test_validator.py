@@ -1,5 +1,7 @@
 import pytest
 from unittest.mock import Mock, patch
+from src.core.config.game_config import GameConfig
+from src.core.models.game_difficulty import Difficulty
 from src.utils.validators import InputValidator, ValidationResult
 
 class TestInputValidator:
@@ -94,6 +96,19 @@ class TestInputValidator:
         result = mock_validator.parse_guess_input(input_str)
         assert result == [1, 2, 3, 4]
 
+    def test_multi_digit_numbers_count_as_one_position(self):
+        """
+        Test custom configurations above 9 are validated and parsed by token
+        """
+        validator = InputValidator(GameConfig(Difficulty.CUSTOM, pattern_length=3, max_number=11))
+
+        assert validator.validate_guess_input("10 11 3").is_valid is True
+        assert validator.parse_guess_input(" 10  11 3 ") == [10, 11, 3]
+        assert validator.validate_guess_input("103").is_valid is True
+        result = validator.validate_guess_input("1011")
+        assert result.error_code == "INVALID_LENGTH"
+        assert "separated by spaces" in result.message
+
     def test_validate_number_range_valid(self, mock_validator):
         """
         Test validation of numbers within valid range